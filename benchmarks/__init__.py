@@ -0,0 +1,4 @@
+"""Performance benchmarks for the ADS Custom integration.
+
+Run ``python -m benchmarks.run_benchmarks --help`` from the repository root.
+"""
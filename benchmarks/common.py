@@ -0,0 +1,122 @@
+"""Shared helpers for the ADS Custom benchmarks."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import ctypes
+import statistics
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+# Patch ConfigSubentry into older Home Assistant releases before the
+# integration is imported
+from tests import ha_compat  # noqa: E402,F401
+
+import pyads  # noqa: E402
+
+_DATA_OFFSET = pyads.structs.SAdsNotificationHeader.data.offset
+_TIMESTAMP_OFFSET = pyads.structs.SAdsNotificationHeader.nTimeStamp.offset
+_SAMPLE_SIZE_OFFSET = pyads.structs.SAdsNotificationHeader.cbSampleSize.offset
+
+
+class FakeAdsClient:
+    """Minimal in-process stand-in for ``pyads.Connection``.
+
+    Records registered notification callbacks so benchmarks can fire them,
+    and accepts reads/writes without any I/O.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the fake client."""
+        self.callbacks: dict[int, tuple[Any, Callable]] = {}
+        self.writes = 0
+        self._next_handle = 1
+
+    def open(self) -> None:
+        """Open the (fake) connection."""
+
+    def close(self) -> None:
+        """Close the (fake) connection."""
+
+    def add_device_notification(self, data, attr, callback, user_handle=None):
+        """Register a notification and return (hnotify, huser)."""
+        handle = self._next_handle
+        self._next_handle += 1
+        self.callbacks[handle] = (data, callback)
+        return handle, handle
+
+    def del_device_notification(self, hnotify, huser) -> None:
+        """Remove a notification."""
+        self.callbacks.pop(hnotify, None)
+
+    def write_by_name(self, name, value, plc_datatype=None) -> None:
+        """Accept a write."""
+        self.writes += 1
+
+    def read_by_name(self, name, plc_datatype=None):
+        """Return a dummy value."""
+        return 0
+
+
+class NotificationBuffer:
+    """A ctypes buffer laid out like a pyads ``SAdsNotificationHeader``.
+
+    ``pointer`` can be passed to ``AdsHub._device_notification_callback``
+    exactly like the pointer pyads hands to notification callbacks.
+    """
+
+    def __init__(self, hnotify: int, data: bytes, timestamp: int = 0) -> None:
+        """Build the header and payload."""
+        size = max(
+            _DATA_OFFSET + len(data),
+            ctypes.sizeof(pyads.structs.SAdsNotificationHeader),
+        )
+        self._buffer = (ctypes.c_ubyte * size)()
+        struct.pack_into("<I", self._buffer, 0, hnotify)
+        struct.pack_into("<Q", self._buffer, _TIMESTAMP_OFFSET, timestamp)
+        struct.pack_into("<I", self._buffer, _SAMPLE_SIZE_OFFSET, len(data))
+        ctypes.memmove(ctypes.addressof(self._buffer) + _DATA_OFFSET, data, len(data))
+        self.pointer = ctypes.pointer(
+            pyads.structs.SAdsNotificationHeader.from_buffer(self._buffer)
+        )
+
+
+def time_it(
+    func: Callable[[], Any],
+    *,
+    number: int,
+    repeat: int,
+    setup: Callable[[], Any] | None = None,
+) -> dict[str, float]:
+    """Time ``func`` and return per-call statistics in microseconds.
+
+    ``func`` is called ``number`` times per batch, for ``repeat`` batches.
+    ``setup`` (if given) runs before every batch and is not timed.
+    """
+    samples: list[float] = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number * 1e6)
+
+    samples.sort()
+    median = statistics.median(samples)
+    return {
+        "number": number,
+        "repeat": repeat,
+        "min_us": samples[0],
+        "median_us": median,
+        "mean_us": statistics.fmean(samples),
+        "p95_us": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "ops_per_sec": 1e6 / median if median else 0.0,
+    }
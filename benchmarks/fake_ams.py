@@ -0,0 +1,431 @@
+"""Local fake AMS/TCP server for testing the native asyncio ADS client.
+
+``FakeAmsServer`` listens on a local TCP port and answers the ADS commands
+``AmsClient`` sends: symbol handles, reads and writes by handle or name,
+symbol information, sum reads, device state and device notifications.
+Symbols are given as a dict of name to ``(plc_datatype, value)``; values
+changed with ``set_value`` (or by a client write) are pushed to every
+notification on that symbol. ``online_change`` replaces the symbol table
+like a TwinCAT online change: handles of symbols that moved or changed
+type become invalid and the symbol version is incremented.
+``set_ads_state`` switches the target between RUN, STOP and CONFIG and
+notifies subscribers of the ADS state.
+
+``delays`` holds per-symbol response delays in seconds, which makes
+responses arrive out of order and is used to check request pipelining.
+Every request is handled in its own task, and ``max_in_flight`` records
+how many were outstanding at the same time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ctypes
+import struct
+from typing import Any
+
+import pyads
+from pyads.constants import ADSIGRP_DEVICE_DATA, ads_type_to_ctype
+
+from custom_components.ads_custom.ams import (
+    ADSCOMMAND_ADD_NOTIFICATION,
+    ADSCOMMAND_DEL_NOTIFICATION,
+    ADSCOMMAND_NOTIFICATION,
+    ADSCOMMAND_READ,
+    ADSCOMMAND_READ_STATE,
+    ADSCOMMAND_READ_WRITE,
+    ADSCOMMAND_WRITE,
+    ADSIGRP_SUMUP_DELDEVNOTE,
+    ADSIGRP_SUMUP_READ,
+    ADSIGRP_SUMUP_WRITE,
+    ADSIGRP_SYM_HNDBYNAME,
+    ADSIGRP_SYM_INFOBYNAMEEX,
+    ADSIGRP_SYM_RELEASEHND,
+    ADSIGRP_SYM_VALBYHND,
+    ADSIGRP_SYM_VALBYNAME,
+    ADSIGRP_SYM_VERSION,
+    AMS_HEADER,
+    AMS_TCP_HEADER,
+    STATE_FLAG_REQUEST,
+    STATE_FLAG_RESPONSE,
+    SYMBOL_ENTRY,
+    encode_value,
+)
+
+from .fake_plc import ADSERR_SYMBOL_NOT_FOUND, filetime_now
+
+ADSERR_DEVICE_SRVNOTSUPP = 1793
+ADSERR_DEVICE_INVALIDOFFSET = 1795
+ADSSTATE_RUN = 5
+# Stands in for a symbol name in notifications of the ADS state
+_ADS_STATE = "<ads state>"
+
+# Index group reported in symbol information for all symbols
+_SYMBOL_INDEX_GROUP = 0x4040
+_STRING_SIZE = 81
+_ADS_TYPES = {ctype: ads_type for ads_type, ctype in ads_type_to_ctype.items()}
+
+
+class FakeAmsServer:
+    """ADS target serving a symbol table over AMS/TCP."""
+
+    def __init__(
+        self,
+        symbols: dict[str, tuple[Any, Any]],
+        *,
+        delays: dict[str, float] | None = None,
+    ) -> None:
+        """Initialize the symbol table; ``start`` opens the port."""
+        self.symbols = dict(symbols)
+        self._names = list(self.symbols)
+        self.delays = delays or {}
+        self.port = 0
+        self.ads_state = ADSSTATE_RUN
+        self.symbol_version = 1
+        self.requests = 0
+        # AMS ports requests were addressed to; all serve the same symbols
+        self.target_ports: set[int] = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._server: asyncio.Server | None = None
+        self._transports: set[asyncio.Transport] = set()
+        self._next_handle = 1
+        # handle -> symbol name
+        self._handles: dict[int, str] = {}
+        # notification handle -> (transport, header fields, symbol name,
+        # None for the symbol version or _ADS_STATE)
+        self._notifications: dict[
+            int, tuple[asyncio.Transport, tuple, str | None]
+        ] = {}
+
+    async def start(self, host: str = "127.0.0.1") -> None:
+        """Listen on a free local port (available as ``port``)."""
+        loop = asyncio.get_running_loop()
+        self._server = await loop.create_server(
+            lambda: _ServerProtocol(self), host, 0
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        """Close all connections and stop listening."""
+        for transport in list(self._transports):
+            transport.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def drop_connections(self) -> None:
+        """Close all client connections, keeping the server listening."""
+        for transport in list(self._transports):
+            transport.abort()
+
+    def set_value(self, name: str, value: Any) -> None:
+        """Change a symbol and notify its subscribers."""
+        plc_datatype, _old = self.symbols[name]
+        self.symbols[name] = (plc_datatype, value)
+        for hnotify, (transport, header, symbol) in list(self._notifications.items()):
+            if symbol == name:
+                self._notify(transport, header, hnotify, name)
+
+    def online_change(self, symbols: dict[str, tuple[Any, Any]]) -> None:
+        """Replace the symbol table and notify the new symbol version.
+
+        Symbols that keep their type and position keep their handles; the
+        handles and notifications of all others become invalid.
+        """
+        old = {
+            name: (self._names.index(name), plc_datatype)
+            for name, (plc_datatype, _value) in self.symbols.items()
+        }
+        self.symbols = dict(symbols)
+        self._names = [name for name in self._names if name in symbols]
+        self._names += [name for name in symbols if name not in self._names]
+        changed = {
+            name
+            for name, layout in old.items()
+            if name not in self.symbols
+            or (self._names.index(name), self.symbols[name][0]) != layout
+        }
+        self._handles = {
+            handle: name
+            for handle, name in self._handles.items()
+            if name not in changed
+        }
+        self._notifications = {
+            hnotify: entry
+            for hnotify, entry in self._notifications.items()
+            if entry[2] not in changed
+        }
+        self.symbol_version = (self.symbol_version + 1) % 256
+        for hnotify, (transport, header, symbol) in list(self._notifications.items()):
+            if symbol is None:
+                self._notify(transport, header, hnotify, None)
+
+    def set_ads_state(self, state: int) -> None:
+        """Change the ADS state and notify its subscribers."""
+        self.ads_state = state
+        for hnotify, (transport, header, symbol) in list(self._notifications.items()):
+            if symbol == _ADS_STATE:
+                self._notify(transport, header, hnotify, _ADS_STATE)
+
+    # Encoding ------------------------------------------------------------
+
+    def _value_bytes(self, name: str | None) -> bytes:
+        if name is None:
+            return bytes((self.symbol_version,))
+        if name == _ADS_STATE:
+            return struct.pack("<H", self.ads_state)
+        plc_datatype, value = self.symbols[name]
+        data = encode_value(plc_datatype, value)
+        if plc_datatype is pyads.PLCTYPE_STRING:
+            data = data[:_STRING_SIZE].ljust(_STRING_SIZE, b"\x00")
+        return data
+
+    def _symbol_entry(self, name: str) -> bytes:
+        plc_datatype, _value = self.symbols[name]
+        size = (
+            _STRING_SIZE
+            if plc_datatype is pyads.PLCTYPE_STRING
+            else ctypes.sizeof(plc_datatype)
+        )
+        strings = name.encode() + b"\x00" + b"\x00" + b"\x00"
+        return (
+            SYMBOL_ENTRY.pack(
+                SYMBOL_ENTRY.size + len(strings),
+                _SYMBOL_INDEX_GROUP,
+                self._names.index(name),
+                size,
+                _ADS_TYPES[plc_datatype],
+                0,
+                len(name),
+                0,
+                0,
+            )
+            + strings
+        )
+
+    @staticmethod
+    def _frame(header: tuple, command: int, flags: int, data: bytes, invoke_id: int) -> bytes:
+        target, target_port, source, source_port = header
+        ams = AMS_HEADER.pack(
+            source, source_port, target, target_port, command, flags, len(data), 0, invoke_id
+        )
+        return AMS_TCP_HEADER.pack(0, len(ams) + len(data)) + ams + data
+
+    def _notify(self, transport, header, hnotify: int, name: str | None) -> None:
+        data = self._value_bytes(name)
+        sample = struct.pack("<QIII", filetime_now(), 1, hnotify, len(data)) + data
+        body = struct.pack("<II", len(sample) + 4, 1) + sample
+        transport.write(
+            self._frame(header, ADSCOMMAND_NOTIFICATION, STATE_FLAG_REQUEST, body, 0)
+        )
+
+    # Request handling ----------------------------------------------------
+
+    async def handle(self, transport: asyncio.Transport, packet: bytes) -> None:
+        """Answer one AMS request."""
+        (
+            target,
+            target_port,
+            source,
+            source_port,
+            command,
+            _flags,
+            length,
+            _error,
+            invoke_id,
+        ) = AMS_HEADER.unpack_from(packet)
+        header = (target, target_port, source, source_port)
+        data = packet[AMS_HEADER.size : AMS_HEADER.size + length]
+        self.requests += 1
+        self.target_ports.add(target_port)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            result, response, after = await self._execute(transport, header, command, data)
+        finally:
+            self.in_flight -= 1
+        if transport.is_closing():
+            return
+        transport.write(
+            self._frame(
+                header,
+                command,
+                STATE_FLAG_RESPONSE,
+                struct.pack("<I", result) + (response if not result else b""),
+                invoke_id,
+            )
+        )
+        if after is not None:
+            after()
+
+    async def _execute(self, transport, header, command: int, data: bytes):
+        """Return (result code, response data, callback after responding)."""
+        if command == ADSCOMMAND_READ_STATE:
+            return 0, struct.pack("<HH", self.ads_state, 0), None
+        if command == ADSCOMMAND_READ:
+            index_group, index_offset, length = struct.unpack_from("<III", data)
+            name = self._handles.get(index_offset)
+            if index_group != ADSIGRP_SYM_VALBYHND or name is None:
+                return ADSERR_DEVICE_INVALIDOFFSET, b"", None
+            value = self._value_bytes(name)[:length]
+            return 0, struct.pack("<I", len(value)) + value, None
+        if command == ADSCOMMAND_WRITE:
+            index_group, index_offset, length = struct.unpack_from("<III", data)
+            value = data[12 : 12 + length]
+            if index_group == ADSIGRP_SYM_RELEASEHND:
+                self._handles.pop(struct.unpack_from("<I", value)[0], None)
+                return 0, b"", None
+            name = self._handles.get(index_offset)
+            if index_group != ADSIGRP_SYM_VALBYHND or name is None:
+                return ADSERR_DEVICE_INVALIDOFFSET, b"", None
+            plc_datatype, _old = self.symbols[name]
+            if plc_datatype is pyads.PLCTYPE_STRING:
+                new = value.split(b"\x00", 1)[0].decode()
+            else:
+                new = plc_datatype.from_buffer_copy(value).value
+            return 0, b"", lambda: self.set_value(name, new)
+        if command == ADSCOMMAND_READ_WRITE:
+            return await self._read_write(data)
+        if command == ADSCOMMAND_ADD_NOTIFICATION:
+            index_group, index_offset = struct.unpack_from("<II", data)
+            name = self._handles.get(index_offset)
+            if index_group == ADSIGRP_SYM_VERSION:
+                name = None
+            elif index_group == ADSIGRP_DEVICE_DATA:
+                name = _ADS_STATE
+            elif index_group != ADSIGRP_SYM_VALBYHND or name is None:
+                return ADSERR_DEVICE_INVALIDOFFSET, b"", None
+            hnotify = self._allocate_handle()
+            self._notifications[hnotify] = (transport, header, name)
+            # Like TwinCAT, the current value follows the response at once
+            return (
+                0,
+                struct.pack("<I", hnotify),
+                lambda: self._notify(transport, header, hnotify, name),
+            )
+        if command == ADSCOMMAND_DEL_NOTIFICATION:
+            (hnotify,) = struct.unpack_from("<I", data)
+            self._notifications.pop(hnotify, None)
+            return 0, b"", None
+        return ADSERR_DEVICE_SRVNOTSUPP, b"", None
+
+    async def _read_write(self, data: bytes):
+        index_group, index_offset, read_length, write_length = struct.unpack_from(
+            "<IIII", data
+        )
+        value = data[16 : 16 + write_length]
+        if index_group == ADSIGRP_SUMUP_READ:
+            errors, chunks = [], []
+            for index in range(index_offset):
+                _group, offset, size = struct.unpack_from("<III", value, 12 * index)
+                if offset < len(self._names):
+                    errors.append(0)
+                    chunks.append(self._value_bytes(self._names[offset])[:size])
+                else:
+                    errors.append(ADSERR_SYMBOL_NOT_FOUND)
+                    chunks.append(bytes(size))
+            response = struct.pack(f"<{len(errors)}I", *errors) + b"".join(chunks)
+            return 0, struct.pack("<I", len(response)) + response, None
+        if index_group == ADSIGRP_SUMUP_WRITE:
+            return self._sum_write(index_offset, value)
+        if index_group == ADSIGRP_SUMUP_DELDEVNOTE:
+            errors = [
+                0
+                if self._notifications.pop(hnotify, None)
+                else ADSERR_DEVICE_INVALIDOFFSET
+                for hnotify in struct.unpack_from(f"<{index_offset}I", value)
+            ]
+            response = struct.pack(f"<{index_offset}I", *errors)
+            return 0, struct.pack("<I", len(response)) + response, None
+
+        name = value.split(b"\x00", 1)[0].decode()
+        if name not in self.symbols:
+            return ADSERR_SYMBOL_NOT_FOUND, b"", None
+        if delay := self.delays.get(name):
+            await asyncio.sleep(delay)
+        if index_group == ADSIGRP_SYM_HNDBYNAME:
+            handle = self._allocate_handle()
+            self._handles[handle] = name
+            response = struct.pack("<I", handle)
+        elif index_group == ADSIGRP_SYM_VALBYNAME:
+            response = self._value_bytes(name)[:read_length]
+        elif index_group == ADSIGRP_SYM_INFOBYNAMEEX:
+            response = self._symbol_entry(name)
+        else:
+            return ADSERR_DEVICE_SRVNOTSUPP, b"", None
+        return 0, struct.pack("<I", len(response)) + response, None
+
+    def _sum_write(self, count: int, value: bytes):
+        """Apply a sum write; subscribers are notified after the response."""
+        errors, changes = [], []
+        offset = 12 * count
+        for index in range(count):
+            group, symbol, size = struct.unpack_from("<III", value, 12 * index)
+            data = value[offset : offset + size]
+            offset += size
+            if group == ADSIGRP_SYM_RELEASEHND:
+                self._handles.pop(struct.unpack_from("<I", data)[0], None)
+                errors.append(0)
+                continue
+            if symbol >= len(self._names):
+                errors.append(ADSERR_SYMBOL_NOT_FOUND)
+                continue
+            name = self._names[symbol]
+            plc_datatype, _old = self.symbols[name]
+            if plc_datatype is pyads.PLCTYPE_STRING:
+                new = data.split(b"\x00", 1)[0].decode()
+            else:
+                new = plc_datatype.from_buffer_copy(data).value
+            errors.append(0)
+            changes.append((name, new))
+        response = struct.pack(f"<{count}I", *errors)
+
+        def notify():
+            for name, new in changes:
+                self.set_value(name, new)
+
+        return 0, struct.pack("<I", len(response)) + response, notify
+
+    def _allocate_handle(self) -> int:
+        handle = self._next_handle
+        self._next_handle += 1
+        return handle
+
+
+class _ServerProtocol(asyncio.Protocol):
+    """Split the byte stream and handle each request in its own task."""
+
+    def __init__(self, server: FakeAmsServer) -> None:
+        self._server = server
+        self._buffer = bytearray()
+        self._transport: asyncio.Transport | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    def connection_made(self, transport) -> None:
+        self._transport = transport
+        self._server._transports.add(transport)  # noqa: SLF001
+
+    def connection_lost(self, exc) -> None:
+        server = self._server
+        server._transports.discard(self._transport)  # noqa: SLF001
+        # Like a router, drop the notifications of the closed connection
+        server._notifications = {  # noqa: SLF001
+            hnotify: entry
+            for hnotify, entry in server._notifications.items()  # noqa: SLF001
+            if entry[0] is not self._transport
+        }
+
+    def data_received(self, data: bytes) -> None:
+        buffer = self._buffer
+        buffer += data
+        while len(buffer) >= AMS_TCP_HEADER.size:
+            _reserved, length = AMS_TCP_HEADER.unpack_from(buffer)
+            end = AMS_TCP_HEADER.size + length
+            if len(buffer) < end:
+                break
+            packet = bytes(buffer[AMS_TCP_HEADER.size : end])
+            del buffer[:end]
+            task = asyncio.ensure_future(self._server.handle(self._transport, packet))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
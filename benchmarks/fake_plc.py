@@ -0,0 +1,350 @@
+"""In-process fake PLC for load and soak testing.
+
+``FakePlc`` is a drop-in replacement for ``pyads.Connection`` that simulates
+a controller with thousands of symbols. A worker thread changes subscribed
+symbols at a configurable rate and delivers notifications exactly like the
+pyads callback thread does (a pointer to an ``SAdsNotificationHeader``), so
+``AdsHub`` and the entity dispatch path run unmodified on a plain Linux box.
+
+Faults can be injected on demand: fixed call/notification latency, random
+``ADSError`` responses and connection drops, optionally with a simulated PLC
+restart that invalidates every notification handle.
+
+``pyads.testserver.AdsTestServer`` was considered, but its handlers resolve
+variables by linear search and notify synchronously on write, which makes it
+unsuitable for thousands of symbols changing many times per second.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+import random
+import struct
+import threading
+import time
+from typing import Any
+
+from .common import NotificationBuffer
+
+import pyads  # noqa: E402
+
+# ADS error codes used for injected faults
+ADSERR_TARGET_PORT_NOT_FOUND = 6
+ADSERR_SYMBOL_NOT_FOUND = 1808
+ADSERR_TIMEOUT = 1861
+
+# Seconds between 1601-01-01 (FILETIME epoch) and 1970-01-01
+_FILETIME_EPOCH_OFFSET = 11644473600
+
+# Symbol type mix: (PLC data type, struct format, initial value)
+SYMBOL_TYPES = (
+    (pyads.PLCTYPE_BOOL, "<?", False),
+    (pyads.PLCTYPE_INT, "<h", 0),
+    (pyads.PLCTYPE_UDINT, "<I", 0),
+    (pyads.PLCTYPE_REAL, "<f", 0.0),
+    (pyads.PLCTYPE_DINT, "<i", 0),
+    (pyads.PLCTYPE_LREAL, "<d", 0.0),
+    (pyads.PLCTYPE_BYTE, "<B", 0),
+    (pyads.PLCTYPE_STRING, None, "state 0"),
+)
+
+_STRING_SIZE = 81
+
+
+def filetime_now() -> int:
+    """Return the current time as a Windows FILETIME (100 ns ticks)."""
+    return int((time.time() + _FILETIME_EPOCH_OFFSET) * 10_000_000)
+
+
+def _next_value(value: Any, fmt: str | None) -> Any:
+    """Return the next simulated value for a symbol."""
+    if fmt == "<?":
+        return not value
+    if fmt in ("<f", "<d"):
+        return round(value + 0.5, 1) % 1000
+    if fmt is None:
+        return f"state {(int(value[6:]) + 1) % 10}"
+    return (value + 1) % 128
+
+
+def _pack(value: Any, fmt: str | None) -> bytes:
+    """Pack a symbol value like the PLC would send it."""
+    if fmt is None:
+        return value.encode("utf-8")[: _STRING_SIZE - 1].ljust(_STRING_SIZE, b"\x00")
+    return struct.pack(fmt, value)
+
+
+class _Symbol:
+    """A simulated PLC variable."""
+
+    __slots__ = ("fmt", "last_change", "name", "plc_datatype", "value")
+
+    def __init__(self, name: str, plc_datatype: type, fmt: str | None, value: Any) -> None:
+        self.name = name
+        self.plc_datatype = plc_datatype
+        self.fmt = fmt
+        self.value = value
+        self.last_change = 0.0
+
+
+class FakePlc:
+    """Simulated PLC speaking the subset of ``pyads.Connection`` used by AdsHub.
+
+    :param symbols: number of generated symbols (``GVL.var0`` ... ``GVL.varN``)
+    :param change_rate: total value changes per second across all subscribed
+        symbols; can be changed while running with ``set_change_rate``
+    :param latency: seconds added to every client call and notification
+    :param error_rate: probability (0-1) that a client call raises ``ADSError``
+    :param seed: seed for reproducible symbol selection and error injection
+    """
+
+    def __init__(
+        self,
+        symbols: int = 1000,
+        *,
+        change_rate: float = 0.0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int | None = 0,
+        tick: float = 0.005,
+    ) -> None:
+        """Initialize the fake PLC."""
+        self.symbols: dict[str, _Symbol] = {}
+        for index in range(symbols):
+            plc_datatype, fmt, value = SYMBOL_TYPES[index % len(SYMBOL_TYPES)]
+            name = f"GVL.var{index}"
+            self.symbols[name] = _Symbol(name, plc_datatype, fmt, value)
+
+        self.latency = latency
+        self.error_rate = error_rate
+        self.stats = {
+            "calls": 0,
+            "errors_injected": 0,
+            "notifications_sent": 0,
+            "changes": 0,
+            "writes": 0,
+            "disconnects": 0,
+            "subscriptions_lost": 0,
+        }
+
+        self._change_rate = change_rate
+        self._tick = tick
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        # hnotify -> (symbol, callback)
+        self._subscriptions: dict[int, tuple[_Symbol, Callable]] = {}
+        self._next_handle = 1
+        # (due time, hnotify, payload, FILETIME timestamp)
+        self._pending: deque[tuple[float, int, bytes, int]] = deque()
+        self._connected = False
+        self._reconnect_at: float | None = None
+        self._reset_on_reconnect = False
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # pyads.Connection API ------------------------------------------------
+
+    def open(self) -> None:
+        """Connect and start the notification thread."""
+        self._connected = True
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="FakePlc", daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop the notification thread and disconnect."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._connected = False
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while connected."""
+        return self._connected
+
+    def add_device_notification(self, data, attr, callback, user_handle=None):
+        """Subscribe to a symbol; its current value is sent right away."""
+        symbol = self._call(data)
+        with self._lock:
+            hnotify = self._next_handle
+            self._next_handle += 1
+            self._subscriptions[hnotify] = (symbol, callback)
+            self._queue(hnotify, symbol, time.monotonic())
+        return hnotify, hnotify
+
+    def del_device_notification(self, hnotify, huser) -> None:
+        """Remove a subscription."""
+        self._call()
+        with self._lock:
+            self._subscriptions.pop(int(hnotify), None)
+
+    def read_by_name(self, name, plc_datatype=None):
+        """Return the current value of a symbol."""
+        return self._call(name).value
+
+    def read_list_by_name(self, data_names):
+        """Return several values with one (simulated) sum read.
+
+        Like pyads, a missing symbol fails the whole read because its symbol
+        info cannot be looked up.
+        """
+        self._call()
+        try:
+            return {name: self.symbols[name].value for name in data_names}
+        except KeyError:
+            raise pyads.ADSError(ADSERR_SYMBOL_NOT_FOUND) from None
+
+    def write_list_by_name(self, data_names_and_values):
+        """Write several values with one (simulated) sum write.
+
+        Returns ``"no error"`` per symbol like pyads; a missing symbol fails
+        the whole write because its symbol info cannot be looked up.
+        """
+        self._call()
+        try:
+            symbols = [
+                (self.symbols[name], value)
+                for name, value in data_names_and_values.items()
+            ]
+        except KeyError:
+            raise pyads.ADSError(ADSERR_SYMBOL_NOT_FOUND) from None
+        now = time.monotonic()
+        with self._lock:
+            for symbol, value in symbols:
+                self.stats["writes"] += 1
+                if symbol.value != value:
+                    symbol.value = value
+                    self._changed(symbol, now)
+        return {name: "no error" for name in data_names_and_values}
+
+    def write_by_name(self, name, value, plc_datatype=None) -> None:
+        """Write a symbol, notifying subscribers on change."""
+        symbol = self._call(name)
+        with self._lock:
+            self.stats["writes"] += 1
+            if symbol.value != value:
+                symbol.value = value
+                self._changed(symbol, time.monotonic())
+
+    # Fault injection -----------------------------------------------------
+
+    def set_change_rate(self, change_rate: float) -> None:
+        """Change the number of value changes per second."""
+        self._change_rate = change_rate
+
+    def disconnect(self, duration: float | None = None, *, reset: bool = False) -> None:
+        """Drop the connection, reconnecting after ``duration`` seconds.
+
+        While disconnected every call raises ``ADSError`` and no
+        notifications are delivered. With ``reset`` the reconnect simulates
+        a PLC restart: all notification handles become invalid.
+        """
+        with self._lock:
+            self._connected = False
+            self._reset_on_reconnect = reset
+            self._pending.clear()
+            self.stats["disconnects"] += 1
+            self._reconnect_at = (
+                None if duration is None else time.monotonic() + duration
+            )
+
+    def reconnect(self) -> None:
+        """Restore the connection immediately."""
+        with self._lock:
+            self._reconnect()
+
+    def last_change(self, name: str) -> float:
+        """Return the ``time.monotonic()`` of a symbol's last value change."""
+        return self.symbols[name].last_change
+
+    # Internals -----------------------------------------------------------
+
+    def _call(self, name: str | None = None) -> _Symbol | None:
+        """Apply latency and injected faults to a client call."""
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.stats["calls"] += 1
+            if not self._connected:
+                raise pyads.ADSError(ADSERR_TARGET_PORT_NOT_FOUND)
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.stats["errors_injected"] += 1
+                raise pyads.ADSError(ADSERR_TIMEOUT)
+        if name is None:
+            return None
+        try:
+            return self.symbols[name]
+        except KeyError:
+            raise pyads.ADSError(ADSERR_SYMBOL_NOT_FOUND) from None
+
+    def _reconnect(self) -> None:
+        """Reconnect; must be called with the lock held."""
+        if self._reset_on_reconnect:
+            self.stats["subscriptions_lost"] += len(self._subscriptions)
+            self._subscriptions.clear()
+        self._connected = True
+        self._reconnect_at = None
+
+    def _queue(self, hnotify: int, symbol: _Symbol, now: float) -> None:
+        """Queue a notification; must be called with the lock held."""
+        self._pending.append(
+            (now + self.latency, hnotify, _pack(symbol.value, symbol.fmt), filetime_now())
+        )
+
+    def _changed(self, symbol: _Symbol, now: float) -> None:
+        """Notify every subscription of a symbol; lock must be held."""
+        symbol.last_change = now
+        self.stats["changes"] += 1
+        for hnotify, (subscribed, _) in self._subscriptions.items():
+            if subscribed is symbol:
+                self._queue(hnotify, symbol, now)
+
+    def _generate(self, count: int, now: float) -> None:
+        """Change ``count`` random subscribed symbols; lock must be held."""
+        if not self._subscriptions:
+            return
+        handles = list(self._subscriptions)
+        for _ in range(count):
+            hnotify = handles[self._random.randrange(len(handles))]
+            symbol = self._subscriptions[hnotify][0]
+            symbol.value = _next_value(symbol.value, symbol.fmt)
+            symbol.last_change = now
+            self.stats["changes"] += 1
+            self._queue(hnotify, symbol, now)
+
+    def _run(self) -> None:
+        """Generate changes and deliver due notifications."""
+        budget = 0.0
+        last = time.monotonic()
+        while not self._stop.is_set():
+            now = time.monotonic()
+            due = []
+            with self._lock:
+                if self._reconnect_at is not None and now >= self._reconnect_at:
+                    self._reconnect()
+                if self._connected:
+                    budget += self._change_rate * (now - last)
+                    if budget >= 1:
+                        self._generate(int(budget), now)
+                        budget -= int(budget)
+                    while self._pending and self._pending[0][0] <= now:
+                        hnotify, payload, timestamp = self._pending.popleft()[1:]
+                        subscription = self._subscriptions.get(hnotify)
+                        if subscription is not None:
+                            due.append((hnotify, payload, timestamp, subscription))
+                else:
+                    budget = 0.0
+            last = now
+
+            # Deliver outside the lock, like the pyads callback thread
+            for hnotify, payload, timestamp, (symbol, callback) in due:
+                buffer = NotificationBuffer(hnotify, payload, timestamp)
+                callback(buffer.pointer, symbol.name)
+            self.stats["notifications_sent"] += len(due)
+
+            self._stop.wait(self._tick)
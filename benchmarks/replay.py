@@ -0,0 +1,179 @@
+"""Replay captured notification traffic through the decode/dispatch path.
+
+Usage (from the repository root)::
+
+    python -m benchmarks.replay ads_capture.bin              # original speed
+    python -m benchmarks.replay ads_capture.bin --speed 10   # 10x faster
+    python -m benchmarks.replay ads_capture.bin --speed 0 --entities
+
+Captures are recorded on a live system with the ``ads_custom.start_capture``
+service. Every captured notification is rebuilt as a pyads notification
+header and fed to ``AdsHub._device_notification_callback``; with
+``--entities`` each symbol is also bound to an ``AdsEntity`` on an asyncio
+loop so the thread-to-loop dispatch is exercised too. Combine with
+``python -m cProfile`` to profile real plant traffic offline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from .common import FakeAdsClient, NotificationBuffer
+
+from custom_components.ads_custom.capture import read_capture  # noqa: E402
+from custom_components.ads_custom.hub import AdsHub  # noqa: E402
+
+
+def _feed(
+    hub: AdsHub,
+    notifications: list[tuple[float, Any, str]],
+    speed: float,
+) -> dict[str, float]:
+    """Feed notifications to the hub, paced by their capture timestamps."""
+    callback = hub._device_notification_callback
+    max_lag = 0.0
+    start = time.perf_counter()
+    first = notifications[0][0] if notifications else 0.0
+    for elapsed, pointer, name in notifications:
+        if speed:
+            due = start + (elapsed - first) / speed
+            lag = time.perf_counter() - due
+            if lag < 0:
+                time.sleep(-lag)
+            else:
+                max_lag = max(max_lag, lag)
+        callback(pointer, name)
+    return {
+        "wall_seconds": time.perf_counter() - start,
+        "max_lag_ms": max_lag * 1000,
+    }
+
+
+def replay(path: str, *, speed: float = 1.0, entities: bool = False) -> dict[str, Any]:
+    """Replay a capture and return the JSON report."""
+    records = list(read_capture(path))
+    symbols: dict[str, type] = {}
+    unknown_types = set()
+    for record in records:
+        if record.plc_datatype is None:
+            unknown_types.add(record.plc_type_name)
+        symbols.setdefault(record.name, record.plc_datatype)
+
+    client = FakeAdsClient()
+    hub = AdsHub(client)
+    received = 0
+    state_writes = 0
+
+    def count(name: str, value: Any) -> None:
+        nonlocal received
+        received += 1
+
+    def build() -> list[tuple[float, Any, str]]:
+        handles = {data: handle for handle, (data, _) in client.callbacks.items()}
+        return [
+            (
+                record.elapsed,
+                NotificationBuffer(
+                    handles[record.name], record.payload, record.timestamp
+                ).pointer,
+                record.name,
+            )
+            for record in records
+        ]
+
+    if not entities:
+        for name, plc_datatype in symbols.items():
+            hub.add_device_notification(name, plc_datatype, count)
+        result = _feed(hub, build(), speed)
+    else:
+        from custom_components.ads_custom.entity import AdsEntity
+
+        loop = asyncio.new_event_loop()
+        hass = SimpleNamespace(
+            loop=loop,
+            async_add_executor_job=lambda func, *args: loop.run_in_executor(
+                None, func, *args
+            ),
+        )
+
+        def count_write() -> None:
+            nonlocal state_writes
+            state_writes += 1
+
+        async def run() -> dict[str, float]:
+            tasks = []
+            for name, plc_datatype in symbols.items():
+                entity = AdsEntity(hub, name, name)
+                entity.hass = hass
+                entity.async_write_ha_state = count_write
+                tasks.append(
+                    asyncio.ensure_future(
+                        entity.async_initialize_device(name, plc_datatype)
+                    )
+                )
+            while len(client.callbacks) < len(symbols):
+                await asyncio.sleep(0.001)
+            result = await loop.run_in_executor(
+                None, _feed, hub, build(), speed
+            )
+            end = time.monotonic() + 5
+            while state_writes < len(records) and time.monotonic() < end:
+                await asyncio.sleep(0.001)
+            await asyncio.gather(*tasks)
+            return result
+
+        try:
+            result = loop.run_until_complete(run())
+        finally:
+            loop.close()
+        received = state_writes
+
+    hub.shutdown()
+    span = records[-1].elapsed - records[0].elapsed if records else 0.0
+    return {
+        "capture": path,
+        "records": len(records),
+        "symbols": len(symbols),
+        "unknown_types": sorted(unknown_types),
+        "speed": speed,
+        "captured_seconds": span,
+        **result,
+        "notifications_per_sec": (
+            len(records) / result["wall_seconds"] if result["wall_seconds"] else 0.0
+        ),
+        "delivered": received,
+        "entities": entities,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("capture", help="capture file (rotated files are included)")
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="replay speed factor (0 = as fast as possible)"
+    )
+    parser.add_argument(
+        "--entities", action="store_true", help="dispatch through AdsEntity on an event loop"
+    )
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    report = replay(args.capture, speed=args.speed, entities=args.entities)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,398 @@
+"""Reproducible benchmarks for the hub and entity hot paths.
+
+Usage (from the repository root)::
+
+    python -m benchmarks.run_benchmarks --output bench_output.json
+    python -m benchmarks.run_benchmarks --compare old.json --threshold 0.2
+
+Results are written as JSON so runs from different versions can be
+compared; ``--compare`` exits with status 1 when any benchmark's median is
+slower than the baseline by more than ``--threshold``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable
+import json
+import platform
+import struct
+import sys
+import threading
+import time
+from types import MappingProxyType, SimpleNamespace
+from typing import Any
+from unittest.mock import patch
+
+from .common import REPO_ROOT, FakeAdsClient, NotificationBuffer, time_it
+
+import pyads  # noqa: E402
+
+from custom_components.ads_custom.const import (  # noqa: E402
+    CONF_ADS_VAR,
+    CONF_ENTITY_DEVICE_ID,
+    DOMAIN,
+    SINGLE_SUBENTRY_UNIQUE_ID,
+    SUBENTRY_TYPE_ENTITY,
+)
+from custom_components.ads_custom.hub import AdsHub  # noqa: E402
+
+BenchmarkFunc = Callable[[int], dict[str, Any]]
+BENCHMARKS: dict[str, BenchmarkFunc] = {}
+
+
+def benchmark(name: str) -> Callable[[BenchmarkFunc], BenchmarkFunc]:
+    """Register a benchmark case."""
+
+    def decorator(func: BenchmarkFunc) -> BenchmarkFunc:
+        BENCHMARKS[name] = func
+        return func
+
+    return decorator
+
+
+# Payloads for a representative mix of PLC data types
+_DECODE_CASES = (
+    (pyads.PLCTYPE_BOOL, struct.pack("<?", True)),
+    (pyads.PLCTYPE_INT, struct.pack("<h", -123)),
+    (pyads.PLCTYPE_UDINT, struct.pack("<I", 100000)),
+    (pyads.PLCTYPE_REAL, struct.pack("<f", 21.5)),
+    (pyads.PLCTYPE_LREAL, struct.pack("<d", 3.14159)),
+    (pyads.PLCTYPE_STRING, b"Running\x00" + bytes(72)),
+)
+
+
+@benchmark("notification_decode")
+def bench_notification_decode(scale: int) -> dict[str, Any]:
+    """Decode notifications through AdsHub._device_notification_callback."""
+    hub = AdsHub(FakeAdsClient())
+    buffers = []
+    for index in range(scale):
+        plc_datatype, payload = _DECODE_CASES[index % len(_DECODE_CASES)]
+        name = f"GVL.var{index}"
+        hub.add_device_notification(name, plc_datatype, lambda name, value: None)
+        buffers.append((NotificationBuffer(index + 1, payload).pointer, name))
+
+    def run() -> None:
+        callback = hub._device_notification_callback
+        for pointer, name in buffers:
+            callback(pointer, name)
+
+    result = time_it(run, number=1, repeat=50)
+    return _per_item(result, scale)
+
+
+@benchmark("entity_dispatch")
+def bench_entity_dispatch(scale: int) -> dict[str, Any]:
+    """Dispatch notifications from the pyads thread to the event loop.
+
+    Measures the time from firing ``scale`` notifications on a worker thread
+    until every resulting state write has run on the loop.
+    """
+    from custom_components.ads_custom.entity import AdsEntity
+
+    client = FakeAdsClient()
+    hub = AdsHub(client)
+    loop = asyncio.new_event_loop()
+    writes = 0
+    done = asyncio.Event()
+    target = 0
+
+    def count_write() -> None:
+        nonlocal writes
+        writes += 1
+        if writes >= target:
+            done.set()
+
+    async def setup_entity() -> AdsEntity:
+        entity = AdsEntity(hub, "Bench", "GVL.bench")
+        entity.hass = SimpleNamespace(
+            loop=loop,
+            async_add_executor_job=lambda func, *args: loop.run_in_executor(
+                None, func, *args
+            ),
+        )
+        entity.async_write_ha_state = count_write
+        init = asyncio.ensure_future(
+            entity.async_initialize_device("GVL.bench", pyads.PLCTYPE_INT)
+        )
+        while not client.callbacks:
+            await asyncio.sleep(0)
+        _, callback = client.callbacks[1]
+        await loop.run_in_executor(
+            None, callback, NotificationBuffer(1, struct.pack("<h", 0)).pointer, "GVL.bench"
+        )
+        await init
+        return entity
+
+    loop.run_until_complete(setup_entity())
+    _, callback = client.callbacks[1]
+    pointers = [
+        NotificationBuffer(1, struct.pack("<h", index % 1000)).pointer
+        for index in range(scale)
+    ]
+
+    def fire() -> None:
+        for pointer in pointers:
+            callback(pointer, "GVL.bench")
+
+    async def run_once() -> None:
+        nonlocal writes, target
+        writes = 0
+        target = scale
+        done.clear()
+        thread = threading.Thread(target=fire)
+        thread.start()
+        await done.wait()
+        thread.join()
+
+    def run() -> None:
+        loop.run_until_complete(run_once())
+
+    try:
+        result = time_it(run, number=1, repeat=20)
+    finally:
+        loop.close()
+    return _per_item(result, scale)
+
+
+def _entity_configs(scale: int, entity_type: str) -> list[dict[str, Any]]:
+    """Return ``scale`` entity configs of one type."""
+    return [
+        {
+            "entity_type": entity_type,
+            "name": f"Entity {index}",
+            CONF_ADS_VAR: f"GVL.var{index}",
+            "adstype": "int",
+            "unique_id": f"uid-{index}",
+            CONF_ENTITY_DEVICE_ID: f"device-{index % 20}",
+        }
+        for index in range(scale)
+    ]
+
+
+@benchmark("platform_setup")
+def bench_platform_setup(scale: int) -> dict[str, Any]:
+    """Run the sensor platform's async_setup_entry for ``scale`` entities."""
+    from custom_components.ads_custom import sensor
+
+    hub = AdsHub(FakeAdsClient())
+    hass = SimpleNamespace(data={DOMAIN: {"entry": hub}})
+    entry = SimpleNamespace(
+        entry_id="entry",
+        title="Bench",
+        async_on_unload=lambda func: None,
+        subentries={
+            "sub": SimpleNamespace(
+                subentry_type=SUBENTRY_TYPE_ENTITY,
+                data=MappingProxyType({"entities": _entity_configs(scale, "sensor")}),
+            )
+        },
+    )
+    added: list[Any] = []
+
+    def add_entities(entities, config_subentry_id=None) -> None:
+        added.extend(entities)
+
+    loop = asyncio.new_event_loop()
+
+    def run() -> None:
+        added.clear()
+        loop.run_until_complete(sensor.async_setup_entry(hass, entry, add_entities))
+
+    with (
+        patch("homeassistant.helpers.entity_platform.async_get_current_platform"),
+        patch.object(
+            sensor,
+            "resolve_device_name",
+            lambda hass, device_id, fallback, entry_id: fallback,
+        ),
+    ):
+        try:
+            result = time_it(run, number=1, repeat=20)
+        finally:
+            loop.close()
+    assert len([e for e in added if isinstance(e, sensor.AdsSensor)]) == scale
+    return _per_item(result, scale)
+
+
+class _FakeConfigEntries:
+    """Config entry manager stand-in that applies subentry updates."""
+
+    def __init__(self, entry: Any) -> None:
+        self._entry = entry
+
+    def async_entries(self, domain: str | None = None) -> list[Any]:
+        return [self._entry]
+
+    def async_add_subentry(self, entry, subentry) -> None:
+        entry.subentries[f"sub-{len(entry.subentries)}"] = subentry
+
+    def async_update_subentry(self, entry, subentry, *, data) -> None:
+        subentry.data = data
+
+    def async_remove_subentry(self, entry, subentry_id) -> None:
+        entry.subentries.pop(subentry_id)
+
+
+@benchmark("migration_default_device")
+def bench_migration_default_device(scale: int) -> dict[str, Any]:
+    """Assign ``scale`` legacy entities to the shared default device."""
+    from custom_components.ads_custom import (
+        _async_migrate_legacy_unassigned_entities_to_default_device,
+    )
+
+    entities = _entity_configs(scale, "sensor")
+    for entity in entities:
+        entity.pop(CONF_ENTITY_DEVICE_ID)
+    subentry = SimpleNamespace(
+        subentry_type=SUBENTRY_TYPE_ENTITY,
+        unique_id=SINGLE_SUBENTRY_UNIQUE_ID,
+        data=MappingProxyType({"entities": entities}),
+    )
+    entry = SimpleNamespace(
+        entry_id="entry", title="Bench", data={}, subentries={"sub": subentry}
+    )
+    hass = SimpleNamespace(config_entries=_FakeConfigEntries(entry))
+    original = subentry.data
+    loop = asyncio.new_event_loop()
+
+    def reset() -> None:
+        subentry.data = original
+
+    def run() -> None:
+        loop.run_until_complete(
+            _async_migrate_legacy_unassigned_entities_to_default_device(hass)
+        )
+
+    try:
+        result = time_it(run, number=1, repeat=20, setup=reset)
+    finally:
+        loop.close()
+    return _per_item(result, scale)
+
+
+@benchmark("migration_consolidate_subentries")
+def bench_migration_consolidate_subentries(scale: int) -> dict[str, Any]:
+    """Fold ``scale`` legacy per-entity subentries into the single subentry."""
+    from custom_components.ads_custom import _async_consolidate_entity_subentries
+
+    entry = SimpleNamespace(entry_id="entry", title="Bench", data={}, subentries={})
+    hass = SimpleNamespace(config_entries=_FakeConfigEntries(entry))
+    loop = asyncio.new_event_loop()
+
+    def reset() -> None:
+        entry.subentries = {
+            f"legacy-{index}": SimpleNamespace(
+                subentry_type=SUBENTRY_TYPE_ENTITY,
+                unique_id=f"legacy-{index}",
+                title=f"Entity {index}",
+                data=MappingProxyType(config),
+            )
+            for index, config in enumerate(_entity_configs(scale, "switch"))
+        }
+
+    def run() -> None:
+        loop.run_until_complete(_async_consolidate_entity_subentries(hass, entry))
+
+    try:
+        result = time_it(run, number=1, repeat=5, setup=reset)
+    finally:
+        loop.close()
+    return _per_item(result, scale)
+
+
+@benchmark("write_by_name")
+def bench_write_by_name(scale: int) -> dict[str, Any]:
+    """Write values through AdsHub.write_by_name."""
+    hub = AdsHub(FakeAdsClient())
+
+    def run() -> None:
+        hub.write_by_name("GVL.bench", True, pyads.PLCTYPE_BOOL)
+
+    return time_it(run, number=max(scale, 1), repeat=20)
+
+
+def _per_item(result: dict[str, Any], scale: int) -> dict[str, Any]:
+    """Convert batch timings of ``scale`` items into per-item timings."""
+    per_item = dict(result)
+    for key in ("min_us", "median_us", "mean_us", "p95_us"):
+        per_item[key] = result[key] / scale
+    per_item["ops_per_sec"] = result["ops_per_sec"] * scale
+    per_item["items"] = scale
+    return per_item
+
+
+def _version() -> str:
+    """Return the integration version from the manifest."""
+    manifest = REPO_ROOT / "custom_components" / "ads_custom" / "manifest.json"
+    return json.loads(manifest.read_text())["version"]
+
+
+def run_benchmarks(names: list[str], scale: int) -> dict[str, Any]:
+    """Run the selected benchmarks and return the JSON report."""
+    results = {}
+    for name in names:
+        print(f"Running {name} ...", file=sys.stderr)
+        results[name] = BENCHMARKS[name](scale)
+    return {
+        "version": _version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.time(),
+        "scale": scale,
+        "results": results,
+    }
+
+
+def compare(report: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """Return regression messages for benchmarks slower than the baseline."""
+    regressions = []
+    for name, result in report["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or not base.get("median_us"):
+            continue
+        ratio = result["median_us"] / base["median_us"]
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{name}: {result['median_us']:.2f}us vs {base['median_us']:.2f}us "
+                f"({ratio:.2f}x, baseline {baseline.get('version')})"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument(
+        "benchmarks", nargs="*", choices=[[], *BENCHMARKS], help="benchmarks to run (default: all)"
+    )
+    parser.add_argument("--scale", type=int, default=1000, help="entities/symbols per run")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="baseline JSON report to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="allowed slowdown vs baseline (0.2 = 20%%)"
+    )
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.benchmarks or list(BENCHMARKS), args.scale)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            regressions = compare(report, json.load(file), args.threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
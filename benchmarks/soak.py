@@ -0,0 +1,229 @@
+"""Load/soak test of AdsHub and entity dispatch against a fake PLC.
+
+Usage (from the repository root)::
+
+    python -m benchmarks.soak --symbols 2000 --rate 5000 --duration 60
+    python -m benchmarks.soak --error-rate 0.01 --disconnect-every 10 --reset
+
+Every symbol of a ``FakePlc`` is subscribed through an ``AdsEntity`` on a
+real asyncio loop; the PLC then changes values at ``--rate`` per second
+while faults are injected. The JSON report covers delivered notifications,
+state writes, end-to-end latency (PLC change to state write), injected
+faults and errors logged by the integration.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import statistics
+import sys
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from .common import REPO_ROOT  # noqa: F401  (sets up sys.path)
+from .fake_plc import FakePlc
+
+from custom_components.ads_custom.hub import AdsHub  # noqa: E402
+
+
+class _ErrorCounter(logging.Handler):
+    """Count warnings and errors logged by the integration."""
+
+    def __init__(self) -> None:
+        super().__init__(logging.WARNING)
+        self.counts: dict[str, int] = {}
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.counts[record.levelname] = self.counts.get(record.levelname, 0) + 1
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    """Return a percentile of sorted samples (0 when empty)."""
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def run_soak(
+    *,
+    symbols: int = 1000,
+    rate: float = 1000.0,
+    duration: float = 10.0,
+    latency: float = 0.0,
+    error_rate: float = 0.0,
+    disconnect_every: float = 0.0,
+    disconnect_for: float = 1.0,
+    reset: bool = False,
+    write_rate: float = 0.0,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Run one soak test and return the JSON report."""
+    from custom_components.ads_custom.entity import AdsEntity
+
+    plc = FakePlc(symbols, latency=latency, seed=seed)
+    hub = AdsHub(plc)
+    loop = asyncio.new_event_loop()
+    hass = SimpleNamespace(
+        loop=loop,
+        async_add_executor_job=lambda func, *args: loop.run_in_executor(
+            None, func, *args
+        ),
+    )
+    latencies: list[float] = []
+    updated: set[str] = set()
+    state_writes = 0
+
+    def make_entity(name: str) -> AdsEntity:
+        entity = AdsEntity(hub, name, name)
+        entity.hass = hass
+
+        def write_state() -> None:
+            nonlocal state_writes
+            state_writes += 1
+            updated.add(name)
+            changed = plc.last_change(name)
+            if changed:
+                latencies.append(time.monotonic() - changed)
+
+        entity.async_write_ha_state = write_state
+        return entity
+
+    async def setup() -> float:
+        start = time.monotonic()
+        entities = [make_entity(name) for name in plc.symbols]
+        await asyncio.gather(
+            *(
+                entity.async_initialize_device(
+                    entity._ads_var, plc.symbols[entity._ads_var].plc_datatype
+                )
+                for entity in entities
+            )
+        )
+        return time.monotonic() - start
+
+    def writer(stop: threading.Event) -> None:
+        rng = random.Random(seed)
+        names = list(plc.symbols)
+        while not stop.wait(1 / write_rate):
+            name = names[rng.randrange(len(names))]
+            symbol = plc.symbols[name]
+            hub.write_by_name(name, symbol.value, symbol.plc_datatype)
+
+    errors = _ErrorCounter()
+    integration_logger = logging.getLogger("custom_components.ads_custom")
+    integration_logger.addHandler(errors)
+    stop = threading.Event()
+    try:
+        setup_seconds = loop.run_until_complete(setup())
+        subscribed = len(updated)
+        latencies.clear()
+        baseline = dict(plc.stats)
+        state_writes = 0
+
+        plc.error_rate = error_rate
+        plc.set_change_rate(rate)
+        if write_rate:
+            threading.Thread(target=writer, args=(stop,), daemon=True).start()
+
+        async def soak() -> None:
+            end = time.monotonic() + duration
+            next_disconnect = time.monotonic() + disconnect_every
+            while (now := time.monotonic()) < end:
+                if disconnect_every and now >= next_disconnect:
+                    plc.disconnect(disconnect_for, reset=reset)
+                    next_disconnect = now + disconnect_every
+                await asyncio.sleep(0.05)
+            plc.set_change_rate(0)
+            # Let in-flight notifications drain
+            await asyncio.sleep(max(latency * 2, 0.1))
+
+        start = time.monotonic()
+        loop.run_until_complete(soak())
+        elapsed = time.monotonic() - start
+    finally:
+        stop.set()
+        plc.error_rate = 0.0
+        plc.reconnect()
+        hub.shutdown()
+        loop.close()
+        integration_logger.removeHandler(errors)
+
+    stats = {key: value - baseline.get(key, 0) for key, value in plc.stats.items()}
+    latencies.sort()
+    return {
+        "config": {
+            "symbols": symbols,
+            "rate": rate,
+            "duration": duration,
+            "latency": latency,
+            "error_rate": error_rate,
+            "disconnect_every": disconnect_every,
+            "disconnect_for": disconnect_for,
+            "reset": reset,
+            "write_rate": write_rate,
+        },
+        "setup_seconds": setup_seconds,
+        "subscribed": subscribed,
+        "elapsed_seconds": elapsed,
+        "plc": stats,
+        "state_writes": state_writes,
+        "state_writes_per_sec": state_writes / elapsed if elapsed else 0.0,
+        "lost_notifications": stats["notifications_sent"] - state_writes,
+        "latency_ms": {
+            "p50": _percentile(latencies, 0.5) * 1000,
+            "p95": _percentile(latencies, 0.95) * 1000,
+            "p99": _percentile(latencies, 0.99) * 1000,
+            "max": latencies[-1] * 1000 if latencies else 0.0,
+            "mean": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        },
+        "log_counts": errors.counts,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--symbols", type=int, default=1000, help="number of PLC symbols")
+    parser.add_argument("--rate", type=float, default=1000.0, help="value changes per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="soak duration in seconds")
+    parser.add_argument("--latency", type=float, default=0.0, help="call/notification latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability of an ADSError per call")
+    parser.add_argument(
+        "--disconnect-every", type=float, default=0.0, help="drop the connection every N seconds (0 = never)"
+    )
+    parser.add_argument("--disconnect-for", type=float, default=1.0, help="seconds each disconnect lasts")
+    parser.add_argument("--reset", action="store_true", help="simulate a PLC restart on every reconnect")
+    parser.add_argument("--write-rate", type=float, default=0.0, help="hub writes per second")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    report = run_soak(
+        symbols=args.symbols,
+        rate=args.rate,
+        duration=args.duration,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        disconnect_every=args.disconnect_every,
+        disconnect_for=args.disconnect_for,
+        reset=args.reset,
+        write_rate=args.write_rate,
+        seed=args.seed,
+    )
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 import asyncio
+from functools import partial
 import logging
 import uuid
 from types import MappingProxyType
+from typing import Any
 
 import pyads
 import voluptuous as vol
@@ -22,9 +24,22 @@ from homeassistant.const import (
     CONF_UNIT_OF_MEASUREMENT,
     EVENT_HOMEASSISTANT_STOP,
 )
-from homeassistant.core import Event, HomeAssistant, ServiceCall
-from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.core import (
+    Event,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import (
+    config_validation as cv,
+    device_registry as dr,
+    entity_registry as er,
+    issue_registry as ir,
+)
 from homeassistant.helpers.device_registry import EVENT_DEVICE_REGISTRY_UPDATED
+from homeassistant.util import dt as dt_util
 
 from .device_registry_compat import (
     async_ensure_device_subentry,
@@ -42,12 +57,30 @@ from .const import (
     CONF_ADS_VAR,
     CONF_ENTITY_DEVICE_ID,
     CONF_ENTITY_DEVICE_NAME,
+    CONF_NATIVE_AMS_CLIENT,
+    CONF_NOTIFICATION_BUDGET,
+    CONF_OPTIMISTIC_TIMEOUT,
+    CONF_PLC_TIMESTAMP_ATTRIBUTE,
+    CONF_POLL_FALLBACK_INTERVAL,
+    CONF_SUPPRESS_REDUNDANT_WRITES,
+    CONF_VALUE_CACHE_MAX_AGE,
     DOMAIN,
     AdsType,
     SINGLE_SUBENTRY_UNIQUE_ID,
     SUBENTRY_TYPE_ENTITY,
 )
+from .ams import AmsConnection
+from .cache import DEFAULT_CACHE_MAX_AGE
+from .capture import DEFAULT_CAPTURE_BACKUP_COUNT, DEFAULT_CAPTURE_MAX_BYTES
+from .connections import ConnectionRegistry, connection_key
 from .hub import AdsHub
+from .paths import config_file_path
+from .polling import DEFAULT_POLL_INTERVAL
+from .profiling import (
+    DEFAULT_PROFILE_DURATION,
+    DEFAULT_PROFILE_INTERVAL,
+    SamplingProfiler,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -100,6 +133,8 @@ CONF_ADS_VALUE = "value"
 DEFAULT_MIGRATED_DEVICE_NAME = "Default ADS Device"
 LEGACY_DEFAULT_DEVICE_SUFFIX = "default-device"
 
+ISSUE_NOTIFICATION_BUDGET_EXCEEDED = "notification_budget_exceeded"
+
 # All platforms supported by this integration
 PLATFORMS = [
     "binary_sensor",
@@ -174,27 +209,225 @@ def _collect_yaml_entities(config: ConfigType) -> list[dict]:
 
 SERVICE_WRITE_DATA_BY_NAME = "write_data_by_name"
 
-SCHEMA_SERVICE_WRITE_DATA_BY_NAME = vol.Schema(
+SERVICE_WRITE_DATA = "write_data"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+CONF_VARIABLES = "variables"
+
+
+def _coerce_ads_value(data: dict) -> dict:
+    """Convert the value of a write to the Python type of its ADS type."""
+    ads_type = data[CONF_ADS_TYPE]
+    value = data[CONF_ADS_VALUE]
+    if ads_type == AdsType.BOOL:
+        value = cv.boolean(value)
+    elif ads_type in (AdsType.REAL, AdsType.LREAL):
+        value = vol.Coerce(float)(value)
+    elif ads_type == AdsType.STRING:
+        value = cv.string(value)
+    else:
+        value = vol.Coerce(int)(value)
+    return {**data, CONF_ADS_VALUE: value}
+
+
+SCHEMA_WRITE_VARIABLE = vol.All(
+    vol.Schema(
+        {
+            vol.Required(CONF_ADS_TYPE): vol.Coerce(AdsType),
+            vol.Required(CONF_ADS_VALUE): vol.Any(bool, int, float, str),
+            vol.Required(CONF_ADS_VAR): str,
+        }
+    ),
+    _coerce_ads_value,
+)
+
+SCHEMA_SERVICE_WRITE_DATA_BY_NAME = vol.All(
+    vol.Schema(
+        {
+            vol.Required(CONF_ADS_TYPE): vol.Coerce(AdsType),
+            vol.Required(CONF_ADS_VALUE): vol.Any(bool, int, float, str),
+            vol.Required(CONF_ADS_VAR): str,
+            vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        }
+    ),
+    _coerce_ads_value,
+)
+
+SCHEMA_SERVICE_WRITE_DATA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(CONF_VARIABLES): vol.All(
+            cv.ensure_list, vol.Length(min=1), [SCHEMA_WRITE_VARIABLE]
+        ),
+    }
+)
+
+SERVICE_READ_DATA_BY_NAME = "read_data_by_name"
+
+CONF_MAX_AGE = "max_age"
+
+SCHEMA_SERVICE_READ_DATA_BY_NAME = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(CONF_VARIABLES): vol.All(
+            cv.ensure_list, vol.Length(min=1), [cv.string]
+        ),
+        # Seconds; without it every variable is read from the PLC
+        vol.Optional(CONF_MAX_AGE): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    }
+)
+
+SERVICE_START_CAPTURE = "start_capture"
+SERVICE_STOP_CAPTURE = "stop_capture"
+
+CONF_CAPTURE_FILENAME = "filename"
+CONF_CAPTURE_MAX_SIZE = "max_size"
+CONF_CAPTURE_BACKUP_COUNT = "backup_count"
+DEFAULT_CAPTURE_FILENAME = "ads_capture.bin"
+
+SCHEMA_SERVICE_START_CAPTURE = vol.Schema(
     {
-        vol.Required(CONF_ADS_TYPE): vol.Coerce(AdsType),
-        vol.Required(CONF_ADS_VALUE): vol.Coerce(int),
-        vol.Required(CONF_ADS_VAR): str,
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(CONF_CAPTURE_FILENAME, default=DEFAULT_CAPTURE_FILENAME): str,
+        # Maximum size per file in MiB
+        vol.Optional(
+            CONF_CAPTURE_MAX_SIZE, default=DEFAULT_CAPTURE_MAX_BYTES // 1024 // 1024
+        ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1024)),
+        vol.Optional(
+            CONF_CAPTURE_BACKUP_COUNT, default=DEFAULT_CAPTURE_BACKUP_COUNT
+        ): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
     }
 )
 
+SCHEMA_SERVICE_STOP_CAPTURE = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    }
+)
+
+SERVICE_START_PROFILING = "start_profiling"
+SERVICE_STOP_PROFILING = "stop_profiling"
+
+CONF_PROFILE_DURATION = "duration"
+CONF_PROFILE_INTERVAL = "interval"
+
+SCHEMA_SERVICE_START_PROFILING = vol.Schema(
+    {
+        # Seconds
+        vol.Optional(CONF_PROFILE_DURATION, default=DEFAULT_PROFILE_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=3600)
+        ),
+        # Milliseconds between samples
+        vol.Optional(
+            CONF_PROFILE_INTERVAL, default=DEFAULT_PROFILE_INTERVAL * 1000
+        ): vol.All(vol.Coerce(float), vol.Range(min=1, max=1000)),
+    }
+)
+
+
+def _capture_path(hass: HomeAssistant, filename: str) -> str:
+    """Resolve a capture file name inside the configuration directory."""
+    try:
+        return config_file_path(hass, filename)
+    except ValueError as err:
+        raise ServiceValidationError(
+            f"Capture file must be inside the configuration directory: {filename}"
+        ) from err
+
+
+async def _async_shutdown_hub(ads_hub: AdsHub) -> None:
+    """Close the hub's connection and stop its I/O thread."""
+    try:
+        await ads_hub.executor.async_run(ads_hub.shutdown)
+    finally:
+        ads_hub.executor.shutdown(wait=False)
+
+
+async def _async_release_connection(hass: HomeAssistant, storage_key: str) -> None:
+    """Drop the hub reference of ``storage_key``, shutting it down if last."""
+    ads_hub = hass.data[DOMAIN].pop(storage_key, None)
+    if ads_hub is None:
+        return
+    if _connection_registry(hass).release(ads_hub, storage_key):
+        await _async_shutdown_hub(ads_hub)
+        # Clean up "connection" if it points to this hub
+        if hass.data[DOMAIN].get("connection") is ads_hub:
+            hass.data[DOMAIN].pop("connection", None)
+
+
+def _connection_registry(hass: HomeAssistant) -> ConnectionRegistry:
+    """Return the registry of hubs shared between YAML and config entries."""
+    return hass.data[DOMAIN].setdefault("_connections", ConnectionRegistry())
+
 
 async def _async_setup_connection(
-    hass: HomeAssistant, config_data: dict, storage_key: str
+    hass: HomeAssistant,
+    config_data: dict,
+    storage_key: str,
+    native_client: bool = False,
 ) -> bool:
-    """Set up an ADS connection from configuration data."""
+    """Set up an ADS connection from configuration data.
+
+    With ``native_client`` the connection uses the asyncio AMS/TCP client
+    instead of pyads. If another consumer (YAML or a config entry) already
+    connected to the same PLC, its hub is shared and the client choice of
+    the first one applies.
+    """
     net_id = config_data[CONF_DEVICE]
     ip_address = config_data.get(CONF_IP_ADDRESS)
     port = config_data.get(CONF_PORT, 48898)
-
-    client = pyads.Connection(net_id, port, ip_address)
+    registry = _connection_registry(hass)
+    key = connection_key(config_data)
+
+    async def async_create_hub() -> AdsHub:
+        """Connect to the PLC (only for its first consumer)."""
+        if native_client:
+            client = AmsConnection(net_id, port, ip_address)
+            # Further ports share the client's TCP connection to the router
+            client_factory = client.for_port
+        else:
+            client = pyads.Connection(net_id, port, ip_address)
+
+            def client_factory(ams_port: int) -> pyads.Connection:
+                return pyads.Connection(net_id, ams_port, ip_address)
+
+        # Opening the native client connects over TCP, so keep it off the loop
+        ads = await hass.async_add_executor_job(AdsHub, client, client_factory)
+        try:
+            # Re-resolve handles after online changes instead of needing a
+            # reload
+            await ads.executor.async_run(ads.watch_symbol_version)
+            # Suspend writes and subscriptions while the PLC is not in RUN
+            await ads.executor.async_run(ads.watch_ads_state)
+        except BaseException:
+            # Not registered yet, so nothing else would close the connection
+            # and the hub's I/O thread
+            await _async_shutdown_hub(ads)
+            raise
+
+        remove_listener = None
+
+        async def async_shutdown_handler(event):
+            """Shutdown ADS connection."""
+            nonlocal remove_listener
+            # The listener removed itself by firing
+            remove_listener = None
+            if not ads.is_shut_down:
+                await ads.executor.async_run(ads.shutdown)
+
+        def async_remove_shutdown_handler() -> None:
+            """Stop listening once the hub was released and shut down."""
+            if remove_listener is not None:
+                remove_listener()
+
+        remove_listener = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STOP, async_shutdown_handler
+        )
+        registry.add_release_callback(key, async_remove_shutdown_handler)
+        return ads
 
     try:
-        ads = AdsHub(client)
+        ads = await registry.async_acquire(key, storage_key, async_create_hub)
     except pyads.ADSError as err:
         _LOGGER.error(
             "Could not connect to ADS host (netid=%s, ip=%s, port=%s): %s",
@@ -208,14 +441,12 @@ async def _async_setup_connection(
     # Store the ADS hub
     hass.data[DOMAIN][storage_key] = ads
 
-    async def async_shutdown_handler(event):
-        """Shutdown ADS connection."""
-        ads.shutdown()
-
-    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_shutdown_handler)
-
     # Register services
-    await _async_register_services(hass, ads)
+    try:
+        await _async_register_services(hass)
+    except BaseException:
+        await _async_release_connection(hass, storage_key)
+        raise
 
     return True
 
@@ -652,6 +883,99 @@ async def _async_handle_device_registry_update(
     )
 
 
+def _hub_options(entry: ConfigEntry) -> dict[str, Any]:
+    """Return the options of ``entry`` that configure its hub."""
+    return {
+        CONF_PLC_TIMESTAMP_ATTRIBUTE: entry.options.get(
+            CONF_PLC_TIMESTAMP_ATTRIBUTE, False
+        ),
+        CONF_VALUE_CACHE_MAX_AGE: entry.options.get(
+            CONF_VALUE_CACHE_MAX_AGE, DEFAULT_CACHE_MAX_AGE
+        ),
+        CONF_SUPPRESS_REDUNDANT_WRITES: entry.options.get(
+            CONF_SUPPRESS_REDUNDANT_WRITES, False
+        ),
+        CONF_OPTIMISTIC_TIMEOUT: entry.options.get(CONF_OPTIMISTIC_TIMEOUT, 0),
+        CONF_NOTIFICATION_BUDGET: entry.options.get(CONF_NOTIFICATION_BUDGET, 0),
+        CONF_POLL_FALLBACK_INTERVAL: entry.options.get(
+            CONF_POLL_FALLBACK_INTERVAL, DEFAULT_POLL_INTERVAL
+        ),
+    }
+
+
+def _apply_hub_options(
+    hass: HomeAssistant, entry: ConfigEntry, ads_hub: AdsHub
+) -> None:
+    """Apply the connection options of ``entry`` to its hub.
+
+    A hub shared with config entries loaded before keeps the options of
+    the first of them; differing options of ``entry`` are logged and not
+    applied, so the order entries are set up in does not matter.
+    """
+    options = _hub_options(entry)
+    owner = next(
+        (
+            hass.config_entries.async_get_entry(entry_id)
+            for entry_id, hub in _loaded_hubs(hass).items()
+            if hub is ads_hub and entry_id != entry.entry_id
+        ),
+        None,
+    )
+    if owner is not None:
+        owner_options = _hub_options(owner)
+        if owner_options != options:
+            _LOGGER.warning(
+                "Ignoring the connection options of '%s': it shares its PLC "
+                "connection with '%s', whose options apply (%s)",
+                entry.title,
+                owner.title,
+                ", ".join(
+                    key
+                    for key, value in options.items()
+                    if owner_options[key] != value
+                ),
+            )
+        options = owner_options
+
+    ads_hub.plc_timestamp_attribute = options[CONF_PLC_TIMESTAMP_ATTRIBUTE]
+    ads_hub.value_cache.max_age = options[CONF_VALUE_CACHE_MAX_AGE]
+    ads_hub.suppress_redundant_writes = options[CONF_SUPPRESS_REDUNDANT_WRITES]
+    ads_hub.optimistic_timeout = options[CONF_OPTIMISTIC_TIMEOUT]
+    ads_hub.notification_budget = options[CONF_NOTIFICATION_BUDGET]
+    ads_hub.poll_fallback_interval = options[CONF_POLL_FALLBACK_INTERVAL]
+    if owner is None:
+        _setup_notification_budget(hass, entry, ads_hub)
+
+
+def _setup_notification_budget(
+    hass: HomeAssistant, entry: ConfigEntry, ads_hub: AdsHub
+) -> None:
+    """Report subscriptions rejected by the handle budget as a repair."""
+    issue_id = f"{ISSUE_NOTIFICATION_BUDGET_EXCEEDED}_{entry.entry_id}"
+    # A reload starts counting from scratch
+    ir.async_delete_issue(hass, DOMAIN, issue_id)
+
+    def budget_exceeded(rejected: int, limit: int) -> None:
+        """Create or update the repair issue (called from the executor)."""
+        hass.loop.call_soon_threadsafe(
+            partial(
+                ir.async_create_issue,
+                hass,
+                DOMAIN,
+                issue_id,
+                is_fixable=False,
+                severity=ir.IssueSeverity.WARNING,
+                translation_key=ISSUE_NOTIFICATION_BUDGET_EXCEEDED,
+                translation_placeholders={
+                    "limit": str(limit),
+                    "rejected": str(rejected),
+                },
+            )
+        )
+
+    ads_hub.budget_exceeded_callback = budget_exceeded
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up ADS from a config entry (hub only)."""
     # Initialize data storage
@@ -673,10 +997,17 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     await _async_migrate_entity_config_entries_for_hub(hass, entry)
 
     # Set up the ADS connection
-    success = await _async_setup_connection(hass, entry.data, entry.entry_id)
+    success = await _async_setup_connection(
+        hass,
+        entry.data,
+        entry.entry_id,
+        native_client=entry.options.get(CONF_NATIVE_AMS_CLIENT, False),
+    )
     if not success:
         return False
 
+    _apply_hub_options(hass, entry, hass.data[DOMAIN][entry.entry_id])
+
     # Also store as "connection" for backward compatibility with YAML platforms
     if "connection" not in hass.data[DOMAIN]:
         hass.data[DOMAIN]["connection"] = hass.data[DOMAIN][entry.entry_id]
@@ -709,25 +1040,111 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     _LOGGER.debug("Unloading config entry: %s", entry.title)
 
+    registry = _connection_registry(hass)
+    ads_hub = hass.data[DOMAIN].get(entry.entry_id)
+    # A hub shared with YAML or another entry stays connected
+    last_user = ads_hub is not None and registry.user_count(ads_hub) <= 1
+    if last_user:
+        # Delete the handles of the removed entities together at shutdown
+        ads_hub.prepare_shutdown()
+
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if not unload_ok:
         _LOGGER.error("Failed to unload some platforms")
+        if last_user:
+            await ads_hub.executor.async_run(ads_hub.cancel_shutdown)
         return False
 
-    ads_hub = hass.data[DOMAIN].get(entry.entry_id)
-    if ads_hub:
-        await hass.async_add_executor_job(ads_hub.shutdown)
-        hass.data[DOMAIN].pop(entry.entry_id, None)
-
-    # Clean up "connection" if it points to this hub
-    if hass.data[DOMAIN].get("connection") is ads_hub:
-        hass.data[DOMAIN].pop("connection", None)
+    await _async_release_connection(hass, entry.entry_id)
 
     return True
 
 
-async def _async_register_services(hass: HomeAssistant, ads: AdsHub) -> None:
+def _loaded_hubs(hass: HomeAssistant) -> dict[str, AdsHub]:
+    """Return the loaded hubs by config entry ID ("connection" for YAML)."""
+    data = hass.data.get(DOMAIN, {})
+    hubs = {
+        key: hub
+        for key, hub in data.items()
+        if isinstance(hub, AdsHub) and key != "connection"
+    }
+    connection = data.get("connection")
+    if isinstance(connection, AdsHub) and connection not in hubs.values():
+        hubs["connection"] = connection
+    return hubs
+
+
+def _resolve_hubs(
+    hass: HomeAssistant, entry_ids: list[str] | None
+) -> dict[str, AdsHub]:
+    """Return the hubs a service call targets, keyed by config entry ID.
+
+    Without a target the call goes to the only loaded hub; with several
+    hubs loaded a target is required.
+    """
+    hubs = _loaded_hubs(hass)
+    if not entry_ids:
+        hubs = _unique_hubs(hubs)
+        if len(hubs) != 1:
+            raise ServiceValidationError(
+                f"{len(hubs)} ADS connections are loaded; "
+                f"select one with {ATTR_CONFIG_ENTRY_ID}"
+            )
+        return hubs
+    unknown = [entry_id for entry_id in entry_ids if entry_id not in hubs]
+    if unknown:
+        raise ServiceValidationError(
+            f"No loaded ADS connection for config entry {', '.join(unknown)}"
+        )
+    return _unique_hubs({entry_id: hubs[entry_id] for entry_id in entry_ids})
+
+
+def _unique_hubs(hubs: dict[str, AdsHub]) -> dict[str, AdsHub]:
+    """Keep the first entry ID of each hub.
+
+    Config entries for the same PLC share one hub, which a service call
+    must reach only once.
+    """
+    unique: dict[str, AdsHub] = {}
+    for entry_id, hub in hubs.items():
+        if hub not in unique.values():
+            unique[entry_id] = hub
+    return unique
+
+
+async def _async_write_variables(
+    hub: AdsHub, variables: list[dict]
+) -> dict[str, bool]:
+    """Write ``variables`` to one hub and return success per variable.
+
+    The writes are queued together, so the hub sends them as one sum write.
+    """
+    results = await asyncio.gather(
+        *(
+            hub.async_write_by_name(
+                variable[CONF_ADS_VAR],
+                variable[CONF_ADS_VALUE],
+                ADS_TYPEMAP[variable[CONF_ADS_TYPE]],
+            )
+            for variable in variables
+        )
+    )
+    return {
+        variable[CONF_ADS_VAR]: result
+        for variable, result in zip(variables, results)
+    }
+
+
+def _response_value(value):
+    """Return a read value in a form service response data can hold."""
+    if isinstance(value, (bytes, bytearray)):
+        # Structured variables come back as their raw bytes
+        return value.hex()
+    return value
+
+
+async def _async_register_services(hass: HomeAssistant) -> None:
     """Register ADS services (thread-safe)."""
     # Store registration state in hass.data instead of global variable
     if "_services_registered" not in hass.data[DOMAIN]:
@@ -739,15 +1156,23 @@ async def _async_register_services(hass: HomeAssistant, ads: AdsHub) -> None:
             return
 
         async def handle_write_data_by_name(call: ServiceCall) -> None:
-            """Write a value to the connected ADS device."""
-            ads_var: str = call.data[CONF_ADS_VAR]
-            ads_type: AdsType = call.data[CONF_ADS_TYPE]
-            value: int = call.data[CONF_ADS_VALUE]
-
-            try:
-                ads.write_by_name(ads_var, value, ADS_TYPEMAP[ads_type])
-            except pyads.ADSError as err:
-                _LOGGER.error(err)
+            """Write a value to one ADS device."""
+            entry_id: str | None = call.data.get(ATTR_CONFIG_ENTRY_ID)
+            if entry_id is None and "connection" in hass.data[DOMAIN]:
+                # Untargeted calls keep going to the first connection
+                hub: AdsHub = hass.data[DOMAIN]["connection"]
+            else:
+                (hub,) = _resolve_hubs(
+                    hass, [entry_id] if entry_id else None
+                ).values()
+            ads_var = call.data[CONF_ADS_VAR]
+            if not await hub.async_write_by_name(
+                ads_var,
+                call.data[CONF_ADS_VALUE],
+                ADS_TYPEMAP[call.data[CONF_ADS_TYPE]],
+            ):
+                # Failed, or suspended while the PLC is not in RUN
+                raise HomeAssistantError(f"Could not write {ads_var} to the PLC")
 
         hass.services.async_register(
             DOMAIN,
@@ -756,6 +1181,141 @@ async def _async_register_services(hass: HomeAssistant, ads: AdsHub) -> None:
             schema=SCHEMA_SERVICE_WRITE_DATA_BY_NAME,
         )
 
+        async def handle_write_data(call: ServiceCall) -> ServiceResponse:
+            """Write a list of variables, one sum write per targeted hub."""
+            hubs = _resolve_hubs(hass, call.data.get(ATTR_CONFIG_ENTRY_ID))
+            variables: list[dict] = call.data[CONF_VARIABLES]
+            # The hubs have executors of their own, so PLCs are written in parallel
+            results = await asyncio.gather(
+                *(_async_write_variables(hub, variables) for hub in hubs.values()),
+                return_exceptions=True,
+            )
+            response: dict[str, dict[str, bool]] = {}
+            for entry_id, result in zip(hubs, results):
+                if isinstance(result, BaseException):
+                    _LOGGER.error(
+                        "Writing to ADS connection %s failed: %s", entry_id, result
+                    )
+                    result = {variable[CONF_ADS_VAR]: False for variable in variables}
+                response[entry_id] = result
+            return response
+
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_WRITE_DATA,
+            handle_write_data,
+            schema=SCHEMA_SERVICE_WRITE_DATA,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+
+        async def handle_read_data_by_name(call: ServiceCall) -> ServiceResponse:
+            """Read a list of variables, one sum read per targeted hub."""
+            hubs = _resolve_hubs(hass, call.data.get(ATTR_CONFIG_ENTRY_ID))
+            names: list[str] = call.data[CONF_VARIABLES]
+            max_age: float | None = call.data.get(CONF_MAX_AGE)
+            results = await asyncio.gather(
+                *(
+                    hub.executor.async_run(hub.read_values, names, max_age)
+                    for hub in hubs.values()
+                ),
+                return_exceptions=True,
+            )
+            response: dict[str, dict] = {}
+            for entry_id, result in zip(hubs, results):
+                if isinstance(result, BaseException):
+                    _LOGGER.error(
+                        "Reading from ADS connection %s failed: %s", entry_id, result
+                    )
+                    result = dict.fromkeys(names)
+                response[entry_id] = {
+                    name: _response_value(value) for name, value in result.items()
+                }
+            return response
+
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_READ_DATA_BY_NAME,
+            handle_read_data_by_name,
+            schema=SCHEMA_SERVICE_READ_DATA_BY_NAME,
+            supports_response=SupportsResponse.ONLY,
+        )
+
+        def capture_hub(call: ServiceCall) -> AdsHub:
+            """Return the one hub a capture service call targets."""
+            entry_id: str | None = call.data.get(ATTR_CONFIG_ENTRY_ID)
+            (hub,) = _resolve_hubs(hass, [entry_id] if entry_id else None).values()
+            return hub
+
+        async def handle_start_capture(call: ServiceCall) -> None:
+            """Start capturing raw notifications to a file."""
+            hub = capture_hub(call)
+            path = _capture_path(hass, call.data[CONF_CAPTURE_FILENAME])
+            await hub.executor.async_run(
+                hub.start_capture,
+                path,
+                call.data[CONF_CAPTURE_MAX_SIZE] * 1024 * 1024,
+                call.data[CONF_CAPTURE_BACKUP_COUNT],
+            )
+
+        async def handle_stop_capture(call: ServiceCall) -> None:
+            """Stop capturing raw notifications."""
+            hub = capture_hub(call)
+            await hub.executor.async_run(hub.stop_capture)
+
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_START_CAPTURE,
+            handle_start_capture,
+            schema=SCHEMA_SERVICE_START_CAPTURE,
+        )
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_STOP_CAPTURE,
+            handle_stop_capture,
+            schema=SCHEMA_SERVICE_STOP_CAPTURE,
+        )
+
+        async def handle_start_profiling(call: ServiceCall) -> None:
+            """Sample the notification thread and loop handlers for a while."""
+            profiler: SamplingProfiler | None = hass.data[DOMAIN].get("_profiler")
+            if profiler is not None and profiler.is_alive():
+                raise ServiceValidationError(
+                    f"Profiling is already running, writing to {profiler.path}"
+                )
+            path = hass.config.path(
+                f"ads_profile_{dt_util.now().strftime('%Y%m%d_%H%M%S')}.collapsed"
+            )
+            profiler = SamplingProfiler(
+                path,
+                duration=call.data[CONF_PROFILE_DURATION],
+                interval=call.data[CONF_PROFILE_INTERVAL] / 1000,
+            )
+            hass.data[DOMAIN]["_profiler"] = profiler
+            profiler.start()
+            _LOGGER.info(
+                "Profiling ADS for up to %.0f s, writing to %s",
+                profiler.duration,
+                path,
+            )
+
+        async def handle_stop_profiling(call: ServiceCall) -> None:
+            """Stop profiling early and write the result."""
+            profiler: SamplingProfiler | None = hass.data[DOMAIN].pop("_profiler", None)
+            if profiler is None or not profiler.is_alive():
+                _LOGGER.info("ADS profiling is not running")
+                return
+            await hass.async_add_executor_job(profiler.stop)
+
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_START_PROFILING,
+            handle_start_profiling,
+            schema=SCHEMA_SERVICE_START_PROFILING,
+        )
+        hass.services.async_register(
+            DOMAIN, SERVICE_STOP_PROFILING, handle_stop_profiling
+        )
+
 
         hass.data[DOMAIN]["_services_registered"] = True
 
@@ -0,0 +1,1019 @@
+"""Native asyncio ADS client speaking AMS/TCP.
+
+``AmsClient`` talks to a TwinCAT ADS router directly over TCP (port 48898)
+without the pyads/TcAdsDll stack. Requests are pipelined: each gets an
+invoke ID and a future, so any number of requests can be outstanding on the
+one connection and responses are matched as they arrive. Device
+notifications are delivered as plain callbacks on the event loop.
+
+When the TCP connection drops, the client reconnects on its own with
+backoff, like the AdsLib router connection of pyads, and registers its
+device notifications again. Their handles stay the same for the caller;
+requests fail with ``ADSERR_CLIENT_PORTNOTOPEN`` only while reconnecting.
+
+``AmsConnection`` wraps the client in the blocking subset of the
+``pyads.Connection`` interface used by ``AdsHub``, so it can be used as a
+drop-in backend. It runs the client on its own event loop thread and
+hands notifications to a separate callback thread, like pyads does, so a
+callback waiting for the hub lock never blocks the I/O of a request that is
+holding it.
+
+Errors are raised as ``pyads.ADSError`` with the ADS error code, exactly as
+pyads would, so callers do not need to know which backend is in use.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import ctypes
+import itertools
+import logging
+import queue
+import struct
+import threading
+from typing import Any
+
+import pyads
+from pyads.constants import ads_type_to_ctype
+from pyads.errorcodes import ERROR_CODES
+
+_LOGGER = logging.getLogger(__name__)
+
+AMS_TCP_PORT = 48898
+# Source AMS port of this client; routes only check the source AMS Net ID
+DEFAULT_LOCAL_PORT = 32905
+DEFAULT_TIMEOUT = 5.0
+# Seconds between reconnection attempts, doubling up to the maximum
+RECONNECT_MIN_DELAY = 1.0
+RECONNECT_MAX_DELAY = 60.0
+# Read size for STRING values, as in pyads
+STRING_BUFFER = 1024
+
+# AMS/TCP header: reserved, length of the AMS packet
+AMS_TCP_HEADER = struct.Struct("<HI")
+# AMS header: target Net ID/port, source Net ID/port, command, state flags,
+# data length, error code, invoke ID
+AMS_HEADER = struct.Struct("<6sH6sHHHIII")
+
+ADSCOMMAND_READ = 2
+ADSCOMMAND_WRITE = 3
+ADSCOMMAND_READ_STATE = 4
+ADSCOMMAND_ADD_NOTIFICATION = 6
+ADSCOMMAND_DEL_NOTIFICATION = 7
+ADSCOMMAND_NOTIFICATION = 8
+ADSCOMMAND_READ_WRITE = 9
+
+STATE_FLAG_REQUEST = 0x0004
+STATE_FLAG_RESPONSE = 0x0005
+
+ADSIGRP_SYM_HNDBYNAME = 0xF003
+ADSIGRP_SYM_VALBYNAME = 0xF004
+ADSIGRP_SYM_VALBYHND = 0xF005
+ADSIGRP_SYM_RELEASEHND = 0xF006
+ADSIGRP_SYM_VERSION = 0xF008
+ADSIGRP_SYM_INFOBYNAMEEX = 0xF009
+ADSIGRP_SUMUP_READ = 0xF080
+ADSIGRP_SUMUP_WRITE = 0xF081
+ADSIGRP_SUMUP_DELDEVNOTE = 0xF085
+
+ADSERR_DEVICE_SYMBOLNOTFOUND = 1808
+ADSERR_CLIENT_SYNCTIMEOUT = 1861
+ADSERR_CLIENT_PORTNOTOPEN = 1864
+
+# AdsSymbolEntry: entry length, index group, index offset, size, data type,
+# flags, name/type/comment lengths
+SYMBOL_ENTRY = struct.Struct("<IIIIIIHHH")
+
+# Layout of pyads.structs.SAdsNotificationHeader
+_HEADER_SIZE = ctypes.sizeof(pyads.structs.SAdsNotificationHeader)
+_TIMESTAMP_OFFSET = pyads.structs.SAdsNotificationHeader.nTimeStamp.offset
+_SAMPLE_SIZE_OFFSET = pyads.structs.SAdsNotificationHeader.cbSampleSize.offset
+_DATA_OFFSET = pyads.structs.SAdsNotificationHeader.data.offset
+
+NotificationCallback = Callable[[int, int, bytes], None]
+
+
+class _Subscription:
+    """A device notification, registered again after a reconnect."""
+
+    __slots__ = (
+        "callback",
+        "attr",
+        "client",
+        "handle",
+        "name",
+        "notification_handle",
+        "symbol_handle",
+    )
+
+    def __init__(
+        self,
+        client: AmsClient,
+        handle: int,
+        name: str | tuple[int, int],
+        attr: pyads.NotificationAttrib,
+        callback: NotificationCallback,
+    ) -> None:
+        # The client (or port client) that registers it
+        self.client = client
+        # Handle given to the caller; the target's handle changes with
+        # every registration
+        self.handle = handle
+        self.name = name
+        self.attr = attr
+        self.callback = callback
+        self.notification_handle: int | None = None
+        self.symbol_handle: int | None = None
+
+
+def net_id_to_bytes(net_id: str) -> bytes:
+    """Encode a dotted AMS Net ID such as ``5.1.2.3.1.1``."""
+    parts = [int(part) for part in net_id.split(".")]
+    if len(parts) != 6:
+        raise ValueError(f"Invalid AMS Net ID: {net_id}")
+    return bytes(parts)
+
+
+def decode_value(plc_datatype: Any, data: bytes) -> Any:
+    """Decode raw PLC bytes like pyads ``read_by_name``."""
+    if plc_datatype is pyads.PLCTYPE_STRING:
+        return data.split(b"\x00", 1)[0].decode("utf-8", errors="ignore")
+    size = ctypes.sizeof(plc_datatype)
+    if len(data) < size:
+        raise pyads.ADSError(text=f"Expected {size} bytes, got {len(data)}")
+    return plc_datatype.from_buffer_copy(data[:size]).value
+
+
+def encode_value(plc_datatype: Any, value: Any) -> bytes:
+    """Encode a value like pyads ``write_by_name``."""
+    if plc_datatype is pyads.PLCTYPE_STRING:
+        return value.encode("utf-8") + b"\x00"
+    return bytes(plc_datatype(value))
+
+
+class _AmsProtocol(asyncio.Protocol):
+    """Split the TCP byte stream into AMS packets."""
+
+    def __init__(self, client: AmsClient) -> None:
+        self._client = client
+        self._buffer = bytearray()
+
+    def data_received(self, data: bytes) -> None:
+        buffer = self._buffer
+        buffer += data
+        while len(buffer) >= AMS_TCP_HEADER.size:
+            _reserved, length = AMS_TCP_HEADER.unpack_from(buffer)
+            end = AMS_TCP_HEADER.size + length
+            if len(buffer) < end:
+                break
+            packet = bytes(buffer[AMS_TCP_HEADER.size : end])
+            del buffer[:end]
+            self._client._packet_received(packet)  # noqa: SLF001
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self._client._connection_lost(exc)  # noqa: SLF001
+
+
+class AmsClient:
+    """Asyncio ADS client for one AMS target.
+
+    :param ams_net_id: AMS Net ID of the target, e.g. ``5.1.2.3.1.1``
+    :param ams_port: AMS port of the target, e.g. 851 for the first PLC
+    :param host: IP address or host name of the target's router
+    :param local_net_id: source AMS Net ID; defaults to the local IP
+        address of the connection followed by ``.1.1``, like pyads
+    """
+
+    def __init__(
+        self,
+        ams_net_id: str,
+        ams_port: int,
+        host: str,
+        *,
+        tcp_port: int = AMS_TCP_PORT,
+        local_net_id: str | None = None,
+        local_port: int = DEFAULT_LOCAL_PORT,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        """Initialize the client; ``connect`` opens the connection."""
+        self.ams_net_id = ams_net_id
+        self.ams_port = ams_port
+        self.host = host
+        self.tcp_port = tcp_port
+        self.local_net_id = local_net_id
+        self.local_port = local_port
+        self.timeout = timeout
+        self._transport: asyncio.Transport | None = None
+        self._target = net_id_to_bytes(ams_net_id)
+        self._source = b""
+        self._invoke_ids = itertools.count(1)
+        # invoke ID -> (future, optional hook called with the response data)
+        self._pending: dict[
+            int, tuple[asyncio.Future[bytes], Callable[[bytes], None] | None]
+        ] = {}
+        # (AMS port, notification handle of the target) -> subscription,
+        # for all ports
+        self._notification_callbacks: dict[tuple[int, int], _Subscription] = {}
+        # (AMS port, handle given to the caller) -> subscription
+        self._subscriptions: dict[tuple[int, int], _Subscription] = {}
+        self._notification_ids = itertools.count(1)
+        # Set by close, so a dropped connection is not reopened
+        self._closing = False
+        self._reconnect_task: asyncio.Task | None = None
+        self._handles: dict[str, int] = {}
+        self._symbol_infos: dict[str, tuple[int, int, int, int]] = {}
+        # Further AMS ports addressed over this connection
+        self._port_clients: list[AmsPortClient] = []
+
+    @property
+    def connected(self) -> bool:
+        """Return True while the TCP connection is open."""
+        return self._transport is not None
+
+    async def connect(self) -> None:
+        """Open the TCP connection to the router."""
+        self._closing = False
+        await self._open()
+
+    async def _open(self) -> None:
+        """Open the TCP connection (for ``connect`` and reconnects)."""
+        loop = asyncio.get_running_loop()
+        try:
+            transport, _protocol = await asyncio.wait_for(
+                loop.create_connection(
+                    lambda: _AmsProtocol(self), self.host, self.tcp_port
+                ),
+                self.timeout,
+            )
+        except (OSError, TimeoutError) as err:
+            raise pyads.ADSError(
+                ADSERR_CLIENT_PORTNOTOPEN, f"Cannot connect to {self.host}: {err}"
+            ) from err
+        self._transport = transport
+        if self.local_net_id is None:
+            self.local_net_id = f"{transport.get_extra_info('sockname')[0]}.1.1"
+        self._source = net_id_to_bytes(self.local_net_id)
+        _LOGGER.debug(
+            "Connected to %s:%s as %s", self.host, self.tcp_port, self.local_net_id
+        )
+
+    async def close(self) -> None:
+        """Release cached handles and close the connection."""
+        self._closing = True
+        task, self._reconnect_task = self._reconnect_task, None
+        if task is not None:
+            task.cancel()
+        if self._transport is None:
+            return
+        handles, self._handles = self._handles, {}
+        for handle in handles.values():
+            try:
+                await self.release_handle(handle)
+            except pyads.ADSError as err:
+                _LOGGER.debug("Error releasing handle %d: %s", handle, err)
+        transport, self._transport = self._transport, None
+        transport.close()
+        self._fail_pending()
+
+    # Raw ADS commands ----------------------------------------------------
+
+    async def request(
+        self,
+        command: int,
+        payload: bytes,
+        on_response: Callable[[bytes], None] | None = None,
+    ) -> bytes:
+        """Send an ADS request and return the response after the result code.
+
+        ``on_response`` is called with the same data as soon as the response
+        is parsed, before any later packet (e.g. a notification) is handled.
+        """
+        return await self._request(self.ams_port, command, payload, on_response)
+
+    async def _request(
+        self,
+        ams_port: int,
+        command: int,
+        payload: bytes,
+        on_response: Callable[[bytes], None] | None,
+    ) -> bytes:
+        """Send a request to ``ams_port`` of the target."""
+        transport = self._transport
+        if transport is None:
+            raise pyads.ADSError(ADSERR_CLIENT_PORTNOTOPEN)
+        invoke_id = next(self._invoke_ids) & 0xFFFFFFFF
+        future: asyncio.Future[bytes] = asyncio.get_running_loop().create_future()
+        self._pending[invoke_id] = (future, on_response)
+        header = AMS_HEADER.pack(
+            self._target,
+            ams_port,
+            self._source,
+            self.local_port,
+            command,
+            STATE_FLAG_REQUEST,
+            len(payload),
+            0,
+            invoke_id,
+        )
+        transport.write(
+            AMS_TCP_HEADER.pack(0, AMS_HEADER.size + len(payload)) + header + payload
+        )
+        try:
+            return await asyncio.wait_for(future, self.timeout)
+        except TimeoutError:
+            raise pyads.ADSError(ADSERR_CLIENT_SYNCTIMEOUT) from None
+        finally:
+            self._pending.pop(invoke_id, None)
+
+    async def read(self, index_group: int, index_offset: int, length: int) -> bytes:
+        """ADS Read."""
+        data = await self.request(
+            ADSCOMMAND_READ, struct.pack("<III", index_group, index_offset, length)
+        )
+        (size,) = struct.unpack_from("<I", data)
+        return data[4 : 4 + size]
+
+    async def write(self, index_group: int, index_offset: int, value: bytes) -> None:
+        """ADS Write."""
+        await self.request(
+            ADSCOMMAND_WRITE,
+            struct.pack("<III", index_group, index_offset, len(value)) + value,
+        )
+
+    async def read_write(
+        self, index_group: int, index_offset: int, read_length: int, value: bytes
+    ) -> bytes:
+        """ADS ReadWrite."""
+        data = await self.request(
+            ADSCOMMAND_READ_WRITE,
+            struct.pack("<IIII", index_group, index_offset, read_length, len(value))
+            + value,
+        )
+        (size,) = struct.unpack_from("<I", data)
+        return data[4 : 4 + size]
+
+    async def read_state(self) -> tuple[int, int]:
+        """Return the ADS state and device state of the target."""
+        data = await self.request(ADSCOMMAND_READ_STATE, b"")
+        return struct.unpack_from("<HH", data)
+
+    # Symbol access -------------------------------------------------------
+
+    async def get_handle(self, name: str) -> int:
+        """Return a new symbol handle; release it with ``release_handle``."""
+        data = await self.read_write(ADSIGRP_SYM_HNDBYNAME, 0, 4, name.encode())
+        return struct.unpack_from("<I", data)[0]
+
+    async def release_handle(self, handle: int) -> None:
+        """Release a symbol handle."""
+        await self.write(ADSIGRP_SYM_RELEASEHND, 0, struct.pack("<I", handle))
+
+    async def read_by_name(self, name: str, plc_datatype: Any) -> Any:
+        """Read a symbol in one round trip."""
+        length = (
+            STRING_BUFFER
+            if plc_datatype is pyads.PLCTYPE_STRING
+            else ctypes.sizeof(plc_datatype)
+        )
+        data = await self.read_write(ADSIGRP_SYM_VALBYNAME, 0, length, name.encode())
+        return decode_value(plc_datatype, data)
+
+    async def write_by_name(self, name: str, value: Any, plc_datatype: Any) -> None:
+        """Write a symbol through a cached handle."""
+        handle = self._handles.get(name)
+        if handle is None:
+            handle = self._handles[name] = await self.get_handle(name)
+        try:
+            await self.write(
+                ADSIGRP_SYM_VALBYHND, handle, encode_value(plc_datatype, value)
+            )
+        except pyads.ADSError:
+            # The handle may be stale after an online change
+            self._handles.pop(name, None)
+            raise
+
+    async def read_list_by_name(self, names: list[str]) -> dict[str, Any]:
+        """Read several symbols with one ADS sum read.
+
+        Values are decoded from the PLC's symbol information; symbols that
+        could not be read have the pyads error text as value, like
+        ``pyads.Connection.read_list_by_name``.
+        """
+        infos = await self._symbol_info_list(names)
+        request = b"".join(
+            struct.pack("<III", index_group, index_offset, size)
+            for index_group, index_offset, size, _data_type in infos
+        )
+        data = await self.read_write(
+            ADSIGRP_SUMUP_READ,
+            len(names),
+            4 * len(names) + sum(info[2] for info in infos),
+            request,
+        )
+        result = {}
+        offset = 4 * len(names)
+        for index, (name, (_group, _offset, size, data_type)) in enumerate(
+            zip(names, infos, strict=True)
+        ):
+            (error,) = struct.unpack_from("<I", data, 4 * index)
+            chunk = data[offset : offset + size]
+            offset += size
+            if error:
+                result[name] = ERROR_CODES.get(error, f"Unknown Error ({error})")
+                continue
+            plc_datatype = ads_type_to_ctype.get(data_type)
+            result[name] = (
+                chunk if plc_datatype is None else decode_value(plc_datatype, chunk)
+            )
+        return result
+
+    async def write_list_by_name(self, values: dict[str, Any]) -> dict[str, str]:
+        """Write several symbols with one ADS sum write.
+
+        Values are encoded from the PLC's symbol information. Returns the
+        pyads error text per symbol (``"no error"`` on success), like
+        ``pyads.Connection.write_list_by_name``.
+        """
+        names = list(values)
+        infos = await self._symbol_info_list(names)
+        request = bytearray()
+        for index_group, index_offset, size, _data_type in infos:
+            request += struct.pack("<III", index_group, index_offset, size)
+        for name, (_group, _offset, size, data_type) in zip(names, infos, strict=True):
+            plc_datatype = ads_type_to_ctype.get(data_type)
+            value = values[name]
+            data = value if plc_datatype is None else encode_value(plc_datatype, value)
+            request += data[:size].ljust(size, b"\x00")
+        data = await self.read_write(
+            ADSIGRP_SUMUP_WRITE, len(names), 4 * len(names), bytes(request)
+        )
+        return {
+            name: ERROR_CODES.get(error, f"Unknown Error ({error})")
+            for name, (error,) in zip(names, struct.iter_unpack("<I", data), strict=True)
+        }
+
+    async def _symbol_info_list(
+        self, names: list[str]
+    ) -> list[tuple[int, int, int, int]]:
+        """Return the (cached) symbol information of several symbols."""
+        missing = [name for name in names if name not in self._symbol_infos]
+        if missing:
+            infos = await asyncio.gather(
+                *(self._read_symbol_info(name) for name in missing)
+            )
+            self._symbol_infos.update(zip(missing, infos, strict=True))
+        return [self._symbol_infos[name] for name in names]
+
+    async def _read_symbol_info(self, name: str) -> tuple[int, int, int, int]:
+        """Return index group, index offset, size and ADS data type."""
+        data = await self.read_write(
+            ADSIGRP_SYM_INFOBYNAMEEX, 0, 0xFFFF, name.encode()
+        )
+        _length, index_group, index_offset, size, data_type, *_rest = (
+            SYMBOL_ENTRY.unpack_from(data)
+        )
+        return index_group, index_offset, size, data_type
+
+    async def symbol_layouts(
+        self, names: list[str]
+    ) -> dict[str, tuple[int, int, int, int] | None]:
+        """Look up the current symbol information of several symbols.
+
+        Returns index group, index offset, size and ADS data type per name,
+        None for a symbol that does not exist. The requests are pipelined.
+        Cached symbol information is dropped first, as it is stale after an
+        online change, and so are the write handles of symbols that moved.
+        """
+        previous, self._symbol_infos = self._symbol_infos, {}
+        infos = await asyncio.gather(
+            *(self._read_symbol_info(name) for name in names), return_exceptions=True
+        )
+        layouts = {}
+        for name, info in zip(names, infos, strict=True):
+            if isinstance(info, pyads.ADSError) and (
+                info.err_code == ADSERR_DEVICE_SYMBOLNOTFOUND
+            ):
+                layouts[name] = None
+            elif isinstance(info, BaseException):
+                raise info
+            else:
+                layouts[name] = self._symbol_infos[name] = info
+            if name in previous and layouts[name] != previous[name]:
+                self._handles.pop(name, None)
+        return layouts
+
+    # Notifications -------------------------------------------------------
+
+    async def add_device_notification(
+        self,
+        name: str | tuple[int, int],
+        attr: pyads.NotificationAttrib,
+        callback: NotificationCallback,
+    ) -> tuple[int, int | None]:
+        """Subscribe to a symbol, or to an (index group, index offset).
+
+        ``callback(notification_handle, filetime, data)`` is called on the
+        event loop for every sample. Returns the notification handle and the
+        symbol handle (None for an index group), both needed for
+        ``del_device_notification``.
+        """
+        subscription = _Subscription(
+            self, next(self._notification_ids), name, attr, callback
+        )
+        await self._add_notification(subscription)
+        self._subscriptions[self.ams_port, subscription.handle] = subscription
+        return subscription.handle, subscription.symbol_handle
+
+    async def _add_notification(self, subscription: _Subscription) -> None:
+        """Register ``subscription`` with the target."""
+        name = subscription.name
+        if isinstance(name, tuple):
+            index_group, handle = name
+            symbol_handle = None
+        else:
+            index_group = ADSIGRP_SYM_VALBYHND
+            handle = symbol_handle = await self.get_handle(name)
+        attr = subscription.attr
+
+        def register(data: bytes) -> None:
+            # Registered while the response is parsed, so a sample sent
+            # right after it is not dropped as unknown
+            subscription.notification_handle = struct.unpack_from("<I", data)[0]
+            self._notification_callbacks[
+                self.ams_port, subscription.notification_handle
+            ] = subscription
+
+        try:
+            await self.request(
+                ADSCOMMAND_ADD_NOTIFICATION,
+                struct.pack(
+                    "<IIIIII16x",
+                    index_group,
+                    handle,
+                    attr.length,
+                    attr.trans_mode,
+                    attr.max_delay,
+                    attr.cycle_time,
+                ),
+                register,
+            )
+        except pyads.ADSError:
+            if symbol_handle is not None:
+                await self.release_handle(symbol_handle)
+            raise
+        subscription.symbol_handle = symbol_handle
+
+    def _release_subscription(
+        self, notification_handle: int, handle: int | None
+    ) -> tuple[int, int | None]:
+        """Forget a subscription; returns the target's handles to delete."""
+        subscription = self._subscriptions.pop(
+            (self.ams_port, notification_handle), None
+        )
+        if subscription is None:
+            return notification_handle, handle
+        self._notification_callbacks.pop(
+            (self.ams_port, subscription.notification_handle), None
+        )
+        return subscription.notification_handle, subscription.symbol_handle
+
+    async def del_device_notification(
+        self, notification_handle: int, handle: int | None
+    ) -> None:
+        """Unsubscribe and release the symbol handle."""
+        notification_handle, handle = self._release_subscription(
+            notification_handle, handle
+        )
+        await self.request(
+            ADSCOMMAND_DEL_NOTIFICATION, struct.pack("<I", notification_handle)
+        )
+        if handle is not None:
+            await self.release_handle(handle)
+
+    async def del_device_notifications(
+        self, handles: list[tuple[int, int | None]]
+    ) -> list[int]:
+        """Unsubscribe several notifications with two sum commands.
+
+        ``handles`` are (notification handle, symbol handle) pairs. One sum
+        command deletes the notifications and a sum write releases the
+        symbol handles. Returns the ADS error code of each deletion.
+        """
+        if not handles:
+            return []
+        handles = [self._release_subscription(*pair) for pair in handles]
+        count = len(handles)
+        data = await self.read_write(
+            ADSIGRP_SUMUP_DELDEVNOTE,
+            count,
+            4 * count,
+            struct.pack(f"<{count}I", *(pair[0] for pair in handles)),
+        )
+        errors = list(struct.unpack_from(f"<{count}I", data))
+        symbol_handles = [pair[1] for pair in handles if pair[1] is not None]
+        if symbol_handles:
+            count = len(symbol_handles)
+            await self.read_write(
+                ADSIGRP_SUMUP_WRITE,
+                count,
+                4 * count,
+                struct.pack("<III", ADSIGRP_SYM_RELEASEHND, 0, 4) * count
+                + struct.pack(f"<{count}I", *symbol_handles),
+            )
+        return errors
+
+    # Protocol callbacks --------------------------------------------------
+
+    def _packet_received(self, packet: bytes) -> None:
+        """Handle one AMS packet from the router."""
+        (
+            _target,
+            _target_port,
+            _source,
+            source_port,
+            command,
+            _flags,
+            length,
+            error,
+            invoke_id,
+        ) = AMS_HEADER.unpack_from(packet)
+        data = packet[AMS_HEADER.size : AMS_HEADER.size + length]
+        if command == ADSCOMMAND_NOTIFICATION:
+            self._notification_received(source_port, data)
+            return
+        pending = self._pending.get(invoke_id)
+        if pending is None or pending[0].done():
+            _LOGGER.debug("Response for unknown invoke ID %d", invoke_id)
+            return
+        future, on_response = pending
+        # Every ADS response starts with its own result code
+        if not error and len(data) >= 4:
+            (error,) = struct.unpack_from("<I", data)
+        if error:
+            future.set_exception(pyads.ADSError(error))
+            return
+        data = data[4:]
+        if on_response is not None:
+            on_response(data)
+        future.set_result(data)
+
+    def _notification_received(self, ams_port: int, data: bytes) -> None:
+        """Split a device notification stream of ``ams_port`` into samples."""
+        callbacks = self._notification_callbacks
+        _length, stamps = struct.unpack_from("<II", data)
+        offset = 8
+        for _ in range(stamps):
+            timestamp, samples = struct.unpack_from("<QI", data, offset)
+            offset += 12
+            for _ in range(samples):
+                notification_handle, size = struct.unpack_from("<II", data, offset)
+                offset += 8
+                sample = data[offset : offset + size]
+                offset += size
+                subscription = callbacks.get((ams_port, notification_handle))
+                if subscription is None:
+                    _LOGGER.debug(
+                        "Notification for unknown handle %d", notification_handle
+                    )
+                    continue
+                try:
+                    subscription.callback(subscription.handle, timestamp, sample)
+                except Exception:
+                    _LOGGER.exception("Error in notification callback")
+
+    def _connection_lost(self, exc: Exception | None) -> None:
+        """Fail all outstanding requests and reconnect unless closing."""
+        if exc is not None:
+            _LOGGER.warning("Lost connection to %s: %s", self.host, exc)
+        self._transport = None
+        # Handles of the target do not survive the connection
+        self._handles.clear()
+        self._notification_callbacks.clear()
+        for port_client in self._port_clients:
+            port_client._handles.clear()  # noqa: SLF001
+        self._fail_pending()
+        if self._closing or (
+            self._reconnect_task is not None and not self._reconnect_task.done()
+        ):
+            return
+        self._reconnect_task = asyncio.get_running_loop().create_task(
+            self._reconnect()
+        )
+
+    async def _reconnect(self) -> None:
+        """Reopen the connection with backoff and restore notifications."""
+        delay = RECONNECT_MIN_DELAY
+        while True:
+            try:
+                await self._open()
+            except pyads.ADSError as err:
+                _LOGGER.debug(
+                    "Reconnecting to %s failed, retrying in %.0f s: %s",
+                    self.host,
+                    delay,
+                    err,
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+                continue
+            await self._restore_notifications()
+            # Dropped again while restoring: this task is still running,
+            # so the loss did not start another one
+            if self.connected or self._closing:
+                return
+
+    async def _restore_notifications(self) -> None:
+        """Register all subscriptions again on the new connection."""
+        subscriptions = list(self._subscriptions.values())
+        results = await asyncio.gather(
+            *(
+                subscription.client._add_notification(subscription)  # noqa: SLF001
+                for subscription in subscriptions
+            ),
+            return_exceptions=True,
+        )
+        failed = 0
+        for subscription, result in zip(subscriptions, results, strict=True):
+            if isinstance(result, BaseException):
+                failed += 1
+                _LOGGER.warning(
+                    "Cannot restore the notification for %s: %s",
+                    subscription.name,
+                    result,
+                )
+        _LOGGER.info(
+            "Reconnected to %s, restored %d of %d notifications",
+            self.host,
+            len(subscriptions) - failed,
+            len(subscriptions),
+        )
+
+    def _fail_pending(self) -> None:
+        pending, self._pending = self._pending, {}
+        for future, _hook in pending.values():
+            if not future.done():
+                future.set_exception(pyads.ADSError(ADSERR_CLIENT_PORTNOTOPEN))
+
+
+class AmsPortClient(AmsClient):
+    """Another AMS port of an ``AmsClient``'s target, over its connection.
+
+    TwinCAT 3 runs each PLC runtime on its own AMS port (851, 852, ...) of
+    the same AMS Net ID. A router accepts one TCP connection per source
+    Net ID, so further ports send their requests through the client's
+    connection instead of opening their own. Symbol handles and symbol
+    information are kept per port.
+    """
+
+    def __init__(self, client: AmsClient, ams_port: int) -> None:
+        """Initialize a port of ``client``; ``client`` must be connected."""
+        self._client = client
+        self.ams_net_id = client.ams_net_id
+        self.ams_port = ams_port
+        self.host = client.host
+        self.timeout = client.timeout
+        self._notification_callbacks = client._notification_callbacks  # noqa: SLF001
+        self._subscriptions = client._subscriptions  # noqa: SLF001
+        self._notification_ids = client._notification_ids  # noqa: SLF001
+        self._handles = {}
+        self._symbol_infos = {}
+        self._port_clients = []
+
+    @property
+    def connected(self) -> bool:
+        """Return True while the client's connection is open."""
+        return self._client.connected
+
+    async def connect(self) -> None:
+        """Start using the port; the client's connection must be open."""
+        if not self._client.connected:
+            raise pyads.ADSError(ADSERR_CLIENT_PORTNOTOPEN)
+        if self not in self._client._port_clients:  # noqa: SLF001
+            self._client._port_clients.append(self)  # noqa: SLF001
+
+    async def close(self) -> None:
+        """Release cached handles; the client's connection stays open."""
+        if self in self._client._port_clients:  # noqa: SLF001
+            self._client._port_clients.remove(self)  # noqa: SLF001
+        handles, self._handles = self._handles, {}
+        for handle in handles.values():
+            try:
+                await self.release_handle(handle)
+            except pyads.ADSError as err:
+                _LOGGER.debug("Error releasing handle %d: %s", handle, err)
+
+    async def _request(
+        self,
+        ams_port: int,
+        command: int,
+        payload: bytes,
+        on_response: Callable[[bytes], None] | None,
+    ) -> bytes:
+        """Send the request through the client's connection."""
+        return await self._client._request(  # noqa: SLF001
+            ams_port, command, payload, on_response
+        )
+
+
+class AmsConnection:
+    """Blocking ``pyads.Connection`` look-alike backed by ``AmsClient``.
+
+    Supports the calls ``AdsHub`` makes. Notification callbacks are called
+    as ``callback(notification, name)`` with a pointer to a
+    ``SAdsNotificationHeader``, like pyads, on a dedicated thread.
+
+    ``for_port`` returns a connection to another AMS port of the target
+    that shares this one's TCP connection and threads.
+    """
+
+    def __init__(
+        self,
+        ams_net_id: str,
+        ams_port: int,
+        ip_address: str | None = None,
+        *,
+        parent: AmsConnection | None = None,
+        **kwargs,
+    ) -> None:
+        """Initialize; ``open`` starts the I/O thread and connects."""
+        self._parent = parent
+        if parent is None:
+            self._client = AmsClient(
+                ams_net_id,
+                ams_port,
+                ip_address or ams_net_id.rsplit(".", 2)[0],
+                **kwargs,
+            )
+            self._callbacks: queue.SimpleQueue = queue.SimpleQueue()
+        else:
+            self._client = AmsPortClient(parent._client, ams_port)  # noqa: SLF001
+            self._callbacks = parent._callbacks  # noqa: SLF001
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._io_thread: threading.Thread | None = None
+        self._callback_thread: threading.Thread | None = None
+
+    @property
+    def ams_port(self) -> int:
+        """Return the AMS port of the target."""
+        return self._client.ams_port
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while connected."""
+        return self._loop is not None and self._client.connected
+
+    def for_port(self, ams_port: int) -> AmsConnection:
+        """Return a connection to ``ams_port`` of the same target.
+
+        It uses this connection's TCP connection and threads, so open it
+        after this one and close it before.
+        """
+        return AmsConnection(self._client.ams_net_id, ams_port, parent=self)
+
+    def open(self) -> None:
+        """Start the I/O and callback threads and connect."""
+        if self._loop is not None:
+            return
+        if self._parent is not None:
+            loop = self._parent._loop  # noqa: SLF001
+            if loop is None:
+                raise pyads.ADSError(ADSERR_CLIENT_PORTNOTOPEN)
+            self._loop = loop
+            try:
+                self._run(self._client.connect())
+            except pyads.ADSError:
+                self._loop = None
+                raise
+            return
+        loop = asyncio.new_event_loop()
+        self._io_thread = threading.Thread(
+            target=loop.run_forever, name="ads_custom AMS I/O", daemon=True
+        )
+        self._io_thread.start()
+        self._loop = loop
+        try:
+            self._run(self._client.connect())
+        except pyads.ADSError:
+            self._stop_loop()
+            raise
+        self._callback_thread = threading.Thread(
+            target=self._run_callbacks, name="ads_custom AMS callbacks", daemon=True
+        )
+        self._callback_thread.start()
+
+    def close(self) -> None:
+        """Disconnect and stop the threads."""
+        if self._loop is None:
+            return
+        if self._parent is not None:
+            try:
+                self._run(self._client.close())
+            finally:
+                self._loop = None
+            return
+        try:
+            self._run(self._client.close())
+        finally:
+            self._callbacks.put(None)
+            if self._callback_thread is not None:
+                self._callback_thread.join()
+                self._callback_thread = None
+            self._stop_loop()
+
+    def read_state(self) -> tuple[int, int]:
+        """Return the ADS state and device state."""
+        return self._run(self._client.read_state())
+
+    def read_by_name(self, data_name: str, plc_datatype: Any = None, **kwargs) -> Any:
+        """Read a symbol."""
+        return self._run(self._client.read_by_name(data_name, plc_datatype))
+
+    def write_by_name(
+        self, data_name: str, value: Any, plc_datatype: Any = None, **kwargs
+    ) -> None:
+        """Write a symbol."""
+        self._run(self._client.write_by_name(data_name, value, plc_datatype))
+
+    def read_list_by_name(self, data_names: list[str], **kwargs) -> dict[str, Any]:
+        """Read several symbols with one sum read."""
+        return self._run(self._client.read_list_by_name(list(data_names)))
+
+    def write_list_by_name(
+        self, data_names_and_values: dict[str, Any], **kwargs
+    ) -> dict[str, str]:
+        """Write several symbols with one sum write."""
+        return self._run(self._client.write_list_by_name(dict(data_names_and_values)))
+
+    def add_device_notification(
+        self,
+        data_name: str | tuple[int, int],
+        attr: pyads.NotificationAttrib,
+        callback: Callable,
+        **kwargs,
+    ) -> tuple[int, int | None]:
+        """Subscribe ``callback(notification, name)`` to a symbol or index group."""
+        put = self._callbacks.put
+
+        def enqueue(notification_handle: int, filetime: int, data: bytes) -> None:
+            put((callback, data_name, notification_handle, filetime, data))
+
+        return self._run(self._client.add_device_notification(data_name, attr, enqueue))
+
+    def del_device_notification(
+        self, notification_handle: int, user_handle: int | None
+    ) -> None:
+        """Unsubscribe."""
+        self._run(
+            self._client.del_device_notification(notification_handle, user_handle)
+        )
+
+    def del_device_notifications(
+        self, handles: list[tuple[int, int | None]]
+    ) -> list[int]:
+        """Unsubscribe several notifications with sum commands."""
+        return self._run(self._client.del_device_notifications(list(handles)))
+
+    def symbol_layouts(
+        self, data_names: list[str]
+    ) -> dict[str, tuple[int, int, int, int] | None]:
+        """Look up the current symbol information of several symbols."""
+        return self._run(self._client.symbol_layouts(list(data_names)))
+
+    def _run(self, coro):
+        """Run a client coroutine on the I/O loop and wait for the result."""
+        loop = self._loop
+        if loop is None:
+            coro.close()
+            raise pyads.ADSError(ADSERR_CLIENT_PORTNOTOPEN)
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def _run_callbacks(self) -> None:
+        """Call notification callbacks in arrival order."""
+        get = self._callbacks.get
+        while (item := get()) is not None:
+            callback, name, notification_handle, filetime, data = item
+            buffer = (ctypes.c_ubyte * max(_DATA_OFFSET + len(data), _HEADER_SIZE))()
+            struct.pack_into("<I", buffer, 0, notification_handle)
+            struct.pack_into("<Q", buffer, _TIMESTAMP_OFFSET, filetime)
+            struct.pack_into("<I", buffer, _SAMPLE_SIZE_OFFSET, len(data))
+            ctypes.memmove(ctypes.addressof(buffer) + _DATA_OFFSET, data, len(data))
+            try:
+                callback(
+                    ctypes.pointer(
+                        pyads.structs.SAdsNotificationHeader.from_buffer(buffer)
+                    ),
+                    name,
+                )
+            except Exception:
+                _LOGGER.exception("Error in notification callback for %s", name)
+
+    def _stop_loop(self) -> None:
+        loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if self._io_thread is not None:
+            self._io_thread.join()
+            self._io_thread = None
+        loop.close()
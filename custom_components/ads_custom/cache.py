@@ -0,0 +1,110 @@
+"""Last-known-value cache of an ADS hub.
+
+Every value the hub decodes from a notification, reads from the PLC or
+polls is stored here with the time it arrived. ``AdsHub.read_by_name``
+answers from the cache without a round trip when the value is fresh:
+
+* a symbol with an open notification handle is always fresh, as the PLC
+  pushes every change;
+* any other value (polled or read) is fresh for ``max_age`` seconds.
+
+Updates come from the notification, poller and executor threads. Each one
+is a single dict assignment, so no lock is needed; hit and miss counters
+live in ``HubMetrics`` and share its relaxed counting.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .metrics import HubMetrics
+
+DEFAULT_CACHE_MAX_AGE = 5.0
+
+
+class ValueCache:
+    """Most recent value per symbol, with freshness rules for reads."""
+
+    def __init__(
+        self, metrics: HubMetrics, max_age: float = DEFAULT_CACHE_MAX_AGE
+    ) -> None:
+        """Initialize an empty cache."""
+        self.metrics = metrics
+        self.max_age = max_age
+        # name -> (value, plc_datatype, time.monotonic() of the update)
+        self._values: dict[str, tuple[Any, Any, float]] = {}
+        # (name, plc_datatype) of the symbols kept current by an open
+        # notification handle; handles are shared per name and type, so one
+        # type of a symbol may stay live while another is released
+        self._live: set[tuple[str, Any]] = set()
+
+    def __len__(self) -> int:
+        """Return the number of cached symbols."""
+        return len(self._values)
+
+    def update(self, name: str, plc_datatype: Any, value: Any) -> None:
+        """Store the latest value of a symbol."""
+        self._values[name] = (value, plc_datatype, time.monotonic())
+
+    def update_if_live(self, name: str, plc_datatype: Any, value: Any) -> None:
+        """Store a value written to a live symbol.
+
+        The notification confirming the write may lag behind it; storing
+        the written value right away keeps ``is_current`` from comparing
+        later writes against the value from before.
+        """
+        if (name, plc_datatype) in self._live:
+            self.update(name, plc_datatype, value)
+
+    def is_current(self, name: str, plc_datatype: Any, value: Any) -> bool:
+        """Return True if a live symbol is known to hold ``value``.
+
+        Only values kept current by a notification handle count, as a
+        variable without one may have been changed by the PLC since. Does
+        not count as a read.
+        """
+        if (name, plc_datatype) not in self._live:
+            return False
+        entry = self._values.get(name)
+        return (
+            entry is not None and entry[1] is plc_datatype and entry[0] == value
+        )
+
+    def set_live(self, name: str, plc_datatype: Any, live: bool) -> None:
+        """Mark whether a handle of ``plc_datatype`` keeps ``name`` current."""
+        if live:
+            self._live.add((name, plc_datatype))
+        else:
+            self._live.discard((name, plc_datatype))
+
+    def get(self, name: str, plc_datatype: Any, max_age: float | None = None) -> Any:
+        """Return the cached value if it is fresh, else None.
+
+        ``max_age`` overrides the cache's default for values that are not
+        kept current by a notification. A ``plc_datatype`` of None accepts
+        a value of any type. Every call counts as a hit or miss.
+        """
+        entry = self._values.get(name)
+        if entry is not None:
+            value, cached_type, updated = entry
+            if (plc_datatype is None or cached_type is plc_datatype) and (
+                (name, cached_type) in self._live
+                or time.monotonic() - updated
+                <= (self.max_age if max_age is None else max_age)
+            ):
+                self.metrics.cache_hits += 1
+                return value
+        self.metrics.cache_misses += 1
+        return None
+
+    def age(self, name: str) -> float | None:
+        """Return the seconds since ``name`` was last updated, if cached."""
+        entry = self._values.get(name)
+        return None if entry is None else time.monotonic() - entry[2]
+
+    def clear(self) -> None:
+        """Forget all values, e.g. when the connection is closed."""
+        self._values.clear()
+        self._live.clear()
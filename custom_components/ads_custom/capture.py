@@ -0,0 +1,261 @@
+"""Binary capture of raw ADS notification traffic.
+
+A capture file starts with ``CAPTURE_MAGIC`` followed by records:
+
+* symbol record ``<BIHH`` (``RECORD_SYMBOL``, symbol id, name length, type
+  length) followed by the UTF-8 symbol name and ctypes type name;
+* notification record ``<BIIQdH`` (``RECORD_NOTIFICATION``, notification
+  handle, symbol id, PLC FILETIME timestamp, seconds since capture start,
+  payload length) followed by the raw payload bytes.
+
+Symbol records are written the first time a symbol appears in a file, so
+every rotated file can be read on its own.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+import logging
+import os
+from pathlib import Path
+import struct
+import threading
+import time
+from typing import NamedTuple
+
+import pyads
+
+_LOGGER = logging.getLogger(__name__)
+
+CAPTURE_MAGIC = b"ADSCAP\x01\n"
+
+RECORD_SYMBOL = 1
+RECORD_NOTIFICATION = 2
+
+_SYMBOL_HEADER = struct.Struct("<BIHH")
+_NOTIFICATION_HEADER = struct.Struct("<BIIQdH")
+
+DEFAULT_CAPTURE_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_CAPTURE_BACKUP_COUNT = 3
+
+# ctypes class name -> PLC data type, used to restore types on replay
+PLC_TYPES_BY_NAME = {
+    plc_type.__name__: plc_type
+    for plc_type in (
+        pyads.PLCTYPE_BOOL,
+        pyads.PLCTYPE_BYTE,
+        pyads.PLCTYPE_SINT,
+        pyads.PLCTYPE_INT,
+        pyads.PLCTYPE_UINT,
+        pyads.PLCTYPE_DINT,
+        pyads.PLCTYPE_UDINT,
+        pyads.PLCTYPE_REAL,
+        pyads.PLCTYPE_LREAL,
+        pyads.PLCTYPE_STRING,
+    )
+}
+
+
+class CaptureError(Exception):
+    """Raised when a capture file cannot be read."""
+
+
+class CaptureRecord(NamedTuple):
+    """A notification read back from a capture file."""
+
+    hnotify: int
+    name: str
+    plc_type_name: str
+    timestamp: int
+    elapsed: float
+    payload: bytes
+
+    @property
+    def plc_datatype(self) -> type | None:
+        """Return the PLC data type, or None if it is not known."""
+        return PLC_TYPES_BY_NAME.get(self.plc_type_name)
+
+
+class NotificationRecorder:
+    """Write raw notifications to a size-bounded, rotating capture file.
+
+    ``path`` is the active file; when it would exceed ``max_bytes`` it is
+    renamed to ``path.1`` (shifting older files up to ``backup_count``) and
+    a new file is started, so at most ``max_bytes * (backup_count + 1)``
+    bytes are kept on disk.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        max_bytes: int = DEFAULT_CAPTURE_MAX_BYTES,
+        backup_count: int = DEFAULT_CAPTURE_BACKUP_COUNT,
+    ) -> None:
+        """Open the capture file."""
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.records = 0
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+        self._symbol_ids: dict[tuple[str, str], int] = {}
+        self._written_symbols: set[int] = set()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self._open()
+
+    def _open(self):
+        """Start a new capture file."""
+        file = open(self.path, "wb")  # noqa: SIM115
+        file.write(CAPTURE_MAGIC)
+        self._size = len(CAPTURE_MAGIC)
+        self._written_symbols.clear()
+        return file
+
+    def _rotate(self) -> None:
+        """Rotate capture files like logging.handlers.RotatingFileHandler."""
+        self._file.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = self.path.with_name(f"{self.path.name}.{index}")
+                if source.exists():
+                    source.replace(self.path.with_name(f"{self.path.name}.{index + 1}"))
+            self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+        self._file = self._open()
+
+    def _encode(
+        self,
+        hnotify: int,
+        name: str,
+        symbol_id: int,
+        type_name: str,
+        timestamp: int,
+        elapsed: float,
+        payload: bytes,
+    ) -> bytes:
+        """Encode a notification, preceded by its symbol record if needed."""
+        data = b""
+        if symbol_id not in self._written_symbols:
+            name_bytes = name.encode("utf-8")
+            type_bytes = type_name.encode("utf-8")
+            data = (
+                _SYMBOL_HEADER.pack(
+                    RECORD_SYMBOL, symbol_id, len(name_bytes), len(type_bytes)
+                )
+                + name_bytes
+                + type_bytes
+            )
+        return (
+            data
+            + _NOTIFICATION_HEADER.pack(
+                RECORD_NOTIFICATION,
+                hnotify,
+                symbol_id,
+                timestamp,
+                elapsed,
+                len(payload),
+            )
+            + payload
+        )
+
+    def record(
+        self,
+        hnotify: int,
+        name: str,
+        plc_datatype: type,
+        timestamp: int,
+        payload: bytes,
+    ) -> None:
+        """Append one notification to the capture."""
+        elapsed = time.monotonic() - self._start
+        type_name = getattr(plc_datatype, "__name__", str(plc_datatype))
+        with self._lock:
+            if self._file is None:
+                return
+            symbol_id = self._symbol_ids.setdefault(
+                (name, type_name), len(self._symbol_ids)
+            )
+            args = (hnotify, name, symbol_id, type_name, timestamp, elapsed, payload)
+            data = self._encode(*args)
+            if (
+                self._size + len(data) > self.max_bytes
+                and self._size > len(CAPTURE_MAGIC)
+            ):
+                self._rotate()
+                data = self._encode(*args)
+
+            self._file.write(data)
+            self._written_symbols.add(symbol_id)
+            self._size += len(data)
+            self.records += 1
+
+    def close(self) -> None:
+        """Flush and close the capture file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        _LOGGER.debug("Closed capture %s after %d records", self.path, self.records)
+
+
+def capture_files(path: str | os.PathLike) -> list[Path]:
+    """Return a capture and its rotated files, oldest first."""
+    path = Path(path)
+    rotated = []
+    index = 1
+    while (candidate := path.with_name(f"{path.name}.{index}")).exists():
+        rotated.append(candidate)
+        index += 1
+    files = list(reversed(rotated))
+    if path.exists():
+        files.append(path)
+    return files
+
+
+def read_capture_file(path: str | os.PathLike) -> Iterator[CaptureRecord]:
+    """Yield the notifications stored in one capture file."""
+    symbols: dict[int, tuple[str, str]] = {}
+    with open(path, "rb") as file:
+        if file.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+            raise CaptureError(f"{path} is not an ADS capture file")
+        while record_type := file.read(1):
+            if record_type[0] == RECORD_SYMBOL:
+                header = record_type + file.read(_SYMBOL_HEADER.size - 1)
+                if len(header) < _SYMBOL_HEADER.size:
+                    break
+                _, symbol_id, name_len, type_len = _SYMBOL_HEADER.unpack(header)
+                text = file.read(name_len + type_len)
+                symbols[symbol_id] = (
+                    text[:name_len].decode("utf-8"),
+                    text[name_len:].decode("utf-8"),
+                )
+            elif record_type[0] == RECORD_NOTIFICATION:
+                header = record_type + file.read(_NOTIFICATION_HEADER.size - 1)
+                if len(header) < _NOTIFICATION_HEADER.size:
+                    break
+                _, hnotify, symbol_id, timestamp, elapsed, size = (
+                    _NOTIFICATION_HEADER.unpack(header)
+                )
+                payload = file.read(size)
+                if len(payload) < size:
+                    # Truncated by an unclean shutdown
+                    break
+                try:
+                    name, type_name = symbols[symbol_id]
+                except KeyError:
+                    raise CaptureError(
+                        f"{path}: notification for unknown symbol id {symbol_id}"
+                    ) from None
+                yield CaptureRecord(hnotify, name, type_name, timestamp, elapsed, payload)
+            else:
+                raise CaptureError(
+                    f"{path}: unknown record type {record_type[0]} at {file.tell() - 1}"
+                )
+
+
+def read_capture(path: str | os.PathLike) -> Iterator[CaptureRecord]:
+    """Yield all notifications of a capture, including rotated files."""
+    files = capture_files(path)
+    if not files:
+        raise CaptureError(f"{path} does not exist")
+    for file in files:
+        yield from read_capture_file(file)
@@ -14,6 +14,8 @@ an entity (or choose to add a new one), then configure it.
 from __future__ import annotations
 
 import logging
+from pathlib import Path
+import re
 import uuid
 from typing import Any
 
@@ -40,11 +42,20 @@ from .const import (
     CONF_ENTITY_CATEGORY,
     CONF_ENTITY_ICON,
     CONF_ENTITY_PICTURE,
+    CONF_NATIVE_AMS_CLIENT,
+    CONF_NOTIFICATION_BUDGET,
+    CONF_OPTIMISTIC_TIMEOUT,
+    CONF_PLC_TIMESTAMP_ATTRIBUTE,
+    CONF_POLL_FALLBACK_INTERVAL,
+    CONF_SUPPRESS_REDUNDANT_WRITES,
+    CONF_VALUE_CACHE_MAX_AGE,
     DOMAIN,
     AdsType,
     SUBENTRY_TYPE_ENTITY,
 )
+from .cache import DEFAULT_CACHE_MAX_AGE
 from .device_groups import (
+    async_add_entities_to_single_subentry,
     async_add_entity_to_single_subentry,
     async_get_or_create_single_entities_subentry,
     async_remove_entity_from_single_subentry,
@@ -57,6 +68,9 @@ from .device_registry_compat import (
     async_get_device_by_identifier,
     device_belongs_to_entry,
 )
+from .paths import config_file_path
+from .polling import DEFAULT_POLL_INTERVAL
+from .symbol_import import SymbolImportError, build_entity_configs, iter_symbols
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -67,6 +81,12 @@ CONF_SELECTED_DEVICE_ID = "selected_device_id"
 CONF_DELETE_ENTITY = "delete_entity"
 CONF_DELETE_EMPTY_DEVICES = "delete_empty_devices"
 
+# Bulk symbol import fields
+CONF_SYMBOL_FILE = "symbol_file"
+CONF_SYMBOL_FILTER = "symbol_filter"
+CONF_MAPPING_RULES = "mapping_rules"
+CONF_GROUP_BY_PREFIX = "group_by_prefix"
+
 # Entity type constants
 CONF_ENTITY_TYPE = "entity_type"
 CONF_ADS_TYPE = "adstype"
@@ -430,7 +450,9 @@ class _EntityStepsMixin(_DeviceMapMixin):
     _entity_data: dict[str, Any]
     _editing_unique_id: str | None
 
-    def _finish(self, reason: str) -> ConfigFlowResult | SubentryFlowResult:
+    def _finish(
+        self, reason: str, description_placeholders: dict[str, str] | None = None
+    ) -> ConfigFlowResult | SubentryFlowResult:
         raise NotImplementedError
 
     # ── Helpers ──────────────────────────────────────────────────────
@@ -566,7 +588,7 @@ class _EntityStepsMixin(_DeviceMapMixin):
             step_id="add_entity",
             menu_options=[
                 "add_switch", "add_sensor", "add_binary_sensor", "add_light",
-                "add_cover", "add_valve", "add_select",
+                "add_cover", "add_valve", "add_select", "import_symbols",
             ],
         )
 
@@ -591,6 +613,80 @@ class _EntityStepsMixin(_DeviceMapMixin):
     async def async_step_add_select(self, user_input: dict[str, Any] | None = None) -> SubentryFlowResult:
         return await self.async_step_configure_select()
 
+    # ── Bulk import from a TwinCAT symbol export ─────────────────────
+
+    async def async_step_import_symbols(self, user_input: dict[str, Any] | None = None) -> SubentryFlowResult:
+        """Create many entities at once from a .tmc, CSV or JSON symbol file."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            symbol_filter = (user_input.get(CONF_SYMBOL_FILTER) or "").strip() or None
+            if symbol_filter is not None:
+                try:
+                    re.compile(symbol_filter)
+                except re.error:
+                    errors[CONF_SYMBOL_FILTER] = "invalid_symbol_filter"
+
+            try:
+                path = Path(config_file_path(self.hass, user_input[CONF_SYMBOL_FILE].strip()))
+            except ValueError:
+                errors[CONF_SYMBOL_FILE] = "invalid_path"
+
+            if not errors:
+                device_id, device_name = self._resolve_device_assignment(dict(user_input))
+                existing_ads_vars = {
+                    ads_var for entity in self._entities() if (ads_var := entity.get(CONF_ADS_VAR))
+                }
+
+                def parse_symbol_file() -> list[dict[str, Any]]:
+                    return build_entity_configs(
+                        iter_symbols(path),
+                        symbol_filter=symbol_filter,
+                        mapping_rules=user_input.get(CONF_MAPPING_RULES),
+                        device_id=device_id,
+                        device_name=device_name,
+                        group_by_prefix=user_input.get(CONF_GROUP_BY_PREFIX, False),
+                        existing_ads_vars=existing_ads_vars,
+                    )
+
+                try:
+                    entities = await self.hass.async_add_executor_job(parse_symbol_file)
+                except OSError:
+                    errors[CONF_SYMBOL_FILE] = "symbol_file_not_found"
+                except SymbolImportError as err:
+                    _LOGGER.warning("Could not import symbols: %s", err)
+                    errors[CONF_SYMBOL_FILE] = "invalid_symbol_file"
+                except ValueError:
+                    errors[CONF_MAPPING_RULES] = "invalid_mapping_rules"
+                else:
+                    if not entities:
+                        errors["base"] = "no_symbols_found"
+                    else:
+                        async_add_entities_to_single_subentry(self.hass, self.entry, entities)
+                        _LOGGER.info(
+                            "Imported %d entities from %s into hub '%s'",
+                            len(entities),
+                            path,
+                            self.entry.title,
+                        )
+                        return self._finish("symbols_imported", {"count": str(len(entities))})
+
+        return self.async_show_form(
+            step_id="import_symbols",
+            data_schema=self.add_suggested_values_to_schema(
+                vol.Schema({
+                    vol.Required(CONF_SYMBOL_FILE): cv.string,
+                    vol.Optional(CONF_SYMBOL_FILTER): cv.string,
+                    vol.Optional(CONF_MAPPING_RULES): selector.TextSelector(
+                        selector.TextSelectorConfig(multiline=True)
+                    ),
+                    vol.Optional(CONF_GROUP_BY_PREFIX, default=False): cv.boolean,
+                    **self._device_assignment_schema(),
+                }),
+                user_input or {},
+            ),
+            errors=errors,
+        )
+
     # ── Select an existing entity, then configure/delete it ──────────
 
     async def async_step_select_entity(self, user_input: dict[str, Any] | None = None) -> SubentryFlowResult:
@@ -872,8 +968,12 @@ class AdsEntitySubentryFlowHandler(_EntityStepsMixin, ConfigSubentryFlow):
             return self.handler.config_entry
         return self._get_entry()
 
-    def _finish(self, reason: str) -> SubentryFlowResult:
-        return self.async_abort(reason=reason)
+    def _finish(
+        self, reason: str, description_placeholders: dict[str, str] | None = None
+    ) -> SubentryFlowResult:
+        return self.async_abort(
+            reason=reason, description_placeholders=description_placeholders
+        )
 
     async def async_step_user(self, user_input: dict[str, Any] | None = None) -> SubentryFlowResult:
         """Entry point when creating the subentry for the first time."""
@@ -914,9 +1014,68 @@ class AdsOptionsFlowHandler(_DeviceMapMixin, OptionsFlow):
                     )
                     return self.async_abort(reason="empty_devices_deleted")
             else:
-                return self.async_create_entry(title="", data={})
+                return self.async_create_entry(
+                    title="",
+                    data={
+                        **self.entry.options,
+                        CONF_PLC_TIMESTAMP_ATTRIBUTE: user_input.get(
+                            CONF_PLC_TIMESTAMP_ATTRIBUTE, False
+                        ),
+                        CONF_NOTIFICATION_BUDGET: user_input.get(
+                            CONF_NOTIFICATION_BUDGET, 0
+                        ),
+                        CONF_POLL_FALLBACK_INTERVAL: user_input.get(
+                            CONF_POLL_FALLBACK_INTERVAL, DEFAULT_POLL_INTERVAL
+                        ),
+                        CONF_NATIVE_AMS_CLIENT: user_input.get(
+                            CONF_NATIVE_AMS_CLIENT, False
+                        ),
+                        CONF_VALUE_CACHE_MAX_AGE: user_input.get(
+                            CONF_VALUE_CACHE_MAX_AGE, DEFAULT_CACHE_MAX_AGE
+                        ),
+                        CONF_SUPPRESS_REDUNDANT_WRITES: user_input.get(
+                            CONF_SUPPRESS_REDUNDANT_WRITES, False
+                        ),
+                        CONF_OPTIMISTIC_TIMEOUT: user_input.get(
+                            CONF_OPTIMISTIC_TIMEOUT, 0
+                        ),
+                    },
+                )
 
-        schema: dict[Any, Any] = {}
+        schema: dict[Any, Any] = {
+            vol.Optional(
+                CONF_PLC_TIMESTAMP_ATTRIBUTE,
+                default=self.entry.options.get(CONF_PLC_TIMESTAMP_ATTRIBUTE, False),
+            ): cv.boolean,
+            vol.Optional(
+                CONF_NOTIFICATION_BUDGET,
+                default=self.entry.options.get(CONF_NOTIFICATION_BUDGET, 0),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Optional(
+                CONF_POLL_FALLBACK_INTERVAL,
+                default=self.entry.options.get(
+                    CONF_POLL_FALLBACK_INTERVAL, DEFAULT_POLL_INTERVAL
+                ),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(
+                CONF_NATIVE_AMS_CLIENT,
+                default=self.entry.options.get(CONF_NATIVE_AMS_CLIENT, False),
+            ): cv.boolean,
+            vol.Optional(
+                CONF_VALUE_CACHE_MAX_AGE,
+                default=self.entry.options.get(
+                    CONF_VALUE_CACHE_MAX_AGE, DEFAULT_CACHE_MAX_AGE
+                ),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(
+                CONF_SUPPRESS_REDUNDANT_WRITES,
+                default=self.entry.options.get(CONF_SUPPRESS_REDUNDANT_WRITES, False),
+            ): cv.boolean,
+            vol.Optional(
+                CONF_OPTIMISTIC_TIMEOUT,
+                default=self.entry.options.get(CONF_OPTIMISTIC_TIMEOUT, 0),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        }
         if empty_device_ids:
             schema[vol.Optional(CONF_DELETE_EMPTY_DEVICES, default=False)] = cv.boolean
 
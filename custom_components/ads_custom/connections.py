@@ -0,0 +1,108 @@
+"""Registry sharing one ADS hub per PLC connection.
+
+YAML configuration sets up a hub under ``hass.data[DOMAIN]["connection"]``
+and imports itself as a config entry, which sets up the same connection
+again. ``ConnectionRegistry`` keys hubs by AMS Net ID, IP address and
+port, so every consumer of a connection gets the same ``AdsHub`` (and, as
+the hub shares handles per symbol, the same notification subscriptions).
+Each consumer holds a reference under its own name; the hub is shut down
+when the last one is released, and the callbacks registered for it with
+``add_release_callback`` (such as the removal of its stop listener) run.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import CONF_DEVICE, CONF_IP_ADDRESS, CONF_PORT
+
+if TYPE_CHECKING:
+    from .hub import AdsHub
+
+DEFAULT_ADS_PORT = 48898
+
+ConnectionKey = tuple[str, str | None, int]
+
+
+def connection_key(config_data: dict[str, Any]) -> ConnectionKey:
+    """Return the registry key of a connection configuration."""
+    return (
+        config_data[CONF_DEVICE],
+        config_data.get(CONF_IP_ADDRESS) or None,
+        config_data.get(CONF_PORT, DEFAULT_ADS_PORT),
+    )
+
+
+class ConnectionRegistry:
+    """Reference-counted hubs by connection key."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._hubs: dict[ConnectionKey, AdsHub] = {}
+        # key -> names of the consumers holding a reference
+        self._users: dict[ConnectionKey, set[str]] = {}
+        # key -> callbacks run when the last reference is released
+        self._release_callbacks: dict[ConnectionKey, list[Callable[[], None]]] = {}
+        # Serialises hub creation, so two consumers never open the same PLC
+        self._lock = asyncio.Lock()
+
+    async def async_acquire(
+        self,
+        key: ConnectionKey,
+        user: str,
+        create: Callable[[], Awaitable[AdsHub]],
+    ) -> AdsHub:
+        """Return the hub for ``key``, creating it with ``create`` if needed.
+
+        Errors of ``create`` propagate and leave the registry unchanged.
+        """
+        async with self._lock:
+            hub = self._hubs.get(key)
+            if hub is None:
+                hub = await create()
+                self._hubs[key] = hub
+                self._users[key] = set()
+            self._users[key].add(user)
+            return hub
+
+    def add_release_callback(
+        self, key: ConnectionKey, callback: Callable[[], None]
+    ) -> None:
+        """Call ``callback`` when the last reference to the hub is released.
+
+        May be called from the ``create`` function passed to
+        ``async_acquire``, before the hub is registered.
+        """
+        self._release_callbacks.setdefault(key, []).append(callback)
+
+    def user_count(self, hub: AdsHub) -> int:
+        """Return the number of consumers holding ``hub``."""
+        key = self._key_of(hub)
+        return 0 if key is None else len(self._users[key])
+
+    def release(self, hub: AdsHub, user: str) -> bool:
+        """Drop the reference of ``user``; True if it was the last one.
+
+        The caller shuts the hub down when this returns True.
+        """
+        key = self._key_of(hub)
+        if key is None:
+            # Not shared (or already released), so the caller owns it
+            return True
+        users = self._users[key]
+        users.discard(user)
+        if users:
+            return False
+        del self._hubs[key]
+        del self._users[key]
+        for callback in self._release_callbacks.pop(key, ()):
+            callback()
+        return True
+
+    def _key_of(self, hub: AdsHub) -> ConnectionKey | None:
+        for key, registered in self._hubs.items():
+            if registered is hub:
+                return key
+        return None
@@ -32,6 +32,26 @@ CONF_ENTITY_PICTURE = "entity_picture"
 CONF_ENTITY_DEVICE_ID = "entity_device_id"
 CONF_ENTITY_DEVICE_NAME = "entity_device_name"
 
+# Hub options (config entry options flow)
+CONF_PLC_TIMESTAMP_ATTRIBUTE = "plc_timestamp_attribute"
+# Maximum number of ADS notification handles per hub (0 = unlimited)
+CONF_NOTIFICATION_BUDGET = "notification_budget"
+# Seconds between reads of symbols without a notification handle (0 = off)
+CONF_POLL_FALLBACK_INTERVAL = "poll_fallback_interval"
+# Use the asyncio AMS/TCP client instead of pyads
+CONF_NATIVE_AMS_CLIENT = "native_ams_client"
+# Seconds a cached value without a notification handle serves reads
+CONF_VALUE_CACHE_MAX_AGE = "value_cache_max_age"
+# Skip writes of values the PLC already reports by notification
+CONF_SUPPRESS_REDUNDANT_WRITES = "suppress_redundant_writes"
+# Seconds a commanded state is shown before the PLC confirms it (0 = off)
+CONF_OPTIMISTIC_TIMEOUT = "optimistic_timeout"
+
+ATTR_PLC_TIMESTAMP = "plc_timestamp"
+
+# Fired when the PLC does not confirm an optimistically shown command
+EVENT_COMMAND_NOT_CONFIRMED = f"{DOMAIN}_command_not_confirmed"
+
 
 class AdsType(StrEnum):
     """Supported Types."""
@@ -311,7 +311,7 @@ class AdsCover(AdsEntity, CoverEntity):
             plctype = pyads.PLCTYPE_UINT if self._ads_var_position_type == "uint" else pyads.PLCTYPE_BYTE
             
             # Register custom update handler for position to track previous value
-            def update_position(name, value):
+            def update_position(name, value, plc_time=None):
                 """Handle position updates and track previous position.
 
                 Only a *genuine* change in value counts as movement. Cyclic
@@ -342,18 +342,16 @@ class AdsCover(AdsEntity, CoverEntity):
                         self._event.set()
                 
                 asyncio.run_coroutine_threadsafe(async_event_set(), self.hass.loop)
-                self.schedule_update_ha_state()
+                self.schedule_notified_state_write(plc_time)
             
             # Set up event for initial wait
             self._event = asyncio.Event()
             
-            await self.hass.async_add_executor_job(
-                self._ads_hub.add_device_notification, 
-                self._ads_var_position, 
-                plctype, 
-                update_position
-            )
-            
+            if not await self.async_subscribe(
+                self._ads_var_position, plctype, update_position
+            ):
+                return
+
             # Wait for initial position update
             try:
                 async with asyncio.timeout(10):
@@ -494,17 +492,19 @@ class AdsCover(AdsEntity, CoverEntity):
                 return False
             return current_position < prev_position
 
-    def stop_cover(self, **kwargs: Any) -> None:
+    async def async_stop_cover(self, **kwargs: Any) -> None:
         """Fire the stop action."""
         if self._ads_var_stop:
-            self._ads_hub.write_by_name(self._ads_var_stop, True, pyads.PLCTYPE_BOOL)
+            await self._ads_hub.async_write_by_name(
+                self._ads_var_stop, True, pyads.PLCTYPE_BOOL
+            )
         # Reset movement tracking so is_opening/is_closing immediately return False
         current = self._state_dict.get(STATE_KEY_POSITION)
         if current is not None:
             self._state_dict[STATE_KEY_PREV_POSITION] = current
         self._position_last_updated = None
 
-    def set_cover_position(self, **kwargs: Any) -> None:
+    async def async_set_cover_position(self, **kwargs: Any) -> None:
         """Set cover position.
         
         Receives HA position (0=closed, 100=open) and converts if needed.
@@ -517,37 +517,46 @@ class AdsCover(AdsEntity, CoverEntity):
             write_position = (100 - position) if self._inverted else position
             # Use UINT or BYTE based on configuration
             plctype = pyads.PLCTYPE_UINT if self._ads_var_position_type == "uint" else pyads.PLCTYPE_BYTE
-            self._ads_hub.write_by_name(
+            await self._ads_hub.async_write_by_name(
                 self._ads_var_pos_set, write_position, plctype
             )
 
-    def open_cover(self, **kwargs: Any) -> None:
+    async def async_open_cover(self, **kwargs: Any) -> None:
         """Move the cover up."""
         if self._ads_var_open is not None:
-            self._ads_hub.write_by_name(self._ads_var_open, True, pyads.PLCTYPE_BOOL)
-            # Write FALSE to close command to ensure only one command is active
-            if self._ads_var_close is not None:
-                self._ads_hub.write_by_name(self._ads_var_close, False, pyads.PLCTYPE_BOOL)
+            await self._async_write_command(self._ads_var_open, self._ads_var_close)
         elif self._ads_var_pos_set is not None:
             # Always use 100 for open in Home Assistant terms
-            # set_cover_position will handle inversion if needed
-            self.set_cover_position(**{ATTR_POSITION: 100})
+            # async_set_cover_position will handle inversion if needed
+            await self.async_set_cover_position(**{ATTR_POSITION: 100})
 
-    def close_cover(self, **kwargs: Any) -> None:
+    async def async_close_cover(self, **kwargs: Any) -> None:
         """Move the cover down."""
         if self._ads_var_close is not None:
-            self._ads_hub.write_by_name(self._ads_var_close, True, pyads.PLCTYPE_BOOL)
-            # Write FALSE to open command to ensure only one command is active
-            if self._ads_var_open is not None:
-                self._ads_hub.write_by_name(self._ads_var_open, False, pyads.PLCTYPE_BOOL)
+            await self._async_write_command(self._ads_var_close, self._ads_var_open)
         elif self._ads_var_pos_set is not None:
             # Always use 0 for close in Home Assistant terms
-            # set_cover_position will handle inversion if needed
-            self.set_cover_position(**{ATTR_POSITION: 0})
+            # async_set_cover_position will handle inversion if needed
+            await self.async_set_cover_position(**{ATTR_POSITION: 0})
+
+    async def _async_write_command(self, command: str, opposite: str | None) -> None:
+        """Set a command variable and clear the opposite one.
+
+        Writing FALSE to the opposite command ensures only one command is
+        active; both writes are queued together and sent in one sum write.
+        """
+        writes = [self._ads_hub.async_write_by_name(command, True, pyads.PLCTYPE_BOOL)]
+        if opposite is not None:
+            writes.append(
+                self._ads_hub.async_write_by_name(opposite, False, pyads.PLCTYPE_BOOL)
+            )
+        await asyncio.gather(*writes)
 
     @property
     def available(self) -> bool:
-        """Return False if state has not been updated yet."""
+        """Return False if state has not been updated yet or a variable is lost."""
+        if self._unavailable_vars:
+            return False
         if self._ads_var is not None or self._ads_var_position is not None:
             return (
                 self._state_dict[STATE_KEY_STATE] is not None
@@ -96,9 +96,22 @@ def async_add_entity_to_single_subentry(
     entity_data: dict[str, Any],
 ) -> None:
     """Append an entity config to the hub's single entities subentry."""
+    async_add_entities_to_single_subentry(hass, entry, [entity_data])
+
+
+def async_add_entities_to_single_subentry(
+    hass: "HomeAssistant",
+    entry: ConfigEntry,
+    entities_data: Iterable[dict[str, Any]],
+) -> None:
+    """Append several entity configs to the single subentry in one update.
+
+    All entities are written with a single subentry update, so the hub is
+    reloaded once no matter how many entities are added.
+    """
     subentry = async_get_or_create_single_entities_subentry(hass, entry)
     entities = iter_entity_configs(dict(subentry.data))
-    entities.append(entity_data)
+    entities.extend(entities_data)
     new_data = with_entity_configs(dict(subentry.data), entities)
     hass.config_entries.async_update_subentry(
         entry, subentry, data=MappingProxyType(new_data)
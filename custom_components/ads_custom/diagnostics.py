@@ -0,0 +1,43 @@
+"""Diagnostics support for ADS."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_DEVICE, CONF_IP_ADDRESS
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, SUBENTRY_TYPE_ENTITY
+from .device_groups import iter_entity_configs
+
+TO_REDACT = {CONF_DEVICE, CONF_IP_ADDRESS}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a hub config entry."""
+    entity_types: dict[str, int] = {}
+    for subentry in entry.subentries.values():
+        if subentry.subentry_type != SUBENTRY_TYPE_ENTITY:
+            continue
+        for entity_config in iter_entity_configs(dict(subentry.data)):
+            entity_type = entity_config.get("entity_type", "unknown")
+            entity_types[entity_type] = entity_types.get(entity_type, 0) + 1
+
+    ads_hub = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    return {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "entities": entity_types,
+        "connected": ads_hub is not None,
+        "capture_active": ads_hub.capture_active if ads_hub else False,
+        "notification_budget": ads_hub.notification_budget if ads_hub else None,
+        "polled_symbols": ads_hub.polled_symbols if ads_hub else None,
+        "ams_ports": ads_hub.ams_ports if ads_hub else None,
+        "plc_state": ads_hub.plc_state if ads_hub else None,
+        "unavailable_symbols": ads_hub.unavailable_symbols if ads_hub else None,
+        "value_cache_max_age": ads_hub.value_cache.max_age if ads_hub else None,
+        "metrics": ads_hub.metrics_snapshot() if ads_hub else None,
+    }
@@ -0,0 +1,103 @@
+"""Priority lanes for moving entity state writes onto the event loop.
+
+Notifications arrive on the pyads callback thread and every state write
+has to hop to the Home Assistant event loop. ``StateDispatcher`` does this
+in two lanes:
+
+* **high** (switches, lights, covers, binary sensors, ...): every update is
+  scheduled on the loop immediately, so control feedback never waits
+  behind telemetry.
+* **low** (sensors): updates are coalesced per entity and written in one
+  batch at most every ``low_priority_interval`` seconds. An entity that
+  changes ten times within the interval is written once, with its latest
+  value.
+
+The low lane costs one loop wakeup per interval no matter how chatty the
+sensors are, which keeps the loop free for the high lane when telemetry
+spikes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from homeassistant.core import callback
+
+if TYPE_CHECKING:
+    from .entity import AdsEntity
+    from .metrics import HubMetrics
+
+PRIORITY_HIGH = "high"
+PRIORITY_LOW = "low"
+
+DEFAULT_LOW_PRIORITY_INTERVAL = 0.25
+
+
+class StateDispatcher:
+    """Schedule entity state writes from the notification thread."""
+
+    def __init__(
+        self,
+        metrics: HubMetrics,
+        low_priority_interval: float = DEFAULT_LOW_PRIORITY_INTERVAL,
+    ) -> None:
+        """Initialize with empty queues."""
+        self.metrics = metrics
+        self.low_priority_interval = low_priority_interval
+        self._lock = threading.Lock()
+        # entity -> (first queued perf_counter, latest plc_time)
+        self._pending: dict[AdsEntity, tuple[float, float | None]] = {}
+        self._flush_scheduled = False
+
+    @property
+    def low_priority_queue(self) -> int:
+        """Return the number of entities waiting for the next batch."""
+        return len(self._pending)
+
+    def dispatch(
+        self,
+        entity: AdsEntity,
+        loop: asyncio.AbstractEventLoop,
+        priority: str,
+        plc_time: float | None = None,
+    ) -> None:
+        """Schedule ``entity._async_write_notified_state`` on ``loop``."""
+        queued = time.perf_counter()
+        if priority != PRIORITY_LOW:
+            self.metrics.high_priority_dispatches += 1
+            loop.call_soon_threadsafe(
+                entity._async_write_notified_state, queued, plc_time  # noqa: SLF001
+            )
+            return
+
+        with self._lock:
+            previous = self._pending.get(entity)
+            if previous is not None:
+                # Keep the oldest queue time so the latency covers the wait
+                queued = previous[0]
+                self.metrics.coalesced_updates += 1
+            self._pending[entity] = (queued, plc_time)
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        loop.call_soon_threadsafe(
+            loop.call_later, self.low_priority_interval, self._async_flush
+        )
+
+    def discard(self, entity: AdsEntity) -> None:
+        """Drop a pending low-priority write, e.g. when the entity is removed."""
+        with self._lock:
+            self._pending.pop(entity, None)
+
+    @callback
+    def _async_flush(self) -> None:
+        """Write all coalesced low-priority states."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._flush_scheduled = False
+        self.metrics.low_priority_batches += 1
+        for entity, (queued, plc_time) in pending.items():
+            entity._async_write_notified_state(queued, plc_time)  # noqa: SLF001
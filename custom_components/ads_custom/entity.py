@@ -5,15 +5,23 @@ from __future__ import annotations
 import asyncio
 from asyncio import timeout
 import logging
+import time
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity import Entity, EntityCategory
-from homeassistant.util import slugify
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util, slugify
 
-from .const import DOMAIN, STATE_KEY_STATE
+from .const import (
+    ATTR_PLC_TIMESTAMP,
+    DOMAIN,
+    EVENT_COMMAND_NOT_CONFIRMED,
+    STATE_KEY_STATE,
+)
 from .device_registry_compat import async_get_device_by_identifier
+from .dispatch import PRIORITY_HIGH, PRIORITY_LOW
 from .hub import AdsHub
 
 _LOGGER = logging.getLogger(__name__)
@@ -44,6 +52,8 @@ class AdsEntity(Entity):
     """Representation of ADS entity."""
 
     _attr_should_poll = False
+    # Dispatch lane of state writes (see dispatch.StateDispatcher)
+    _ads_priority = PRIORITY_HIGH
 
     def __init__(
         self,
@@ -64,6 +74,15 @@ class AdsEntity(Entity):
         self._ads_hub = ads_hub
         self._ads_var = ads_var
         self._event = None  # type: asyncio.Event | None
+        # Tokens of this entity's hub subscriptions, released on removal
+        self._notification_tokens = []
+        # Subscribed variables the PLC currently cannot deliver
+        self._unavailable_vars = set()
+        # Last state notified by the PLC, and the commanded state shown
+        # until the PLC confirms it (see async_write_state)
+        self._notified_state = None
+        self._optimistic_value = None
+        self._optimistic_cancel = None
         if unique_id is not None:
             self._attr_unique_id = unique_id
         self._attr_name = name
@@ -103,7 +122,7 @@ class AdsEntity(Entity):
     ) -> None:
         """Register device notification."""
 
-        def update(name, value):
+        def update(name, value, plc_time=None):
             """Handle device notifications."""
             _LOGGER.debug("Variable %s changed its value to %d", name, value)
 
@@ -111,9 +130,12 @@ class AdsEntity(Entity):
                 self._state_dict[state_key] = value
             else:
                 self._state_dict[state_key] = value / factor
+            if state_key == STATE_KEY_STATE:
+                self._notified_state = self._state_dict[state_key]
 
-            asyncio.run_coroutine_threadsafe(async_event_set(), self.hass.loop)
-            self.schedule_update_ha_state()
+            if not self._event.is_set():
+                asyncio.run_coroutine_threadsafe(async_event_set(), self.hass.loop)
+            self.schedule_notified_state_write(plc_time)
 
         async def async_event_set():
             """Set event in async context."""
@@ -121,19 +143,199 @@ class AdsEntity(Entity):
 
         self._event = asyncio.Event()
 
-        await self.hass.async_add_executor_job(
-            self._ads_hub.add_device_notification, ads_var, plctype, update
-        )
+        if not await self.async_subscribe(ads_var, plctype, update):
+            return
         try:
             async with timeout(10):
                 await self._event.wait()
         except TimeoutError:
             _LOGGER.debug("Variable %s: Timeout during first update", ads_var)
 
+    async def async_subscribe(self, ads_var: str, plctype: type, update) -> bool:
+        """Subscribe ``update(name, value, plc_time)`` to a PLC variable.
+
+        The subscription is released in ``async_will_remove_from_hass``.
+        Entities disabled in the registry are not subscribed. The entity is
+        unavailable while the PLC cannot deliver the variable. Returns True
+        if the subscription was added and the variable is available.
+        """
+        if self.registry_entry is not None and self.registry_entry.disabled:
+            return False
+        token = await self._ads_hub.executor.async_run(
+            self._ads_hub.add_device_notification,
+            ads_var,
+            plctype,
+            update,
+            True,
+            self._availability_changed,
+        )
+        if token is None:
+            return False
+        self._notification_tokens.append(token)
+        return ads_var not in self._unavailable_vars
+
+    def _availability_changed(self, ads_var: str, available: bool) -> None:
+        """Track a variable the PLC stopped or resumed delivering.
+
+        Called from the hub's notification and monitor threads.
+        """
+        if available:
+            self._unavailable_vars.discard(ads_var)
+        else:
+            self._unavailable_vars.add(ads_var)
+        self.schedule_notified_state_write()
+
+    async def async_write_state(self, value, plctype: type, *writes) -> bool:
+        """Command a new state by writing the entity's variable.
+
+        Further ``(ads_var, value, plctype)`` writes are queued with it and
+        go out in the same sum write. If the hub has an
+        ``optimistic_timeout``, the state shows ``value`` right away and is
+        rolled back, with an ``ads_custom_command_not_confirmed`` event, if
+        the PLC does not notify it within that many seconds or the write
+        fails. Returns True if the PLC accepted the write.
+        """
+        hub = self._ads_hub
+        self._async_set_optimistic(value)
+        results = await asyncio.gather(
+            hub.async_write_by_name(self._ads_var, value, plctype),
+            *(hub.async_write_by_name(*write) for write in writes),
+        )
+        if not results[0]:
+            self._async_end_optimistic(confirmed=False, reason="write_failed")
+        return results[0]
+
+    @callback
+    def _async_set_optimistic(self, value) -> None:
+        """Show a commanded state until the PLC confirms it."""
+        timeout_seconds = self._ads_hub.optimistic_timeout
+        if not timeout_seconds:
+            return
+        if self._optimistic_cancel is not None:
+            self._optimistic_cancel()
+            self._optimistic_cancel = None
+        if value == self._state_dict.get(STATE_KEY_STATE) == self._notified_state:
+            # Already confirmed; the PLC will not notify an unchanged value
+            return
+        self._state_dict[STATE_KEY_STATE] = value
+        if value != self._notified_state:
+            self._optimistic_value = value
+            self._optimistic_cancel = async_call_later(
+                self.hass, timeout_seconds, self._async_optimistic_expired
+            )
+        self.async_write_ha_state()
+
+    @callback
+    def _async_optimistic_expired(self, _now) -> None:
+        """Roll back a commanded state the PLC did not confirm in time."""
+        self._optimistic_cancel = None
+        self._async_roll_back("timeout")
+
+    @callback
+    def _async_end_optimistic(self, confirmed: bool, reason: str = "timeout") -> None:
+        """Stop waiting for confirmation, rolling back unless ``confirmed``."""
+        if self._optimistic_cancel is None:
+            return
+        self._optimistic_cancel()
+        self._optimistic_cancel = None
+        if not confirmed:
+            self._async_roll_back(reason)
+
+    @callback
+    def _async_roll_back(self, reason: str) -> None:
+        """Show the last notified state again and report the failed command."""
+        self._ads_hub.metrics.optimistic_rollbacks += 1
+        _LOGGER.warning(
+            "%s: PLC did not confirm %s = %s (%s), showing the PLC state again",
+            self.entity_id,
+            self._ads_var,
+            self._optimistic_value,
+            reason,
+        )
+        self._state_dict[STATE_KEY_STATE] = self._notified_state
+        self.hass.bus.async_fire(
+            EVENT_COMMAND_NOT_CONFIRMED,
+            {
+                "entity_id": self.entity_id,
+                "ads_var": self._ads_var,
+                "value": self._optimistic_value,
+                "reason": reason,
+            },
+        )
+        self.async_write_ha_state()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Release the hub subscriptions of this entity."""
+        if self._optimistic_cancel is not None:
+            self._optimistic_cancel()
+            self._optimistic_cancel = None
+        self._ads_hub.dispatcher.discard(self)
+        tokens, self._notification_tokens = self._notification_tokens, []
+        if tokens:
+            await self._ads_hub.executor.async_run(self._remove_notifications, tokens)
+
+    def _remove_notifications(self, tokens: list) -> None:
+        """Remove subscriptions (runs in the executor)."""
+        for token in tokens:
+            self._ads_hub.remove_device_notification(token)
+
+    def schedule_notified_state_write(self, plc_time: float | None = None) -> None:
+        """Schedule a state write from the ADS notification thread.
+
+        Equivalent to ``schedule_update_ha_state()``, but goes through the
+        hub's dispatcher: high-priority entities are written right away,
+        low-priority ones are coalesced into batches. ``plc_time`` is the PLC
+        timestamp of the notification, used for the end-to-end latency and
+        the optional ``plc_timestamp`` attribute.
+        """
+        self._ads_hub.dispatcher.dispatch(
+            self, self.hass.loop, self._ads_priority, plc_time
+        )
+
+    @callback
+    def _async_write_notified_state(
+        self, queued: float, plc_time: float | None = None
+    ) -> None:
+        """Write the state scheduled by ``schedule_notified_state_write``."""
+        metrics = self._ads_hub.metrics
+        if (
+            self._optimistic_cancel is not None
+            and self._notified_state == self._optimistic_value
+        ):
+            self._async_end_optimistic(confirmed=True)
+        if self._ads_priority == PRIORITY_LOW:
+            metrics.low_priority_dispatch_latency.add(time.perf_counter() - queued)
+        else:
+            metrics.dispatch_latency.add(time.perf_counter() - queued)
+        self._update_plc_timestamp(plc_time)
+        self.async_write_ha_state()
+        if plc_time is not None:
+            metrics.end_to_end_latency.add(time.time() - plc_time)
+
+    def _update_plc_timestamp(self, plc_time: float | None) -> None:
+        """Set or drop the ``plc_timestamp`` attribute, keeping the others."""
+        attributes = getattr(self, "_attr_extra_state_attributes", None) or {}
+        if not self._ads_hub.plc_timestamp_attribute:
+            if ATTR_PLC_TIMESTAMP in attributes:
+                self._attr_extra_state_attributes = {
+                    key: value
+                    for key, value in attributes.items()
+                    if key != ATTR_PLC_TIMESTAMP
+                }
+            return
+        if plc_time is not None:
+            self._attr_extra_state_attributes = {
+                **attributes,
+                ATTR_PLC_TIMESTAMP: dt_util.utc_from_timestamp(plc_time).isoformat(),
+            }
+
     @property
     def available(self) -> bool:
-        """Return False if state has not been updated yet."""
-        return self._state_dict[STATE_KEY_STATE] is not None
+        """Return False if state has not been updated yet or a variable is lost."""
+        return (
+            not self._unavailable_vars
+            and self._state_dict[STATE_KEY_STATE] is not None
+        )
 
 
 def resolve_device_name(
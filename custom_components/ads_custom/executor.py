@@ -0,0 +1,62 @@
+"""Per-hub executor for blocking ADS calls.
+
+A pyads connection serialises every call behind the hub lock, so running
+hub calls on Home Assistant's shared executor only occupies threads other
+integrations need (and lets their jobs delay ours). ``HubExecutor`` gives
+each hub a single worker thread of its own, matching the one call the
+connection can make at a time, and records how long jobs wait for it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+import time
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    from .metrics import HubMetrics
+
+_T = TypeVar("_T")
+
+
+class HubExecutor:
+    """Run blocking hub calls on one dedicated worker thread."""
+
+    def __init__(self, metrics: HubMetrics, name: str = "ads_custom_io") -> None:
+        """Initialize the executor; the thread starts with the first job."""
+        self.metrics = metrics
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of submitted jobs that have not finished."""
+        metrics = self.metrics
+        return metrics.io_submitted - metrics.io_completed
+
+    async def async_run(self, func: Callable[..., _T], *args: Any) -> _T:
+        """Run ``func(*args)`` on the worker thread and return its result."""
+        metrics = self.metrics
+        # io_submitted is only written on the event loop and io_completed
+        # only on the worker, so the queue depth needs no lock
+        metrics.io_submitted += 1
+        depth = self.queue_depth
+        if depth > metrics.io_queue_peak:
+            metrics.io_queue_peak = depth
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._run, time.perf_counter(), func, args
+        )
+
+    def _run(self, queued: float, func: Callable[..., _T], args: tuple) -> _T:
+        """Call ``func`` on the worker, recording the queue wait."""
+        metrics = self.metrics
+        metrics.io_wait.add(time.perf_counter() - queued)
+        try:
+            return func(*args)
+        finally:
+            metrics.io_completed += 1
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs; queued jobs still run."""
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,177 @@
+"""Per-subscription health of an ADS hub.
+
+A notification handle can stop delivering while the connection itself is
+fine: an online change may remove or move the symbol, or the PLC may drop
+the handle. The hub then marks only the affected subscriptions unavailable
+and ``SubscriptionMonitor`` resubscribes them on a background thread:
+
+* a subscription whose symbol cannot be found, or whose handle was
+  invalidated, is retried after ``RESUBSCRIBE_MIN_DELAY`` seconds, doubling
+  with every failed attempt up to ``RESUBSCRIBE_MAX_DELAY``;
+* every ``silence_timeout`` seconds the handles that have been silent for
+  that long are verified with one sum read (``AdsHub.check_silent_
+  subscriptions``). Notifications are sent on change, so silence alone is
+  not an error;
+* when the PLC's symbol version changes (an online change or download),
+  the subscribed symbols are looked up again in bulk and only those whose
+  layout changed get new handles (``AdsHub._refresh_symbols``);
+* when the PLC returns to RUN, the subscribed values are read in bulk and
+  reported before the subscriptions become available again
+  (``AdsHub._resume``).
+
+The connection and all other subscriptions are left alone.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+RESUBSCRIBE_MIN_DELAY = 5.0
+RESUBSCRIBE_MAX_DELAY = 300.0
+DEFAULT_SILENCE_TIMEOUT = 300.0
+
+
+def resubscribe_delay(attempts):
+    """Return the seconds to wait after ``attempts`` failed resubscriptions."""
+    return min(RESUBSCRIBE_MIN_DELAY * 2**attempts, RESUBSCRIBE_MAX_DELAY)
+
+
+class SubscriptionMonitor(threading.Thread):
+    """Resubscribe unavailable subscriptions and verify silent handles.
+
+    :param hub: the ``AdsHub`` whose subscriptions are monitored; it opens
+        the handles (``hub._resubscribe``) and reads the silent symbols
+    """
+
+    def __init__(self, hub):
+        """Initialize the monitor; it is started on the first ``schedule``."""
+        super().__init__(name="ads_custom monitor", daemon=True)
+        self._hub = hub
+        self._lock = threading.Lock()
+        # subscription key -> (failed attempts, time.monotonic() of the next)
+        self._retries = {}
+        # AMS ports (None for the hub's own) whose symbols changed online,
+        # and whether new handles need their symbol layout looked up
+        self._refresh_ports = set()
+        self._layouts_requested = False
+        # Whether the PLC returned to RUN and the values need refreshing
+        self._values_requested = False
+        self._next_check = None
+        self._wakeup = threading.Event()
+        self._stopped = False
+
+    @property
+    def pending(self):
+        """Return the number of subscriptions waiting to be resubscribed."""
+        with self._lock:
+            return len(self._retries)
+
+    def schedule(self, key):
+        """Resubscribe ``key`` with backoff until it succeeds or is discarded."""
+        with self._lock:
+            if key in self._retries:
+                return
+            self._retries[key] = (0, time.monotonic() + resubscribe_delay(0))
+            self._start()
+        self._wakeup.set()
+
+    def discard(self, key):
+        """Stop resubscribing ``key``, e.g. when its last subscriber left."""
+        with self._lock:
+            self._retries.pop(key, None)
+
+    def request_refresh(self, port):
+        """Re-resolve the subscriptions of ``port`` after an online change."""
+        with self._lock:
+            self._refresh_ports.add(port)
+            self._start()
+        self._wakeup.set()
+
+    def request_layouts(self):
+        """Look up the symbol layouts of new handles."""
+        with self._lock:
+            self._layouts_requested = True
+            self._start()
+        self._wakeup.set()
+
+    def request_values(self):
+        """Refresh the subscribed values after the PLC returned to RUN."""
+        with self._lock:
+            self._values_requested = True
+            self._start()
+        self._wakeup.set()
+
+    def watch(self):
+        """Start the thread so silent handles are checked."""
+        with self._lock:
+            self._start()
+
+    def _start(self):
+        """Start the thread once (monitor lock held)."""
+        if not self.is_alive() and not self._stopped:
+            self.start()
+
+    def stop(self):
+        """Stop the monitor thread."""
+        self._stopped = True
+        self._wakeup.set()
+        if self.is_alive():
+            self.join()
+
+    def run(self):
+        """Run due work until stopped."""
+        while not self._stopped:
+            timeout = self.run_due()
+            self._wakeup.wait(timeout)
+            self._wakeup.clear()
+
+    def run_due(self):
+        """Retry and check what is due; returns seconds until the next task."""
+        with self._lock:
+            ports, self._refresh_ports = self._refresh_ports, set()
+            layouts, self._layouts_requested = self._layouts_requested, False
+            values, self._values_requested = self._values_requested, False
+        # Re-resolve first: new handles without a layout count as moved
+        for port in ports:
+            self._hub._refresh_symbols(port)  # noqa: SLF001
+        if layouts:
+            self._hub._record_layouts()  # noqa: SLF001
+        if values:
+            self._hub._resume()  # noqa: SLF001
+
+        now = time.monotonic()
+        with self._lock:
+            due = [key for key, (_, when) in self._retries.items() if when <= now]
+        for key in due:
+            resubscribed = self._hub._resubscribe(key)  # noqa: SLF001
+            with self._lock:
+                entry = self._retries.get(key)
+                if entry is None:
+                    continue
+                if resubscribed:
+                    del self._retries[key]
+                else:
+                    attempts = entry[0] + 1
+                    self._retries[key] = (
+                        attempts,
+                        time.monotonic() + resubscribe_delay(attempts),
+                    )
+
+        silence_timeout = self._hub.silence_timeout
+        if silence_timeout:
+            if self._next_check is None:
+                self._next_check = now + silence_timeout
+            elif self._next_check <= now:
+                self._hub.check_silent_subscriptions(silence_timeout)
+                self._next_check = time.monotonic() + silence_timeout
+        else:
+            self._next_check = None
+
+        with self._lock:
+            times = [when for _, when in self._retries.values()]
+        if self._next_check is not None:
+            times.append(self._next_check)
+        if not times:
+            return None
+        return max(min(times) - time.monotonic(), 0)
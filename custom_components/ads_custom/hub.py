@@ -1,101 +1,1435 @@
 """Support for Automation Device Specification (ADS)."""
 
+import asyncio
 from collections import namedtuple
 import ctypes
+from functools import partial
 import logging
 import struct
 import threading
+import time
 
 import pyads
+from pyads.constants import (
+    ADSIGRP_DEVICE_DATA,
+    ADSIGRP_SYM_INFOBYNAMEEX,
+    ADSIGRP_SYM_VERSION,
+    ADSIOFFS_DEVDATA_ADSSTATE,
+    ADSSTATE_RUN,
+)
+from pyads.errorcodes import ERROR_CODES
+
+from .cache import ValueCache
+from .capture import (
+    DEFAULT_CAPTURE_BACKUP_COUNT,
+    DEFAULT_CAPTURE_MAX_BYTES,
+    NotificationRecorder,
+)
+from .dispatch import StateDispatcher
+from .executor import HubExecutor
+from .health import DEFAULT_SILENCE_TIMEOUT, SubscriptionMonitor
+from .metrics import HubMetrics
+from .polling import DEFAULT_POLL_INTERVAL, PollScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
-# Tuple to hold data needed for notification
-NotificationItem = namedtuple(  # noqa: PYI024
-    "NotificationItem", "hnotify huser name plc_datatype callback"
+# A callback registered through add_device_notification. The instance is
+# also the token passed to remove_device_notification.
+NotificationSubscriber = namedtuple(  # noqa: PYI024
+    "NotificationSubscriber",
+    "callback timestamped availability_callback",
+    defaults=(None,),
 )
 
 
+# Decoders of notification payloads by PLC data type; strings and other
+# types are handled in the notification callback
+NOTIFICATION_STRUCTS = {
+    plc_datatype: struct.Struct(fmt)
+    for plc_datatype, fmt in (
+        (pyads.PLCTYPE_BOOL, "<?"),
+        (pyads.PLCTYPE_BYTE, "<B"),  # BYTE is unsigned (0-255)
+        (pyads.PLCTYPE_INT, "<h"),
+        (pyads.PLCTYPE_UINT, "<H"),
+        (pyads.PLCTYPE_SINT, "<b"),  # SINT is signed (-128 to 127)
+        (pyads.PLCTYPE_USINT, "<B"),
+        (pyads.PLCTYPE_DINT, "<i"),
+        (pyads.PLCTYPE_UDINT, "<I"),
+        (pyads.PLCTYPE_WORD, "<H"),
+        (pyads.PLCTYPE_DWORD, "<I"),
+        (pyads.PLCTYPE_LREAL, "<d"),
+        (pyads.PLCTYPE_REAL, "<f"),
+        (pyads.PLCTYPE_TOD, "<i"),  # Treat as DINT
+        (pyads.PLCTYPE_DATE, "<i"),  # Treat as DINT
+        (pyads.PLCTYPE_DT, "<i"),  # Treat as DINT
+        (pyads.PLCTYPE_TIME, "<i"),  # Treat as DINT
+    )
+}
+
+
+class NotificationItem:
+    """An ADS notification handle shared by all subscribers of a symbol."""
+
+    __slots__ = (
+        "attr",
+        "available",
+        "hnotify",
+        "huser",
+        "key",
+        "last_plc_time",
+        "last_update",
+        "last_value",
+        "layout",
+        "name",
+        "plc_datatype",
+        "port",
+        "subscribers",
+        "unpacker",
+    )
+
+    def __init__(self, hnotify, huser, name, plc_datatype, key, port=None, attr=None):
+        """Initialize the notification item without subscribers."""
+        # None while the subscription waits to be resubscribed
+        self.hnotify = hnotify
+        self.huser = huser
+        self.name = name
+        # AMS port of the handle, None for the hub's own client
+        self.port = port
+        self.plc_datatype = plc_datatype
+        # Precompiled decoder of the payload, None for strings and raw bytes
+        self.unpacker = NOTIFICATION_STRUCTS.get(plc_datatype)
+        self.key = key
+        self.attr = attr
+        # False while the PLC cannot deliver the symbol (see health.py)
+        self.available = True
+        # time.monotonic() of the last notification or confirming read
+        self.last_update = time.monotonic()
+        # (index group, index offset, size, ADS type) of the symbol, looked
+        # up to tell which symbols an online change moved
+        self.layout = None
+        # Replaced (never mutated) so the notification thread can iterate
+        # it without holding the hub lock.
+        self.subscribers = ()
+        self.last_value = None
+        self.last_plc_time = None
+
+    @property
+    def callback(self):
+        """Return the callback of the first subscriber."""
+        return self.subscribers[0].callback if self.subscribers else None
+
+# ADS error code of add_device_notification for a missing symbol
+ADSERR_DEVICE_SYMBOLNOTFOUND = 1808
+
+# ADS errors after which a symbol or its handle must be looked up again,
+# typically after an online change (symbol not found, symbol version
+# invalid, notification handle invalid, symbol not active)
+SYMBOL_ERROR_CODES = frozenset((ADSERR_DEVICE_SYMBOLNOTFOUND, 1809, 1812, 1826))
+SYMBOL_ERROR_TEXTS = frozenset(ERROR_CODES[code] for code in SYMBOL_ERROR_CODES)
+
+# Result of a successful write in pyads write_list_by_name
+SUM_WRITE_OK = "no error"
+
+# Texts pyads reports in place of a value a sum read could not read
+ADS_ERROR_TEXTS = frozenset(text for code, text in ERROR_CODES.items() if code)
+
+# ADS error code of a request the target did not answer in time
+ADSERR_CLIENT_SYNCTIMEOUT = 1861
+
+# Seconds shutdown spends deleting notification handles before it closes
+# the connection, which drops the remaining ones
+DEFAULT_SHUTDOWN_TIMEOUT = 5.0
+
+# ADS device states as shown by the PLC state sensor
+ADS_STATE_NAMES = {
+    0: "invalid",
+    1: "idle",
+    2: "reset",
+    3: "init",
+    4: "start",
+    ADSSTATE_RUN: "run",
+    6: "stop",
+    7: "savecfg",
+    8: "loadcfg",
+    9: "powerfailure",
+    10: "powergood",
+    11: "error",
+    12: "shutdown",
+    13: "suspend",
+    14: "resume",
+    15: "config",
+    16: "reconfig",
+}
+
+# Seconds between 1601-01-01 (FILETIME epoch) and 1970-01-01
+FILETIME_EPOCH_OFFSET = 11644473600
+
+
+def split_port(name):
+    """Split a ``port:symbol`` address into (AMS port or None, symbol).
+
+    ``852:MAIN.counter`` addresses ``MAIN.counter`` in the PLC runtime on
+    AMS port 852; a name without a port prefix is returned unchanged.
+    """
+    port, sep, symbol = name.partition(":")
+    if sep and port.isdigit():
+        return int(port), symbol
+    return None, name
+
+
+def filetime_to_timestamp(filetime):
+    """Convert a Windows FILETIME (100 ns ticks since 1601) to a POSIX timestamp."""
+    return filetime / 10_000_000 - FILETIME_EPOCH_OFFSET
+
+
 class AdsHub:
     """Representation of an ADS connection."""
 
-    def __init__(self, ads_client):
-        """Initialize the ADS hub."""
+    def __init__(self, ads_client, client_factory=None):
+        """Initialize the ADS hub.
+
+        Symbols may be addressed as ``port:symbol`` to reach another AMS
+        port (PLC runtime) of the same target. The client for such a port
+        is created with ``client_factory(port)`` and opened on first use.
+        """
         self._client = ads_client
         self._client.open()
+        self._default_port = getattr(ads_client, "ams_port", None)
+        self._client_factory = client_factory
+        # AMS port -> open client of a further port
+        self._port_clients = {}
 
         # All ADS devices are registered here
         self._devices = []
+        # (AMS port or None, notification handle) -> NotificationItem
         self._notification_items = {}
+        # (name, plc_datatype, transmission settings) -> NotificationItem
+        self._subscriptions = {}
+        # id(NotificationSubscriber) -> NotificationItem; subscribers are kept
+        # alive by their item, so the ids stay unique while registered
+        self._subscriber_items = {}
         self._lock = threading.Lock()
+        self._recorder = None
+        self.metrics = HubMetrics()
+        # Moves entity state writes to the event loop in priority lanes
+        self.dispatcher = StateDispatcher(self.metrics)
+        # Runs the blocking calls of this hub off Home Assistant's executor
+        self.executor = HubExecutor(self.metrics)
+        # Last known value per symbol, serving reads without a round trip
+        self.value_cache = ValueCache(self.metrics)
+        # Expose the PLC timestamp of the last notification as an attribute
+        self.plc_timestamp_attribute = False
+        # Maximum number of ADS notification handles (0 = unlimited) and
+        # an optional callback(rejected, limit) called when it is exceeded
+        self.notification_budget = 0
+        self.budget_exceeded_callback = None
+        # Seconds between reads of symbols polled because no notification
+        # handle was available (0 = no polling fallback)
+        self.poll_fallback_interval = DEFAULT_POLL_INTERVAL
+        self._poller = PollScheduler(self)
+        # Seconds a handle may stay silent before its symbol is read to
+        # verify it (0 = never), and the thread resubscribing lost symbols
+        self.silence_timeout = DEFAULT_SILENCE_TIMEOUT
+        self._monitor = SubscriptionMonitor(self)
+        # AMS port or None -> handle of the PLC's symbol version, once
+        # watch_symbol_version was called
+        self._watch_versions = False
+        self._version_items = {}
+        # ADS state of the PLC (None until known, see watch_ads_state) and
+        # the handle reporting it
+        self.ads_state = None
+        self._state_item = None
+        # Writes queued by async_write_by_name as (name, value, plc_datatype,
+        # future), and the task sending them
+        self._write_queue = []
+        self._writer = None
+        # The batch being written, and whether writes of values a live
+        # notification already reports are skipped
+        self._writing = []
+        self.suppress_redundant_writes = False
+        # Seconds entities show a commanded state before the PLC confirms it
+        # (0 = wait for the notification)
+        self.optimistic_timeout = 0
+        # While the hub is being unloaded, handles released by entities are
+        # kept here and deleted together by shutdown
+        self._closing = False
+        self._released_items = []
+        # Set by shutdown, so a late stop event does not shut down twice
+        self.is_shut_down = False
+
+    def prepare_shutdown(self):
+        """Defer deleting released notification handles until shutdown.
+
+        Called before the entities are removed on unload, so their handles
+        are deleted in one bulk request instead of one by one.
+        """
+        self._closing = True
+
+    def cancel_shutdown(self):
+        """Delete the handles released since ``prepare_shutdown``."""
+        with self._lock:
+            self._closing = False
+            items, self._released_items = self._released_items, []
+            self._delete_notifications(items)
 
-    def shutdown(self, *args, **kwargs):
-        """Shutdown ADS connection."""
+    def shutdown(self, *args, timeout=DEFAULT_SHUTDOWN_TIMEOUT, **kwargs):
+        """Shutdown ADS connection.
+
+        All notification handles are deleted in one bulk request if the
+        client supports it, else one by one for at most ``timeout``
+        seconds. Closing the connection drops any handles left over, so
+        an unresponsive PLC cannot hold up Home Assistant.
+        """
 
         _LOGGER.debug("Shutting down ADS")
-        for notification_item in self._notification_items.values():
-            _LOGGER.debug(
-                "Deleting device notification %d, %d",
-                notification_item.hnotify,
-                notification_item.huser,
-            )
+        self.is_shut_down = True
+        self.stop_capture()
+        self._poller.stop()
+        self._monitor.stop()
+        with self._lock:
+            items = [
+                *self._notification_items.values(),
+                *self._released_items,
+                *self._version_items.values(),
+            ]
+            if self._state_item is not None:
+                items.append(self._state_item)
+            self._notification_items = {}
+            self._version_items = {}
+            self._state_item = None
+            self._subscriptions = {}
+            self._subscriber_items = {}
+            self._released_items = []
+            self._delete_notifications(items, time.monotonic() + timeout)
+            port_clients, self._port_clients = self._port_clients, {}
+        self.value_cache.clear()
+        # Further ports share the connection of the hub's client, so close
+        # them first
+        for port, client in port_clients.items():
             try:
-                self._client.del_device_notification(
-                    notification_item.hnotify, notification_item.huser
-                )
+                client.close()
             except pyads.ADSError as err:
-                _LOGGER.error(err)
+                self.metrics.ads_errors += 1
+                _LOGGER.error("Error closing AMS port %d: %s", port, err)
         try:
             self._client.close()
         except pyads.ADSError as err:
+            self.metrics.ads_errors += 1
             _LOGGER.error(err)
 
+    def _delete_notifications(self, items, deadline=None):
+        """Delete the ADS handles of ``items`` (hub lock held)."""
+        by_port = {}
+        for item in items:
+            by_port.setdefault(item.port, []).append(item)
+        for port, port_items in by_port.items():
+            client = self._client if port is None else self._port_clients.get(port)
+            if client is None:
+                continue
+            if not self._delete_port_notifications(client, port_items, deadline):
+                return
+
+    def _delete_port_notifications(self, client, items, deadline):
+        """Delete handles of one client; False if the PLC stopped responding."""
+        bulk = getattr(client, "del_device_notifications", None)
+        if bulk is not None:
+            try:
+                errors = bulk([(item.hnotify, item.huser) for item in items])
+            except pyads.ADSError as err:
+                self.metrics.ads_errors += 1
+                _LOGGER.warning(
+                    "Error deleting %d device notifications: %s", len(items), err
+                )
+                return True
+            failed = sum(1 for error in errors if error)
+            self.metrics.ads_errors += failed
+            _LOGGER.debug(
+                "Deleted %d device notifications (%d failed)", len(items), failed
+            )
+            return True
+
+        # pyads has no bulk delete; it keeps a callback per handle that
+        # only its own del_device_notification releases
+        for index, item in enumerate(items):
+            if deadline is not None and time.monotonic() > deadline:
+                _LOGGER.warning(
+                    "Timed out deleting device notifications; closing the "
+                    "connection drops the remaining %d",
+                    len(items) - index,
+                )
+                return False
+            try:
+                client.del_device_notification(item.hnotify, item.huser)
+            except pyads.ADSError as err:
+                self.metrics.ads_errors += 1
+                if getattr(err, "err_code", None) == ADSERR_CLIENT_SYNCTIMEOUT:
+                    _LOGGER.warning(
+                        "PLC is not responding; closing the connection drops "
+                        "the remaining %d device notifications",
+                        len(items) - index,
+                    )
+                    return False
+                _LOGGER.error(
+                    "Error deleting device notification for %s: %s", item.name, err
+                )
+        return True
+
+    def _route(self, name):
+        """Return the client and symbol name of a ``port:symbol`` address.
+
+        Must be called with the hub lock held. The client of a further AMS
+        port is opened on first use; raises ``ADSError`` if it cannot be.
+        """
+        port, symbol = split_port(name)
+        if port is None or port == self._default_port:
+            return self._client, symbol
+        client = self._port_clients.get(port)
+        if client is None:
+            if self._client_factory is None:
+                raise pyads.ADSError(text=f"AMS port {port} is not available")
+            client = self._client_factory(port)
+            client.open()
+            self._port_clients[port] = client
+            _LOGGER.debug("Opened AMS port %d", port)
+            if self._watch_versions:
+                self._add_version_notification(port, client)
+        return client, symbol
+
+    def _port_of(self, name):
+        """Return the AMS port of ``name``, None for the hub's own client."""
+        port = split_port(name)[0]
+        return None if port == self._default_port else port
+
+    @property
+    def ams_ports(self):
+        """Return the further AMS ports the hub has opened."""
+        return sorted(self._port_clients)
+
+    @property
+    def capture_active(self):
+        """Return True while notifications are being captured."""
+        return self._recorder is not None
+
+    def start_capture(
+        self,
+        path,
+        max_bytes=DEFAULT_CAPTURE_MAX_BYTES,
+        backup_count=DEFAULT_CAPTURE_BACKUP_COUNT,
+    ):
+        """Start writing every raw notification to a rotating capture file."""
+        recorder = NotificationRecorder(path, max_bytes, backup_count)
+        previous, self._recorder = self._recorder, recorder
+        if previous is not None:
+            previous.close()
+        _LOGGER.info("Capturing ADS notifications to %s", path)
+
+    def stop_capture(self):
+        """Stop capturing notifications; returns the number of records."""
+        recorder, self._recorder = self._recorder, None
+        if recorder is None:
+            return 0
+        recorder.close()
+        _LOGGER.info(
+            "Stopped ADS capture to %s (%d notifications)",
+            recorder.path,
+            recorder.records,
+        )
+        return recorder.records
+
+    def metrics_snapshot(self):
+        """Return the hub metrics as a JSON-serialisable dict."""
+        snapshot = self.metrics.snapshot(
+            self.active_notifications,
+            self.dispatcher.low_priority_queue,
+            len(self.value_cache),
+        )
+        snapshot["plc_state"] = self.plc_state
+        return snapshot
+
+    @property
+    def plc_state(self):
+        """Return the name of the PLC's ADS state, None while unknown."""
+        return ADS_STATE_NAMES.get(self.ads_state)
+
+    @property
+    def plc_running(self):
+        """Return False while the PLC is known not to be in RUN."""
+        return self.ads_state in (None, ADSSTATE_RUN)
+
+    @property
+    def active_notifications(self):
+        """Return the number of registered device notifications."""
+        return len(self._notification_items)
+
+    @property
+    def unavailable_symbols(self):
+        """Return the subscribed symbols the PLC currently cannot deliver."""
+        with self._lock:
+            return sorted(
+                {item.name for item in self._subscriptions.values() if not item.available}
+            )
+
     def register_device(self, device):
         """Register a new device."""
         self._devices.append(device)
 
     def write_by_name(self, name, value, plc_datatype):
-        """Write a value to the device."""
+        """Write a value to the device; skipped while the PLC is not in RUN."""
 
+        if self._writes_suspended():
+            return None
+        metrics = self.metrics
+        start = time.perf_counter()
         with self._lock:
             try:
-                return self._client.write_by_name(name, value, plc_datatype)
+                client, symbol = self._route(name)
+                return client.write_by_name(symbol, value, plc_datatype)
             except pyads.ADSError as err:
+                metrics.ads_errors += 1
                 _LOGGER.error("Error writing %s: %s", name, err)
+            finally:
+                metrics.writes += 1
+                metrics.write_latency.add(time.perf_counter() - start)
+
+    async def async_write_by_name(self, name, value, plc_datatype):
+        """Write a value to the device from the event loop.
+
+        Writes are queued and sent on the hub executor. Everything queued
+        in the same event loop iteration, or while the previous batch is
+        being written, goes out together with one ADS sum write, so an
+        automation switching dozens of entities costs a single round trip.
+        Writes keep their order. Returns True if the PLC accepted the write.
+
+        With ``suppress_redundant_writes`` a write is skipped (and reported
+        as successful) if the symbol's notification already reports the
+        value and no other write to it is queued or in flight.
+
+        While the PLC is not in RUN the queue is suspended: writes are
+        rejected (False) without sending them.
+        """
+        if self._writes_suspended():
+            return False
+        if (
+            self.suppress_redundant_writes
+            and self.value_cache.is_current(name, plc_datatype, value)
+            and not self._write_pending(name)
+        ):
+            self.metrics.suppressed_writes += 1
+            return True
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._write_queue.append((name, value, plc_datatype, future))
+        if self._writer is None:
+            self._writer = loop.create_task(self._async_write_queued())
+        return await future
+
+    async def _async_write_queued(self):
+        """Send queued writes in batches until the queue is empty."""
+        try:
+            while self._write_queue:
+                batch, self._write_queue = self._write_queue, []
+                self._writing = batch
+                try:
+                    results = await self.executor.async_run(
+                        self.write_batch, [write[:3] for write in batch]
+                    )
+                except Exception as err:  # noqa: BLE001
+                    for *_write, future in batch:
+                        if not future.done():
+                            future.set_exception(err)
+                    continue
+                finally:
+                    self._writing = []
+                for (*_write, future), result in zip(batch, results, strict=True):
+                    if not future.done():
+                        future.set_result(result)
+        finally:
+            self._writer = None
+
+    def _writes_suspended(self, count=1):
+        """Return True (and count them) if ``count`` writes must be rejected."""
+        if self.plc_running:
+            return False
+        self.metrics.suspended_writes += count
+        _LOGGER.debug("Rejecting %d write(s): the PLC is in %s", count, self.plc_state)
+        return True
+
+    def _write_pending(self, name):
+        """Return True if a write to ``name`` is queued or in flight."""
+        return any(
+            write[0] == name for write in (*self._writing, *self._write_queue)
+        )
+
+    def write_batch(self, writes):
+        """Write ``(name, value, plc_datatype)`` tuples in order.
+
+        Consecutive writes go out as one ADS sum write; a symbol written
+        twice starts a new one, so the PLC sees every value. Returns a list
+        telling which writes succeeded; all fail while the PLC is not in
+        RUN.
+        """
+        if writes and self._writes_suspended(len(writes)):
+            return [False] * len(writes)
+        results = []
+        chunk = {}
+        types = []
+        for name, value, plc_datatype in writes:
+            if name in chunk:
+                results += self._write_chunk(chunk, types)
+                chunk, types = {}, []
+            chunk[name] = value
+            types.append(plc_datatype)
+        if chunk:
+            results += self._write_chunk(chunk, types)
+        cache = self.value_cache
+        for (name, value, plc_datatype), written in zip(writes, results, strict=True):
+            if written:
+                cache.update_if_live(name, plc_datatype, value)
+        return results
+
+    def _write_chunk(self, values, types):
+        """Write distinct symbols; one sum write per AMS port with several."""
+        by_port = {}
+        for (name, value), plc_datatype in zip(values.items(), types, strict=True):
+            by_port.setdefault(self._port_of(name), []).append(
+                (name, value, plc_datatype)
+            )
+        written = {}
+        for writes in by_port.values():
+            errors = None
+            if len(writes) > 1 and hasattr(self._client, "write_list_by_name"):
+                errors = self._sum_write({name: value for name, value, _ in writes})
+            for name, value, plc_datatype in writes:
+                if errors is not None:
+                    written[name] = errors.get(name, SUM_WRITE_OK) == SUM_WRITE_OK
+                else:
+                    written[name] = self._write_one(name, value, plc_datatype)
+        return [written[name] for name in values]
+
+    def _sum_write(self, values):
+        """Write several symbols of one AMS port with one ADS sum write.
+
+        Returns a dict of name to pyads result text, or None if the sum
+        write failed as a whole.
+        """
 
-    def read_by_name(self, name, plc_datatype):
-        """Read a value from the device."""
+        metrics = self.metrics
+        start = time.perf_counter()
+        # symbol -> name as addressed, e.g. "852:MAIN.x" -> "MAIN.x"
+        names = {split_port(name)[1]: name for name in values}
+        with self._lock:
+            try:
+                client, _symbol = self._route(next(iter(values)))
+                errors = client.write_list_by_name(
+                    {symbol: values[name] for symbol, name in names.items()}
+                )
+            except pyads.ADSError as err:
+                # Looking up the symbol info of one bad name fails the whole
+                # sum write; the caller then writes one by one
+                metrics.ads_errors += 1
+                _LOGGER.debug("Sum write of %d symbols failed: %s", len(values), err)
+                return None
+            metrics.writes += len(values)
+            metrics.sum_writes += 1
+            metrics.write_latency.add(time.perf_counter() - start)
+        errors = {names.get(symbol, symbol): error for symbol, error in errors.items()}
+        for name, error in errors.items():
+            if error != SUM_WRITE_OK:
+                metrics.ads_errors += 1
+                _LOGGER.error("Error writing %s: %s", name, error)
+        return errors
 
+    def _write_one(self, name, value, plc_datatype):
+        """Write a single value; returns True on success."""
+
+        metrics = self.metrics
+        start = time.perf_counter()
         with self._lock:
             try:
-                return self._client.read_by_name(name, plc_datatype)
+                client, symbol = self._route(name)
+                client.write_by_name(symbol, value, plc_datatype)
             except pyads.ADSError as err:
+                metrics.ads_errors += 1
+                _LOGGER.error("Error writing %s: %s", name, err)
+                return False
+            finally:
+                metrics.writes += 1
+                metrics.write_latency.add(time.perf_counter() - start)
+        return True
+
+    def read_by_name(self, name, plc_datatype, max_age=None, use_cache=True):
+        """Read a value from the device.
+
+        A fresh value from the hub's value cache is returned without a
+        round trip (see ``ValueCache.get``; ``max_age`` overrides the
+        cache's maximum age). With ``use_cache=False`` the PLC is always
+        read.
+        """
+
+        cache = self.value_cache
+        if use_cache:
+            value = cache.get(name, plc_datatype, max_age)
+            if value is not None:
+                return value
+        with self._lock:
+            try:
+                client, symbol = self._route(name)
+                value = client.read_by_name(symbol, plc_datatype)
+            except pyads.ADSError as err:
+                self.metrics.ads_errors += 1
                 _LOGGER.error("Error reading %s: %s", name, err)
+                return None
+        if value is not None:
+            cache.update(name, plc_datatype, value)
+        return value
+
+    def read_list_by_name(self, names):
+        """Read several values with ADS sum reads, one per AMS port.
+
+        Returns a dict of name to value, or None if a read failed. Values
+        of symbols the PLC could not read are pyads error strings.
+        """
+
+        by_port = {}
+        for name in names:
+            by_port.setdefault(self._port_of(name), []).append(name)
+        result = {}
+        with self._lock:
+            for port_names in by_port.values():
+                # symbol -> name as addressed
+                symbols = {split_port(name)[1]: name for name in port_names}
+                try:
+                    client, _symbol = self._route(port_names[0])
+                    values = client.read_list_by_name(list(symbols))
+                except pyads.ADSError as err:
+                    self.metrics.ads_errors += 1
+                    _LOGGER.debug("Error reading %d symbols: %s", len(names), err)
+                    return None
+                finally:
+                    self.metrics.sum_reads += 1
+                result.update(
+                    (symbols.get(symbol, symbol), value)
+                    for symbol, value in values.items()
+                )
+        return result
+
+    def read_values(self, names, max_age=None):
+        """Read several values for a one-off query, in one sum read.
+
+        Returns a dict of name to value, in the order of ``names``, with
+        None for symbols the PLC could not read. With ``max_age`` values
+        the value cache holds (live ones, or ones at most ``max_age``
+        seconds old) are returned without reading them.
+        """
+
+        values = {}
+        missing = names
+        if max_age is not None:
+            missing = []
+            for name in names:
+                value = self.value_cache.get(name, None, max_age)
+                if value is None:
+                    missing.append(name)
+                else:
+                    values[name] = value
+        if missing:
+            result = self.read_list_by_name(missing)
+            if result is None:
+                # A single unknown symbol fails the whole sum read, so find
+                # the readable ones one by one
+                result = {}
+                for name in missing:
+                    single = self.read_list_by_name([name])
+                    result[name] = None if single is None else single.get(name)
+            for name in missing:
+                value = result.get(name)
+                if isinstance(value, str) and value in ADS_ERROR_TEXTS:
+                    value = None
+                values[name] = value
+        return {name: values[name] for name in names}
+
+    def add_device_notification(
+        self,
+        name,
+        plc_datatype,
+        callback,
+        timestamped=False,
+        availability_callback=None,
+    ):
+        """Add a notification to the ADS devices.
 
-    def add_device_notification(self, name, plc_datatype, callback):
-        """Add a notification to the ADS devices."""
+        Subscriptions are shared: subscribing to a symbol that is already
+        subscribed with the same type and transmission settings adds the
+        callback to the existing ADS handle instead of creating a new one,
+        and replays the last received value to the new callback.
+
+        With ``timestamped`` the callback is called as
+        ``callback(name, value, plc_time)``, where ``plc_time`` is the PLC-side
+        POSIX timestamp of the sample (None if the PLC did not send one).
+
+        A new ADS handle is only created while fewer than
+        ``notification_budget`` handles are open; sharing an existing handle
+        is always allowed.
+
+        If no handle can be created (budget used up or refused by the PLC)
+        the symbol is polled every ``poll_fallback_interval`` seconds instead,
+        unless that is 0.
+
+        If the symbol does not exist, or its handle is invalidated later,
+        the subscription is kept and resubscribed with backoff (see
+        ``health.py``). ``availability_callback(name, available)`` is called
+        whenever the symbol becomes unavailable or available again, and
+        right away for a symbol that is unavailable already. All symbols
+        count as unavailable while the PLC is not in RUN.
+
+        Returns a token for ``remove_device_notification``, or None if the
+        subscription failed.
+        """
 
         attr = pyads.NotificationAttrib(ctypes.sizeof(plc_datatype))
+        key = (
+            name,
+            plc_datatype,
+            attr.length,
+            attr.trans_mode,
+            attr.max_delay,
+            attr.cycle_time,
+        )
+        subscriber = NotificationSubscriber(
+            callback, timestamped, availability_callback
+        )
 
+        with self._lock:
+            notification_item = self._subscriptions.get(key)
+            if notification_item is None:
+                try:
+                    notification_item = self._open_notification(
+                        name, plc_datatype, attr, key
+                    )
+                except pyads.ADSError:
+                    # Keep the subscription and look the symbol up again
+                    # later, e.g. after an online change adds it
+                    notification_item = NotificationItem(
+                        None, None, name, plc_datatype, key, self._port_of(name), attr
+                    )
+                    notification_item.available = False
+                    self._subscriptions[key] = notification_item
+                    self._monitor.schedule(key)
+                replay = False
+            else:
+                _LOGGER.debug(
+                    "Sharing device notification %d for variable %s",
+                    notification_item.hnotify,
+                    name,
+                )
+                replay = notification_item.last_value is not None
+            if notification_item is not None:
+                notification_item.subscribers = (
+                    *notification_item.subscribers,
+                    subscriber,
+                )
+                self._subscriber_items[id(subscriber)] = notification_item
+                value = notification_item.last_value
+                plc_time = notification_item.last_plc_time
+                available = notification_item.available and self.plc_running
+
+        if notification_item is None:
+            interval = self.poll_fallback_interval
+            if not interval:
+                return None
+            _LOGGER.warning(
+                "Polling %s every %s s instead of using a device notification",
+                name,
+                interval,
+            )
+            self._poller.add(name, plc_datatype, subscriber, interval)
+            return subscriber
+        if not available and availability_callback is not None:
+            self._call_availability(subscriber, name, False)
+        if replay:
+            self._call_subscriber(subscriber, name, value, plc_time)
+        return subscriber
+
+    def add_polled_notification(
+        self,
+        name,
+        plc_datatype,
+        callback,
+        timestamped=False,
+        interval=DEFAULT_POLL_INTERVAL,
+    ):
+        """Poll a symbol instead of subscribing to it.
+
+        Symbols polled at the same interval are read together with one sum
+        read per tick, and ``callback`` is only called when the value
+        changed. Timestamped callbacks receive None as ``plc_time``.
+
+        Returns a token for ``remove_device_notification``.
+        """
+        subscriber = NotificationSubscriber(callback, timestamped)
+        self._poller.add(name, plc_datatype, subscriber, interval)
+        return subscriber
+
+    @property
+    def polled_symbols(self):
+        """Return the number of symbols read by the polling scheduler."""
+        return self._poller.polled_symbols
+
+    def _open_notification(self, name, plc_datatype, attr, key):
+        """Create a new ADS notification handle.
+
+        Must be called with the hub lock held. Returns the new item, or None
+        if the budget is used up or the PLC refused the handle, in which case
+        polling may work instead. Raises ``ADSError`` if the symbol does not
+        exist.
+        """
+        notification_item = NotificationItem(
+            None, None, name, plc_datatype, key, self._port_of(name), attr
+        )
+        try:
+            if not self._open_handle(notification_item):
+                return None
+        except pyads.ADSError as err:
+            self.metrics.ads_errors += 1
+            _LOGGER.error("Error subscribing to %s: %s", name, err)
+            if getattr(err, "err_code", None) in SYMBOL_ERROR_CODES:
+                raise
+            return None
+        self._subscriptions[key] = notification_item
+        return notification_item
+
+    def _open_handle(self, notification_item):
+        """Create the ADS handle of ``notification_item``.
+
+        Must be called with the hub lock held. Returns False if the budget
+        is used up; errors of the PLC are raised as ``ADSError``.
+        """
+        name = notification_item.name
+        if self._budget_exhausted(name):
+            return False
+        port = notification_item.port
+        client, symbol = self._route(name)
+        hnotify, huser = client.add_device_notification(
+            symbol,
+            notification_item.attr,
+            self._device_notification_callback
+            if port is None
+            else partial(self._device_notification_callback, port=port),
+        )
+        notification_item.hnotify = hnotify = int(hnotify)
+        notification_item.huser = huser
+        notification_item.last_update = time.monotonic()
+        self._notification_items[port, hnotify] = notification_item
+        if self.silence_timeout:
+            self._monitor.watch()
+        if self._watch_versions and notification_item.layout is None:
+            self._monitor.request_layouts()
+        _LOGGER.debug("Added device notification %d for variable %s", hnotify, name)
+        return True
+
+    def _resubscribe(self, key):
+        """Open a new handle for an unavailable subscription.
+
+        Called by the monitor thread. Returns False if the PLC still cannot
+        deliver the symbol, so it is retried later. The subscription becomes
+        available with the first notification of the new handle.
+        """
+        with self._lock:
+            notification_item = self._subscriptions.get(key)
+            if notification_item is None or notification_item.hnotify is not None:
+                return True
+            if self._closing:
+                return False
+            try:
+                if not self._open_handle(notification_item):
+                    return False
+            except pyads.ADSError as err:
+                self.metrics.ads_errors += 1
+                _LOGGER.debug(
+                    "Resubscribing to %s failed: %s", notification_item.name, err
+                )
+                return False
+            self.metrics.resubscribes += 1
+        _LOGGER.info("Resubscribed to %s", notification_item.name)
+        return True
+
+    def invalidate_subscriptions(self, names=None):
+        """Drop the handles of ``names`` (all if None) and resubscribe them.
+
+        For handles the PLC no longer serves, e.g. after an online change.
+        The subscribers are told the symbols are unavailable until the new
+        handles deliver a value. Returns the number of handles dropped.
+        """
+        with self._lock:
+            items = [
+                item
+                for item in self._notification_items.values()
+                if names is None or item.name in names
+            ]
+        return self._invalidate(items, available=False)
+
+    def _invalidate(self, items, available):
+        """Delete the handles of ``items`` and schedule new ones.
+
+        Unless ``available``, the subscribers are told the symbols are
+        unavailable.
+        """
+        with self._lock:
+            items = [
+                item
+                for item in items
+                if self._notification_items.get((item.port, item.hnotify)) is item
+            ]
+            for item in items:
+                del self._notification_items[item.port, item.hnotify]
+            # The PLC may reject deleting an invalid handle; the pyads
+            # callback of the handle is released either way
+            self._delete_notifications(items)
+            for item in items:
+                item.hnotify = item.huser = None
+                # Not replayed to new subscribers until the new handle
+                # confirms it
+                item.last_value = None
+                self.value_cache.set_live(item.name, item.plc_datatype, False)
+                self._monitor.schedule(item.key)
+        if not available:
+            for item in items:
+                self._set_availability(item, False)
+        return len(items)
+
+    def check_silent_subscriptions(self, silence_timeout):
+        """Verify handles that sent no notification for ``silence_timeout`` s.
+
+        The silent symbols are read with one sum read per AMS port. A symbol
+        the PLC no longer knows is marked unavailable and resubscribed; one
+        whose value changed without a notification is resubscribed. Errors
+        of the connection leave the subscriptions alone. Returns the number
+        of handles dropped.
+        """
+        if not self.plc_running:
+            # No notifications are expected from a PLC that is not running
+            return 0
+        cutoff = time.monotonic() - silence_timeout
+        with self._lock:
+            items = [
+                item
+                for item in self._notification_items.values()
+                if item.last_update <= cutoff
+            ]
+        if not items:
+            return 0
+        values = self.read_list_by_name([item.name for item in items])
+        if values is None:
+            # A missing symbol fails the whole sum read of pyads (its
+            # lookup is part of it), so read them one by one
+            values = {item.name: self._read_status(item) for item in items}
+        now = time.monotonic()
+        lost = []
+        stale = []
+        for item in items:
+            value = values.get(item.name)
+            if isinstance(value, str) and value in SYMBOL_ERROR_TEXTS:
+                lost.append(item)
+            elif value is None or (
+                isinstance(value, str)
+                and value in ADS_ERROR_TEXTS
+                and item.plc_datatype is not pyads.PLCTYPE_STRING
+            ):
+                continue
+            elif value != item.last_value:
+                stale.append(item)
+            else:
+                item.last_update = now
+        for item in lost:
+            _LOGGER.warning("%s is no longer available in the PLC", item.name)
+        for item in stale:
+            _LOGGER.warning("Device notification for %s stopped updating", item.name)
+        dropped = self._invalidate(lost, available=False)
+        dropped += self._invalidate(stale, available=True)
+        self.metrics.stale_handles += dropped
+        return dropped
+
+    def _read_status(self, notification_item):
+        """Read one symbol; the pyads error text in place of a failed value."""
+        with self._lock:
+            try:
+                client, symbol = self._route(notification_item.name)
+                return client.read_by_name(symbol, notification_item.plc_datatype)
+            except pyads.ADSError as err:
+                self.metrics.ads_errors += 1
+                return ERROR_CODES.get(getattr(err, "err_code", None))
+
+    def watch_symbol_version(self):
+        """Detect online changes by subscribing to the PLC's symbol version.
+
+        TwinCAT changes the version when an online change or download
+        changes the symbol table; the subscriptions are then re-resolved
+        (see ``_refresh_symbols``). Further AMS ports are watched as they
+        are opened.
+        """
+        with self._lock:
+            self._watch_versions = True
+            self._add_version_notification(None, self._client)
+
+    def _add_version_notification(self, port, client):
+        """Subscribe to the symbol version of one AMS port (hub lock held)."""
+        try:
+            hnotify, huser = client.add_device_notification(
+                (ADSIGRP_SYM_VERSION, 0),
+                pyads.NotificationAttrib(1),
+                partial(self._symbol_version_callback, port=port),
+            )
+        except pyads.ADSError as err:
+            self.metrics.ads_errors += 1
+            _LOGGER.warning(
+                "Cannot watch the symbol version of AMS port %s, online changes "
+                "are not detected: %s",
+                port or self._default_port,
+                err,
+            )
+            return
+        self._version_items[port] = NotificationItem(
+            int(hnotify), huser, "symbol version", pyads.PLCTYPE_BYTE, None, port
+        )
+
+    def _symbol_version_callback(self, notification, name, port=None):
+        """Handle a notification of the symbol version (notification thread)."""
+        contents = notification.contents
+        # The first sample may arrive before the handle is stored
+        with self._lock:
+            notification_item = self._version_items.get(port)
+        if notification_item is None or not contents.cbSampleSize:
+            return
+        version = ctypes.c_ubyte.from_address(
+            ctypes.addressof(contents)
+            + pyads.structs.SAdsNotificationHeader.data.offset
+        ).value
+        previous, notification_item.last_value = notification_item.last_value, version
+        if previous is not None and version != previous:
+            _LOGGER.info(
+                "Symbol version of AMS port %s changed to %d (online change)",
+                port or self._default_port,
+                version,
+            )
+            self._monitor.request_refresh(port)
+
+    def watch_ads_state(self):
+        """Follow the ADS state of the PLC with a device notification.
+
+        While the PLC is not in RUN (STOP, CONFIG, ...) the subscriptions
+        are reported unavailable and writes are rejected without sending
+        them. When it runs again the subscribed values are read in bulk
+        and reported before the subscriptions become available.
+        """
         with self._lock:
             try:
                 hnotify, huser = self._client.add_device_notification(
-                    name, attr, self._device_notification_callback
+                    (ADSIGRP_DEVICE_DATA, ADSIOFFS_DEVDATA_ADSSTATE),
+                    pyads.NotificationAttrib(ctypes.sizeof(pyads.PLCTYPE_UINT)),
+                    self._ads_state_callback,
+                )
+            except pyads.ADSError as err:
+                self.metrics.ads_errors += 1
+                _LOGGER.warning(
+                    "Cannot watch the ADS state of the PLC, STOP is not detected: %s",
+                    err,
+                )
+                return
+            self._state_item = NotificationItem(
+                int(hnotify), huser, "ADS state", pyads.PLCTYPE_UINT, None
+            )
+
+    def _ads_state_callback(self, notification, name):
+        """Handle a notification of the PLC's ADS state (notification thread)."""
+        contents = notification.contents
+        if contents.cbSampleSize < ctypes.sizeof(ctypes.c_uint16):
+            return
+        state = ctypes.c_uint16.from_address(
+            ctypes.addressof(contents)
+            + pyads.structs.SAdsNotificationHeader.data.offset
+        ).value
+        was_running = self.plc_running
+        self.ads_state = state
+        if state == ADSSTATE_RUN:
+            if not was_running:
+                _LOGGER.info("PLC is in RUN again, resuming subscriptions")
+                self._monitor.request_values()
+            return
+        if was_running:
+            self.metrics.plc_stops += 1
+            _LOGGER.warning(
+                "PLC is in %s: entities are unavailable and writes are rejected "
+                "until it is in RUN again",
+                self.plc_state,
+            )
+            self._report_run_state(False)
+
+    def _report_run_state(self, running):
+        """Tell all availability subscribers whether the PLC is in RUN.
+
+        Symbols unavailable on their own stay unavailable.
+        """
+        with self._lock:
+            items = list(self._subscriptions.values())
+        for item in items:
+            if not item.available:
+                continue
+            for subscriber in item.subscribers:
+                if subscriber.availability_callback is not None:
+                    self._call_availability(subscriber, item.name, running)
+
+    def _resume(self):
+        """Refresh the subscribed values after the PLC returned to RUN.
+
+        Runs on the monitor thread. Notifications are only sent on change,
+        so values the PLC changed while it was not running (or during a
+        restart) are read with one sum read per AMS port and passed to
+        the subscribers, which then become available again.
+        """
+        if not self.plc_running:
+            return
+        with self._lock:
+            items = [
+                item for item in self._subscriptions.values() if item.hnotify is not None
+            ]
+        values = self.read_list_by_name([item.name for item in items]) if items else {}
+        if values is None:
+            values = {item.name: self._read_status(item) for item in items}
+        refreshed = 0
+        for item in items:
+            value = values.get(item.name)
+            if isinstance(value, str) and value in SYMBOL_ERROR_TEXTS:
+                # Left to the symbol version and silent handle checks
+                continue
+            if value is None or (
+                isinstance(value, str)
+                and value in ADS_ERROR_TEXTS
+                and item.plc_datatype is not pyads.PLCTYPE_STRING
+            ):
+                continue
+            item.last_update = time.monotonic()
+            if value == item.last_value:
+                continue
+            self.value_cache.update(item.name, item.plc_datatype, value)
+            item.last_value = value
+            item.last_plc_time = None
+            refreshed += 1
+            for subscriber in item.subscribers:
+                self._call_subscriber(subscriber, item.name, value, None)
+        _LOGGER.debug("Refreshed %d of %d values after RUN", refreshed, len(items))
+        if self.plc_running:
+            self._report_run_state(True)
+
+    def _symbol_layouts(self, client, symbols):
+        """Look up the layout of ``symbols``; None for a missing one.
+
+        Must be called with the hub lock held. The native client pipelines
+        the lookups, pyads reads one symbol after the other.
+        """
+        bulk = getattr(client, "symbol_layouts", None)
+        if bulk is not None:
+            return bulk(symbols)
+        layouts = {}
+        for symbol in symbols:
+            try:
+                info = client.read_write(
+                    ADSIGRP_SYM_INFOBYNAMEEX,
+                    0,
+                    pyads.structs.SAdsSymbolEntry,
+                    symbol,
+                    pyads.PLCTYPE_STRING,
+                    return_ctypes=True,
                 )
             except pyads.ADSError as err:
-                _LOGGER.error("Error subscribing to %s: %s", name, err)
+                if getattr(err, "err_code", None) not in SYMBOL_ERROR_CODES:
+                    raise
+                layouts[symbol] = None
             else:
-                hnotify = int(hnotify)
-                self._notification_items[hnotify] = NotificationItem(
-                    hnotify, huser, name, plc_datatype, callback
+                layouts[symbol] = (info.iGroup, info.iOffs, info.size, info.dataType)
+        return layouts
+
+    def _record_layouts(self):
+        """Look up the layouts of new handles (monitor thread)."""
+        with self._lock:
+            by_port = {}
+            for item in self._notification_items.values():
+                if item.layout is None:
+                    by_port.setdefault(item.port, []).append(item)
+            for port, items in by_port.items():
+                client = self._client if port is None else self._port_clients.get(port)
+                if client is None:
+                    continue
+                try:
+                    layouts = self._symbol_layouts(
+                        client, list({split_port(item.name)[1] for item in items})
+                    )
+                except pyads.ADSError as err:
+                    self.metrics.ads_errors += 1
+                    _LOGGER.debug("Error looking up %d symbols: %s", len(items), err)
+                    continue
+                for item in items:
+                    item.layout = layouts.get(split_port(item.name)[1])
+
+    def _refresh_symbols(self, port):
+        """Re-resolve the subscriptions of AMS ``port`` after an online change.
+
+        Runs on the monitor thread. The symbols are looked up again in bulk
+        and only subscriptions whose symbol moved, changed size or type, or
+        disappeared get new handles; the others keep theirs. Subscriptions
+        waiting for a missing symbol are retried at once.
+        """
+        self.metrics.online_changes += 1
+        with self._lock:
+            client = self._client if port is None else self._port_clients.get(port)
+            items = [
+                item for item in self._subscriptions.values() if item.port == port
+            ]
+            if client is None or not items:
+                return
+            # pyads caches symbol information for sum reads and writes
+            cache = getattr(client, "_symbol_info_cache", None)
+            if cache is not None:
+                cache.clear()
+            try:
+                layouts = self._symbol_layouts(
+                    client, list({split_port(item.name)[1] for item in items})
                 )
+            except pyads.ADSError as err:
+                self.metrics.ads_errors += 1
+                _LOGGER.warning(
+                    "Cannot look up symbols after the online change, renewing "
+                    "all handles: %s",
+                    err,
+                )
+                layouts = None
+        lost = []
+        moved = []
+        found = []
+        for item in items:
+            layout = None if layouts is None else layouts.get(split_port(item.name)[1])
+            if item.hnotify is None:
+                if layout is not None:
+                    found.append(item)
+            elif layouts is not None and layout is None:
+                lost.append(item)
+            elif layout is None or layout != item.layout:
+                moved.append(item)
+            item.layout = layout
+        self._invalidate(lost, available=False)
+        self._invalidate(moved, available=True)
+        for item in (*moved, *found):
+            if self._resubscribe(item.key):
+                self._monitor.discard(item.key)
+        _LOGGER.info(
+            "Online change: %d of %d subscriptions re-resolved, %d lost",
+            len(moved) + len(found),
+            len(items),
+            len(lost),
+        )
 
+    def _set_availability(self, notification_item, available):
+        """Tell the subscribers of ``notification_item`` if availability changed."""
+        if notification_item.available == available:
+            return
+        notification_item.available = available
+        if not self.plc_running:
+            # The subscribers are told when the PLC runs again
+            return
+        name = notification_item.name
+        if available:
+            _LOGGER.info("%s is available again", name)
+        for subscriber in notification_item.subscribers:
+            if subscriber.availability_callback is not None:
+                self._call_availability(subscriber, name, available)
+
+    @staticmethod
+    def _call_availability(subscriber, name, available):
+        """Call one availability callback, isolating it from errors."""
+        try:
+            subscriber.availability_callback(name, available)
+        except Exception:
+            _LOGGER.exception("Error in availability callback for %s", name)
+
+    def _budget_exhausted(self, name):
+        """Return True (and report it) if no new handle may be opened.
+
+        Must be called with the hub lock held.
+        """
+        budget = self.notification_budget
+        if not budget or len(self._notification_items) < budget:
+            return False
+        self.metrics.budget_rejections += 1
+        _LOGGER.warning(
+            "Not subscribing to %s: the notification budget of %d handles is used up",
+            name,
+            budget,
+        )
+        if self.budget_exceeded_callback is not None:
+            self.budget_exceeded_callback(self.metrics.budget_rejections, budget)
+        return True
+
+    def remove_device_notification(self, token):
+        """Remove a subscriber added with ``add_device_notification``.
+
+        The ADS notification handle is deleted once its last subscriber is
+        removed.
+        """
+        with self._lock:
+            notification_item = self._subscriber_items.pop(id(token), None)
+            if notification_item is None:
+                self._poller.remove(token)
+                return
+            notification_item.subscribers = tuple(
+                s for s in notification_item.subscribers if s is not token
+            )
+            if notification_item.subscribers:
+                return
+            self._subscriptions.pop(notification_item.key, None)
+            self.value_cache.set_live(
+                notification_item.name, notification_item.plc_datatype, False
+            )
+            if notification_item.hnotify is None:
+                # Waiting to be resubscribed, there is no handle to delete
+                self._monitor.discard(notification_item.key)
+                return
+            self._notification_items.pop(
+                (notification_item.port, notification_item.hnotify), None
+            )
+            if self._closing:
+                self._released_items.append(notification_item)
+                return
+            try:
+                client, _symbol = self._route(notification_item.name)
+                client.del_device_notification(
+                    notification_item.hnotify, notification_item.huser
+                )
+            except pyads.ADSError as err:
+                self.metrics.ads_errors += 1
+                _LOGGER.error(
+                    "Error unsubscribing from %s: %s", notification_item.name, err
+                )
+            else:
                 _LOGGER.debug(
-                    "Added device notification %d for variable %s", hnotify, name
+                    "Deleted device notification %d for variable %s",
+                    notification_item.hnotify,
+                    notification_item.name,
                 )
 
-    def _device_notification_callback(self, notification, name):
-        """Handle device notifications."""
+    @staticmethod
+    def _call_subscriber(subscriber, name, value, plc_time):
+        """Call one subscriber, isolating it from errors in the others."""
+        try:
+            if subscriber.timestamped:
+                subscriber.callback(name, value, plc_time)
+            else:
+                subscriber.callback(name, value)
+        except Exception:
+            _LOGGER.exception("Error in notification callback for %s", name)
+
+    def _device_notification_callback(self, notification, name, port=None):
+        """Handle device notifications (of AMS ``port``, None for the hub's own)."""
+        start = time.perf_counter()
+        metrics = self.metrics
         contents = notification.contents
         hnotify = int(contents.hNotification)
         _LOGGER.debug("Received notification %d", hnotify)
@@ -110,42 +1444,54 @@ class AdsHub:
 
         # Acquire notification item
         with self._lock:
-            notification_item = self._notification_items.get(hnotify)
+            notification_item = self._notification_items.get((port, hnotify))
 
         if not notification_item:
+            metrics.unknown_notifications += 1
             _LOGGER.error("Unknown device notification handle: %d", hnotify)
             return
 
+        recorder = self._recorder
+        if recorder is not None:
+            recorder.record(
+                hnotify,
+                notification_item.name,
+                notification_item.plc_datatype,
+                contents.nTimeStamp,
+                bytes(data),
+            )
+
         # Data parsing based on PLC data type
-        plc_datatype = notification_item.plc_datatype
-        unpack_formats = {
-            pyads.PLCTYPE_BYTE: "<B",  # BYTE is unsigned (0-255)
-            pyads.PLCTYPE_INT: "<h",
-            pyads.PLCTYPE_UINT: "<H",
-            pyads.PLCTYPE_SINT: "<b",  # SINT is signed (-128 to 127)
-            pyads.PLCTYPE_USINT: "<B",
-            pyads.PLCTYPE_DINT: "<i",
-            pyads.PLCTYPE_UDINT: "<I",
-            pyads.PLCTYPE_WORD: "<H",
-            pyads.PLCTYPE_DWORD: "<I",
-            pyads.PLCTYPE_LREAL: "<d",
-            pyads.PLCTYPE_REAL: "<f",
-            pyads.PLCTYPE_TOD: "<i",  # Treat as DINT
-            pyads.PLCTYPE_DATE: "<i",  # Treat as DINT
-            pyads.PLCTYPE_DT: "<i",  # Treat as DINT
-            pyads.PLCTYPE_TIME: "<i",  # Treat as DINT
-        }
-
-        if plc_datatype == pyads.PLCTYPE_BOOL:
-            value = bool(struct.unpack("<?", bytearray(data))[0])
-        elif plc_datatype == pyads.PLCTYPE_STRING:
+        unpacker = notification_item.unpacker
+        if unpacker is not None:
+            value = unpacker.unpack_from(data)[0]
+        elif notification_item.plc_datatype == pyads.PLCTYPE_STRING:
             value = (
                 bytearray(data).split(b"\x00", 1)[0].decode("utf-8", errors="ignore")
             )
-        elif plc_datatype in unpack_formats:
-            value = struct.unpack(unpack_formats[plc_datatype], bytearray(data))[0]
         else:
             value = bytearray(data)
             _LOGGER.warning("No callback available for this datatype")
 
-        notification_item.callback(notification_item.name, value)
+        metrics.notifications += 1
+        metrics.decode_time.add(time.perf_counter() - start)
+
+        filetime = contents.nTimeStamp
+        plc_time = filetime_to_timestamp(filetime) if filetime else None
+        if plc_time is not None:
+            metrics.plc_latency.add(time.time() - plc_time)
+
+        name = notification_item.name
+        if notification_item.last_value is None:
+            # From now on the handle keeps the cached value current
+            self.value_cache.set_live(
+                name, notification_item.plc_datatype, True
+            )
+        self.value_cache.update(name, notification_item.plc_datatype, value)
+        notification_item.last_value = value
+        notification_item.last_plc_time = plc_time
+        notification_item.last_update = time.monotonic()
+        if not notification_item.available:
+            self._set_availability(notification_item, True)
+        for subscriber in notification_item.subscribers:
+            self._call_subscriber(subscriber, name, value, plc_time)
@@ -198,18 +198,24 @@ class AdsLight(AdsEntity, LightEntity):
         """Return True if the entity is on."""
         return self._state_dict.get(STATE_KEY_STATE)
 
-    def turn_on(self, **kwargs: Any) -> None:
+    async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the light on or set a specific dimmer value."""
         brightness = kwargs.get(ATTR_BRIGHTNESS)
-        self._ads_hub.write_by_name(self._ads_var, True, pyads.PLCTYPE_BOOL)
+        writes = []
 
         if self._ads_var_brightness is not None and brightness is not None:
             # Scale brightness from HA range (0-255) to PLC range (0-brightness_scale)
             scaled_brightness = int(brightness * self._brightness_scale / 255)
-            self._ads_hub.write_by_name(
-                self._ads_var_brightness, scaled_brightness, self._get_brightness_plc_type()
+            writes.append(
+                (
+                    self._ads_var_brightness,
+                    scaled_brightness,
+                    self._get_brightness_plc_type(),
+                )
             )
+        # Queued together, so both go out in one sum write
+        await self.async_write_state(True, pyads.PLCTYPE_BOOL, *writes)
 
-    def turn_off(self, **kwargs: Any) -> None:
+    async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the light off."""
-        self._ads_hub.write_by_name(self._ads_var, False, pyads.PLCTYPE_BOOL)
+        await self.async_write_state(False, pyads.PLCTYPE_BOOL)
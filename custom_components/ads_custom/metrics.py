@@ -0,0 +1,200 @@
+"""Lightweight performance counters for an ADS hub.
+
+Counters are plain integer attributes and latency samples go into
+fixed-size ``array`` ring buffers, so recording a sample takes no lock and
+allocates nothing that outlives the call. Updates from the pyads callback
+thread and the event loop may race; an occasionally lost increment is an
+acceptable price for keeping the hot path cheap.
+"""
+
+from __future__ import annotations
+
+from array import array
+import time
+from typing import Any
+
+DEFAULT_WINDOW_SIZE = 1024
+
+# Upper bounds (ms) of the histogram buckets reported for latency windows
+HISTOGRAM_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000)
+
+
+class LatencyWindow:
+    """Ring buffer holding the most recent latency samples, in seconds."""
+
+    __slots__ = ("_index", "_samples", "_size", "count")
+
+    def __init__(self, size: int = DEFAULT_WINDOW_SIZE) -> None:
+        """Preallocate the buffer."""
+        self._samples = array("d", bytes(8 * size))
+        self._size = size
+        self._index = 0
+        self.count = 0
+
+    def add(self, seconds: float) -> None:
+        """Record one sample."""
+        index = self._index
+        self._samples[index] = seconds
+        self._index = (index + 1) % self._size
+        self.count += 1
+
+    def summary(self) -> dict[str, Any]:
+        """Return percentiles of the buffered samples in milliseconds."""
+        filled = min(self.count, self._size)
+        if not filled:
+            return {
+                "count": 0,
+                "p50": None,
+                "p95": None,
+                "p99": None,
+                "max": None,
+                "histogram": {},
+            }
+        samples = sorted(self._samples[:filled])
+
+        def percentile(fraction: float) -> float:
+            return round(samples[min(filled - 1, int(filled * fraction))] * 1000, 3)
+
+        histogram = {}
+        position = 0
+        for bound in HISTOGRAM_BUCKETS_MS:
+            start = position
+            while position < filled and samples[position] * 1000 <= bound:
+                position += 1
+            histogram[f"<={bound}"] = position - start
+        histogram[f">{HISTOGRAM_BUCKETS_MS[-1]}"] = filled - position
+
+        return {
+            "count": self.count,
+            "p50": percentile(0.5),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+            "max": round(samples[-1] * 1000, 3),
+            "histogram": histogram,
+        }
+
+
+class HubMetrics:
+    """Counters and latency windows for one ``AdsHub``."""
+
+    def __init__(self, window_size: int = DEFAULT_WINDOW_SIZE) -> None:
+        """Initialize all counters to zero."""
+        self.started = time.monotonic()
+        self.notifications = 0
+        self.unknown_notifications = 0
+        self.writes = 0
+        # ADS sum writes of batched entity commands
+        self.sum_writes = 0
+        # Writes skipped because the PLC already reported the value, and
+        # writes rejected because the PLC was not in RUN
+        self.suppressed_writes = 0
+        self.suspended_writes = 0
+        # Optimistic states rolled back because the PLC did not confirm them
+        self.optimistic_rollbacks = 0
+        # Reads answered from (or missed in) the hub's value cache
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # ADS sum reads issued by the polling fallback
+        self.sum_reads = 0
+        self.ads_errors = 0
+        # Subscriptions rejected by the hub's notification budget
+        self.budget_rejections = 0
+        # Handles found invalid or silent and dropped, and the successful
+        # resubscriptions of lost symbols
+        self.stale_handles = 0
+        self.resubscribes = 0
+        # Online changes detected through the PLC's symbol version
+        self.online_changes = 0
+        # Times the PLC left RUN (STOP, CONFIG, ...)
+        self.plc_stops = 0
+        # pyads callback entry -> value decoded
+        self.decode_time = LatencyWindow(window_size)
+        # pyads callback thread -> state written on the event loop, for the
+        # high-priority lane and the coalesced low-priority lane
+        self.dispatch_latency = LatencyWindow(window_size)
+        self.low_priority_dispatch_latency = LatencyWindow(window_size)
+        self.high_priority_dispatches = 0
+        self.coalesced_updates = 0
+        self.low_priority_batches = 0
+        # PLC timestamp -> pyads callback (network, router and pyads thread;
+        # assumes the PLC and Home Assistant clocks are synchronised)
+        self.plc_latency = LatencyWindow(window_size)
+        # PLC timestamp -> state written on the event loop
+        self.end_to_end_latency = LatencyWindow(window_size)
+        # hub.write_by_name round trip
+        self.write_latency = LatencyWindow(window_size)
+        # Jobs on the hub's own executor and their wait for the worker
+        self.io_submitted = 0
+        self.io_completed = 0
+        self.io_queue_peak = 0
+        self.io_wait = LatencyWindow(window_size)
+        self._rate_time = self.started
+        self._rate_count = 0
+        self._rate = 0.0
+
+    def notification_rate(self) -> float:
+        """Return notifications per second since the previous call.
+
+        The rate is only recomputed once at least a second has passed, so
+        several readers polling at the same time see the same value.
+        """
+        now = time.monotonic()
+        elapsed = now - self._rate_time
+        if elapsed >= 1:
+            count = self.notifications
+            self._rate = round((count - self._rate_count) / elapsed, 2)
+            self._rate_count = count
+            self._rate_time = now
+        return self._rate
+
+    def cache_hit_rate(self) -> float | None:
+        """Return the percentage of reads answered from the value cache."""
+        reads = self.cache_hits + self.cache_misses
+        return round(100 * self.cache_hits / reads, 1) if reads else None
+
+    def snapshot(
+        self,
+        active_notifications: int,
+        low_priority_queue: int = 0,
+        cached_values: int = 0,
+    ) -> dict[str, Any]:
+        """Return all metrics as a JSON-serialisable dict."""
+        return {
+            "uptime_seconds": round(time.monotonic() - self.started, 1),
+            "notifications": self.notifications,
+            "notifications_per_second": self.notification_rate(),
+            "unknown_notifications": self.unknown_notifications,
+            "active_notifications": active_notifications,
+            "writes": self.writes,
+            "sum_writes": self.sum_writes,
+            "suppressed_writes": self.suppressed_writes,
+            "suspended_writes": self.suspended_writes,
+            "optimistic_rollbacks": self.optimistic_rollbacks,
+            "sum_reads": self.sum_reads,
+            "ads_errors": self.ads_errors,
+            "cached_values": cached_values,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_hit_rate": self.cache_hit_rate(),
+            "budget_rejections": self.budget_rejections,
+            "stale_handles": self.stale_handles,
+            "resubscribes": self.resubscribes,
+            "online_changes": self.online_changes,
+            "plc_stops": self.plc_stops,
+            "decode_time_ms": self.decode_time.summary(),
+            "high_priority_dispatches": self.high_priority_dispatches,
+            "coalesced_updates": self.coalesced_updates,
+            "low_priority_batches": self.low_priority_batches,
+            "low_priority_queue": low_priority_queue,
+            "dispatch_latency_ms": self.dispatch_latency.summary(),
+            "low_priority_dispatch_latency_ms": (
+                self.low_priority_dispatch_latency.summary()
+            ),
+            "plc_latency_ms": self.plc_latency.summary(),
+            "end_to_end_latency_ms": self.end_to_end_latency.summary(),
+            "write_latency_ms": self.write_latency.summary(),
+            "io_jobs": self.io_completed,
+            "io_queue_depth": self.io_submitted - self.io_completed,
+            "io_queue_peak": self.io_queue_peak,
+            "io_wait_ms": self.io_wait.summary(),
+        }
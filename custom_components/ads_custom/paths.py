@@ -0,0 +1,26 @@
+"""Resolve user-supplied file names inside the configuration directory.
+
+Services and config flows take file names for captures and symbol imports.
+They are resolved relative to the configuration directory, and any name
+that ends up outside it (an absolute path, ``..`` or a symlink) is
+rejected, so the integration never reads or writes other files of the
+host.
+"""
+
+from __future__ import annotations
+
+import os
+
+from homeassistant.core import HomeAssistant
+
+
+def config_file_path(hass: HomeAssistant, filename: str) -> str:
+    """Return the real path of ``filename`` in the configuration directory.
+
+    Raises ValueError if the path is outside the configuration directory.
+    """
+    config_dir = os.path.realpath(hass.config.config_dir)
+    path = os.path.realpath(hass.config.path(filename))
+    if os.path.commonpath([config_dir, path]) != config_dir:
+        raise ValueError(f"{filename} is outside the configuration directory")
+    return path
@@ -0,0 +1,176 @@
+"""Polling fallback for symbols that cannot use a device notification.
+
+``PollScheduler`` groups polled symbols by interval and reads every due
+group with a single ADS sum read (``read_list_by_name``), then calls the
+subscribers of the values that changed since the previous read. It is the
+fallback when the hub's notification budget is used up or the PLC refuses
+another notification handle, and costs one round trip per group and tick
+instead of one per symbol.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+import pyads
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+class PollItem:
+    """A polled symbol and the subscribers interested in it."""
+
+    __slots__ = ("last_value", "name", "plc_datatype", "subscribers")
+
+    def __init__(self, name, plc_datatype):
+        """Initialize the item without subscribers."""
+        self.name = name
+        self.plc_datatype = plc_datatype
+        # Replaced (never mutated), like NotificationItem.subscribers
+        self.subscribers = ()
+        self.last_value = None
+
+
+class PollGroup:
+    """All symbols polled at the same interval."""
+
+    __slots__ = ("interval", "items", "next_due")
+
+    def __init__(self, interval):
+        """Initialize an empty group that is due immediately."""
+        self.interval = interval
+        # (name, plc_datatype) -> PollItem
+        self.items = {}
+        self.next_due = time.monotonic()
+
+
+class PollScheduler(threading.Thread):
+    """Read polled symbols in per-interval groups on a background thread.
+
+    :param hub: the ``AdsHub`` used for reads; subscribers are called
+        through ``hub._call_subscriber`` like notification subscribers
+    """
+
+    def __init__(self, hub):
+        """Initialize the scheduler; it is started on the first ``add``."""
+        super().__init__(name="ads_custom poller", daemon=True)
+        self._hub = hub
+        self._lock = threading.Lock()
+        # interval -> PollGroup
+        self._groups = {}
+        # id(subscriber) -> (PollGroup, PollItem)
+        self._subscriber_items = {}
+        self._wakeup = threading.Event()
+        self._stopped = False
+
+    @property
+    def polled_symbols(self):
+        """Return the number of polled symbols over all groups."""
+        with self._lock:
+            return sum(len(group.items) for group in self._groups.values())
+
+    def add(self, name, plc_datatype, subscriber, interval=DEFAULT_POLL_INTERVAL):
+        """Poll ``name`` every ``interval`` seconds for ``subscriber``.
+
+        A symbol already polled at that interval is shared; the new
+        subscriber gets the last value right away.
+        """
+        with self._lock:
+            group = self._groups.get(interval)
+            if group is None:
+                group = self._groups[interval] = PollGroup(interval)
+            key = (name, plc_datatype)
+            item = group.items.get(key)
+            if item is None:
+                item = group.items[key] = PollItem(name, plc_datatype)
+                # Read new symbols with the next tick instead of waiting
+                group.next_due = time.monotonic()
+            item.subscribers = (*item.subscribers, subscriber)
+            self._subscriber_items[id(subscriber)] = (group, item)
+            value = item.last_value
+            if not self.is_alive() and not self._stopped:
+                self.start()
+        self._wakeup.set()
+        if value is not None:
+            self._hub._call_subscriber(subscriber, name, value, None)  # noqa: SLF001
+
+    def remove(self, subscriber):
+        """Stop polling for ``subscriber``; returns False if it is unknown."""
+        with self._lock:
+            entry = self._subscriber_items.pop(id(subscriber), None)
+            if entry is None:
+                return False
+            group, item = entry
+            item.subscribers = tuple(s for s in item.subscribers if s is not subscriber)
+            if not item.subscribers:
+                del group.items[(item.name, item.plc_datatype)]
+                if not group.items:
+                    del self._groups[group.interval]
+            return True
+
+    def stop(self):
+        """Stop the polling thread."""
+        self._stopped = True
+        self._wakeup.set()
+        if self.is_alive():
+            self.join()
+
+    def run(self):
+        """Poll due groups until stopped."""
+        while not self._stopped:
+            timeout = self.poll_due()
+            self._wakeup.wait(timeout)
+            self._wakeup.clear()
+
+    def poll_due(self):
+        """Read all due groups; returns seconds until the next one is due."""
+        now = time.monotonic()
+        with self._lock:
+            due = []
+            for group in self._groups.values():
+                if group.next_due <= now:
+                    # Skip missed ticks instead of bursting to catch up
+                    group.next_due = max(group.next_due + group.interval, now)
+                    due.append((group.interval, tuple(group.items.values())))
+        for interval, items in due:
+            self._poll(interval, items)
+        with self._lock:
+            if not self._groups:
+                return None
+            next_due = min(group.next_due for group in self._groups.values())
+        return max(next_due - time.monotonic(), 0)
+
+    def _poll(self, interval, items):
+        """Read one group and dispatch the changed values."""
+        hub = self._hub
+        values = hub.read_list_by_name([item.name for item in items])
+        if values is None:
+            # A single bad symbol fails the whole sum read (symbol lookup is
+            # part of it), so read the group one by one this tick
+            _LOGGER.debug("Sum read of the %s s poll group failed", interval)
+            values = {
+                item.name: hub.read_by_name(
+                    item.name, item.plc_datatype, use_cache=False
+                )
+                for item in items
+            }
+        cache = hub.value_cache
+        for item in items:
+            value = values.get(item.name)
+            if value is None or (
+                # pyads reports per-symbol errors of a sum read as strings
+                isinstance(value, str) and item.plc_datatype is not pyads.PLCTYPE_STRING
+            ):
+                continue
+            # Refresh the cache even if unchanged, the value is confirmed
+            cache.update(item.name, item.plc_datatype, value)
+            if value == item.last_value:
+                continue
+            item.last_value = value
+            name = item.name
+            for subscriber in item.subscribers:
+                hub._call_subscriber(subscriber, name, value, None)  # noqa: SLF001
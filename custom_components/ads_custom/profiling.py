@@ -0,0 +1,116 @@
+"""Sampling profiler for the integration's hot paths.
+
+``SamplingProfiler`` periodically snapshots the stacks of all threads with
+``sys._current_frames()`` and keeps the ones that are running code of this
+integration: the pyads notification thread inside
+``AdsHub._device_notification_callback``, entity update handlers on the
+event loop and executor jobs such as writes. Samples are aggregated into
+collapsed stacks (``thread;frame;frame count``), the input format of
+flamegraph.pl and speedscope.
+
+Nothing is hooked into the hub, so there is no overhead while the profiler
+is not running.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+import logging
+import os
+from pathlib import Path
+import sys
+import threading
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+PACKAGE_DIR = str(Path(__file__).resolve().parent)
+
+DEFAULT_PROFILE_DURATION = 60
+DEFAULT_PROFILE_INTERVAL = 0.005
+
+
+class SamplingProfiler(threading.Thread):
+    """Collect stack samples for a bounded time window.
+
+    :param path: collapsed-stack output file, written when sampling stops
+    :param duration: seconds after which sampling stops on its own
+    :param interval: seconds between samples
+    :param root_dir: only stacks with a frame below this directory are kept
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        duration: float = DEFAULT_PROFILE_DURATION,
+        interval: float = DEFAULT_PROFILE_INTERVAL,
+        root_dir: str = PACKAGE_DIR,
+    ) -> None:
+        """Initialize the profiler thread."""
+        super().__init__(name="ads_custom profiler", daemon=True)
+        self.path = Path(path)
+        self.duration = duration
+        self.interval = interval
+        self.samples = 0
+        self.stacks: Counter[str] = Counter()
+        self._root_dir = root_dir
+        self._stop_event = threading.Event()
+        self._thread_names: dict[int, str] = {}
+
+    def stop(self) -> None:
+        """Stop sampling and wait until the output file is written."""
+        self._stop_event.set()
+        self.join()
+
+    def run(self) -> None:
+        """Sample until stopped or the duration expires, then write."""
+        deadline = time.monotonic() + self.duration
+        while not self._stop_event.wait(self.interval):
+            self._sample()
+            if time.monotonic() >= deadline:
+                break
+        self._write()
+
+    def _thread_name(self, ident: int) -> str:
+        """Return the name of a thread, refreshing the cache on a miss."""
+        name = self._thread_names.get(ident)
+        if name is None:
+            self._thread_names = {
+                thread.ident: thread.name for thread in threading.enumerate()
+            }
+            name = self._thread_names.setdefault(ident, f"thread-{ident}")
+        return name
+
+    def _sample(self) -> None:
+        """Record the stacks of all threads running integration code."""
+        own = threading.get_ident()
+        root_dir = self._root_dir
+        self.samples += 1
+        for ident, frame in sys._current_frames().items():  # noqa: SLF001
+            if ident == own:
+                continue
+            frames = []
+            relevant = False
+            while frame is not None:
+                code = frame.f_code
+                if not relevant and code.co_filename.startswith(root_dir):
+                    relevant = True
+                frames.append(f"{Path(code.co_filename).stem}:{code.co_qualname}")
+                frame = frame.f_back
+            if relevant:
+                frames.append(self._thread_name(ident))
+                frames.reverse()
+                self.stacks[";".join(frames)] += 1
+
+    def _write(self) -> None:
+        """Write the collapsed stacks to ``path``."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f"{stack} {count}\n")
+        _LOGGER.info(
+            "Wrote ADS profile to %s (%d samples, %d matching stacks)",
+            self.path,
+            self.samples,
+            sum(self.stacks.values()),
+        )
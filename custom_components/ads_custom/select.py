@@ -153,12 +153,12 @@ class AdsSelect(AdsEntity, SelectEntity):
     async def async_added_to_hass(self) -> None:
         """Register device notification."""
         # Register notification with custom callback for select entity
-        def update_callback(name: str, value: int) -> None:
+        def update_callback(name: str, value: int, plc_time: float | None = None) -> None:
             """Handle the value update from ADS."""
             # Additional safety check for options
             if self._attr_options and 0 <= value < len(self._attr_options):
                 self._attr_current_option = self._attr_options[value]
-                self.schedule_update_ha_state()
+                self.schedule_notified_state_write(plc_time)
             else:
                 _LOGGER.warning(
                     "Invalid value %d for select %s (valid range: 0-%d)",
@@ -167,17 +167,17 @@ class AdsSelect(AdsEntity, SelectEntity):
                     len(self._attr_options) - 1 if self._attr_options else -1,
                 )
 
-        await self.hass.async_add_executor_job(
-            self._ads_hub.add_device_notification,
-            self._ads_var,
-            pyads.PLCTYPE_INT,
-            update_callback
-        )
+        await self.async_subscribe(self._ads_var, pyads.PLCTYPE_INT, update_callback)
 
-    def select_option(self, option: str) -> None:
+    async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
         if option in self._attr_options:
             index = self._attr_options.index(option)
-            self._ads_hub.write_by_name(self._ads_var, index, pyads.PLCTYPE_INT)
+            if not await self._ads_hub.async_write_by_name(
+                self._ads_var, index, pyads.PLCTYPE_INT
+            ):
+                # Failed or suspended while the PLC is not in RUN; keep
+                # showing the option the PLC has
+                return
             self._attr_current_option = option
-            self.schedule_update_ha_state()
+            self.async_write_ha_state()
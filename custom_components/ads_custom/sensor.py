@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
 import logging
+from typing import Any
 
 import voluptuous as vol
 
@@ -13,6 +17,7 @@ from homeassistant.components.sensor import (
     STATE_CLASSES_SCHEMA as SENSOR_STATE_CLASSES_SCHEMA,
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
@@ -21,12 +26,20 @@ from homeassistant.const import (
     CONF_NAME,
     CONF_UNIQUE_ID,
     CONF_UNIT_OF_MEASUREMENT,
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfTime,
 )
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers import entity_platform
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType, StateType
+from homeassistant.helpers.update_coordinator import (
+    CoordinatorEntity,
+    DataUpdateCoordinator,
+)
 
 from . import ADS_TYPEMAP, CONF_ADS_FACTOR, CONF_ADS_TYPE
 from .const import (
@@ -38,12 +51,119 @@ from .const import (
     AdsType,
 )
 from .device_groups import get_device_name, iter_entity_configs
+from .dispatch import PRIORITY_LOW
 from .entity import AdsEntity, resolve_device_name
-from .hub import AdsHub
+from .hub import ADS_STATE_NAMES, AdsHub
 
 _LOGGER = logging.getLogger(__name__)
 DEFAULT_NAME = "ADS sensor"
 
+# How often the diagnostic sensors refresh; all of a hub's sensors share
+# one metrics snapshot per interval
+METRICS_UPDATE_INTERVAL = timedelta(seconds=30)
+
+
+@dataclass(frozen=True, kw_only=True)
+class AdsHubSensorEntityDescription(SensorEntityDescription):
+    """Describes a hub performance metric sensor."""
+
+    value_fn: Callable[[dict[str, Any]], StateType]
+    attributes_fn: Callable[[dict[str, Any]], dict[str, Any]] | None = None
+
+
+def _latency_sensor(key: str) -> AdsHubSensorEntityDescription:
+    """Describe a sensor showing the p95 of a latency window in ms."""
+    metric = f"{key}_ms"
+    return AdsHubSensorEntityDescription(
+        key=key,
+        translation_key=key,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=2,
+        value_fn=lambda metrics: metrics[metric]["p95"],
+        attributes_fn=lambda metrics: metrics[metric],
+    )
+
+
+HUB_SENSORS: tuple[AdsHubSensorEntityDescription, ...] = (
+    AdsHubSensorEntityDescription(
+        key="plc_state",
+        translation_key="plc_state",
+        device_class=SensorDeviceClass.ENUM,
+        options=list(ADS_STATE_NAMES.values()),
+        value_fn=lambda metrics: metrics["plc_state"],
+        attributes_fn=lambda metrics: {
+            "plc_stops": metrics["plc_stops"],
+            "suspended_writes": metrics["suspended_writes"],
+        },
+    ),
+    AdsHubSensorEntityDescription(
+        key="notifications_per_second",
+        translation_key="notifications_per_second",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="1/s",
+        value_fn=lambda metrics: metrics["notifications_per_second"],
+    ),
+    AdsHubSensorEntityDescription(
+        key="notifications",
+        translation_key="notifications",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics["notifications"],
+        attributes_fn=lambda metrics: {
+            "unknown_notifications": metrics["unknown_notifications"]
+        },
+    ),
+    AdsHubSensorEntityDescription(
+        key="active_notifications",
+        translation_key="active_notifications",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: metrics["active_notifications"],
+    ),
+    AdsHubSensorEntityDescription(
+        key="ads_errors",
+        translation_key="ads_errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics["ads_errors"],
+    ),
+    _latency_sensor("decode_time"),
+    _latency_sensor("dispatch_latency"),
+    _latency_sensor("low_priority_dispatch_latency"),
+    _latency_sensor("plc_latency"),
+    _latency_sensor("end_to_end_latency"),
+    _latency_sensor("write_latency"),
+    AdsHubSensorEntityDescription(
+        key="io_queue_depth",
+        translation_key="io_queue_depth",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: metrics["io_queue_depth"],
+        attributes_fn=lambda metrics: {
+            "io_jobs": metrics["io_jobs"],
+            "io_queue_peak": metrics["io_queue_peak"],
+        },
+    ),
+    _latency_sensor("io_wait"),
+    AdsHubSensorEntityDescription(
+        key="suppressed_writes",
+        translation_key="suppressed_writes",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics["suppressed_writes"],
+    ),
+    AdsHubSensorEntityDescription(
+        key="cache_hit_rate",
+        translation_key="cache_hit_rate",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        suggested_display_precision=1,
+        value_fn=lambda metrics: metrics["cache_hit_rate"],
+        attributes_fn=lambda metrics: {
+            "cached_values": metrics["cached_values"],
+            "cache_hits": metrics["cache_hits"],
+            "cache_misses": metrics["cache_misses"],
+        },
+    ),
+)
+
 PLATFORM_SCHEMA = SENSOR_PLATFORM_SCHEMA.extend(
     {
         vol.Required(CONF_ADS_VAR): cv.string,
@@ -183,10 +303,80 @@ async def async_setup_entry(
                     config_subentry_id=subentry_id,
                 )
 
+    coordinator = metrics_coordinator(hass, entry, ads_hub)
+    await coordinator.async_refresh()
+    async_add_entities(
+        AdsHubSensor(coordinator, entry, description) for description in HUB_SENSORS
+    )
+
+
+def metrics_coordinator(
+    hass: HomeAssistant, entry: ConfigEntry, ads_hub: AdsHub
+) -> DataUpdateCoordinator[dict[str, Any]]:
+    """Return a coordinator taking one metrics snapshot of ``ads_hub`` per interval.
+
+    A snapshot copies and sorts every latency window, so the diagnostic
+    sensors read their values from a shared one instead of each taking
+    their own.
+    """
+
+    async def async_update_metrics() -> dict[str, Any]:
+        return ads_hub.metrics_snapshot()
+
+    return DataUpdateCoordinator(
+        hass,
+        _LOGGER,
+        config_entry=entry,
+        name=f"{entry.title} metrics",
+        update_interval=METRICS_UPDATE_INTERVAL,
+        update_method=async_update_metrics,
+    )
+
+
+class AdsHubSensor(
+    CoordinatorEntity[DataUpdateCoordinator[dict[str, Any]]], SensorEntity
+):
+    """Diagnostic sensor exposing one of the hub's performance metrics."""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    entity_description: AdsHubSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: DataUpdateCoordinator[dict[str, Any]],
+        entry: ConfigEntry,
+        description: AdsHubSensorEntityDescription,
+    ) -> None:
+        """Initialize the metric sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=entry.title,
+            manufacturer="Beckhoff",
+            model="ADS connection",
+        )
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the metric from the coordinator's snapshot."""
+        return self.entity_description.value_fn(self.coordinator.data)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the metric's attributes from the coordinator's snapshot."""
+        attributes_fn = self.entity_description.attributes_fn
+        return None if attributes_fn is None else attributes_fn(self.coordinator.data)
+
 
 class AdsSensor(AdsEntity, SensorEntity):
     """Representation of an ADS sensor entity."""
 
+    # Telemetry: coalesced and written in batches
+    _ads_priority = PRIORITY_LOW
+
     def __init__(
         self,
         ads_hub: AdsHub,
@@ -150,10 +150,10 @@ class AdsSwitch(AdsEntity, SwitchEntity):
         """Return True if the entity is on."""
         return self._state_dict.get(STATE_KEY_STATE)
 
-    def turn_on(self, **kwargs: Any) -> None:
+    async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
-        self._ads_hub.write_by_name(self._ads_var, True, pyads.PLCTYPE_BOOL)
+        await self.async_write_state(True, pyads.PLCTYPE_BOOL)
 
-    def turn_off(self, **kwargs: Any) -> None:
+    async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the switch off."""
-        self._ads_hub.write_by_name(self._ads_var, False, pyads.PLCTYPE_BOOL)
+        await self.async_write_state(False, pyads.PLCTYPE_BOOL)
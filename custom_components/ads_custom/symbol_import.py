@@ -0,0 +1,345 @@
+"""Bulk import of ADS entities from TwinCAT symbol exports.
+
+Supported sources are TwinCAT module class files (``.tmc``), CSV symbol
+exports and JSON symbol exports (either a JSON array or JSON Lines). All
+parsers stream their input so that multi-megabyte files can be imported on
+small Home Assistant hosts without loading the whole document into memory.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+import csv
+import json
+import logging
+from pathlib import Path
+import re
+from typing import Any, NamedTuple
+import uuid
+import xml.etree.ElementTree as ET
+
+from homeassistant.const import CONF_NAME, CONF_UNIQUE_ID
+
+from .const import (
+    CONF_ADS_VAR,
+    CONF_ENTITY_DEVICE_ID,
+    CONF_ENTITY_DEVICE_NAME,
+    AdsType,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+CONF_ENTITY_TYPE = "entity_type"
+CONF_ADS_TYPE = "adstype"
+
+# Chunk size used when streaming JSON exports
+_JSON_CHUNK_SIZE = 64 * 1024
+_JSON_SEPARATOR_RE = re.compile(r"[\s\[\],}]*")
+_JSON_WRAPPER_RE = re.compile(r'\s*\{\s*"symbols"\s*:')
+
+# Map of IEC 61131-3 type names (as found in symbol exports) to AdsType
+_PLC_TYPE_NAMES: dict[str, AdsType] = {
+    "BOOL": AdsType.BOOL,
+    "BIT": AdsType.BOOL,
+    "BYTE": AdsType.BYTE,
+    "INT": AdsType.INT,
+    "UINT": AdsType.UINT,
+    "SINT": AdsType.SINT,
+    "USINT": AdsType.USINT,
+    "DINT": AdsType.DINT,
+    "UDINT": AdsType.UDINT,
+    "WORD": AdsType.WORD,
+    "DWORD": AdsType.DWORD,
+    "REAL": AdsType.REAL,
+    "LREAL": AdsType.LREAL,
+    "STRING": AdsType.STRING,
+    "TIME": AdsType.TIME,
+    "DATE": AdsType.DATE,
+    "DT": AdsType.DATE_AND_TIME,
+    "DATE_AND_TIME": AdsType.DATE_AND_TIME,
+    "TOD": AdsType.TOD,
+    "TIME_OF_DAY": AdsType.TOD,
+}
+
+# Entity types that can be created from a single symbol, with the ADS types
+# each of them accepts.
+_BOOL_ONLY = frozenset({AdsType.BOOL})
+IMPORTABLE_ENTITY_TYPES: dict[str, frozenset[AdsType]] = {
+    "switch": _BOOL_ONLY,
+    "light": _BOOL_ONLY,
+    "valve": _BOOL_ONLY,
+    "binary_sensor": frozenset({AdsType.BOOL, AdsType.REAL}),
+    "sensor": frozenset(AdsType),
+}
+
+# Naming rules applied (in order) after any user supplied rules. A rule maps
+# a regular expression, searched case-insensitively in the symbol name, to an
+# entity type. Symbols matching no rule become binary sensors (BOOL) or
+# sensors (everything else).
+DEFAULT_MAPPING_RULES: tuple[tuple[str, str], ...] = (
+    ("light", r"light|lamp|licht|leuchte"),
+    ("valve", r"valve|ventil"),
+    ("switch", r"switch|schalter|relay|relais|enable|cmd"),
+)
+
+
+class PlcSymbol(NamedTuple):
+    """A symbol read from a symbol export."""
+
+    name: str
+    plc_type: str
+
+
+class SymbolImportError(Exception):
+    """Error to indicate a symbol file could not be parsed."""
+
+
+def normalize_plc_type(plc_type: str) -> AdsType | None:
+    """Return the AdsType for a PLC type name, or None if unsupported.
+
+    Sized strings (``STRING(80)``) map to STRING; structured types, arrays,
+    pointers and references are not importable.
+    """
+    type_name = plc_type.strip().upper()
+    if type_name.startswith("STRING"):
+        return AdsType.STRING
+    return _PLC_TYPE_NAMES.get(type_name)
+
+
+def parse_mapping_rules(text: str | None) -> list[tuple[str, re.Pattern[str]]]:
+    """Parse user mapping rules of the form ``entity_type = regex``.
+
+    One rule per line; blank lines and lines starting with ``#`` are ignored.
+    Raises ValueError on unknown entity types or invalid expressions.
+    """
+    rules: list[tuple[str, re.Pattern[str]]] = []
+    for line in (text or "").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        entity_type, sep, pattern = line.partition("=")
+        entity_type = entity_type.strip()
+        if not sep or entity_type not in IMPORTABLE_ENTITY_TYPES:
+            raise ValueError(f"Invalid mapping rule: {line}")
+        try:
+            rules.append((entity_type, re.compile(pattern.strip(), re.IGNORECASE)))
+        except re.error as err:
+            raise ValueError(f"Invalid mapping rule: {line}") from err
+    return rules
+
+
+def _local_tag(tag: str) -> str:
+    """Strip an XML namespace from a tag name."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def iter_tmc_symbols(path: Path) -> Iterator[PlcSymbol]:
+    """Stream symbols out of a TwinCAT ``.tmc`` module class file.
+
+    Only ``<Symbol>`` elements (the PLC's instance data) are considered;
+    data type definitions are skipped. Processed elements are cleared as
+    soon as they are consumed to keep memory usage flat.
+    """
+    depth_in_symbol = 0
+    try:
+        for event, elem in ET.iterparse(path, events=("start", "end")):
+            tag = _local_tag(elem.tag)
+            if event == "start":
+                if tag == "Symbol":
+                    depth_in_symbol += 1
+                continue
+            if tag == "Symbol":
+                depth_in_symbol -= 1
+                name = type_name = None
+                for child in elem:
+                    child_tag = _local_tag(child.tag)
+                    if child_tag == "Name":
+                        name = (child.text or "").strip()
+                    elif child_tag in ("BaseType", "Type") and type_name is None:
+                        type_name = (child.text or "").strip()
+                if name and type_name:
+                    yield PlcSymbol(name, type_name)
+                elem.clear()
+            elif depth_in_symbol == 0 and tag in ("DataType", "DataArea"):
+                elem.clear()
+    except ET.ParseError as err:
+        raise SymbolImportError(f"Invalid TMC file {path}: {err}") from err
+
+
+def iter_csv_symbols(path: Path) -> Iterator[PlcSymbol]:
+    """Stream symbols out of a CSV symbol export.
+
+    The file may carry a header row with ``name`` and ``type`` columns (in
+    any order, case-insensitive); without a header the first two columns
+    are taken as name and type. Both ``,`` and ``;`` delimiters are accepted.
+    """
+    with path.open(newline="", encoding="utf-8-sig") as csv_file:
+        sample = csv_file.read(4096)
+        csv_file.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+
+        name_col, type_col = 0, 1
+        for index, row in enumerate(csv.reader(csv_file, dialect)):
+            if index == 0:
+                header = [column.strip().lower() for column in row]
+                if "name" in header and "type" in header:
+                    name_col, type_col = header.index("name"), header.index("type")
+                    continue
+            if len(row) <= max(name_col, type_col):
+                continue
+            name, type_name = row[name_col].strip(), row[type_col].strip()
+            if name and type_name:
+                yield PlcSymbol(name, type_name)
+
+
+def _symbol_from_json(obj: Any) -> PlcSymbol | None:
+    """Build a PlcSymbol from a JSON object of a symbol export."""
+    if not isinstance(obj, dict):
+        return None
+    name = obj.get("name") or obj.get("Name")
+    type_name = (
+        obj.get("type") or obj.get("Type") or obj.get("BaseType") or obj.get("datatype")
+    )
+    if not isinstance(name, str) or not isinstance(type_name, str):
+        return None
+    return PlcSymbol(name.strip(), type_name.strip())
+
+
+def iter_json_symbols(path: Path) -> Iterator[PlcSymbol]:
+    """Stream symbols out of a JSON symbol export.
+
+    Accepts a top-level JSON array of symbol objects, an object with a
+    ``symbols`` array, or JSON Lines. Objects are decoded one at a time from
+    a sliding buffer rather than loading the whole document.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    with path.open(encoding="utf-8-sig") as json_file:
+        while True:
+            # Skip whitespace and the array/wrapper punctuation between objects
+            if match := _JSON_WRAPPER_RE.match(buffer, pos):
+                pos = match.end()
+            pos = _JSON_SEPARATOR_RE.match(buffer, pos).end()
+
+            if pos < len(buffer):
+                try:
+                    obj, pos = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError as err:
+                    if eof:
+                        raise SymbolImportError(
+                            f"Invalid JSON file {path}: {err}"
+                        ) from err
+                else:
+                    if (symbol := _symbol_from_json(obj)) is not None:
+                        yield symbol
+                    continue
+            elif eof:
+                return
+
+            # Need more data: drop the consumed part and read the next chunk
+            chunk = json_file.read(_JSON_CHUNK_SIZE)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+
+
+def iter_symbols(path: Path) -> Iterator[PlcSymbol]:
+    """Stream symbols from a symbol file, picking the parser by extension."""
+    suffix = path.suffix.lower()
+    if suffix == ".tmc":
+        return iter_tmc_symbols(path)
+    if suffix == ".csv":
+        return iter_csv_symbols(path)
+    if suffix in (".json", ".jsonl"):
+        return iter_json_symbols(path)
+    raise SymbolImportError(f"Unsupported symbol file type: {path.suffix}")
+
+
+def map_symbol(
+    symbol: PlcSymbol,
+    rules: Iterable[tuple[str, re.Pattern[str]]],
+) -> tuple[str, AdsType] | None:
+    """Return (entity_type, ads_type) for a symbol, or None if not importable."""
+    ads_type = normalize_plc_type(symbol.plc_type)
+    if ads_type is None:
+        return None
+
+    for entity_type, pattern in rules:
+        if ads_type in IMPORTABLE_ENTITY_TYPES[entity_type] and pattern.search(
+            symbol.name
+        ):
+            return entity_type, ads_type
+
+    if ads_type == AdsType.BOOL:
+        return "binary_sensor", ads_type
+    return "sensor", ads_type
+
+
+def build_entity_configs(
+    symbols: Iterable[PlcSymbol],
+    *,
+    symbol_filter: str | None = None,
+    mapping_rules: str | None = None,
+    device_id: str,
+    device_name: str,
+    group_by_prefix: bool = False,
+    existing_ads_vars: set[str] | None = None,
+) -> list[dict[str, Any]]:
+    """Map symbols to entity configs ready to be stored in the entities subentry.
+
+    Symbols not matching ``symbol_filter``, with unsupported types, or whose
+    variable is already configured (``existing_ads_vars``) are skipped. With
+    ``group_by_prefix`` each symbol is assigned to a device named after its
+    namespace (everything before the last ``.``) instead of ``device_id``.
+    """
+    filter_pattern = re.compile(symbol_filter, re.IGNORECASE) if symbol_filter else None
+    rules = [
+        *parse_mapping_rules(mapping_rules),
+        *(
+            (entity_type, re.compile(pattern, re.IGNORECASE))
+            for entity_type, pattern in DEFAULT_MAPPING_RULES
+        ),
+    ]
+    seen_ads_vars = set(existing_ads_vars or ())
+    prefix_devices: dict[str, str] = {}
+    entities: list[dict[str, Any]] = []
+
+    for symbol in symbols:
+        if symbol.name in seen_ads_vars:
+            continue
+        if filter_pattern is not None and not filter_pattern.search(symbol.name):
+            continue
+        mapped = map_symbol(symbol, rules)
+        if mapped is None:
+            continue
+        entity_type, ads_type = mapped
+        seen_ads_vars.add(symbol.name)
+
+        prefix, _, short_name = symbol.name.rpartition(".")
+        entity: dict[str, Any] = {
+            CONF_ENTITY_TYPE: entity_type,
+            CONF_ADS_VAR: symbol.name,
+            CONF_NAME: short_name or symbol.name,
+            CONF_UNIQUE_ID: uuid.uuid4().hex,
+        }
+        if entity_type in ("sensor", "binary_sensor"):
+            entity[CONF_ADS_TYPE] = ads_type.value
+
+        if group_by_prefix and prefix:
+            if prefix not in prefix_devices:
+                prefix_devices[prefix] = uuid.uuid4().hex
+            entity[CONF_ENTITY_DEVICE_ID] = prefix_devices[prefix]
+            entity[CONF_ENTITY_DEVICE_NAME] = prefix
+        else:
+            entity[CONF_ENTITY_DEVICE_ID] = device_id
+            entity[CONF_ENTITY_DEVICE_NAME] = device_name
+
+        entities.append(entity)
+
+    _LOGGER.debug("Mapped %d symbols to entities", len(entities))
+    return entities
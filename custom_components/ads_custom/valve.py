@@ -167,10 +167,10 @@ class AdsValve(AdsEntity, ValveEntity):
             return None
         return not state
 
-    def open_valve(self, **kwargs) -> None:
+    async def async_open_valve(self, **kwargs) -> None:
         """Open the valve."""
-        self._ads_hub.write_by_name(self._ads_var, True, pyads.PLCTYPE_BOOL)
+        await self.async_write_state(True, pyads.PLCTYPE_BOOL)
 
-    def close_valve(self, **kwargs) -> None:
+    async def async_close_valve(self, **kwargs) -> None:
         """Close the valve."""
-        self._ads_hub.write_by_name(self._ads_var, False, pyads.PLCTYPE_BOOL)
+        await self.async_write_state(False, pyads.PLCTYPE_BOOL)
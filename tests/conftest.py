@@ -16,26 +16,7 @@ REPO_ROOT = Path(__file__).resolve().parent.parent
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
-import homeassistant.config_entries as _ce
-
-if not hasattr(_ce, "ConfigSubentry"):
-
-    class _ConfigSubentry:  # noqa: D101
-        def __init__(self, **kwargs):
-            for k, v in kwargs.items():
-                setattr(self, k, v)
-
-    _ce.ConfigSubentry = _ConfigSubentry  # type: ignore[attr-defined]
-
-if not hasattr(_ce, "ConfigSubentryFlow"):
-
-    class _ConfigSubentryFlow:  # noqa: D101
-        pass
-
-    _ce.ConfigSubentryFlow = _ConfigSubentryFlow  # type: ignore[attr-defined]
-
-if not hasattr(_ce, "SubentryFlowResult"):
-    _ce.SubentryFlowResult = dict  # type: ignore[attr-defined]
+from tests import ha_compat  # noqa: E402,F401
 
 # ---------------------------------------------------------------------------
 
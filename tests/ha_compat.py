@@ -0,0 +1,30 @@
+"""Home Assistant compatibility shim for the test suite.
+
+``ConfigSubentry`` was introduced in Home Assistant 2025.7.0 (which requires
+Python 3.13+). On older releases (2025.1.x on Python 3.12) the subentry
+classes are patched in here, so the integration can be imported. Import this
+module before any ``custom_components`` import; the benchmarks reuse it.
+"""
+
+from __future__ import annotations
+
+import homeassistant.config_entries as _ce
+
+if not hasattr(_ce, "ConfigSubentry"):
+
+    class _ConfigSubentry:  # noqa: D101
+        def __init__(self, **kwargs):
+            for k, v in kwargs.items():
+                setattr(self, k, v)
+
+    _ce.ConfigSubentry = _ConfigSubentry  # type: ignore[attr-defined]
+
+if not hasattr(_ce, "ConfigSubentryFlow"):
+
+    class _ConfigSubentryFlow:  # noqa: D101
+        pass
+
+    _ce.ConfigSubentryFlow = _ConfigSubentryFlow  # type: ignore[attr-defined]
+
+if not hasattr(_ce, "SubentryFlowResult"):
+    _ce.SubentryFlowResult = dict  # type: ignore[attr-defined]
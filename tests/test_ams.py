@@ -0,0 +1,419 @@
+"""Tests for the native asyncio ADS client against a local fake AMS server."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pyads
+import pytest
+
+from benchmarks.fake_ams import FakeAmsServer
+from custom_components.ads_custom.ams import AmsClient, AmsConnection
+from custom_components.ads_custom.hub import AdsHub
+
+SYMBOLS = {
+    "GVL.flag": (pyads.PLCTYPE_BOOL, False),
+    "GVL.count": (pyads.PLCTYPE_INT, -5),
+    "GVL.total": (pyads.PLCTYPE_UDINT, 100000),
+    "GVL.temp": (pyads.PLCTYPE_REAL, 21.5),
+    "GVL.text": (pyads.PLCTYPE_STRING, "hello"),
+}
+
+
+@pytest.fixture
+async def server():
+    """Return a started fake AMS server."""
+    server = FakeAmsServer(SYMBOLS, delays={"GVL.temp": 0.1})
+    await server.start()
+    yield server
+    await server.close()
+
+
+@pytest.fixture
+async def client(server):
+    """Return an AmsClient connected to the fake server."""
+    client = AmsClient(
+        "127.0.0.1.1.1", 851, "127.0.0.1", tcp_port=server.port, timeout=1
+    )
+    await client.connect()
+    yield client
+    await client.close()
+
+
+async def _wait_connected(client):
+    """Wait until ``client`` has reconnected."""
+    for _ in range(200):
+        if client.connected:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("client did not reconnect")
+
+
+class TestAmsClient:
+    """Tests for AmsClient."""
+
+    async def test_read_and_write_by_name(self, client, server):
+        """Values round-trip with pyads data types."""
+        assert await client.read_by_name("GVL.count", pyads.PLCTYPE_INT) == -5
+        assert await client.read_by_name("GVL.text", pyads.PLCTYPE_STRING) == "hello"
+        await client.write_by_name("GVL.count", 42, pyads.PLCTYPE_INT)
+        await client.write_by_name("GVL.text", "bye", pyads.PLCTYPE_STRING)
+        assert server.symbols["GVL.count"][1] == 42
+        assert await client.read_by_name("GVL.text", pyads.PLCTYPE_STRING) == "bye"
+        assert await client.read_state() == (5, 0)
+
+    async def test_requests_are_pipelined(self, client, server):
+        """Many requests are outstanding at once and matched by invoke ID."""
+        slow = asyncio.ensure_future(client.read_by_name("GVL.temp", pyads.PLCTYPE_REAL))
+        fast = [
+            client.read_by_name("GVL.total", pyads.PLCTYPE_UDINT) for _ in range(20)
+        ]
+        start = time.monotonic()
+        assert await asyncio.gather(*fast) == [100000] * 20
+        # The fast reads were not queued behind the slow one
+        assert not slow.done()
+        assert time.monotonic() - start < 0.1
+        assert await slow == pytest.approx(21.5)
+        assert server.max_in_flight > 1
+
+    async def test_errors(self, client, server):
+        """ADS errors and timeouts are raised as ADSError."""
+        with pytest.raises(pyads.ADSError) as err:
+            await client.read_by_name("GVL.missing", pyads.PLCTYPE_INT)
+        assert err.value.err_code == 1808
+
+        client.timeout = 0.01
+        with pytest.raises(pyads.ADSError) as err:
+            await client.read_by_name("GVL.temp", pyads.PLCTYPE_REAL)
+        assert err.value.err_code == 1861
+
+    async def test_notifications_on_loop(self, client, server):
+        """Notifications are delivered on the loop, starting with the value."""
+        received = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+
+        def callback(hnotify, filetime, data):
+            assert asyncio.get_running_loop() is loop
+            received.put_nowait((hnotify, filetime, data))
+
+        hnotify, handle = await client.add_device_notification(
+            "GVL.count", pyads.NotificationAttrib(2), callback
+        )
+        first = await asyncio.wait_for(received.get(), 1)
+        assert first[0] == hnotify
+        assert first[1] > 0
+        assert first[2] == (-5).to_bytes(2, "little", signed=True)
+
+        server.set_value("GVL.count", 7)
+        assert (await asyncio.wait_for(received.get(), 1))[2] == b"\x07\x00"
+
+        await client.del_device_notification(hnotify, handle)
+        server.set_value("GVL.count", 8)
+        await asyncio.sleep(0.05)
+        assert received.empty()
+
+    async def test_read_list_by_name(self, client):
+        """Sum reads decode values from the PLC's symbol information."""
+        result = await client.read_list_by_name(["GVL.flag", "GVL.total", "GVL.text"])
+        assert result == {"GVL.flag": False, "GVL.total": 100000, "GVL.text": "hello"}
+
+    async def test_write_list_by_name(self, client, server):
+        """Sum writes encode values from the PLC's symbol information."""
+        result = await client.write_list_by_name({"GVL.count": 9, "GVL.text": "sum"})
+        assert result == {"GVL.count": "no error", "GVL.text": "no error"}
+        assert server.symbols["GVL.count"][1] == 9
+        assert server.symbols["GVL.text"][1] == "sum"
+
+    async def test_del_device_notifications(self, client, server):
+        """Notifications and their symbol handles are released in bulk."""
+        handles = [
+            await client.add_device_notification(
+                name, pyads.NotificationAttrib(2), lambda *args: None
+            )
+            for name in ("GVL.flag", "GVL.count")
+        ]
+        assert await client.del_device_notifications(handles) == [0, 0]
+        assert server._notifications == {}
+        assert server._handles == {}
+        assert await client.del_device_notifications(handles[:1]) != [0]
+
+    async def test_connection_lost_fails_pending(self, client, server):
+        """Outstanding requests fail when the connection drops, then it is reopened."""
+        pending = asyncio.ensure_future(client.read_by_name("GVL.temp", pyads.PLCTYPE_REAL))
+        await asyncio.sleep(0.01)
+        server.drop_connections()
+        with pytest.raises(pyads.ADSError) as err:
+            await pending
+        assert err.value.err_code == 1864
+        await _wait_connected(client)
+        assert await client.read_by_name("GVL.count", pyads.PLCTYPE_INT) == -5
+
+    async def test_notifications_resume_after_reconnect(self, client, server):
+        """Notifications are registered again and keep the caller's handle."""
+        received = []
+        handle, _symbol_handle = await client.add_device_notification(
+            "GVL.count",
+            pyads.NotificationAttrib(2),
+            lambda hnotify, filetime, data: received.append((hnotify, data)),
+        )
+        await asyncio.sleep(0.05)
+        server.drop_connections()
+        await asyncio.sleep(0.01)
+        await _wait_connected(client)
+        # The restored handle sends its current value, then every change
+        await asyncio.sleep(0.05)
+        server.set_value("GVL.count", 7)
+        await asyncio.sleep(0.05)
+
+        assert received[-1] == (handle, (7).to_bytes(2, "little"))
+        assert all(hnotify == handle for hnotify, _data in received)
+        await client.del_device_notification(handle, None)
+        assert server._notifications == {}
+
+    async def test_close_stops_reconnecting(self, server):
+        """A closed client does not reconnect."""
+        client = AmsClient(
+            "127.0.0.1.1.1", 851, "127.0.0.1", tcp_port=server.port, timeout=1
+        )
+        await client.connect()
+        await client.close()
+        await asyncio.sleep(0.05)
+        assert not client.connected
+        assert server._transports == set()
+
+
+class TestAmsConnection:
+    """Tests for the pyads-compatible blocking wrapper."""
+
+    async def test_hub_on_ams_connection(self, server):
+        """AdsHub works unmodified on top of AmsConnection."""
+        connection = AmsConnection(
+            "127.0.0.1.1.1", 851, "127.0.0.1", tcp_port=server.port, timeout=1
+        )
+        loop = asyncio.get_running_loop()
+        received = []
+        changed = threading.Event()
+
+        def callback(name, value):
+            received.append(value)
+            if value == 3:
+                changed.set()
+
+        def run():
+            hub = AdsHub(connection)
+            try:
+                hub.add_device_notification("GVL.count", pyads.PLCTYPE_INT, callback)
+                hub.write_by_name("GVL.count", 3, pyads.PLCTYPE_INT)
+                assert changed.wait(2)
+                assert hub.read_by_name("GVL.total", pyads.PLCTYPE_UDINT) == 100000
+                assert hub.read_list_by_name(["GVL.flag"]) == {"GVL.flag": False}
+            finally:
+                hub.shutdown()
+
+        # The blocking wrapper must not be used on the server's loop
+        await loop.run_in_executor(None, run)
+        assert received == [-5, 3]
+        assert not connection.is_open
+
+    async def test_hub_survives_connection_drop(self, server):
+        """The hub's subscriptions keep delivering after a reconnect."""
+        connection = AmsConnection(
+            "127.0.0.1.1.1", 851, "127.0.0.1", tcp_port=server.port, timeout=1
+        )
+        loop = asyncio.get_running_loop()
+        received = []
+        changed = threading.Event()
+
+        def callback(name, value):
+            received.append(value)
+            if value == 9:
+                changed.set()
+
+        def run():
+            hub = AdsHub(connection)
+            try:
+                hub.add_device_notification("GVL.count", pyads.PLCTYPE_INT, callback)
+                (subscription,) = connection._client._subscriptions.values()
+                first = subscription.notification_handle
+                loop.call_soon_threadsafe(server.drop_connections)
+                # Registered again under a new handle of the target
+                deadline = time.monotonic() + 2
+                while subscription.notification_handle == first:
+                    assert time.monotonic() < deadline
+                    time.sleep(0.01)
+                connection.write_by_name("GVL.count", 9, pyads.PLCTYPE_INT)
+                assert changed.wait(2)
+                assert hub.metrics.unknown_notifications == 0
+            finally:
+                hub.shutdown()
+
+        await loop.run_in_executor(None, run)
+        assert received[0] == -5
+        assert received[-1] == 9
+        assert server._notifications == {}
+
+    async def test_hub_with_several_ams_ports(self, server):
+        """Further ports share the connection; ``port:symbol`` routes to them."""
+        connection = AmsConnection(
+            "127.0.0.1.1.1", 851, "127.0.0.1", tcp_port=server.port, timeout=1
+        )
+        loop = asyncio.get_running_loop()
+        received = []
+        changed = threading.Event()
+
+        def callback(name, value):
+            received.append((name, value))
+            if len(received) == 4:
+                changed.set()
+
+        def run():
+            hub = AdsHub(connection, connection.for_port)
+            try:
+                hub.add_device_notification("GVL.count", pyads.PLCTYPE_INT, callback)
+                hub.add_device_notification(
+                    "852:GVL.count", pyads.PLCTYPE_INT, callback
+                )
+                assert hub.write_batch(
+                    [("852:GVL.count", 3, pyads.PLCTYPE_INT)]
+                ) == [True]
+                assert changed.wait(2)
+                assert hub.read_list_by_name(["GVL.flag", "852:GVL.total"]) == {
+                    "GVL.flag": False,
+                    "852:GVL.total": 100000,
+                }
+                assert hub.ams_ports == [852]
+                assert len(server._transports) == 1
+            finally:
+                hub.shutdown()
+
+        await loop.run_in_executor(None, run)
+        assert sorted(received) == [
+            ("852:GVL.count", -5),
+            ("852:GVL.count", 3),
+            ("GVL.count", -5),
+            ("GVL.count", 3),
+        ]
+        assert server.target_ports == {851, 852}
+        assert server._notifications == {}
+        assert not connection.is_open
+
+    async def test_online_change_re_resolves_changed_symbols(self, server):
+        """Only moved symbols get new handles; missing ones are picked up."""
+        connection = AmsConnection(
+            "127.0.0.1.1.1", 851, "127.0.0.1", tcp_port=server.port, timeout=1
+        )
+        loop = asyncio.get_running_loop()
+        received = []
+        delivered = threading.Event()
+
+        def callback(name, value):
+            received.append((name, value))
+            if name == "GVL.new":
+                delivered.set()
+
+        def wait_for(condition):
+            deadline = time.monotonic() + 2
+            while not condition():
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+
+        def handles(hub):
+            return {item.name: item.hnotify for item in hub._subscriptions.values()}
+
+        def run():
+            hub = AdsHub(connection)
+            try:
+                hub.watch_symbol_version()
+                for name, plc_datatype in (
+                    ("GVL.flag", pyads.PLCTYPE_BOOL),
+                    ("GVL.text", pyads.PLCTYPE_STRING),
+                    ("GVL.new", pyads.PLCTYPE_INT),
+                ):
+                    hub.add_device_notification(name, plc_datatype, callback)
+                assert hub.unavailable_symbols == ["GVL.new"]
+                wait_for(
+                    lambda: all(
+                        item.layout for item in hub._notification_items.values()
+                    )
+                )
+                before = handles(hub)
+
+                # Removing GVL.temp moves GVL.text behind it
+                symbols = {
+                    name: entry for name, entry in SYMBOLS.items() if name != "GVL.temp"
+                }
+                symbols["GVL.new"] = (pyads.PLCTYPE_INT, 7)
+                loop.call_soon_threadsafe(server.online_change, symbols)
+
+                assert delivered.wait(2)
+                wait_for(lambda: ("GVL.text", "hello") in received[2:])
+                after = handles(hub)
+                assert after["GVL.flag"] == before["GVL.flag"]
+                assert after["GVL.text"] != before["GVL.text"]
+                assert hub.unavailable_symbols == []
+                assert hub.metrics.online_changes == 1
+            finally:
+                hub.shutdown()
+
+        await loop.run_in_executor(None, run)
+        assert ("GVL.new", 7) in received
+        assert server._notifications == {}
+
+    async def test_plc_stop_suspends_and_run_refreshes(self, server):
+        """STOP rejects writes; RUN delivers values changed in between."""
+        connection = AmsConnection(
+            "127.0.0.1.1.1", 851, "127.0.0.1", tcp_port=server.port, timeout=1
+        )
+        loop = asyncio.get_running_loop()
+        received = []
+        available = []
+        refreshed = threading.Event()
+
+        def callback(name, value):
+            received.append(value)
+            if value == 42:
+                refreshed.set()
+
+        def wait_for(condition):
+            deadline = time.monotonic() + 2
+            while not condition():
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+
+        def run():
+            hub = AdsHub(connection)
+            try:
+                hub.watch_ads_state()
+                hub.add_device_notification(
+                    "GVL.count",
+                    pyads.PLCTYPE_INT,
+                    callback,
+                    availability_callback=lambda name, value: available.append(value),
+                )
+                wait_for(lambda: hub.plc_state == "run" and received)
+
+                loop.call_soon_threadsafe(server.set_ads_state, 6)
+                wait_for(lambda: available == [False])
+                assert hub.write_batch([("GVL.count", 1, pyads.PLCTYPE_INT)]) == [False]
+                # Changed without a notification, e.g. by a restart
+                server.symbols["GVL.count"] = (pyads.PLCTYPE_INT, 42)
+
+                loop.call_soon_threadsafe(server.set_ads_state, 5)
+                assert refreshed.wait(2)
+                wait_for(lambda: available == [False, True])
+            finally:
+                hub.shutdown()
+
+        await loop.run_in_executor(None, run)
+        assert received == [-5, 42]
+        assert server.symbols["GVL.count"] == (pyads.PLCTYPE_INT, 42)
+        assert server._notifications == {}
+
+    async def test_open_failure(self):
+        """A refused connection raises ADSError from open()."""
+        connection = AmsConnection("127.0.0.1.1.1", 851, "127.0.0.1", tcp_port=1)
+        loop = asyncio.get_running_loop()
+        with pytest.raises(pyads.ADSError):
+            await loop.run_in_executor(None, AdsHub, connection)
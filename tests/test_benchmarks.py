@@ -0,0 +1,27 @@
+"""Smoke tests for the benchmark suite."""
+
+from __future__ import annotations
+
+import pytest
+
+from benchmarks.run_benchmarks import BENCHMARKS, compare, run_benchmarks
+
+
+class TestBenchmarks:
+    """Tests that the benchmarks keep running against the current code."""
+
+    @pytest.mark.parametrize("name", sorted(BENCHMARKS))
+    def test_benchmark_runs(self, name):
+        """Every benchmark should run and report per-item statistics."""
+        report = run_benchmarks([name], scale=5)
+        result = report["results"][name]
+        assert result["median_us"] > 0
+        assert result["ops_per_sec"] > 0
+
+    def test_compare_flags_regressions(self):
+        """compare() should report benchmarks slower than the threshold."""
+        baseline = {"version": "1.0.0", "results": {"a": {"median_us": 1.0}, "b": {"median_us": 1.0}}}
+        report = {"results": {"a": {"median_us": 1.5}, "b": {"median_us": 1.1}}}
+        regressions = compare(report, baseline, threshold=0.2)
+        assert len(regressions) == 1
+        assert regressions[0].startswith("a:")
@@ -0,0 +1,70 @@
+"""Tests for the hub's last-known-value cache."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pyads
+
+from custom_components.ads_custom.cache import ValueCache
+from custom_components.ads_custom.metrics import HubMetrics
+
+
+class TestValueCache:
+    """Tests for ValueCache freshness rules and statistics."""
+
+    def test_fresh_value_is_a_hit(self):
+        """A value within the maximum age is returned and counted."""
+        cache = ValueCache(HubMetrics(), max_age=5)
+        cache.update("GVL.a", pyads.PLCTYPE_INT, 7)
+        assert cache.get("GVL.a", pyads.PLCTYPE_INT) == 7
+        assert cache.get("GVL.b", pyads.PLCTYPE_INT) is None
+        assert cache.metrics.cache_hits == 1
+        assert cache.metrics.cache_misses == 1
+        assert cache.metrics.cache_hit_rate() == 50.0
+
+    def test_stale_value_is_a_miss(self):
+        """Values older than the maximum age are not served."""
+        cache = ValueCache(HubMetrics(), max_age=5)
+        with patch("custom_components.ads_custom.cache.time.monotonic", return_value=100):
+            cache.update("GVL.a", pyads.PLCTYPE_INT, 7)
+        with patch("custom_components.ads_custom.cache.time.monotonic", return_value=106):
+            assert cache.get("GVL.a", pyads.PLCTYPE_INT) is None
+            assert cache.get("GVL.a", pyads.PLCTYPE_INT, max_age=10) == 7
+
+    def test_live_value_never_expires(self):
+        """Values kept current by a notification handle are always fresh."""
+        cache = ValueCache(HubMetrics(), max_age=0)
+        cache.update("GVL.a", pyads.PLCTYPE_BOOL, True)
+        cache.set_live("GVL.a", pyads.PLCTYPE_BOOL, True)
+        assert cache.get("GVL.a", pyads.PLCTYPE_BOOL) is True
+
+        cache.set_live("GVL.a", pyads.PLCTYPE_BOOL, False)
+        assert cache.get("GVL.a", pyads.PLCTYPE_BOOL) is None
+
+    def test_live_per_data_type(self):
+        """Releasing one type's handle keeps the other type of a symbol live."""
+        cache = ValueCache(HubMetrics(), max_age=0)
+        cache.set_live("GVL.a", pyads.PLCTYPE_INT, True)
+        cache.set_live("GVL.a", pyads.PLCTYPE_UINT, True)
+        cache.update("GVL.a", pyads.PLCTYPE_UINT, 7)
+
+        cache.set_live("GVL.a", pyads.PLCTYPE_INT, False)
+        assert cache.get("GVL.a", pyads.PLCTYPE_UINT) == 7
+        assert cache.is_current("GVL.a", pyads.PLCTYPE_UINT, 7)
+        cache.update_if_live("GVL.a", pyads.PLCTYPE_UINT, 8)
+        assert cache.get("GVL.a", None) == 8
+
+        cache.set_live("GVL.a", pyads.PLCTYPE_UINT, False)
+        assert cache.get("GVL.a", pyads.PLCTYPE_UINT) is None
+        assert not cache.is_current("GVL.a", pyads.PLCTYPE_UINT, 8)
+
+    def test_other_data_type_is_a_miss(self):
+        """A value cached with another data type is not reinterpreted.
+
+        Reads that let the PLC decide the type accept any cached type.
+        """
+        cache = ValueCache(HubMetrics())
+        cache.update("GVL.a", pyads.PLCTYPE_INT, 7)
+        assert cache.get("GVL.a", pyads.PLCTYPE_DINT) is None
+        assert cache.get("GVL.a", None) == 7
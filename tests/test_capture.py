@@ -0,0 +1,129 @@
+"""Tests for notification capture and replay."""
+
+from __future__ import annotations
+
+import struct
+
+import pyads
+import pytest
+
+from benchmarks.common import FakeAdsClient, NotificationBuffer
+from benchmarks.replay import replay
+from custom_components.ads_custom.capture import (
+    CaptureError,
+    NotificationRecorder,
+    capture_files,
+    read_capture,
+)
+from custom_components.ads_custom.hub import AdsHub
+
+
+def _capture(hub: AdsHub, hnotify: int, payload: bytes, timestamp: int = 0) -> None:
+    """Fire one notification through the hub."""
+    hub._device_notification_callback(
+        NotificationBuffer(hnotify, payload, timestamp).pointer, ""
+    )
+
+
+class TestNotificationRecorder:
+    """Tests for the binary capture format."""
+
+    def test_round_trip(self, tmp_path):
+        """Records are read back with symbol, type, timestamp and payload."""
+        path = tmp_path / "capture.bin"
+        recorder = NotificationRecorder(path)
+        recorder.record(7, "GVL.bLamp", pyads.PLCTYPE_BOOL, 123, b"\x01")
+        recorder.record(8, "GVL.nValue", pyads.PLCTYPE_INT, 456, struct.pack("<h", -5))
+        recorder.record(7, "GVL.bLamp", pyads.PLCTYPE_BOOL, 789, b"\x00")
+        recorder.close()
+
+        records = list(read_capture(path))
+        assert [(r.hnotify, r.name, r.timestamp, r.payload) for r in records] == [
+            (7, "GVL.bLamp", 123, b"\x01"),
+            (8, "GVL.nValue", 456, struct.pack("<h", -5)),
+            (7, "GVL.bLamp", 789, b"\x00"),
+        ]
+        assert records[1].plc_datatype is pyads.PLCTYPE_INT
+        assert records[0].elapsed <= records[2].elapsed
+
+    def test_rotation_bounds_size(self, tmp_path):
+        """Rotated files are capped and each one can be read on its own."""
+        path = tmp_path / "capture.bin"
+        recorder = NotificationRecorder(path, max_bytes=200, backup_count=2)
+        for index in range(50):
+            recorder.record(1, "GVL.nCounter", pyads.PLCTYPE_DINT, index, struct.pack("<i", index))
+        recorder.close()
+
+        files = capture_files(path)
+        assert [f.name for f in files] == ["capture.bin.2", "capture.bin.1", "capture.bin"]
+        assert all(f.stat().st_size <= 200 for f in files)
+        timestamps = [r.timestamp for r in read_capture(path)]
+        assert timestamps == list(range(50 - len(timestamps), 50))
+
+    def test_truncated_file_is_tolerated(self, tmp_path):
+        """A record cut off by an unclean shutdown ends the capture."""
+        path = tmp_path / "capture.bin"
+        recorder = NotificationRecorder(path)
+        recorder.record(1, "GVL.a", pyads.PLCTYPE_BOOL, 1, b"\x01")
+        recorder.record(1, "GVL.a", pyads.PLCTYPE_BOOL, 2, b"\x00")
+        recorder.close()
+        path.write_bytes(path.read_bytes()[:-3])
+        assert [r.timestamp for r in read_capture(path)] == [1]
+
+    def test_invalid_file_raises(self, tmp_path):
+        """Non-capture files and missing captures raise CaptureError."""
+        path = tmp_path / "capture.bin"
+        path.write_bytes(b"not a capture")
+        with pytest.raises(CaptureError):
+            list(read_capture(path))
+        with pytest.raises(CaptureError):
+            list(read_capture(tmp_path / "missing.bin"))
+
+
+class TestHubCapture:
+    """Tests for capturing through AdsHub."""
+
+    def test_capture_records_raw_notifications(self, tmp_path):
+        """Only notifications received while capturing are written."""
+        hub = AdsHub(FakeAdsClient())
+        hub.add_device_notification("GVL.nValue", pyads.PLCTYPE_INT, lambda n, v: None)
+        _capture(hub, 1, struct.pack("<h", 1))
+
+        path = tmp_path / "capture.bin"
+        hub.start_capture(path)
+        assert hub.capture_active
+        _capture(hub, 1, struct.pack("<h", 2), timestamp=42)
+        _capture(hub, 99, b"\x00")  # unknown handle is not captured
+        assert hub.stop_capture() == 1
+        assert not hub.capture_active
+        _capture(hub, 1, struct.pack("<h", 3))
+
+        records = list(read_capture(path))
+        assert [(r.name, r.timestamp, r.payload) for r in records] == [
+            ("GVL.nValue", 42, struct.pack("<h", 2))
+        ]
+
+    def test_shutdown_stops_capture(self, tmp_path):
+        """shutdown() closes an active capture."""
+        hub = AdsHub(FakeAdsClient())
+        hub.start_capture(tmp_path / "capture.bin")
+        hub.shutdown()
+        assert not hub.capture_active
+
+
+class TestReplay:
+    """Tests for the replay tool."""
+
+    @pytest.mark.parametrize("entities", [False, True])
+    def test_replay(self, tmp_path, entities):
+        """A capture is replayed through the hub (and entities)."""
+        path = tmp_path / "capture.bin"
+        recorder = NotificationRecorder(path)
+        for index in range(20):
+            recorder.record(index % 4, f"GVL.n{index % 4}", pyads.PLCTYPE_INT, index, struct.pack("<h", index))
+        recorder.close()
+
+        report = replay(str(path), speed=0, entities=entities)
+        assert report["records"] == 20
+        assert report["symbols"] == 4
+        assert report["delivered"] == 20
@@ -0,0 +1,123 @@
+"""Tests for the registry sharing hubs between connection consumers."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pyads
+import pytest
+
+from custom_components.ads_custom.connections import (
+    ConnectionRegistry,
+    connection_key,
+)
+
+
+class TestConnectionKey:
+    """Tests for connection_key."""
+
+    def test_defaults(self):
+        """A missing IP address and port match their defaults."""
+        assert connection_key({"device": "5.1.2.3.1.1"}) == ("5.1.2.3.1.1", None, 48898)
+        assert connection_key(
+            {"device": "5.1.2.3.1.1", "ip_address": "", "port": 48898}
+        ) == connection_key({"device": "5.1.2.3.1.1"})
+
+    def test_ip_address_and_port_distinguish(self):
+        """The same Net ID through another address is another connection."""
+        key = connection_key({"device": "5.1.2.3.1.1", "ip_address": "10.0.0.2"})
+        assert key != connection_key({"device": "5.1.2.3.1.1"})
+        assert key != connection_key(
+            {"device": "5.1.2.3.1.1", "ip_address": "10.0.0.2", "port": 851}
+        )
+
+
+class TestConnectionRegistry:
+    """Tests for ConnectionRegistry."""
+
+    async def test_consumers_share_one_hub(self):
+        """The hub is created once and shut down after the last release."""
+        registry = ConnectionRegistry()
+        hub = MagicMock()
+        created = []
+
+        async def create():
+            created.append(hub)
+            return hub
+
+        key = ("5.1.2.3.1.1", None, 48898)
+        assert await registry.async_acquire(key, "connection", create) is hub
+        assert await registry.async_acquire(key, "entry-a", create) is hub
+        assert created == [hub]
+        assert registry.user_count(hub) == 2
+
+        assert registry.release(hub, "entry-a") is False
+        assert registry.release(hub, "connection") is True
+        assert registry.user_count(hub) == 0
+
+    async def test_concurrent_setup_connects_once(self):
+        """Consumers set up at the same time wait for the first connection."""
+        registry = ConnectionRegistry()
+        calls = 0
+
+        async def create():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return MagicMock()
+
+        key = ("5.1.2.3.1.1", None, 48898)
+        first, second = await asyncio.gather(
+            registry.async_acquire(key, "connection", create),
+            registry.async_acquire(key, "entry-a", create),
+        )
+        assert first is second
+        assert calls == 1
+
+    async def test_failed_connection_is_not_registered(self):
+        """A connection error propagates and the next consumer retries."""
+        registry = ConnectionRegistry()
+        key = ("5.1.2.3.1.1", None, 48898)
+
+        async def fail():
+            raise pyads.ADSError(text="unreachable")
+
+        with pytest.raises(pyads.ADSError):
+            await registry.async_acquire(key, "entry-a", fail)
+
+        hub = MagicMock()
+
+        async def create():
+            return hub
+
+        assert await registry.async_acquire(key, "entry-a", create) is hub
+        assert registry.user_count(hub) == 1
+
+    def test_unregistered_hub_is_owned_by_caller(self):
+        """Releasing a hub the registry does not know asks for shutdown."""
+        assert ConnectionRegistry().release(MagicMock(), "entry-a") is True
+
+    async def test_release_callbacks_run_on_last_release(self):
+        """Callbacks registered for a connection run once it is released."""
+        registry = ConnectionRegistry()
+        hub = MagicMock()
+        released = []
+        key = ("5.1.2.3.1.1", None, 48898)
+
+        async def create():
+            registry.add_release_callback(key, lambda: released.append(hub))
+            return hub
+
+        await registry.async_acquire(key, "connection", create)
+        await registry.async_acquire(key, "entry-a", create)
+
+        registry.release(hub, "entry-a")
+        assert released == []
+        registry.release(hub, "connection")
+        assert released == [hub]
+
+        # A new hub for the same connection starts without callbacks
+        await registry.async_acquire(key, "entry-a", create)
+        registry.release(hub, "entry-a")
+        assert released == [hub, hub]
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pyads
 
@@ -22,6 +22,7 @@ def _make_cover(
 ) -> tuple[AdsCover, MagicMock]:
     """Create an AdsCover with a mock hub, returning (cover, hub_mock)."""
     hub = MagicMock()
+    hub.async_write_by_name = AsyncMock(return_value=True)
     cover = AdsCover(
         ads_hub=hub,
         ads_var_closed_state=None,
@@ -182,35 +183,35 @@ class TestAdsCoverPositionProperties:
 class TestAdsCoverActions:
     """Tests for AdsCover action methods."""
 
-    def test_set_cover_position_normal_mode(self):
+    async def test_set_cover_position_normal_mode(self):
         """set_cover_position should write position as-is in normal mode."""
         cover, hub = _make_cover(ads_var_position="GVL.position", inverted=False)
-        cover.set_cover_position(position=75)
-        hub.write_by_name.assert_called_once_with(
+        await cover.async_set_cover_position(position=75)
+        hub.async_write_by_name.assert_called_once_with(
             "GVL.cover_set_pos", 75, pyads.PLCTYPE_BYTE
         )
 
-    def test_set_cover_position_inverted_mode(self):
+    async def test_set_cover_position_inverted_mode(self):
         """set_cover_position should invert position in inverted mode."""
         cover, hub = _make_cover(ads_var_position="GVL.position", inverted=True)
-        cover.set_cover_position(position=75)
-        hub.write_by_name.assert_called_once_with(
+        await cover.async_set_cover_position(position=75)
+        hub.async_write_by_name.assert_called_once_with(
             "GVL.cover_set_pos", 25, pyads.PLCTYPE_BYTE
         )
 
-    def test_open_cover_writes_true(self):
+    async def test_open_cover_writes_true(self):
         """open_cover should write True to the open variable."""
         cover, hub = _make_cover(ads_var_position="GVL.position")
-        cover.open_cover()
-        hub.write_by_name.assert_any_call("GVL.cover_open", True, pyads.PLCTYPE_BOOL)
+        await cover.async_open_cover()
+        hub.async_write_by_name.assert_any_call("GVL.cover_open", True, pyads.PLCTYPE_BOOL)
 
-    def test_close_cover_writes_true(self):
+    async def test_close_cover_writes_true(self):
         """close_cover should write True to the close variable."""
         cover, hub = _make_cover(ads_var_position="GVL.position")
-        cover.close_cover()
-        hub.write_by_name.assert_any_call("GVL.cover_close", True, pyads.PLCTYPE_BOOL)
+        await cover.async_close_cover()
+        hub.async_write_by_name.assert_any_call("GVL.cover_close", True, pyads.PLCTYPE_BOOL)
 
-    def test_stop_cover_resets_movement_state(self):
+    async def test_stop_cover_resets_movement_state(self):
         """stop_cover should reset prev_position so is_opening/is_closing return False."""
         cover, hub = _make_cover(
             ads_var_position="GVL.position", ads_var_stop="GVL.cover_stop"
@@ -220,7 +221,7 @@ class TestAdsCoverActions:
         # Cover appears to be opening
         assert cover.is_opening is True
         # Stop the cover
-        cover.stop_cover()
+        await cover.async_stop_cover()
         # After stop, prev_position == current_position → not moving
         assert cover.is_opening is False
         assert cover.is_closing is False
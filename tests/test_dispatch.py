@@ -0,0 +1,86 @@
+"""Tests for the priority lanes of the state dispatcher."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+from custom_components.ads_custom.dispatch import (
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    StateDispatcher,
+)
+from custom_components.ads_custom.metrics import HubMetrics
+
+
+class TestStateDispatcher:
+    """Tests for StateDispatcher."""
+
+    async def test_high_priority_is_written_immediately(self):
+        """Every high-priority update is scheduled on its own."""
+        loop = asyncio.get_running_loop()
+        dispatcher = StateDispatcher(HubMetrics(), low_priority_interval=10)
+        entity = MagicMock()
+        for plc_time in (1.0, 2.0):
+            await loop.run_in_executor(
+                None, dispatcher.dispatch, entity, loop, PRIORITY_HIGH, plc_time
+            )
+        await asyncio.sleep(0)
+
+        assert entity._async_write_notified_state.call_count == 2
+        assert dispatcher.metrics.high_priority_dispatches == 2
+
+    async def test_low_priority_is_coalesced(self):
+        """Low-priority updates are batched and only the latest is written."""
+        loop = asyncio.get_running_loop()
+        dispatcher = StateDispatcher(HubMetrics(), low_priority_interval=0.01)
+        first, second = MagicMock(), MagicMock()
+
+        def burst():
+            for plc_time in (1.0, 2.0, 3.0):
+                dispatcher.dispatch(first, loop, PRIORITY_LOW, plc_time)
+            dispatcher.dispatch(second, loop, PRIORITY_LOW)
+
+        start = time.perf_counter()
+        await loop.run_in_executor(None, burst)
+        assert dispatcher.low_priority_queue == 2
+        await asyncio.sleep(0.05)
+
+        queued, plc_time = first._async_write_notified_state.call_args.args
+        assert plc_time == 3.0
+        assert queued >= start
+        first._async_write_notified_state.assert_called_once()
+        second._async_write_notified_state.assert_called_once()
+        assert dispatcher.metrics.coalesced_updates == 2
+        assert dispatcher.metrics.low_priority_batches == 1
+        assert dispatcher.low_priority_queue == 0
+
+    async def test_discard_drops_pending_write(self):
+        """A removed entity is not written by the next batch."""
+        loop = asyncio.get_running_loop()
+        dispatcher = StateDispatcher(HubMetrics(), low_priority_interval=0.01)
+        entity = MagicMock()
+        dispatcher.dispatch(entity, loop, PRIORITY_LOW)
+        dispatcher.discard(entity)
+        await asyncio.sleep(0.05)
+        entity._async_write_notified_state.assert_not_called()
+
+
+class TestEntityPriority:
+    """Tests for the priority of ADS entities."""
+
+    def test_sensor_uses_low_priority_lane(self, ads_hub):
+        """Sensors record their latency in the low-priority window."""
+        from custom_components.ads_custom.entity import AdsEntity
+        from custom_components.ads_custom.sensor import AdsSensor
+
+        assert AdsEntity._ads_priority == PRIORITY_HIGH
+        assert AdsSensor._ads_priority == PRIORITY_LOW
+        entity = AdsEntity(ads_hub, "Test", "GVL.n")
+        entity._ads_priority = PRIORITY_LOW
+        entity.async_write_ha_state = MagicMock()
+        entity._async_write_notified_state(time.perf_counter())
+
+        assert ads_hub.metrics.low_priority_dispatch_latency.count == 1
+        assert ads_hub.metrics.dispatch_latency.count == 0
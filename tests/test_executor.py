@@ -0,0 +1,62 @@
+"""Tests for the per-hub ADS executor."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from custom_components.ads_custom.executor import HubExecutor
+from custom_components.ads_custom.metrics import HubMetrics
+
+
+@pytest.fixture
+def executor():
+    """Return a HubExecutor that is shut down after the test."""
+    executor = HubExecutor(HubMetrics())
+    yield executor
+    executor.shutdown()
+
+
+class TestHubExecutor:
+    """Tests for HubExecutor."""
+
+    async def test_runs_on_dedicated_thread(self, executor):
+        """Jobs run on the hub's own worker and return their result."""
+        name = await executor.async_run(lambda: threading.current_thread().name)
+        assert name.startswith("ads_custom_io")
+        assert await executor.async_run(sum, (1, 2, 3)) == 6
+
+    async def test_jobs_are_serialised(self, executor):
+        """A single worker runs the jobs one at a time, in order."""
+        release = threading.Event()
+        order = []
+
+        def job(index):
+            if index == 0:
+                release.wait(1)
+            order.append(index)
+
+        jobs = [asyncio.ensure_future(executor.async_run(job, i)) for i in range(3)]
+        await asyncio.sleep(0)
+        assert executor.queue_depth == 3
+        release.set()
+        await asyncio.gather(*jobs)
+
+        assert order == [0, 1, 2]
+        snapshot = executor.metrics.snapshot(0)
+        assert snapshot["io_queue_depth"] == 0
+        assert snapshot["io_queue_peak"] == 3
+        assert snapshot["io_jobs"] == 3
+        assert snapshot["io_wait_ms"]["count"] == 3
+
+    async def test_exception_is_raised_and_counted(self, executor):
+        """A failing job still counts as completed."""
+
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            await executor.async_run(fail)
+        assert executor.queue_depth == 0
@@ -0,0 +1,140 @@
+"""Tests for the fake PLC load/soak harness."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pyads
+import pytest
+
+from benchmarks.fake_plc import FakePlc
+from benchmarks.soak import run_soak
+from custom_components.ads_custom.hub import AdsHub
+
+
+def _wait_for(predicate, timeout=2.0):
+    """Wait until predicate() is true or the timeout expires."""
+    end = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > end:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+class TestFakePlc:
+    """Tests for the FakePlc client."""
+
+    def test_notifications_decode_through_hub(self):
+        """Initial values and generated changes reach hub callbacks decoded."""
+        plc = FakePlc(8, seed=1)
+        hub = AdsHub(plc)
+        received = {}
+        done = threading.Event()
+
+        def callback(name, value):
+            received.setdefault(name, []).append(value)
+            if len(received.get("GVL.var1", [])) >= 3:
+                done.set()
+
+        try:
+            for name, symbol in plc.symbols.items():
+                hub.add_device_notification(name, symbol.plc_datatype, callback)
+            assert _wait_for(lambda: len(received) == 8)
+            assert received["GVL.var0"] == [False]
+            assert received["GVL.var7"] == ["state 0"]
+
+            plc.write_by_name("GVL.var1", 5)
+            plc.write_by_name("GVL.var1", -2)
+            assert done.wait(2)
+            assert received["GVL.var1"] == [0, 5, -2]
+        finally:
+            hub.shutdown()
+
+    def test_polling_fallback_through_hub(self):
+        """Symbols over the notification budget are polled with sum reads."""
+        plc = FakePlc(4, seed=1)
+        hub = AdsHub(plc)
+        hub.notification_budget = 1
+        hub.poll_fallback_interval = 0.01
+        received = {}
+
+        def callback(name, value):
+            received.setdefault(name, []).append(value)
+
+        try:
+            for name, symbol in plc.symbols.items():
+                hub.add_device_notification(name, symbol.plc_datatype, callback)
+            assert hub.active_notifications == 1
+            assert hub.polled_symbols == 3
+            assert _wait_for(lambda: len(received) == 4)
+
+            plc.write_by_name("GVL.var2", 7)
+            assert _wait_for(lambda: received["GVL.var2"][-1] == 7)
+            assert received["GVL.var2"] == [0, 7]
+        finally:
+            hub.shutdown()
+
+    def test_change_rate(self):
+        """The worker thread changes subscribed symbols at the given rate."""
+        plc = FakePlc(4, change_rate=500)
+        hub = AdsHub(plc)
+        count = 0
+
+        def callback(name, value):
+            nonlocal count
+            count += 1
+
+        try:
+            hub.add_device_notification("GVL.var2", pyads.PLCTYPE_UDINT, callback)
+            assert _wait_for(lambda: count > 20)
+        finally:
+            hub.shutdown()
+        assert plc.stats["changes"] >= 20
+
+    def test_injected_errors(self):
+        """error_rate makes calls raise ADSError, which the hub logs."""
+        plc = FakePlc(1, error_rate=1.0)
+        hub = AdsHub(plc)
+        try:
+            with pytest.raises(pyads.ADSError):
+                plc.read_by_name("GVL.var0")
+            assert hub.read_by_name("GVL.var0", pyads.PLCTYPE_BOOL) is None
+        finally:
+            plc.error_rate = 0.0
+            hub.shutdown()
+        assert plc.stats["errors_injected"] == 2
+
+    def test_unknown_symbol(self):
+        """Unknown symbols raise ADSError like a real PLC."""
+        plc = FakePlc(1)
+        with pytest.raises(pyads.ADSError):
+            plc.read_by_name("GVL.missing")
+
+    def test_disconnect_with_reset(self):
+        """A disconnect fails calls; a reset on reconnect drops subscriptions."""
+        plc = FakePlc(2)
+        hub = AdsHub(plc)
+        try:
+            hub.add_device_notification("GVL.var0", pyads.PLCTYPE_BOOL, lambda n, v: None)
+            plc.disconnect(0.05, reset=True)
+            with pytest.raises(pyads.ADSError):
+                plc.read_by_name("GVL.var0")
+            assert _wait_for(lambda: plc.is_open)
+            assert plc.read_by_name("GVL.var0") is False
+            assert plc.stats["subscriptions_lost"] == 1
+        finally:
+            hub.shutdown()
+
+
+class TestSoak:
+    """Smoke test for the soak runner."""
+
+    def test_run_soak(self):
+        """A short soak run subscribes everything and reports latency."""
+        report = run_soak(symbols=20, rate=200, duration=0.3, write_rate=20)
+        assert report["subscribed"] == 20
+        assert report["state_writes"] > 0
+        assert report["lost_notifications"] == 0
+        assert report["latency_ms"]["max"] >= report["latency_ms"]["p50"]
@@ -0,0 +1,92 @@
+"""Tests for the subscription monitor."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+from custom_components.ads_custom.health import (
+    RESUBSCRIBE_MAX_DELAY,
+    RESUBSCRIBE_MIN_DELAY,
+    SubscriptionMonitor,
+    resubscribe_delay,
+)
+
+
+def _monitor(silence_timeout=0):
+    hub = MagicMock()
+    hub.silence_timeout = silence_timeout
+    monitor = SubscriptionMonitor(hub)
+    # Run due work by hand instead of on the thread
+    monitor.start = MagicMock()
+    return monitor, hub
+
+
+class TestResubscribeBackoff:
+    """Tests for retrying lost subscriptions."""
+
+    def test_delay_doubles_up_to_the_maximum(self):
+        """Each failed attempt doubles the delay, capped at the maximum."""
+        assert resubscribe_delay(0) == RESUBSCRIBE_MIN_DELAY
+        assert resubscribe_delay(1) == 2 * RESUBSCRIBE_MIN_DELAY
+        assert resubscribe_delay(20) == RESUBSCRIBE_MAX_DELAY
+
+    def test_failed_retry_backs_off(self):
+        """A retry is only attempted once its delay has passed."""
+        monitor, hub = _monitor()
+        hub._resubscribe.return_value = False
+        with patch("custom_components.ads_custom.health.time.monotonic") as clock:
+            clock.return_value = 100.0
+            monitor.schedule("key")
+            assert monitor.run_due() == RESUBSCRIBE_MIN_DELAY
+            hub._resubscribe.assert_not_called()
+
+            clock.return_value = 100.0 + RESUBSCRIBE_MIN_DELAY
+            assert monitor.run_due() == 2 * RESUBSCRIBE_MIN_DELAY
+            hub._resubscribe.assert_called_once_with("key")
+
+            hub._resubscribe.return_value = True
+            clock.return_value += 2 * RESUBSCRIBE_MIN_DELAY
+            assert monitor.run_due() is None
+        assert monitor.pending == 0
+
+    def test_discarded_key_is_not_retried(self):
+        """Removing the last subscriber stops the retries."""
+        monitor, hub = _monitor()
+        monitor.schedule("key")
+        monitor.discard("key")
+        assert monitor.pending == 0
+        assert monitor.run_due() is None
+
+
+class TestSilenceCheck:
+    """Tests for the periodic check of silent handles."""
+
+    def test_checks_every_silence_timeout(self):
+        """The first check runs one silence timeout after the start."""
+        monitor, hub = _monitor(silence_timeout=60)
+        with patch("custom_components.ads_custom.health.time.monotonic") as clock:
+            clock.return_value = 0.0
+            assert monitor.run_due() == 60
+            hub.check_silent_subscriptions.assert_not_called()
+
+            clock.return_value = 60.0
+            assert monitor.run_due() == 60
+            hub.check_silent_subscriptions.assert_called_once_with(60)
+
+    def test_disabled(self):
+        """A silence timeout of 0 never checks."""
+        monitor, hub = _monitor()
+        assert monitor.run_due() is None
+        hub.check_silent_subscriptions.assert_not_called()
+
+
+class TestRunStateResume:
+    """Tests for refreshing values when the PLC returns to RUN."""
+
+    def test_values_are_refreshed_once(self):
+        """A requested refresh runs on the next pass only."""
+        monitor, hub = _monitor()
+        monitor.request_values()
+        monitor.run_due()
+        monitor.run_due()
+        hub._resume.assert_called_once_with()
@@ -2,13 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
 import ctypes
 import struct
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 
 import pyads
 
-from custom_components.ads_custom.hub import AdsHub
+from custom_components.ads_custom.hub import NOTIFICATION_STRUCTS, AdsHub, split_port
 
 
 # ---------------------------------------------------------------------------
@@ -55,6 +57,70 @@ class TestAdsHubLifecycle:
         ads_hub.shutdown()  # must not raise
 
 
+    def test_shutdown_deletes_notifications_in_bulk(self, ads_hub, mock_ads_client):
+        """A client with a bulk delete gets all handles in one call."""
+        mock_ads_client.del_device_notifications = MagicMock(return_value=[0, 1808])
+        ads_hub.add_device_notification("GVL.var1", pyads.PLCTYPE_BOOL, MagicMock())
+        mock_ads_client.add_device_notification.return_value = (2, 3)
+        ads_hub.add_device_notification("GVL.var2", pyads.PLCTYPE_INT, MagicMock())
+
+        ads_hub.shutdown()
+
+        mock_ads_client.del_device_notifications.assert_called_once_with(
+            [(1, 1), (2, 3)]
+        )
+        mock_ads_client.del_device_notification.assert_not_called()
+        assert ads_hub.metrics.ads_errors == 1
+        mock_ads_client.close.assert_called_once()
+
+    def test_shutdown_gives_up_on_unresponsive_plc(self, ads_hub, mock_ads_client):
+        """After a timeout the remaining handles are left to the close."""
+        ads_hub.add_device_notification("GVL.var1", pyads.PLCTYPE_BOOL, MagicMock())
+        mock_ads_client.add_device_notification.return_value = (2, 2)
+        ads_hub.add_device_notification("GVL.var2", pyads.PLCTYPE_INT, MagicMock())
+        mock_ads_client.del_device_notification.side_effect = pyads.ADSError(1861)
+
+        ads_hub.shutdown()
+
+        mock_ads_client.del_device_notification.assert_called_once()
+        mock_ads_client.close.assert_called_once()
+
+    def test_shutdown_time_is_bounded(self, ads_hub, mock_ads_client):
+        """No handles are deleted one by one once the timeout has passed."""
+        ads_hub.add_device_notification("GVL.var1", pyads.PLCTYPE_BOOL, MagicMock())
+
+        ads_hub.shutdown(timeout=-1)
+
+        mock_ads_client.del_device_notification.assert_not_called()
+        mock_ads_client.close.assert_called_once()
+
+    def test_unload_defers_deletes_to_shutdown(self, ads_hub, mock_ads_client):
+        """Handles released while unloading are deleted by shutdown."""
+        mock_ads_client.del_device_notifications = MagicMock(return_value=[0])
+        token = ads_hub.add_device_notification(
+            "GVL.var1", pyads.PLCTYPE_BOOL, MagicMock()
+        )
+        ads_hub.prepare_shutdown()
+        ads_hub.remove_device_notification(token)
+        mock_ads_client.del_device_notifications.assert_not_called()
+
+        ads_hub.shutdown()
+
+        mock_ads_client.del_device_notifications.assert_called_once_with([(1, 1)])
+
+    def test_cancelled_unload_deletes_released_handles(self, ads_hub, mock_ads_client):
+        """If unloading fails, the released handles are deleted right away."""
+        token = ads_hub.add_device_notification(
+            "GVL.var1", pyads.PLCTYPE_BOOL, MagicMock()
+        )
+        ads_hub.prepare_shutdown()
+        ads_hub.remove_device_notification(token)
+
+        ads_hub.cancel_shutdown()
+
+        mock_ads_client.del_device_notification.assert_called_once_with(1, 1)
+
+
 # ---------------------------------------------------------------------------
 # Device registration
 # ---------------------------------------------------------------------------
@@ -116,9 +182,9 @@ class TestAddDeviceNotification:
         cb = MagicMock()
         ads_hub.add_device_notification("GVL.var", pyads.PLCTYPE_BOOL, cb)
 
-        # The handle returned by mock is (1, 1)
-        assert 1 in ads_hub._notification_items
-        item = ads_hub._notification_items[1]
+        # The handle returned by mock is (1, 1), on the hub's own port
+        assert (None, 1) in ads_hub._notification_items
+        item = ads_hub._notification_items[None, 1]
         assert item.name == "GVL.var"
         assert item.callback is cb
 
@@ -185,6 +251,12 @@ class TestNotificationCallback:
         ads_hub._device_notification_callback(notif, "GVL.test")
         return cb
 
+    def test_decoder_is_precompiled(self, ads_hub):
+        """The item reuses a shared struct instead of building one per event."""
+        self._register_and_fire(ads_hub, pyads.PLCTYPE_INT, struct.pack("<h", 1))
+        (item,) = ads_hub._notification_items.values()
+        assert item.unpacker is NOTIFICATION_STRUCTS[pyads.PLCTYPE_INT]
+
     def test_bool_true(self, ads_hub):
         """BOOL notification with value True."""
         data = struct.pack("<?", True)
@@ -218,8 +290,7 @@ class TestNotificationCallback:
     def test_udint_value(self, ads_hub):
         """UDINT (unsigned 32-bit) notification.
 
-        Note: In hub.py ``_device_notification_callback``, the
-        ``unpack_formats`` dict maps several pyads PLC types that share the
+        Note: In hub.py the ``NOTIFICATION_STRUCTS`` dict maps several pyads PLC types that share the
         same ``ctypes.c_uint`` identity (UDINT, DWORD, DATE, DT, TIME).
         Because TIME is listed last with format ``"<i"`` (signed), it
         overwrites the unsigned ``"<I"`` for UDINT/DWORD.  We test with a
@@ -314,3 +385,681 @@ class TestNotificationCallback:
         data = struct.pack("<i", 43200000)
         cb = self._register_and_fire(ads_hub, pyads.PLCTYPE_TOD, data)
         cb.assert_called_once_with("GVL.test", 43200000)
+
+
+# ---------------------------------------------------------------------------
+# Shared subscriptions
+# ---------------------------------------------------------------------------
+
+class TestSharedSubscriptions:
+    """Tests for refcounted subscriptions shared by several callbacks."""
+
+    def test_same_symbol_shares_handle(self, ads_hub, mock_ads_client):
+        """A second subscriber reuses the handle and receives every value."""
+        first, second = MagicMock(), MagicMock()
+        ads_hub.add_device_notification("GVL.b", pyads.PLCTYPE_BOOL, first)
+        ads_hub.add_device_notification("GVL.b", pyads.PLCTYPE_BOOL, second)
+        assert mock_ads_client.add_device_notification.call_count == 1
+
+        notif, _buf = _make_notification(1, struct.pack("<?", True))
+        ads_hub._device_notification_callback(notif, "GVL.b")
+        first.assert_called_once_with("GVL.b", True)
+        second.assert_called_once_with("GVL.b", True)
+
+    def test_different_type_gets_own_handle(self, ads_hub, mock_ads_client):
+        """The same symbol with another data type is subscribed separately."""
+        ads_hub.add_device_notification("GVL.n", pyads.PLCTYPE_INT, MagicMock())
+        mock_ads_client.add_device_notification.return_value = (2, 2)
+        ads_hub.add_device_notification("GVL.n", pyads.PLCTYPE_DINT, MagicMock())
+        assert mock_ads_client.add_device_notification.call_count == 2
+        assert ads_hub.active_notifications == 2
+
+    def test_late_subscriber_gets_last_value(self, ads_hub):
+        """Joining an active subscription replays the last value."""
+        ads_hub.add_device_notification("GVL.n", pyads.PLCTYPE_INT, MagicMock())
+        notif, _buf = _make_notification(1, struct.pack("<h", 42))
+        ads_hub._device_notification_callback(notif, "GVL.n")
+
+        late = MagicMock()
+        ads_hub.add_device_notification("GVL.n", pyads.PLCTYPE_INT, late, True)
+        late.assert_called_once_with("GVL.n", 42, None)
+
+    def test_handle_deleted_with_last_subscriber(self, ads_hub, mock_ads_client):
+        """The ADS handle is only deleted when the last subscriber leaves."""
+        first = ads_hub.add_device_notification("GVL.b", pyads.PLCTYPE_BOOL, MagicMock())
+        second = ads_hub.add_device_notification("GVL.b", pyads.PLCTYPE_BOOL, MagicMock())
+
+        ads_hub.remove_device_notification(first)
+        mock_ads_client.del_device_notification.assert_not_called()
+        ads_hub.remove_device_notification(first)  # already removed: no-op
+        ads_hub.remove_device_notification(second)
+        mock_ads_client.del_device_notification.assert_called_once_with(1, 1)
+        assert ads_hub.active_notifications == 0
+
+    def test_failing_subscriber_does_not_block_others(self, ads_hub):
+        """An exception in one callback does not stop the fan-out."""
+        failing = MagicMock(side_effect=RuntimeError("boom"))
+        other = MagicMock()
+        ads_hub.add_device_notification("GVL.b", pyads.PLCTYPE_BOOL, failing)
+        ads_hub.add_device_notification("GVL.b", pyads.PLCTYPE_BOOL, other)
+        notif, _buf = _make_notification(1, struct.pack("<?", False))
+        ads_hub._device_notification_callback(notif, "GVL.b")
+        other.assert_called_once_with("GVL.b", False)
+
+    def test_failed_subscription_returns_none(self, ads_hub, mock_ads_client):
+        """No token is returned when the PLC refuses the handle."""
+        ads_hub.poll_fallback_interval = 0
+        mock_ads_client.add_device_notification.side_effect = pyads.ADSError(1814)
+        assert ads_hub.add_device_notification("GVL.x", pyads.PLCTYPE_BOOL, MagicMock()) is None
+        assert ads_hub.active_notifications == 0
+
+
+class TestSubscriptionHealth:
+    """Tests for per-subscription availability and resubscription."""
+
+    @staticmethod
+    def _subscribe(ads_hub, mock_ads_client, name="GVL.x"):
+        """Subscribe with a symbol error; returns (value cb, availability cb)."""
+        # Run the monitor by hand instead of on its thread
+        ads_hub._monitor.start = MagicMock()
+        callback, availability = MagicMock(), MagicMock()
+        mock_ads_client.add_device_notification.side_effect = pyads.ADSError(1808)
+        token = ads_hub.add_device_notification(
+            name, pyads.PLCTYPE_INT, callback, availability_callback=availability
+        )
+        assert token is not None
+        mock_ads_client.add_device_notification.side_effect = None
+        return callback, availability
+
+    def test_missing_symbol_is_resubscribed(self, ads_hub, mock_ads_client):
+        """A missing symbol is unavailable until a new handle delivers it."""
+        callback, availability = self._subscribe(ads_hub, mock_ads_client)
+        availability.assert_called_once_with("GVL.x", False)
+        assert ads_hub.unavailable_symbols == ["GVL.x"]
+        assert ads_hub._monitor.pending == 1
+
+        mock_ads_client.add_device_notification.return_value = (5, 5)
+        assert ads_hub._resubscribe(next(iter(ads_hub._subscriptions)))
+        assert ads_hub.metrics.resubscribes == 1
+
+        notification, _buf = _make_notification(5, struct.pack("<h", 3))
+        ads_hub._device_notification_callback(notification, "GVL.x")
+        availability.assert_called_with("GVL.x", True)
+        callback.assert_called_once_with("GVL.x", 3)
+        assert ads_hub.unavailable_symbols == []
+
+    def test_removing_pending_subscription(self, ads_hub, mock_ads_client):
+        """The retry stops and no handle is deleted."""
+        self._subscribe(ads_hub, mock_ads_client)
+        token = next(iter(ads_hub._subscriptions.values())).subscribers[0]
+        ads_hub.remove_device_notification(token)
+        assert ads_hub._monitor.pending == 0
+        mock_ads_client.del_device_notification.assert_not_called()
+
+    def test_invalidate_subscriptions(self, ads_hub, mock_ads_client):
+        """Invalidated handles are dropped and their symbols unavailable."""
+        ads_hub._monitor.start = MagicMock()
+        availability = MagicMock()
+        ads_hub.add_device_notification(
+            "GVL.a", pyads.PLCTYPE_INT, MagicMock(), availability_callback=availability
+        )
+        mock_ads_client.add_device_notification.return_value = (2, 2)
+        ads_hub.add_device_notification("GVL.b", pyads.PLCTYPE_INT, MagicMock())
+
+        assert ads_hub.invalidate_subscriptions({"GVL.a"}) == 1
+        availability.assert_called_once_with("GVL.a", False)
+        assert ads_hub.active_notifications == 1
+        assert ads_hub.unavailable_symbols == ["GVL.a"]
+        mock_ads_client.del_device_notification.assert_called_once_with(1, 1)
+
+    def test_silent_handles_are_verified(self, ads_hub, mock_ads_client):
+        """Lost symbols become unavailable, stale handles are renewed."""
+        ads_hub._monitor.start = MagicMock()
+        items = {}
+        for hnotify, name in enumerate(("GVL.ok", "GVL.lost", "GVL.stale"), 1):
+            mock_ads_client.add_device_notification.return_value = (hnotify, hnotify)
+            ads_hub.add_device_notification(name, pyads.PLCTYPE_INT, MagicMock())
+            notification, _buf = _make_notification(hnotify, struct.pack("<h", 1))
+            ads_hub._device_notification_callback(notification, name)
+            items[name] = ads_hub._notification_items[None, hnotify]
+        mock_ads_client.read_list_by_name.return_value = {
+            "GVL.ok": 1,
+            "GVL.lost": "symbol not found",
+            "GVL.stale": 2,
+        }
+
+        assert ads_hub.check_silent_subscriptions(0) == 2
+        assert ads_hub.unavailable_symbols == ["GVL.lost"]
+        assert ads_hub.active_notifications == 1
+        assert ads_hub.metrics.stale_handles == 2
+        assert ads_hub._monitor.pending == 2
+
+    def test_connection_errors_change_nothing(self, ads_hub, mock_ads_client):
+        """A read failing for the whole connection leaves handles alone."""
+        ads_hub._monitor.start = MagicMock()
+        ads_hub.add_device_notification("GVL.a", pyads.PLCTYPE_INT, MagicMock())
+        mock_ads_client.read_list_by_name.side_effect = pyads.ADSError(1861)
+        mock_ads_client.read_by_name.side_effect = pyads.ADSError(1861)
+
+        assert ads_hub.check_silent_subscriptions(0) == 0
+        assert ads_hub.active_notifications == 1
+        assert ads_hub.unavailable_symbols == []
+
+
+class TestOnlineChange:
+    """Tests for re-resolving subscriptions after an online change."""
+
+    @staticmethod
+    def _entry(index_offset, size=2):
+        info = pyads.structs.SAdsSymbolEntry()
+        info.iGroup, info.iOffs, info.size, info.dataType = 0x4040, index_offset, size, 2
+        return info
+
+    def test_version_change_requests_refresh(self, ads_hub, mock_ads_client):
+        """The first version is recorded; a different one triggers a refresh."""
+        ads_hub._monitor = MagicMock()
+        mock_ads_client.add_device_notification.return_value = (9, None)
+        ads_hub.watch_symbol_version()
+        data_name, attr, callback = mock_ads_client.add_device_notification.call_args[0]
+        assert data_name == (0xF008, 0)
+        assert attr.length == 1
+
+        for version in (4, 4, 5):
+            notification, _buf = _make_notification(9, bytes((version,)))
+            callback(notification, data_name)
+        ads_hub._monitor.request_refresh.assert_called_once_with(None)
+        # The version handle is not a subscription, but deleted on shutdown
+        assert ads_hub.active_notifications == 0
+        ads_hub.shutdown()
+        mock_ads_client.del_device_notification.assert_called_once_with(9, None)
+
+    def test_only_changed_symbols_are_resubscribed(self, ads_hub, mock_ads_client):
+        """Unchanged symbols keep their handles, moved ones get new ones."""
+        ads_hub._monitor.start = MagicMock()
+        availability = MagicMock()
+        for hnotify, name in enumerate(("GVL.same", "GVL.moved", "GVL.gone"), 1):
+            mock_ads_client.add_device_notification.return_value = (hnotify, hnotify)
+            ads_hub.add_device_notification(
+                name, pyads.PLCTYPE_INT, MagicMock(), availability_callback=availability
+            )
+        for item in ads_hub._notification_items.values():
+            item.layout = (0x4040, item.hnotify, 2, 2)
+
+        def read_write(index_group, index_offset, read_type, symbol, write_type, **kwargs):
+            if symbol == "GVL.gone":
+                raise pyads.ADSError(1808)
+            return self._entry({"GVL.same": 1, "GVL.moved": 7}[symbol])
+
+        mock_ads_client.read_write.side_effect = read_write
+        mock_ads_client.add_device_notification.return_value = (4, 4)
+        mock_ads_client.add_device_notification.reset_mock()
+        ads_hub._refresh_symbols(None)
+
+        assert sorted(hnotify for _port, hnotify in ads_hub._notification_items) == [1, 4]
+        assert mock_ads_client.add_device_notification.call_args[0][0] == "GVL.moved"
+        assert ads_hub.unavailable_symbols == ["GVL.gone"]
+        availability.assert_called_once_with("GVL.gone", False)
+        assert ads_hub.metrics.online_changes == 1
+
+
+class TestPlcRunState:
+    """Tests for suspending subscriptions and writes while the PLC is not in RUN."""
+
+    @staticmethod
+    def _watch(ads_hub, mock_ads_client):
+        """Watch the ADS state; returns a function notifying a new state."""
+        mock_ads_client.add_device_notification.return_value = (9, None)
+        ads_hub.watch_ads_state()
+        data_name, attr, callback = mock_ads_client.add_device_notification.call_args[0]
+        assert data_name == (0xF100, 0)
+        assert attr.length == 2
+
+        def notify(state):
+            notification, _buf = _make_notification(9, struct.pack("<H", state))
+            callback(notification, data_name)
+
+        return notify
+
+    def test_stop_suspends_writes(self, ads_hub, mock_ads_client):
+        """Writes are rejected without an ADS call until the PLC runs again."""
+        notify = self._watch(ads_hub, mock_ads_client)
+        assert ads_hub.plc_state is None
+        notify(5)
+        assert ads_hub.plc_state == "run"
+        notify(6)
+
+        assert ads_hub.plc_state == "stop"
+        assert ads_hub.plc_running is False
+        assert ads_hub.write_batch([("GVL.a", 1, pyads.PLCTYPE_INT)] * 2) == [False, False]
+        assert ads_hub.write_by_name("GVL.a", 1, pyads.PLCTYPE_INT) is None
+        mock_ads_client.write_by_name.assert_not_called()
+        assert ads_hub.metrics.suspended_writes == 3
+        assert ads_hub.metrics_snapshot()["plc_stops"] == 1
+
+        ads_hub.shutdown()
+        mock_ads_client.del_device_notification.assert_called_once_with(9, None)
+
+    async def test_queued_write_is_rejected(self, ads_hub, mock_ads_client):
+        """The write queue answers False while the PLC is in CONFIG."""
+        notify = self._watch(ads_hub, mock_ads_client)
+        notify(15)
+        assert await ads_hub.async_write_by_name("GVL.a", True, pyads.PLCTYPE_BOOL) is False
+        mock_ads_client.write_by_name.assert_not_called()
+
+    def test_subscriptions_unavailable_until_refreshed(self, ads_hub, mock_ads_client):
+        """Subscribers become unavailable on STOP and get fresh values on RUN."""
+        ads_hub._monitor = MagicMock()
+        notify = self._watch(ads_hub, mock_ads_client)
+        events = []
+        mock_ads_client.add_device_notification.return_value = (1, 1)
+        ads_hub.add_device_notification(
+            "GVL.x",
+            pyads.PLCTYPE_INT,
+            lambda name, value: events.append((name, value)),
+            availability_callback=lambda name, available: events.append(available),
+        )
+        ads_hub._subscriptions[next(iter(ads_hub._subscriptions))].last_value = 1
+
+        notify(6)
+        assert events == [False]
+        # A subscriber joining while the PLC is stopped is told at once
+        late = MagicMock()
+        ads_hub.add_device_notification(
+            "GVL.x", pyads.PLCTYPE_INT, MagicMock(), availability_callback=late
+        )
+        late.assert_called_once_with("GVL.x", False)
+
+        notify(5)
+        ads_hub._monitor.request_values.assert_called_once()
+        mock_ads_client.read_list_by_name.return_value = {"GVL.x": 2}
+        ads_hub._resume()
+        assert events == [False, ("GVL.x", 2), True]
+        assert ads_hub.read_by_name("GVL.x", pyads.PLCTYPE_INT, max_age=60) == 2
+
+    def test_lost_symbol_stays_unavailable(self, ads_hub, mock_ads_client):
+        """RUN does not report a symbol the PLC cannot deliver as available."""
+        notify = self._watch(ads_hub, mock_ads_client)
+        notify(6)
+        mock_ads_client.add_device_notification.side_effect = pyads.ADSError(1808)
+        ads_hub._monitor.start = MagicMock()
+        availability = MagicMock()
+        ads_hub.add_device_notification(
+            "GVL.gone", pyads.PLCTYPE_INT, MagicMock(), availability_callback=availability
+        )
+        availability.assert_called_once_with("GVL.gone", False)
+
+        notify(5)
+        ads_hub._resume()
+        availability.assert_called_once()
+
+
+class TestNotificationBudget:
+    """Tests for the per-hub notification handle budget."""
+
+    def test_rejects_new_handles_over_budget(self, ads_hub, mock_ads_client):
+        """Once the budget is used up new symbols are rejected and reported."""
+        mock_ads_client.add_device_notification.side_effect = [(1, 1), (2, 2)]
+        ads_hub.notification_budget = 1
+        ads_hub.poll_fallback_interval = 0
+        ads_hub.budget_exceeded_callback = MagicMock()
+
+        assert ads_hub.add_device_notification("GVL.a", pyads.PLCTYPE_BOOL, MagicMock())
+        assert ads_hub.add_device_notification("GVL.b", pyads.PLCTYPE_BOOL, MagicMock()) is None
+        assert mock_ads_client.add_device_notification.call_count == 1
+        assert ads_hub.metrics.budget_rejections == 1
+        ads_hub.budget_exceeded_callback.assert_called_once_with(1, 1)
+
+    def test_sharing_is_not_limited(self, ads_hub):
+        """Subscribers of an already subscribed symbol share its handle."""
+        ads_hub.notification_budget = 1
+        ads_hub.add_device_notification("GVL.a", pyads.PLCTYPE_BOOL, MagicMock())
+        assert ads_hub.add_device_notification("GVL.a", pyads.PLCTYPE_BOOL, MagicMock())
+        assert ads_hub.metrics.budget_rejections == 0
+
+    def test_removal_frees_budget(self, ads_hub):
+        """A released handle makes room for another symbol."""
+        ads_hub.notification_budget = 1
+        token = ads_hub.add_device_notification("GVL.a", pyads.PLCTYPE_BOOL, MagicMock())
+        ads_hub.remove_device_notification(token)
+        assert ads_hub.add_device_notification("GVL.b", pyads.PLCTYPE_BOOL, MagicMock())
+
+
+class TestValueCacheReads:
+    """Tests for reads served from the hub's value cache."""
+
+    def test_notified_value_is_read_without_round_trip(self, ads_hub, mock_ads_client):
+        """A symbol with a notification handle is read from the cache."""
+        ads_hub.add_device_notification("GVL.b", pyads.PLCTYPE_BOOL, MagicMock())
+        notif, _buf = _make_notification(1, struct.pack("<?", True))
+        ads_hub._device_notification_callback(notif, "GVL.b")
+
+        assert ads_hub.read_by_name("GVL.b", pyads.PLCTYPE_BOOL, max_age=0) is True
+        mock_ads_client.read_by_name.assert_not_called()
+        assert ads_hub.metrics_snapshot()["cache_hits"] == 1
+
+    def test_removed_subscription_ages_out(self, ads_hub, mock_ads_client):
+        """Without a handle the cached value is only served while fresh."""
+        token = ads_hub.add_device_notification("GVL.b", pyads.PLCTYPE_BOOL, MagicMock())
+        notif, _buf = _make_notification(1, struct.pack("<?", True))
+        ads_hub._device_notification_callback(notif, "GVL.b")
+        ads_hub.remove_device_notification(token)
+
+        mock_ads_client.read_by_name.return_value = False
+        assert ads_hub.read_by_name("GVL.b", pyads.PLCTYPE_BOOL, max_age=0) is False
+        mock_ads_client.read_by_name.assert_called_once()
+
+    def test_read_result_is_cached(self, ads_hub, mock_ads_client):
+        """A value read from the PLC serves the next read within max age."""
+        mock_ads_client.read_by_name.return_value = 42
+        assert ads_hub.read_by_name("GVL.n", pyads.PLCTYPE_INT) == 42
+        assert ads_hub.read_by_name("GVL.n", pyads.PLCTYPE_INT) == 42
+        assert ads_hub.read_by_name("GVL.n", pyads.PLCTYPE_INT, use_cache=False) == 42
+        assert mock_ads_client.read_by_name.call_count == 2
+
+
+class TestReadValues:
+    """Tests for one-off reads of several symbols."""
+
+    def test_one_sum_read(self, ads_hub, mock_ads_client):
+        """All symbols are read together; unreadable ones report None."""
+        mock_ads_client.read_list_by_name.return_value = {
+            "GVL.a": 1.5,
+            "GVL.s": "Auto",
+            "GVL.x": "symbol not found",
+        }
+        assert ads_hub.read_values(["GVL.s", "GVL.a", "GVL.x"]) == {
+            "GVL.s": "Auto",
+            "GVL.a": 1.5,
+            "GVL.x": None,
+        }
+        mock_ads_client.read_list_by_name.assert_called_once_with(
+            ["GVL.s", "GVL.a", "GVL.x"]
+        )
+
+    def test_failed_sum_read_reads_one_by_one(self, ads_hub, mock_ads_client):
+        """If the sum read fails, each symbol is read on its own."""
+
+        def read_list(names):
+            if "GVL.missing" in names:
+                raise pyads.ADSError(text="symbol not found")
+            return dict.fromkeys(names, 7)
+
+        mock_ads_client.read_list_by_name.side_effect = read_list
+        assert ads_hub.read_values(["GVL.a", "GVL.missing"]) == {
+            "GVL.a": 7,
+            "GVL.missing": None,
+        }
+
+    def test_max_age_serves_from_cache(self, ads_hub, mock_ads_client):
+        """With max_age only symbols without a fresh cached value are read."""
+        ads_hub.value_cache.update("GVL.a", pyads.PLCTYPE_INT, 3)
+        mock_ads_client.read_list_by_name.return_value = {"GVL.b": 4}
+
+        assert ads_hub.read_values(["GVL.a", "GVL.b"], max_age=10) == {
+            "GVL.a": 3,
+            "GVL.b": 4,
+        }
+        mock_ads_client.read_list_by_name.assert_called_once_with(["GVL.b"])
+        # Without max_age the PLC is always read
+        mock_ads_client.read_list_by_name.return_value = {"GVL.a": 5}
+        assert ads_hub.read_values(["GVL.a"]) == {"GVL.a": 5}
+
+
+class TestAsyncWrites:
+    """Tests for queued writes through async_write_by_name."""
+
+    async def test_concurrent_writes_use_one_sum_write(self, ads_hub, mock_ads_client):
+        """Writes issued together go out as one sum write, in order."""
+        mock_ads_client.write_list_by_name.side_effect = lambda values: {
+            name: "no error" for name in values
+        }
+        results = await asyncio.gather(
+            ads_hub.async_write_by_name("GVL.a", True, pyads.PLCTYPE_BOOL),
+            ads_hub.async_write_by_name("GVL.b", 5, pyads.PLCTYPE_INT),
+        )
+
+        assert results == [True, True]
+        mock_ads_client.write_list_by_name.assert_called_once_with(
+            {"GVL.a": True, "GVL.b": 5}
+        )
+        mock_ads_client.write_by_name.assert_not_called()
+        assert ads_hub.metrics.sum_writes == 1
+        assert ads_hub.metrics.writes == 2
+
+    async def test_single_write_uses_write_by_name(self, ads_hub, mock_ads_client):
+        """A lone write does not need the symbol info of a sum write."""
+        assert await ads_hub.async_write_by_name("GVL.a", True, pyads.PLCTYPE_BOOL)
+        mock_ads_client.write_by_name.assert_called_once_with(
+            "GVL.a", True, pyads.PLCTYPE_BOOL
+        )
+        mock_ads_client.write_list_by_name.assert_not_called()
+
+    def test_repeated_symbol_starts_new_sum_write(self, ads_hub, mock_ads_client):
+        """A pulse (TRUE then FALSE) on one symbol is not collapsed."""
+        mock_ads_client.write_list_by_name.side_effect = lambda values: {
+            name: "no error" for name in values
+        }
+        results = ads_hub.write_batch(
+            [
+                ("GVL.a", True, pyads.PLCTYPE_BOOL),
+                ("GVL.b", True, pyads.PLCTYPE_BOOL),
+                ("GVL.a", False, pyads.PLCTYPE_BOOL),
+            ]
+        )
+
+        assert results == [True, True, True]
+        mock_ads_client.write_list_by_name.assert_called_once_with(
+            {"GVL.a": True, "GVL.b": True}
+        )
+        mock_ads_client.write_by_name.assert_called_once_with(
+            "GVL.a", False, pyads.PLCTYPE_BOOL
+        )
+
+    def test_failed_sum_write_falls_back(self, ads_hub, mock_ads_client):
+        """A sum write failing as a whole is retried one write at a time."""
+        mock_ads_client.write_list_by_name.side_effect = pyads.ADSError(1808)
+        mock_ads_client.write_by_name.side_effect = [None, pyads.ADSError(1808)]
+        results = ads_hub.write_batch(
+            [("GVL.a", 1, pyads.PLCTYPE_INT), ("GVL.missing", 2, pyads.PLCTYPE_INT)]
+        )
+
+        assert results == [True, False]
+        assert mock_ads_client.write_by_name.call_count == 2
+
+    def test_symbol_error_in_sum_write(self, ads_hub, mock_ads_client):
+        """Per-symbol errors of a sum write fail only that write."""
+        mock_ads_client.write_list_by_name.return_value = {
+            "GVL.a": "no error",
+            "GVL.b": "ADSERR_DEVICE_ACCESSDENIED",
+        }
+        results = ads_hub.write_batch(
+            [("GVL.a", 1, pyads.PLCTYPE_INT), ("GVL.b", 2, pyads.PLCTYPE_INT)]
+        )
+
+        assert results == [True, False]
+        assert ads_hub.metrics.ads_errors == 1
+
+
+class TestAmsPorts:
+    """Tests for symbols addressed on further AMS ports as ``port:symbol``."""
+
+    @staticmethod
+    def _hub(mock_ads_client):
+        port_client = MagicMock(spec=pyads.Connection)
+        port_client.add_device_notification.return_value = (1, 1)
+        factory = MagicMock(return_value=port_client)
+        return AdsHub(mock_ads_client, factory), factory, port_client
+
+    def test_split_port(self):
+        """Only a numeric prefix selects a port."""
+        assert split_port("852:MAIN.x") == (852, "MAIN.x")
+        assert split_port("MAIN.x") == (None, "MAIN.x")
+        assert split_port("GVL.a:b") == (None, "GVL.a:b")
+
+    def test_port_client_is_opened_once(self, mock_ads_client):
+        """The client of a port is created on first use and then reused."""
+        hub, factory, port_client = self._hub(mock_ads_client)
+        port_client.read_by_name.return_value = 4
+
+        assert hub.read_by_name("852:MAIN.x", pyads.PLCTYPE_INT) == 4
+        hub.write_by_name("852:MAIN.y", 1, pyads.PLCTYPE_INT)
+
+        factory.assert_called_once_with(852)
+        port_client.open.assert_called_once()
+        port_client.read_by_name.assert_called_once_with("MAIN.x", pyads.PLCTYPE_INT)
+        port_client.write_by_name.assert_called_once_with(
+            "MAIN.y", 1, pyads.PLCTYPE_INT
+        )
+        mock_ads_client.read_by_name.assert_not_called()
+        assert hub.ams_ports == [852]
+
+        hub.shutdown()
+        port_client.close.assert_called_once()
+        mock_ads_client.close.assert_called_once()
+
+    def test_port_without_factory_fails(self, ads_hub, mock_ads_client):
+        """Without a client factory a further port cannot be reached."""
+        assert ads_hub.read_by_name("852:MAIN.x", pyads.PLCTYPE_INT) is None
+        assert ads_hub.metrics.ads_errors == 1
+
+    def test_one_sum_write_per_port(self, mock_ads_client):
+        """Writes are grouped by port and keep the names as addressed."""
+        hub, _factory, port_client = self._hub(mock_ads_client)
+        for client in (mock_ads_client, port_client):
+            client.write_list_by_name.side_effect = lambda values: {
+                name: "no error" for name in values
+            }
+        results = hub.write_batch(
+            [
+                ("GVL.a", 1, pyads.PLCTYPE_INT),
+                ("852:GVL.a", 2, pyads.PLCTYPE_INT),
+                ("GVL.b", 3, pyads.PLCTYPE_INT),
+                ("852:GVL.b", 4, pyads.PLCTYPE_INT),
+            ]
+        )
+
+        assert results == [True, True, True, True]
+        mock_ads_client.write_list_by_name.assert_called_once_with(
+            {"GVL.a": 1, "GVL.b": 3}
+        )
+        port_client.write_list_by_name.assert_called_once_with(
+            {"GVL.a": 2, "GVL.b": 4}
+        )
+
+    def test_sum_read_per_port(self, mock_ads_client):
+        """A read across ports returns the values under the addressed names."""
+        hub, _factory, port_client = self._hub(mock_ads_client)
+        mock_ads_client.read_list_by_name.return_value = {"GVL.a": 1}
+        port_client.read_list_by_name.return_value = {"GVL.a": 2}
+
+        assert hub.read_list_by_name(["GVL.a", "852:GVL.a"]) == {
+            "GVL.a": 1,
+            "852:GVL.a": 2,
+        }
+
+    def test_same_handle_on_two_ports(self, mock_ads_client):
+        """Equal handle numbers of different ports reach their own item."""
+        hub, _factory, port_client = self._hub(mock_ads_client)
+        local, remote = MagicMock(), MagicMock()
+        hub.add_device_notification("GVL.a", pyads.PLCTYPE_INT, local)
+        token = hub.add_device_notification("852:GVL.a", pyads.PLCTYPE_INT, remote)
+
+        callback = port_client.add_device_notification.call_args[0][2]
+        notification, _buf = _make_notification(1, struct.pack("<h", 9))
+        callback(notification, "GVL.a")
+        remote.assert_called_once_with("852:GVL.a", 9)
+        local.assert_not_called()
+
+        hub.remove_device_notification(token)
+        port_client.del_device_notification.assert_called_once_with(1, 1)
+        mock_ads_client.del_device_notification.assert_not_called()
+
+
+class TestRedundantWriteSuppression:
+    """Tests for skipping writes of values the PLC already reports."""
+
+    @staticmethod
+    def _notify(ads_hub, value):
+        notif, _buf = _make_notification(1, struct.pack("<?", value))
+        ads_hub._device_notification_callback(notif, "GVL.b")
+
+    async def test_matching_live_value_is_not_written(self, ads_hub, mock_ads_client):
+        """Turning on a switch that reports on costs no round trip."""
+        ads_hub.suppress_redundant_writes = True
+        ads_hub.add_device_notification("GVL.b", pyads.PLCTYPE_BOOL, MagicMock())
+        self._notify(ads_hub, True)
+
+        assert await ads_hub.async_write_by_name("GVL.b", True, pyads.PLCTYPE_BOOL)
+        mock_ads_client.write_by_name.assert_not_called()
+        assert ads_hub.metrics.suppressed_writes == 1
+
+        assert await ads_hub.async_write_by_name("GVL.b", False, pyads.PLCTYPE_BOOL)
+        mock_ads_client.write_by_name.assert_called_once()
+
+    async def test_disabled_by_default(self, ads_hub, mock_ads_client):
+        """Without the option every write goes to the PLC."""
+        ads_hub.add_device_notification("GVL.b", pyads.PLCTYPE_BOOL, MagicMock())
+        self._notify(ads_hub, True)
+        await ads_hub.async_write_by_name("GVL.b", True, pyads.PLCTYPE_BOOL)
+        mock_ads_client.write_by_name.assert_called_once()
+
+    async def test_write_before_notification_is_not_suppressed(
+        self, ads_hub, mock_ads_client
+    ):
+        """Off then on is written even if the off notification lags behind."""
+        ads_hub.suppress_redundant_writes = True
+        ads_hub.add_device_notification("GVL.b", pyads.PLCTYPE_BOOL, MagicMock())
+        self._notify(ads_hub, True)
+
+        await ads_hub.async_write_by_name("GVL.b", False, pyads.PLCTYPE_BOOL)
+        await ads_hub.async_write_by_name("GVL.b", True, pyads.PLCTYPE_BOOL)
+        assert mock_ads_client.write_by_name.call_count == 2
+
+    async def test_queued_write_is_not_suppressed(self, ads_hub, mock_ads_client):
+        """A write racing a queued write to the same symbol keeps its order."""
+        ads_hub.suppress_redundant_writes = True
+        ads_hub.add_device_notification("GVL.b", pyads.PLCTYPE_BOOL, MagicMock())
+        self._notify(ads_hub, True)
+
+        await asyncio.gather(
+            ads_hub.async_write_by_name("GVL.b", False, pyads.PLCTYPE_BOOL),
+            ads_hub.async_write_by_name("GVL.b", True, pyads.PLCTYPE_BOOL),
+        )
+        assert ads_hub.metrics.suppressed_writes == 0
+
+    async def test_polled_value_is_never_suppressed(self, ads_hub, mock_ads_client):
+        """Values without a notification handle may be stale."""
+        ads_hub.suppress_redundant_writes = True
+        ads_hub.value_cache.update("GVL.b", pyads.PLCTYPE_BOOL, True)
+        await ads_hub.async_write_by_name("GVL.b", True, pyads.PLCTYPE_BOOL)
+        mock_ads_client.write_by_name.assert_called_once()
+
+
+class TestEntitySubscriptions:
+    """Tests for the subscription lifecycle of AdsEntity."""
+
+    @staticmethod
+    def _entity(ads_hub):
+        from custom_components.ads_custom.entity import AdsEntity
+
+        # Subscriptions run on the hub's own executor, not on hass
+        entity = AdsEntity(ads_hub, "Test", "GVL.b")
+        entity.hass = SimpleNamespace()
+        return entity
+
+    async def test_removal_releases_subscription(self, ads_hub, mock_ads_client):
+        """Removing the entity deletes its notification handle."""
+        entity = self._entity(ads_hub)
+        assert await entity.async_subscribe("GVL.b", pyads.PLCTYPE_BOOL, MagicMock())
+        assert ads_hub.active_notifications == 1
+
+        await entity.async_will_remove_from_hass()
+        mock_ads_client.del_device_notification.assert_called_once_with(1, 1)
+        assert ads_hub.active_notifications == 0
+
+    async def test_disabled_entity_is_not_subscribed(self, ads_hub, mock_ads_client):
+        """Entities disabled in the registry do not use a handle."""
+        entity = self._entity(ads_hub)
+        entity.registry_entry = SimpleNamespace(disabled=True)
+        assert not await entity.async_subscribe("GVL.b", pyads.PLCTYPE_BOOL, MagicMock())
+        mock_ads_client.add_device_notification.assert_not_called()
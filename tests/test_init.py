@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import ctypes
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 import voluptuous as vol
@@ -198,6 +198,489 @@ class TestServiceSchema:
                 {"adstype": "nonexistent", "value": 1, "adsvar": "x"}
             )
 
+    @pytest.mark.parametrize(
+        ("adstype", "value", "expected"),
+        [
+            ("real", "21.5", 21.5),
+            ("lreal", 3, 3.0),
+            ("string", "Auto", "Auto"),
+            ("bool", "on", True),
+            ("dint", "-7", -7),
+        ],
+    )
+    def test_value_is_converted_to_adstype(self, adstype, value, expected):
+        """The value is converted to the Python type of its ADS type."""
+        from custom_components.ads_custom import SCHEMA_SERVICE_WRITE_DATA_BY_NAME
+
+        result = SCHEMA_SERVICE_WRITE_DATA_BY_NAME(
+            {"adstype": adstype, "value": value, "adsvar": "GVL.x"}
+        )
+        assert result["value"] == expected
+        assert type(result["value"]) is type(expected)
+
+    def test_value_not_matching_adstype_raises(self):
+        """A value that cannot be converted is rejected."""
+        from custom_components.ads_custom import SCHEMA_SERVICE_WRITE_DATA_BY_NAME
+
+        with pytest.raises(vol.Invalid):
+            SCHEMA_SERVICE_WRITE_DATA_BY_NAME(
+                {"adstype": "int", "value": "warm", "adsvar": "GVL.x"}
+            )
+
+    def test_write_data_schema(self):
+        """write_data takes a list of variables and an optional entry list."""
+        from custom_components.ads_custom import SCHEMA_SERVICE_WRITE_DATA
+
+        result = SCHEMA_SERVICE_WRITE_DATA(
+            {
+                "config_entry_id": "entry-a",
+                "variables": [
+                    {"adsvar": "GVL.a", "adstype": "real", "value": "1.5"},
+                    {"adsvar": "GVL.b", "adstype": "bool", "value": False},
+                ],
+            }
+        )
+        assert result["config_entry_id"] == ["entry-a"]
+        assert [v["value"] for v in result["variables"]] == [1.5, False]
+        with pytest.raises(vol.Invalid):
+            SCHEMA_SERVICE_WRITE_DATA({"variables": []})
+
+    def test_read_data_by_name_schema(self):
+        """read_data_by_name takes symbol names and an optional max age."""
+        from custom_components.ads_custom import SCHEMA_SERVICE_READ_DATA_BY_NAME
+
+        assert SCHEMA_SERVICE_READ_DATA_BY_NAME(
+            {"variables": "GVL.a", "max_age": "2.5"}
+        ) == {"variables": ["GVL.a"], "max_age": 2.5}
+        with pytest.raises(vol.Invalid):
+            SCHEMA_SERVICE_READ_DATA_BY_NAME({"variables": ["GVL.a"], "max_age": -1})
+
+    def test_structured_values_are_returned_as_hex(self):
+        """Raw bytes of structured variables become a hex string."""
+        from custom_components.ads_custom import _response_value
+
+        assert _response_value(b"\x01\xff") == "01ff"
+        assert _response_value(21.5) == 21.5
+
+
+class TestServiceHubs:
+    """Tests for resolving and writing to the hubs a service call targets."""
+
+    def _hass(self, **hubs):
+        """Return a hass mock with the given hubs loaded."""
+        hass = MagicMock()
+        hass.data = {DOMAIN: {"_services_registered": True, **hubs}}
+        return hass
+
+    def _hub(self):
+        """Return a hub mock that passes isinstance checks."""
+        from custom_components.ads_custom.hub import AdsHub
+
+        return MagicMock(spec=AdsHub)
+
+    def test_single_hub_needs_no_target(self):
+        """With one hub loaded an untargeted call goes to it."""
+        from custom_components.ads_custom import _resolve_hubs
+
+        hub = self._hub()
+        hass = self._hass(**{"entry-a": hub, "connection": hub})
+        assert _resolve_hubs(hass, None) == {"entry-a": hub}
+
+    def test_several_hubs_need_a_target(self):
+        """With several hubs loaded an untargeted call is rejected."""
+        from homeassistant.exceptions import ServiceValidationError
+
+        from custom_components.ads_custom import _resolve_hubs
+
+        hub_a, hub_b = self._hub(), self._hub()
+        hass = self._hass(**{"entry-a": hub_a, "entry-b": hub_b, "connection": hub_a})
+        with pytest.raises(ServiceValidationError):
+            _resolve_hubs(hass, None)
+        assert _resolve_hubs(hass, ["entry-b"]) == {"entry-b": hub_b}
+
+    def test_unknown_entry_raises(self):
+        """Targeting an entry without a loaded hub is rejected."""
+        from homeassistant.exceptions import ServiceValidationError
+
+        from custom_components.ads_custom import _resolve_hubs
+
+        hass = self._hass(**{"entry-a": self._hub()})
+        with pytest.raises(ServiceValidationError):
+            _resolve_hubs(hass, ["entry-a", "missing"])
+
+    def test_yaml_hub_is_addressed_as_connection(self):
+        """A hub set up from YAML is only stored under "connection"."""
+        from custom_components.ads_custom import _resolve_hubs
+
+        hub = self._hub()
+        assert _resolve_hubs(self._hass(connection=hub), None) == {"connection": hub}
+
+    def test_shared_hub_is_targeted_once(self):
+        """Entries sharing one PLC connection resolve to its hub once."""
+        from custom_components.ads_custom import _resolve_hubs
+
+        hub = self._hub()
+        hass = self._hass(**{"entry-a": hub, "entry-b": hub})
+        assert _resolve_hubs(hass, None) == {"entry-a": hub}
+        assert _resolve_hubs(hass, ["entry-b", "entry-a"]) == {"entry-b": hub}
+
+    @pytest.mark.asyncio
+    async def test_write_variables_reports_per_variable(self):
+        """Each variable is queued on the hub and its result reported."""
+        import pyads
+
+        from custom_components.ads_custom import _async_write_variables
+
+        hub = self._hub()
+        hub.async_write_by_name = AsyncMock(side_effect=[True, False])
+        result = await _async_write_variables(
+            hub,
+            [
+                {"adsvar": "GVL.a", "adstype": AdsType.REAL, "value": 1.5},
+                {"adsvar": "GVL.b", "adstype": AdsType.STRING, "value": "x"},
+            ],
+        )
+        assert result == {"GVL.a": True, "GVL.b": False}
+        assert hub.async_write_by_name.await_args_list[0].args == (
+            "GVL.a",
+            1.5,
+            pyads.PLCTYPE_REAL,
+        )
+
+
+class TestWriteDataByNameService:
+    """Tests for the write_data_by_name service handler."""
+
+    @staticmethod
+    async def _handler(hub):
+        """Register the services with ``hub`` loaded and return the handler."""
+        from custom_components.ads_custom import _async_register_services
+
+        hass = MagicMock()
+        hass.data = {DOMAIN: {"entry-a": hub, "connection": hub}}
+        await _async_register_services(hass)
+        return {
+            call.args[1]: call.args[2]
+            for call in hass.services.async_register.call_args_list
+        }["write_data_by_name"]
+
+    @staticmethod
+    def _call():
+        from types import SimpleNamespace
+
+        return SimpleNamespace(
+            data={"adsvar": "GVL.a", "adstype": AdsType.INT, "value": 3}
+        )
+
+    @pytest.mark.asyncio
+    async def test_write_is_sent(self):
+        """The value is queued on the targeted hub."""
+        import pyads
+
+        from custom_components.ads_custom.hub import AdsHub
+
+        hub = MagicMock(spec=AdsHub)
+        hub.async_write_by_name = AsyncMock(return_value=True)
+        await (await self._handler(hub))(self._call())
+        hub.async_write_by_name.assert_awaited_once_with("GVL.a", 3, pyads.PLCTYPE_INT)
+
+    @pytest.mark.asyncio
+    async def test_failed_write_raises(self):
+        """A failed or suspended write is reported to the caller."""
+        from homeassistant.exceptions import HomeAssistantError
+
+        from custom_components.ads_custom.hub import AdsHub
+
+        hub = MagicMock(spec=AdsHub)
+        hub.async_write_by_name = AsyncMock(return_value=False)
+        with pytest.raises(HomeAssistantError, match="GVL.a"):
+            await (await self._handler(hub))(self._call())
+
+
+class TestSharedHubOptions:
+    """Tests for the connection options of config entries sharing a hub."""
+
+    @staticmethod
+    def _entry(entry_id, **options):
+        entry = MagicMock()
+        entry.entry_id = entry_id
+        entry.title = entry_id
+        entry.options = options
+        return entry
+
+    @staticmethod
+    def _hass(hub, *entries):
+        """Return a hass mock with ``entries`` loaded on ``hub``."""
+        hass = MagicMock()
+        hass.data = {DOMAIN: {entry.entry_id: hub for entry in entries}}
+        by_id = {entry.entry_id: entry for entry in entries}
+        hass.config_entries.async_get_entry = by_id.get
+        return hass
+
+    @staticmethod
+    def _hub():
+        from custom_components.ads_custom.hub import AdsHub
+
+        hub = MagicMock(spec=AdsHub)
+        hub.value_cache = MagicMock()
+        return hub
+
+    def test_first_entry_options_apply(self, caplog):
+        """A later entry on the same PLC does not override the options."""
+        from custom_components.ads_custom import _apply_hub_options
+
+        hub = self._hub()
+        first = self._entry("entry-a", optimistic_timeout=2, value_cache_max_age=1)
+        second = self._entry("entry-b", optimistic_timeout=5, value_cache_max_age=1)
+
+        with patch("custom_components.ads_custom.ir") as ir:
+            _apply_hub_options(self._hass(hub, first), first, hub)
+            _apply_hub_options(self._hass(hub, first, second), second, hub)
+
+        assert hub.optimistic_timeout == 2
+        assert hub.value_cache.max_age == 1
+        assert "optimistic_timeout" in caplog.text
+        assert "value_cache_max_age" not in caplog.text
+        # Only the first entry reports rejected subscriptions
+        ir.async_delete_issue.assert_called_once()
+
+    def test_matching_options_do_not_warn(self, caplog):
+        """Entries with the same options share the hub silently."""
+        from custom_components.ads_custom import _apply_hub_options
+
+        hub = self._hub()
+        first = self._entry("entry-a", suppress_redundant_writes=True)
+        second = self._entry("entry-b", suppress_redundant_writes=True)
+        hass = self._hass(hub, first, second)
+
+        with patch("custom_components.ads_custom.ir"):
+            _apply_hub_options(hass, second, hub)
+
+        assert hub.suppress_redundant_writes is True
+        assert caplog.text == ""
+
+
+class TestCaptureService:
+    """Tests for the start_capture service helpers."""
+
+    def test_schema_defaults(self):
+        """start_capture defaults to a 10 MiB file with three backups."""
+        from custom_components.ads_custom import SCHEMA_SERVICE_START_CAPTURE
+
+        assert SCHEMA_SERVICE_START_CAPTURE({}) == {
+            "filename": "ads_capture.bin",
+            "max_size": 10,
+            "backup_count": 3,
+        }
+
+    def test_capture_path_stays_in_config_dir(self, tmp_path):
+        """Capture files outside the configuration directory are rejected."""
+        from homeassistant.exceptions import ServiceValidationError
+
+        from custom_components.ads_custom import _capture_path
+
+        hass = MagicMock()
+        hass.config.config_dir = str(tmp_path)
+        hass.config.path = lambda *parts: str(tmp_path.joinpath(*parts))
+
+        assert _capture_path(hass, "captures/plc.bin") == str(tmp_path / "captures" / "plc.bin")
+        with pytest.raises(ServiceValidationError):
+            _capture_path(hass, "../plc.bin")
+
+
+class TestCaptureServiceTargets:
+    """Tests for the hub the capture services act on."""
+
+    @staticmethod
+    async def _handlers(hass):
+        """Register the services and return the handlers by service name."""
+        from custom_components.ads_custom import _async_register_services
+
+        await _async_register_services(hass)
+        return {
+            call.args[1]: call.args[2]
+            for call in hass.services.async_register.call_args_list
+        }
+
+    @staticmethod
+    def _hass(tmp_path, **hubs):
+        hass = MagicMock()
+        hass.data = {DOMAIN: dict(hubs)}
+        hass.config.config_dir = str(tmp_path)
+        hass.config.path = lambda *parts: str(tmp_path.joinpath(*parts))
+        return hass
+
+    @staticmethod
+    def _hub():
+        from custom_components.ads_custom.hub import AdsHub
+
+        hub = MagicMock(spec=AdsHub)
+        hub.executor = MagicMock()
+        hub.executor.async_run = AsyncMock()
+        return hub
+
+    @pytest.mark.asyncio
+    async def test_capture_targets_the_selected_entry(self, tmp_path):
+        """With two connections the capture goes to the one selected."""
+        from types import SimpleNamespace
+
+        from homeassistant.exceptions import ServiceValidationError
+
+        hub_a, hub_b = self._hub(), self._hub()
+        hass = self._hass(tmp_path, **{"entry-a": hub_a, "entry-b": hub_b})
+        handlers = await self._handlers(hass)
+        data = {"filename": "b.bin", "max_size": 1, "backup_count": 0}
+
+        with pytest.raises(ServiceValidationError):
+            await handlers["start_capture"](SimpleNamespace(data=data))
+        await handlers["start_capture"](
+            SimpleNamespace(data={**data, "config_entry_id": "entry-b"})
+        )
+        await handlers["stop_capture"](SimpleNamespace(data={"config_entry_id": "entry-b"}))
+
+        hub_a.executor.async_run.assert_not_awaited()
+        assert [call.args[0] for call in hub_b.executor.async_run.await_args_list] == [
+            hub_b.start_capture,
+            hub_b.stop_capture,
+        ]
+        assert hub_b.executor.async_run.await_args_list[0].args[1] == str(tmp_path / "b.bin")
+
+    @pytest.mark.asyncio
+    async def test_reloaded_entry_uses_the_new_hub(self, tmp_path):
+        """After a reload the services use the new hub, not the unloaded one."""
+        from types import SimpleNamespace
+
+        old, new = self._hub(), self._hub()
+        hass = self._hass(tmp_path, **{"entry-a": old})
+        handlers = await self._handlers(hass)
+        hass.data[DOMAIN]["entry-a"] = new
+
+        await handlers["stop_capture"](SimpleNamespace(data={}))
+        old.executor.async_run.assert_not_awaited()
+        new.executor.async_run.assert_awaited_once_with(new.stop_capture)
+
+
+class TestShutdownListener:
+    """Tests for the Home Assistant stop listener of a connection."""
+
+    @staticmethod
+    async def _setup(hass, storage_key):
+        """Set up a connection with a mocked hub and return the hub."""
+        from custom_components.ads_custom import _async_setup_connection
+
+        hub = MagicMock()
+        hub.is_shut_down = False
+        hub.executor.async_run = AsyncMock()
+
+        async def add_executor_job(target, *args):
+            return hub
+
+        hass.async_add_executor_job = add_executor_job
+        with patch(
+            "custom_components.ads_custom._async_register_services", AsyncMock()
+        ):
+            assert await _async_setup_connection(
+                hass, {"device": "5.1.2.3.1.1"}, storage_key
+            )
+        return hass.data[DOMAIN][storage_key]
+
+    @pytest.mark.asyncio
+    async def test_listener_is_removed_on_last_release(self):
+        """Releasing the last reference stops listening for the stop event."""
+        from custom_components.ads_custom import _connection_registry
+
+        hass = MagicMock()
+        hass.data = {DOMAIN: {}}
+        hub = await self._setup(hass, "connection")
+        assert await self._setup(hass, "entry-a") is hub
+        hass.bus.async_listen_once.assert_called_once()
+        remove_listener = hass.bus.async_listen_once.return_value
+
+        registry = _connection_registry(hass)
+        registry.release(hub, "connection")
+        remove_listener.assert_not_called()
+        registry.release(hub, "entry-a")
+        remove_listener.assert_called_once_with()
+
+    @pytest.mark.asyncio
+    async def test_stop_after_shutdown_does_nothing(self):
+        """The stop handler skips a hub that was already shut down."""
+        from custom_components.ads_custom import _connection_registry
+
+        hass = MagicMock()
+        hass.data = {DOMAIN: {}}
+        hub = await self._setup(hass, "entry-a")
+        handler = hass.bus.async_listen_once.call_args.args[1]
+
+        hub.executor.async_run.reset_mock()
+        hub.is_shut_down = True
+        await handler(MagicMock())
+        hub.executor.async_run.assert_not_awaited()
+
+        # Once fired, the listener is gone and is not removed again
+        _connection_registry(hass).release(hub, "entry-a")
+        hass.bus.async_listen_once.return_value.assert_not_called()
+
+
+class TestConnectionSetupErrors:
+    """Tests for cleaning up a connection whose setup fails."""
+
+    @staticmethod
+    def _hass_and_hub():
+        hass = MagicMock()
+        hass.data = {DOMAIN: {}}
+        hub = MagicMock()
+        hub.is_shut_down = False
+        hub.executor.async_run = AsyncMock()
+
+        async def add_executor_job(target, *args):
+            return hub
+
+        hass.async_add_executor_job = add_executor_job
+        return hass, hub
+
+    @pytest.mark.asyncio
+    async def test_hub_is_shut_down_if_creation_fails(self):
+        """An error after the hub is constructed closes it before re-raising."""
+        from custom_components.ads_custom import (
+            _async_setup_connection,
+            _connection_registry,
+        )
+
+        hass, hub = self._hass_and_hub()
+        hub.executor.async_run.side_effect = [None, RuntimeError("boom"), None]
+
+        with pytest.raises(RuntimeError):
+            await _async_setup_connection(hass, {"device": "5.1.2.3.1.1"}, "entry-a")
+
+        assert hub.executor.async_run.await_args_list[-1].args == (hub.shutdown,)
+        hub.executor.shutdown.assert_called_once_with(wait=False)
+        assert _connection_registry(hass).user_count(hub) == 0
+        hass.bus.async_listen_once.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_connection_is_released_if_setup_fails(self):
+        """A registered hub is released again when the rest of setup fails."""
+        from custom_components.ads_custom import (
+            _async_setup_connection,
+            _connection_registry,
+        )
+
+        hass, hub = self._hass_and_hub()
+        with (
+            patch(
+                "custom_components.ads_custom._async_register_services",
+                AsyncMock(side_effect=RuntimeError("boom")),
+            ),
+            pytest.raises(RuntimeError),
+        ):
+            await _async_setup_connection(hass, {"device": "5.1.2.3.1.1"}, "entry-a")
+
+        assert "entry-a" not in hass.data[DOMAIN]
+        assert _connection_registry(hass).user_count(hub) == 0
+        hub.executor.shutdown.assert_called_once_with(wait=False)
+        hass.bus.async_listen_once.return_value.assert_called_once_with()
+
 
 class TestLegacyDefaultDeviceMigration:
     """Tests for legacy entity default-device migration."""
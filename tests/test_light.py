@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pyads
 
@@ -16,6 +16,8 @@ def _make_light(
 ) -> tuple[AdsLight, MagicMock]:
     """Create an AdsLight with a mock hub, returning (light, hub_mock)."""
     hub = MagicMock()
+    hub.async_write_by_name = AsyncMock(return_value=True)
+    hub.optimistic_timeout = 0
     light = AdsLight(
         ads_hub=hub,
         ads_var_enable="GVL.light_on",
@@ -29,84 +31,84 @@ def _make_light(
 
 
 class TestAdsLightTurnOn:
-    """Tests for AdsLight.turn_on brightness scaling."""
+    """Tests for AdsLight.async_turn_on brightness scaling."""
 
-    def test_turn_on_no_brightness_var(self):
+    async def test_turn_on_no_brightness_var(self):
         """turn_on without brightness var should only write the enable flag."""
         light, hub = _make_light(brightness_var=None)
-        light.turn_on()
-        hub.write_by_name.assert_called_once_with(
+        await light.async_turn_on()
+        hub.async_write_by_name.assert_called_once_with(
             "GVL.light_on", True, pyads.PLCTYPE_BOOL
         )
 
-    def test_turn_on_with_brightness_default_scale(self):
+    async def test_turn_on_with_brightness_default_scale(self):
         """turn_on with brightness=128, scale=255 should write 128."""
         light, hub = _make_light(
             brightness_var="GVL.brightness", brightness_scale=255
         )
-        light.turn_on(brightness=128)
+        await light.async_turn_on(brightness=128)
 
-        assert hub.write_by_name.call_count == 2
-        hub.write_by_name.assert_any_call(
+        assert hub.async_write_by_name.call_count == 2
+        hub.async_write_by_name.assert_any_call(
             "GVL.light_on", True, pyads.PLCTYPE_BOOL
         )
-        hub.write_by_name.assert_any_call(
+        hub.async_write_by_name.assert_any_call(
             "GVL.brightness", 128, pyads.PLCTYPE_BYTE
         )
 
-    def test_turn_on_with_brightness_scale_100(self):
+    async def test_turn_on_with_brightness_scale_100(self):
         """turn_on with brightness=255, scale=100 should write 100."""
         light, hub = _make_light(
             brightness_var="GVL.brightness", brightness_scale=100
         )
-        light.turn_on(brightness=255)
+        await light.async_turn_on(brightness=255)
 
-        hub.write_by_name.assert_any_call(
+        hub.async_write_by_name.assert_any_call(
             "GVL.brightness", 100, pyads.PLCTYPE_BYTE
         )
 
-    def test_turn_on_with_brightness_scale_100_half(self):
+    async def test_turn_on_with_brightness_scale_100_half(self):
         """turn_on with brightness=127, scale=100 should write ~49."""
         light, hub = _make_light(
             brightness_var="GVL.brightness", brightness_scale=100
         )
-        light.turn_on(brightness=127)
+        await light.async_turn_on(brightness=127)
 
         # int(127 * 100 / 255) = 49
-        hub.write_by_name.assert_any_call(
+        hub.async_write_by_name.assert_any_call(
             "GVL.brightness", 49, pyads.PLCTYPE_BYTE
         )
 
-    def test_turn_on_uses_uint_plctype(self):
+    async def test_turn_on_uses_uint_plctype(self):
         """When brightness_type is 'uint', PLCTYPE_UINT should be used."""
         light, hub = _make_light(
             brightness_var="GVL.brightness",
             brightness_type="uint",
         )
-        light.turn_on(brightness=200)
+        await light.async_turn_on(brightness=200)
 
-        hub.write_by_name.assert_any_call(
+        hub.async_write_by_name.assert_any_call(
             "GVL.brightness", 200, pyads.PLCTYPE_UINT
         )
 
-    def test_turn_on_without_brightness_kwarg(self):
+    async def test_turn_on_without_brightness_kwarg(self):
         """turn_on without brightness kwarg should only write enable."""
         light, hub = _make_light(brightness_var="GVL.brightness")
-        light.turn_on()
+        await light.async_turn_on()
 
-        hub.write_by_name.assert_called_once_with(
+        hub.async_write_by_name.assert_called_once_with(
             "GVL.light_on", True, pyads.PLCTYPE_BOOL
         )
 
 
 class TestAdsLightTurnOff:
-    """Tests for AdsLight.turn_off."""
+    """Tests for AdsLight.async_turn_off."""
 
-    def test_turn_off_writes_false(self):
+    async def test_turn_off_writes_false(self):
         """turn_off should write False to the enable variable."""
         light, hub = _make_light()
-        light.turn_off()
-        hub.write_by_name.assert_called_once_with(
+        await light.async_turn_off()
+        hub.async_write_by_name.assert_called_once_with(
             "GVL.light_on", False, pyads.PLCTYPE_BOOL
         )
 
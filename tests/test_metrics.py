@@ -0,0 +1,222 @@
+"""Tests for hub performance metrics, diagnostic sensors and diagnostics."""
+
+from __future__ import annotations
+
+import struct
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pyads
+import pytest
+
+from benchmarks.common import NotificationBuffer
+from custom_components.ads_custom.diagnostics import async_get_config_entry_diagnostics
+from custom_components.ads_custom.hub import FILETIME_EPOCH_OFFSET
+from custom_components.ads_custom.metrics import HubMetrics, LatencyWindow
+from custom_components.ads_custom.sensor import (
+    HUB_SENSORS,
+    AdsHubSensor,
+    metrics_coordinator,
+)
+
+
+class TestLatencyWindow:
+    """Tests for the latency ring buffer."""
+
+    def test_empty_summary(self):
+        """An empty window reports no percentiles."""
+        assert LatencyWindow(4).summary()["p50"] is None
+
+    def test_keeps_most_recent_samples(self):
+        """Old samples are overwritten once the buffer is full."""
+        window = LatencyWindow(4)
+        for seconds in (1.0, 1.0, 0.001, 0.002, 0.003, 0.004):
+            window.add(seconds)
+        summary = window.summary()
+        assert summary["count"] == 6
+        assert summary["max"] == 4.0
+        assert summary["p50"] == 3.0
+
+    def test_histogram(self):
+        """Samples are counted into millisecond buckets."""
+        window = LatencyWindow(8)
+        for seconds in (0.0005, 0.002, 0.003, 0.2, 2.0):
+            window.add(seconds)
+        histogram = window.summary()["histogram"]
+        assert histogram["<=1"] == 1
+        assert histogram["<=5"] == 2
+        assert histogram["<=500"] == 1
+        assert histogram[">1000"] == 1
+        assert sum(histogram.values()) == 5
+
+
+class TestHubMetrics:
+    """Tests for metrics recorded by AdsHub."""
+
+    def test_notification_rate(self):
+        """The rate is recomputed at most once per second."""
+        metrics = HubMetrics()
+        with patch("custom_components.ads_custom.metrics.time.monotonic") as monotonic:
+            monotonic.return_value = metrics.started + 2
+            metrics.notifications = 10
+            assert metrics.notification_rate() == 5.0
+            metrics.notifications = 20
+            assert metrics.notification_rate() == 5.0
+            monotonic.return_value = metrics.started + 4
+            assert metrics.notification_rate() == 5.0
+
+    def test_hub_counts_notifications(self, ads_hub):
+        """Decoded and unknown notifications are counted separately."""
+        ads_hub.add_device_notification("GVL.n", pyads.PLCTYPE_INT, MagicMock())
+        ads_hub._device_notification_callback(
+            NotificationBuffer(1, struct.pack("<h", 5)).pointer, "GVL.n"
+        )
+        ads_hub._device_notification_callback(
+            NotificationBuffer(2, struct.pack("<h", 5)).pointer, "GVL.x"
+        )
+        metrics = ads_hub.metrics.snapshot(ads_hub.active_notifications)
+        assert metrics["notifications"] == 1
+        assert metrics["unknown_notifications"] == 1
+        assert metrics["active_notifications"] == 1
+        assert metrics["decode_time_ms"]["count"] == 1
+
+    def test_hub_counts_writes_and_errors(self, ads_hub, mock_ads_client):
+        """Writes are timed and ADS errors are counted."""
+        ads_hub.write_by_name("GVL.a", 1, pyads.PLCTYPE_INT)
+        mock_ads_client.write_by_name.side_effect = pyads.ADSError()
+        ads_hub.write_by_name("GVL.a", 2, pyads.PLCTYPE_INT)
+        mock_ads_client.read_by_name.side_effect = pyads.ADSError()
+        ads_hub.read_by_name("GVL.a", pyads.PLCTYPE_INT)
+        assert ads_hub.metrics.writes == 2
+        assert ads_hub.metrics.write_latency.count == 2
+        assert ads_hub.metrics.ads_errors == 2
+
+
+class TestPlcTimestamps:
+    """Tests for PLC timestamp latency tracing."""
+
+    def test_timestamped_callback_receives_plc_time(self, ads_hub):
+        """Timestamped callbacks get the PLC time; PLC latency is recorded."""
+        callback = MagicMock()
+        ads_hub.add_device_notification("GVL.n", pyads.PLCTYPE_INT, callback, True)
+        plc_time = time.time() - 0.25
+        filetime = int((plc_time + FILETIME_EPOCH_OFFSET) * 10_000_000)
+        ads_hub._device_notification_callback(
+            NotificationBuffer(1, struct.pack("<h", 3), filetime).pointer, "GVL.n"
+        )
+        name, value, received = callback.call_args.args
+        assert (name, value) == ("GVL.n", 3)
+        assert received == pytest.approx(plc_time, abs=1e-3)
+        assert ads_hub.metrics.plc_latency.summary()["p50"] >= 250
+
+    def test_missing_timestamp(self, ads_hub):
+        """Without a PLC timestamp nothing is recorded and plc_time is None."""
+        callback = MagicMock()
+        ads_hub.add_device_notification("GVL.n", pyads.PLCTYPE_INT, callback, True)
+        ads_hub._device_notification_callback(
+            NotificationBuffer(1, struct.pack("<h", 3)).pointer, "GVL.n"
+        )
+        assert callback.call_args.args[2] is None
+        assert ads_hub.metrics.plc_latency.count == 0
+
+    @pytest.mark.parametrize("attribute", [False, True])
+    def test_entity_records_end_to_end_latency(self, ads_hub, attribute):
+        """State writes record end-to-end latency and the optional attribute."""
+        from custom_components.ads_custom.entity import AdsEntity
+
+        ads_hub.plc_timestamp_attribute = attribute
+        entity = AdsEntity(ads_hub, "Test", "GVL.n")
+        entity.async_write_ha_state = MagicMock()
+        entity._async_write_notified_state(time.perf_counter(), 0.0)
+
+        entity.async_write_ha_state.assert_called_once()
+        assert ads_hub.metrics.end_to_end_latency.count == 1
+        assert ads_hub.metrics.dispatch_latency.count == 1
+        attributes = entity.extra_state_attributes or {}
+        if attribute:
+            assert attributes == {"plc_timestamp": "1970-01-01T00:00:00+00:00"}
+        else:
+            assert attributes == {}
+
+
+    def test_plc_timestamp_keeps_other_attributes(self, ads_hub):
+        """The attribute is merged in, and dropped again when turned off."""
+        from custom_components.ads_custom.entity import AdsEntity
+
+        ads_hub.plc_timestamp_attribute = True
+        entity = AdsEntity(ads_hub, "Test", "GVL.n")
+        entity.async_write_ha_state = MagicMock()
+        entity._attr_extra_state_attributes = {"mode": "auto"}
+        entity._async_write_notified_state(time.perf_counter(), 0.0)
+        assert entity.extra_state_attributes == {
+            "mode": "auto",
+            "plc_timestamp": "1970-01-01T00:00:00+00:00",
+        }
+
+        ads_hub.plc_timestamp_attribute = False
+        entity._async_write_notified_state(time.perf_counter(), 1.0)
+        assert entity.extra_state_attributes == {"mode": "auto"}
+
+
+class TestDiagnosticSensors:
+    """Tests for the per-hub diagnostic sensors."""
+
+    async def test_sensors_read_snapshot(self, ads_hub):
+        """Each sensor takes its value (and attributes) from the snapshot."""
+        entry = SimpleNamespace(
+            entry_id="entry-1", title="PLC", async_on_unload=lambda func: None
+        )
+        coordinator = metrics_coordinator(MagicMock(), entry, ads_hub)
+        ads_hub.metrics.write_latency.add(0.004)
+        await coordinator.async_refresh()
+        sensors = {d.key: AdsHubSensor(coordinator, entry, d) for d in HUB_SENSORS}
+
+        assert sensors["write_latency"].native_value == 4.0
+        assert sensors["write_latency"].extra_state_attributes["count"] == 1
+        assert sensors["active_notifications"].native_value == 0
+        assert sensors["plc_state"].native_value is None
+        ads_hub.ads_state = 6
+        await coordinator.async_refresh()
+        assert sensors["plc_state"].native_value == "stop"
+        assert sensors["plc_state"].options[5] == "run"
+        assert sensors["ads_errors"].unique_id == "entry-1_ads_errors"
+        assert sensors["ads_errors"].device_info["identifiers"] == {("ads_custom", "entry-1")}
+
+    async def test_one_snapshot_per_refresh(self, ads_hub):
+        """All sensors of a hub share the snapshot of one refresh."""
+        entry = SimpleNamespace(
+            entry_id="entry-1", title="PLC", async_on_unload=lambda func: None
+        )
+        coordinator = metrics_coordinator(MagicMock(), entry, ads_hub)
+        sensors = [AdsHubSensor(coordinator, entry, d) for d in HUB_SENSORS]
+        with patch.object(
+            ads_hub, "metrics_snapshot", wraps=ads_hub.metrics_snapshot
+        ) as snapshot:
+            await coordinator.async_refresh()
+            for sensor in sensors:
+                sensor.native_value
+                sensor.extra_state_attributes
+        snapshot.assert_called_once_with()
+
+
+class TestDiagnostics:
+    """Tests for the diagnostics download."""
+
+    async def test_diagnostics(self, ads_hub):
+        """Diagnostics redact the connection and include metrics."""
+        entry = SimpleNamespace(
+            entry_id="entry-1",
+            data={"device": "5.1.2.3.1.1", "ip_address": "10.0.0.2", "port": 851},
+            subentries={
+                "sub": SimpleNamespace(
+                    subentry_type="entity",
+                    data={"entities": [{"entity_type": "switch"}, {"entity_type": "switch"}]},
+                )
+            },
+        )
+        hass = SimpleNamespace(data={"ads_custom": {"entry-1": ads_hub}})
+        result = await async_get_config_entry_diagnostics(hass, entry)
+        assert result["entry"] == {"device": "**REDACTED**", "ip_address": "**REDACTED**", "port": 851}
+        assert result["entities"] == {"switch": 2}
+        assert result["metrics"]["notifications"] == 0
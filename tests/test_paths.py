@@ -0,0 +1,41 @@
+"""Tests for resolving file names inside the configuration directory."""
+
+from __future__ import annotations
+
+import os
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.ads_custom.paths import config_file_path
+
+
+def _hass(config_dir):
+    """Return a hass mock resolving paths like Home Assistant does."""
+    hass = MagicMock()
+    hass.config.config_dir = str(config_dir)
+    hass.config.path = lambda *parts: os.path.join(str(config_dir), *parts)
+    return hass
+
+
+class TestConfigFilePath:
+    """Tests for config_file_path."""
+
+    def test_relative_name_resolves_in_config_dir(self, tmp_path):
+        """Names relative to the configuration directory are accepted."""
+        path = config_file_path(_hass(tmp_path), "symbols/plc.tmc")
+        assert path == str(tmp_path.resolve() / "symbols" / "plc.tmc")
+
+    @pytest.mark.parametrize("filename", ["/etc/passwd", "../secrets.yaml"])
+    def test_names_outside_config_dir_are_rejected(self, tmp_path, filename):
+        """Absolute paths and ``..`` cannot leave the configuration directory."""
+        with pytest.raises(ValueError):
+            config_file_path(_hass(tmp_path / "config"), filename)
+
+    def test_symlink_out_of_config_dir_is_rejected(self, tmp_path):
+        """A symlink pointing outside the configuration directory is rejected."""
+        config_dir = tmp_path / "config"
+        config_dir.mkdir()
+        (config_dir / "link.tmc").symlink_to(tmp_path / "outside.tmc")
+        with pytest.raises(ValueError):
+            config_file_path(_hass(config_dir), "link.tmc")
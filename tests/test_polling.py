@@ -0,0 +1,125 @@
+"""Tests for the polling fallback scheduler."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pyads
+import pytest
+
+from custom_components.ads_custom.hub import NotificationSubscriber
+
+
+@pytest.fixture
+def poller(ads_hub):
+    """Return the hub's scheduler with its thread disabled; tests tick by hand."""
+    ads_hub._poller.stop()
+    return ads_hub._poller
+
+
+def _subscriber():
+    return NotificationSubscriber(MagicMock(), False)
+
+
+class TestPollScheduler:
+    """Tests for PollScheduler."""
+
+    def test_group_is_read_with_one_sum_read(self, poller, mock_ads_client):
+        """Symbols with the same interval are read together."""
+        first, second = _subscriber(), _subscriber()
+        poller.add("GVL.a", pyads.PLCTYPE_INT, first, 1.0)
+        poller.add("GVL.b", pyads.PLCTYPE_BOOL, second, 1.0)
+        mock_ads_client.read_list_by_name.return_value = {"GVL.a": 7, "GVL.b": True}
+
+        timeout = poller.poll_due()
+
+        mock_ads_client.read_list_by_name.assert_called_once_with(["GVL.a", "GVL.b"])
+        first.callback.assert_called_once_with("GVL.a", 7)
+        second.callback.assert_called_once_with("GVL.b", True)
+        assert 0 < timeout <= 1.0
+
+    def test_only_changes_are_dispatched(self, poller, mock_ads_client):
+        """Unchanged values do not call the subscribers again."""
+        first, second = _subscriber(), _subscriber()
+        poller.add("GVL.a", pyads.PLCTYPE_INT, first, 0)
+        poller.add("GVL.b", pyads.PLCTYPE_INT, second, 0)
+        mock_ads_client.read_list_by_name.return_value = {"GVL.a": 1, "GVL.b": 2}
+        poller.poll_due()
+        mock_ads_client.read_list_by_name.return_value = {"GVL.a": 1, "GVL.b": 3}
+        poller.poll_due()
+
+        assert first.callback.call_count == 1
+        assert second.callback.call_count == 2
+
+    def test_intervals_are_grouped_separately(self, poller, mock_ads_client):
+        """Each interval gets its own group and schedule."""
+        poller.add("GVL.fast", pyads.PLCTYPE_INT, _subscriber(), 0.5)
+        poller.add("GVL.slow", pyads.PLCTYPE_INT, _subscriber(), 10.0)
+        mock_ads_client.read_list_by_name.return_value = {}
+
+        assert poller.poll_due() <= 0.5
+        assert mock_ads_client.read_list_by_name.call_count == 2
+        poller.poll_due()
+        assert mock_ads_client.read_list_by_name.call_count == 2
+
+    def test_failed_sum_read_reads_individually(self, poller, mock_ads_client):
+        """A failed sum read falls back to single reads; errors are skipped."""
+        good, bad = _subscriber(), _subscriber()
+        poller.add("GVL.good", pyads.PLCTYPE_INT, good, 1.0)
+        poller.add("GVL.bad", pyads.PLCTYPE_INT, bad, 1.0)
+        mock_ads_client.read_list_by_name.side_effect = pyads.ADSError(1808)
+        mock_ads_client.read_by_name.side_effect = [5, pyads.ADSError(1808)]
+
+        poller.poll_due()
+
+        good.callback.assert_called_once_with("GVL.good", 5)
+        bad.callback.assert_not_called()
+
+    def test_error_strings_are_skipped(self, poller, mock_ads_client):
+        """Per-symbol errors of a sum read are not dispatched as values."""
+        subscriber = _subscriber()
+        poller.add("GVL.a", pyads.PLCTYPE_INT, subscriber, 1.0)
+        mock_ads_client.read_list_by_name.return_value = {"GVL.a": "symbol not found"}
+        poller.poll_due()
+        subscriber.callback.assert_not_called()
+
+    def test_late_subscriber_gets_last_value(self, poller, mock_ads_client):
+        """Joining a polled symbol replays its last value."""
+        poller.add("GVL.a", pyads.PLCTYPE_INT, _subscriber(), 1.0)
+        mock_ads_client.read_list_by_name.return_value = {"GVL.a": 9}
+        poller.poll_due()
+
+        late = _subscriber()
+        poller.add("GVL.a", pyads.PLCTYPE_INT, late, 1.0)
+        late.callback.assert_called_once_with("GVL.a", 9)
+        assert poller.polled_symbols == 1
+
+
+class TestPollingFallback:
+    """Tests for the hub falling back to polling."""
+
+    def test_budget_exhaustion_falls_back_to_polling(self, ads_hub, poller, mock_ads_client):
+        """Symbols over the budget are polled and can be removed again."""
+        ads_hub.notification_budget = 1
+        ads_hub.add_device_notification("GVL.a", pyads.PLCTYPE_INT, MagicMock())
+        callback = MagicMock()
+        token = ads_hub.add_device_notification("GVL.b", pyads.PLCTYPE_INT, callback, True)
+
+        assert token is not None
+        assert ads_hub.active_notifications == 1
+        assert ads_hub.polled_symbols == 1
+        mock_ads_client.read_list_by_name.return_value = {"GVL.b": 4}
+        poller.poll_due()
+        callback.assert_called_once_with("GVL.b", 4, None)
+
+        ads_hub.remove_device_notification(token)
+        assert ads_hub.polled_symbols == 0
+
+    def test_refused_handle_falls_back_to_polling(self, ads_hub, poller, mock_ads_client):
+        """A handle refused by the PLC is polled; missing symbols are not."""
+        mock_ads_client.add_device_notification.side_effect = pyads.ADSError(1810)
+        assert ads_hub.add_device_notification("GVL.a", pyads.PLCTYPE_INT, MagicMock())
+        mock_ads_client.add_device_notification.side_effect = pyads.ADSError(1808)
+        assert ads_hub.add_device_notification("GVL.x", pyads.PLCTYPE_INT, MagicMock())
+        assert ads_hub.polled_symbols == 1
+        assert ads_hub.unavailable_symbols == ["GVL.x"]
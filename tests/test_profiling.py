@@ -0,0 +1,58 @@
+"""Tests for the sampling profiler."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import threading
+import time
+
+from custom_components.ads_custom.profiling import SamplingProfiler
+
+
+def _busy_integration_code(stop: threading.Event) -> None:
+    """Stand-in for integration code running on another thread."""
+    while not stop.is_set():
+        sum(range(1000))
+
+
+class TestSamplingProfiler:
+    """Tests for SamplingProfiler."""
+
+    def test_collects_matching_stacks(self, tmp_path):
+        """Only stacks running code below root_dir are written, collapsed."""
+        stop = threading.Event()
+        worker = threading.Thread(
+            target=_busy_integration_code, args=(stop,), name="pyads-callback"
+        )
+        idle = threading.Thread(target=stop.wait, name="idle")
+        worker.start()
+        idle.start()
+        path = tmp_path / "profile.collapsed"
+        profiler = SamplingProfiler(
+            path, duration=10, interval=0.001, root_dir=str(Path(__file__).parent)
+        )
+        try:
+            profiler.start()
+            time.sleep(0.1)
+            profiler.stop()
+        finally:
+            stop.set()
+            worker.join()
+            idle.join()
+
+        lines = path.read_text().splitlines()
+        assert lines
+        stack, count = lines[0].rsplit(" ", 1)
+        assert stack.startswith("pyads-callback;")
+        assert "test_profiling:_busy_integration_code" in stack
+        assert int(count) > 0
+        assert not any(line.startswith("idle;") for line in lines)
+
+    def test_stops_after_duration(self, tmp_path):
+        """The profiler stops on its own and writes the file."""
+        path = tmp_path / "profile.collapsed"
+        profiler = SamplingProfiler(path, duration=0.05, interval=0.01)
+        profiler.start()
+        profiler.join(2)
+        assert not profiler.is_alive()
+        assert path.exists()
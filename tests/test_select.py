@@ -0,0 +1,43 @@
+"""Tests for the ADS Select platform commands."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pyads
+
+from custom_components.ads_custom.select import AdsSelect
+
+
+def _make_select(write_result: bool = True) -> tuple[AdsSelect, MagicMock]:
+    """Create an AdsSelect with a mock hub, returning (select, hub)."""
+    hub = MagicMock()
+    hub.async_write_by_name = AsyncMock(return_value=write_result)
+    select = AdsSelect(hub, "GVL.mode", "Mode", ["off", "auto", "manual"], "mode_1")
+    select.hass = MagicMock()
+    select.entity_id = "select.mode"
+    select.async_write_ha_state = MagicMock()
+    return select, hub
+
+
+class TestAdsSelectCommands:
+    """Tests for AdsSelect.async_select_option."""
+
+    async def test_select_writes_index(self):
+        """Selecting an option writes its index and shows it."""
+        select, hub = _make_select()
+        await select.async_select_option("manual")
+        hub.async_write_by_name.assert_awaited_once_with(
+            "GVL.mode", 2, pyads.PLCTYPE_INT
+        )
+        assert select.current_option == "manual"
+        select.async_write_ha_state.assert_called_once_with()
+
+    async def test_failed_write_keeps_current_option(self):
+        """An option the PLC did not accept is not shown."""
+        select, hub = _make_select(write_result=False)
+        select._attr_current_option = "off"
+        await select.async_select_option("auto")
+        hub.async_write_by_name.assert_awaited_once()
+        assert select.current_option == "off"
+        select.async_write_ha_state.assert_not_called()
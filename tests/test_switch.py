@@ -0,0 +1,136 @@
+"""Tests for the ADS Switch platform commands and optimistic state."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pyads
+import pytest
+
+from custom_components.ads_custom.const import EVENT_COMMAND_NOT_CONFIRMED
+from custom_components.ads_custom.metrics import HubMetrics
+from custom_components.ads_custom.switch import AdsSwitch
+
+
+def _make_switch(optimistic_timeout: float = 0) -> tuple[AdsSwitch, MagicMock]:
+    """Create an AdsSwitch with a mock hub and hass, returning (switch, hub)."""
+    hub = MagicMock()
+    hub.async_write_by_name = AsyncMock(return_value=True)
+    hub.optimistic_timeout = optimistic_timeout
+    hub.metrics = HubMetrics()
+    switch = AdsSwitch(hub, "Test Switch", "GVL.switch", "test_switch_1")
+    switch.hass = MagicMock()
+    switch.entity_id = "switch.test_switch"
+    switch.async_write_ha_state = MagicMock()
+    return switch, hub
+
+
+def _notify(switch: AdsSwitch, value: bool) -> None:
+    """Deliver a notification like async_initialize_device's callback."""
+    switch._state_dict["state"] = value
+    switch._notified_state = value
+    switch._async_write_notified_state(0.0)
+
+
+@pytest.fixture
+def call_later():
+    """Capture the confirmation timer instead of scheduling it."""
+    with patch("custom_components.ads_custom.entity.async_call_later") as mock:
+        yield mock
+
+
+class TestAdsSwitchCommands:
+    """Tests for AdsSwitch.async_turn_on / async_turn_off."""
+
+    async def test_turn_on_writes_true(self):
+        """Without optimistic mode the state waits for the PLC."""
+        switch, hub = _make_switch()
+        await switch.async_turn_on()
+        hub.async_write_by_name.assert_called_once_with(
+            "GVL.switch", True, pyads.PLCTYPE_BOOL
+        )
+        assert switch.is_on is None
+
+    async def test_turn_off_writes_false(self):
+        """async_turn_off writes False to the variable."""
+        switch, hub = _make_switch()
+        await switch.async_turn_off()
+        hub.async_write_by_name.assert_called_once_with(
+            "GVL.switch", False, pyads.PLCTYPE_BOOL
+        )
+
+
+class TestOptimisticState:
+    """Tests for the optimistic state shown until the PLC confirms it."""
+
+    async def test_state_shown_immediately_and_confirmed(self, call_later):
+        """The commanded state is shown and kept once the PLC notifies it."""
+        switch, _hub = _make_switch(optimistic_timeout=2)
+        _notify(switch, False)
+        with patch.object(switch, "async_write_ha_state"):
+            await switch.async_turn_on()
+            assert switch.is_on is True
+            call_later.assert_called_once()
+            assert call_later.call_args.args[1] == 2
+
+            _notify(switch, True)
+        call_later.return_value.assert_called_once()
+        assert switch._optimistic_cancel is None
+
+    async def test_rolled_back_without_confirmation(self, call_later):
+        """The state returns to the PLC value and an event is fired."""
+        switch, hub = _make_switch(optimistic_timeout=2)
+        with patch.object(switch, "async_write_ha_state"):
+            _notify(switch, False)
+        await switch.async_turn_on()
+
+        expired = call_later.call_args.args[2]
+        expired(None)
+        assert switch.is_on is False
+        assert hub.metrics.optimistic_rollbacks == 1
+        switch.hass.bus.async_fire.assert_called_once_with(
+            EVENT_COMMAND_NOT_CONFIRMED,
+            {
+                "entity_id": "switch.test_switch",
+                "ads_var": "GVL.switch",
+                "value": True,
+                "reason": "timeout",
+            },
+        )
+
+    async def test_failed_write_rolls_back_at_once(self, call_later):
+        """A rejected write does not wait for the timeout."""
+        switch, hub = _make_switch(optimistic_timeout=2)
+        hub.async_write_by_name.return_value = False
+        with patch.object(switch, "async_write_ha_state"):
+            _notify(switch, False)
+        await switch.async_turn_on()
+
+        assert switch.is_on is False
+        call_later.return_value.assert_called_once()
+        assert switch.hass.bus.async_fire.call_args.args[1]["reason"] == "write_failed"
+
+    async def test_unchanged_state_is_not_tracked(self, call_later):
+        """Turning on a switch that is on needs no confirmation."""
+        switch, _hub = _make_switch(optimistic_timeout=2)
+        with patch.object(switch, "async_write_ha_state"):
+            _notify(switch, True)
+        await switch.async_turn_on()
+        call_later.assert_not_called()
+
+
+class TestSymbolAvailability:
+    """Tests for entities following the availability of their variables."""
+
+    def test_lost_variable_makes_entity_unavailable(self):
+        """Only a lost variable flips the entity, and it recovers."""
+        switch, hub = _make_switch()
+        _notify(switch, True)
+        assert switch.available
+
+        switch._availability_changed("GVL.switch", False)
+        assert not switch.available
+        hub.dispatcher.dispatch.assert_called_once()
+
+        switch._availability_changed("GVL.switch", True)
+        assert switch.available
@@ -0,0 +1,212 @@
+"""Tests for bulk entity import from TwinCAT symbol exports."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from custom_components.ads_custom.const import (
+    CONF_ADS_VAR,
+    CONF_ENTITY_DEVICE_ID,
+    CONF_ENTITY_DEVICE_NAME,
+    AdsType,
+)
+from custom_components.ads_custom.symbol_import import (
+    PlcSymbol,
+    SymbolImportError,
+    build_entity_configs,
+    iter_symbols,
+    normalize_plc_type,
+    parse_mapping_rules,
+)
+
+_TMC = """<?xml version="1.0" encoding="utf-8"?>
+<TcModuleClass>
+  <DataTypes>
+    <DataType>
+      <Name>ST_Room</Name>
+      <SubItem><Name>bLight</Name><Type>BOOL</Type></SubItem>
+    </DataType>
+  </DataTypes>
+  <Modules>
+    <Module>
+      <DataAreas>
+        <DataArea>
+          <Symbol><Name>GVL.bKitchenLight</Name><BitSize>8</BitSize><BaseType>BOOL</BaseType></Symbol>
+          <Symbol><Name>GVL.fTemperature</Name><BitSize>32</BitSize><BaseType>REAL</BaseType></Symbol>
+          <Symbol><Name>GVL.stRoom</Name><BitSize>8</BitSize><BaseType>ST_Room</BaseType></Symbol>
+        </DataArea>
+      </DataAreas>
+    </Module>
+  </Modules>
+</TcModuleClass>
+"""
+
+
+def _build(symbols, **kwargs):
+    """Build entity configs with a fixed default device."""
+    return build_entity_configs(
+        symbols, device_id="dev-1", device_name="PLC", **kwargs
+    )
+
+
+class TestParsers:
+    """Tests for the streaming symbol file parsers."""
+
+    def test_tmc_symbols(self, tmp_path):
+        """Only <Symbol> elements are read from a .tmc file, not data types."""
+        path = tmp_path / "Plc.tmc"
+        path.write_text(_TMC)
+        assert list(iter_symbols(path)) == [
+            PlcSymbol("GVL.bKitchenLight", "BOOL"),
+            PlcSymbol("GVL.fTemperature", "REAL"),
+            PlcSymbol("GVL.stRoom", "ST_Room"),
+        ]
+
+    def test_invalid_tmc_raises(self, tmp_path):
+        """A malformed .tmc file raises SymbolImportError."""
+        path = tmp_path / "broken.tmc"
+        path.write_text("<TcModuleClass><Symbol>")
+        with pytest.raises(SymbolImportError):
+            list(iter_symbols(path))
+
+    def test_csv_with_header(self, tmp_path):
+        """CSV exports are read by header column, with ; delimiters."""
+        path = tmp_path / "symbols.csv"
+        path.write_text("Comment;Type;Name\nlamp;BOOL;GVL.bLamp\npump;INT;GVL.nPump\n")
+        assert list(iter_symbols(path)) == [
+            PlcSymbol("GVL.bLamp", "BOOL"),
+            PlcSymbol("GVL.nPump", "INT"),
+        ]
+
+    def test_csv_without_header(self, tmp_path):
+        """Without a header the first two columns are name and type."""
+        path = tmp_path / "symbols.csv"
+        path.write_text("GVL.bLamp,BOOL\nGVL.sText,STRING(80)\n")
+        assert list(iter_symbols(path)) == [
+            PlcSymbol("GVL.bLamp", "BOOL"),
+            PlcSymbol("GVL.sText", "STRING(80)"),
+        ]
+
+    def test_json_array_across_chunks(self, tmp_path, monkeypatch):
+        """JSON arrays are decoded object by object across read chunks."""
+        import custom_components.ads_custom.symbol_import as symbol_import
+
+        monkeypatch.setattr(symbol_import, "_JSON_CHUNK_SIZE", 7)
+        path = tmp_path / "symbols.json"
+        path.write_text(
+            json.dumps(
+                {"symbols": [{"name": f"GVL.n{i}", "type": "INT"} for i in range(5)]}
+            )
+        )
+        assert [s.name for s in iter_symbols(path)] == [f"GVL.n{i}" for i in range(5)]
+
+    def test_json_lines(self, tmp_path):
+        """JSON Lines exports are supported."""
+        path = tmp_path / "symbols.jsonl"
+        path.write_text('{"Name": "GVL.a", "BaseType": "BOOL"}\n{"Name": "GVL.b", "BaseType": "DINT"}\n')
+        assert list(iter_symbols(path)) == [
+            PlcSymbol("GVL.a", "BOOL"),
+            PlcSymbol("GVL.b", "DINT"),
+        ]
+
+    def test_invalid_json_raises(self, tmp_path):
+        """Truncated JSON raises SymbolImportError."""
+        path = tmp_path / "symbols.json"
+        path.write_text('[{"name": "GVL.a", "type": ')
+        with pytest.raises(SymbolImportError):
+            list(iter_symbols(path))
+
+    def test_unsupported_extension_raises(self, tmp_path):
+        """Unknown file extensions are rejected."""
+        with pytest.raises(SymbolImportError):
+            iter_symbols(tmp_path / "symbols.xlsx")
+
+
+class TestMapping:
+    """Tests for symbol to entity mapping."""
+
+    def test_normalize_plc_type(self):
+        """IEC type names map to AdsType; structured types are unsupported."""
+        assert normalize_plc_type("bool") is AdsType.BOOL
+        assert normalize_plc_type("STRING(255)") is AdsType.STRING
+        assert normalize_plc_type("TIME_OF_DAY") is AdsType.TOD
+        assert normalize_plc_type("ST_Room") is None
+
+    def test_default_rules(self):
+        """Naming rules pick light/switch; BOOL falls back to binary_sensor."""
+        entities = _build(
+            [
+                PlcSymbol("GVL.bKitchenLight", "BOOL"),
+                PlcSymbol("GVL.bPumpEnable", "BOOL"),
+                PlcSymbol("GVL.bDoorContact", "BOOL"),
+                PlcSymbol("GVL.fTemperature", "REAL"),
+                PlcSymbol("GVL.stRoom", "ST_Room"),
+            ]
+        )
+        assert [(e[CONF_ADS_VAR], e["entity_type"]) for e in entities] == [
+            ("GVL.bKitchenLight", "light"),
+            ("GVL.bPumpEnable", "switch"),
+            ("GVL.bDoorContact", "binary_sensor"),
+            ("GVL.fTemperature", "sensor"),
+        ]
+        assert entities[3]["adstype"] == "real"
+        assert entities[0]["name"] == "bKitchenLight"
+        assert all(e[CONF_ENTITY_DEVICE_ID] == "dev-1" for e in entities)
+        assert len({e["unique_id"] for e in entities}) == 4
+
+    def test_user_rules_take_precedence(self):
+        """User rules are checked before the built-in rules."""
+        entities = _build(
+            [PlcSymbol("GVL.bLightSensor", "BOOL")],
+            mapping_rules="# comment\nbinary_sensor = sensor$",
+        )
+        assert entities[0]["entity_type"] == "binary_sensor"
+
+    def test_rule_ignored_for_incompatible_type(self):
+        """A switch rule does not apply to a REAL symbol."""
+        entities = _build(
+            [PlcSymbol("GVL.fPumpSwitch", "REAL")],
+            mapping_rules="switch = pump",
+        )
+        assert entities[0]["entity_type"] == "sensor"
+
+    def test_invalid_rules_raise(self):
+        """Unknown entity types and bad patterns raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_mapping_rules("cover = blind")
+        with pytest.raises(ValueError):
+            parse_mapping_rules("switch = (")
+
+    def test_filter_and_existing_symbols(self):
+        """Filtered-out, duplicate and already configured symbols are skipped."""
+        entities = _build(
+            [
+                PlcSymbol("GVL.a", "BOOL"),
+                PlcSymbol("GVL.a", "BOOL"),
+                PlcSymbol("GVL.b", "BOOL"),
+                PlcSymbol("MAIN.c", "BOOL"),
+            ],
+            symbol_filter=r"^gvl\.",
+            existing_ads_vars={"GVL.b"},
+        )
+        assert [e[CONF_ADS_VAR] for e in entities] == ["GVL.a"]
+
+    def test_group_by_prefix(self):
+        """With group_by_prefix each namespace gets its own device."""
+        entities = _build(
+            [
+                PlcSymbol("GVL_Kitchen.a", "BOOL"),
+                PlcSymbol("GVL_Kitchen.b", "BOOL"),
+                PlcSymbol("GVL_Bath.c", "BOOL"),
+            ],
+            group_by_prefix=True,
+        )
+        assert [e[CONF_ENTITY_DEVICE_NAME] for e in entities] == [
+            "GVL_Kitchen",
+            "GVL_Kitchen",
+            "GVL_Bath",
+        ]
+        assert entities[0][CONF_ENTITY_DEVICE_ID] == entities[1][CONF_ENTITY_DEVICE_ID]
+        assert entities[0][CONF_ENTITY_DEVICE_ID] != entities[2][CONF_ENTITY_DEVICE_ID]